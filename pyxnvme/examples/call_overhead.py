@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+    Micro-benchmark of the per-call cost of the ctypes and the cffi binding
+
+    The cffi binding is measured when it is built, see xnvme/cffi_build.py
+"""
+import argparse
+import timeit
+
+import xnvme
+from xnvme.queue import Queue
+
+def per_call(func, number):
+    """Returns the nanoseconds per invocation of 'func', best of three runs"""
+
+    return min(timeit.repeat(func, number=number, repeat=3)) / number * 1e9
+
+def calls(api, dev, queue):
+    """Returns the calls to measure, with arguments prepared for the given 'api'"""
+
+    return [
+        ("xnvme_ver_major()", api.xnvme_ver_major),
+        ("xnvme_dev_get_nsid(dev)", lambda: api.xnvme_dev_get_nsid(dev)),
+        ("xnvme_queue_get_outstanding(queue)",
+         lambda: api.xnvme_queue_get_outstanding(queue)),
+        ("xnvme_queue_poke(queue, 0)", lambda: api.xnvme_queue_poke(queue, 0)),
+    ]
+
+def main(args):
+    """Measure and print the per-call cost of each binding"""
+
+    dev = xnvme.CAPI.xnvme_dev_open(args.uri.encode(), None)
+    if not dev:
+        raise OSError("xnvme_dev_open(%s): failed" % args.uri)
+
+    bindings = [False] + ([True] if xnvme.FAST is not None else [])
+    geo = xnvme.CAPI.xnvme_dev_get_geo(dev).contents
+    buf = xnvme.Buffer(dev, (args.nlb + 1) * geo.lba_nbytes)
+    try:
+        cmds = [(xnvme.XNVME_SPEC_NVM_OPC_READ, 0, args.nlb, buf)] * args.batch
+
+        results = []
+        for fast in bindings:
+            with Queue(dev, args.qdepth, fast=fast) as queue:
+                if fast:
+                    handles = (xnvme.FFI.cast("struct xnvme_dev *", dev), queue.binding.handle)
+                else:
+                    handles = (dev, queue.binding.handle)
+
+                for name, func in calls(queue.binding.api, *handles):
+                    results.append((queue.binding.name, name, per_call(func, args.number)))
+
+                nsec = per_call(lambda: queue.submit_batch(cmds), max(1, args.number // 1000))
+                results.append((queue.binding.name, "Queue.submit_batch(), per command",
+                                nsec / args.batch))
+
+        for binding, name, nsec in results:
+            print("%-7s %-40s %10.1f ns" % (binding, name, nsec))
+    finally:
+        buf.close()
+        xnvme.CAPI.xnvme_dev_close(dev)
+
+if __name__ == "__main__":
+    PRSR = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    PRSR.add_argument("uri", nargs="?", default="/dev/nvme0n1", help="Device URI")
+    PRSR.add_argument("--number", type=int, default=100000, help="Calls per measurement")
+    PRSR.add_argument("--qdepth", type=int, default=64, help="Queue capacity")
+    PRSR.add_argument("--batch", type=int, default=1024, help="Commands per batch")
+    PRSR.add_argument("--nlb", type=int, default=0, help="Zero-based number of LBAs")
+    main(PRSR.parse_args())
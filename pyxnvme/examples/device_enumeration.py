@@ -2,17 +2,19 @@
 """
     Showing how to enumerated devices via the ctypes-wrapped xNVMe C API
 """
-from ctypes import byref, POINTER
 import xnvme
 
 def main():
     """Enumerate devices on the system"""
 
-    arg = POINTER(xnvme.Enumeration)()
+    def enumerate_cb(dev, _):
+        """Print the device-handle, and signal the backend to close it"""
 
-    xnvme.CAPI.xnvme_enumerate(byref(arg), 0x0)
+        xnvme.CAPI.xnvme_dev_pr(dev, 0x0)
 
-    xnvme.CAPI.xnvme_enumeration_pr(arg, 0x0)
+        return xnvme.libxnvme.XNVME_ENUMERATE_DEV_CLOSE
+
+    xnvme.CAPI.xnvme_enumerate(None, None, xnvme.XNVME_ENUMERATE_CB(enumerate_cb), None)
 
 if __name__ == "__main__":
     main()
@@ -5,6 +5,8 @@ import codecs
 import glob
 import os
 from setuptools import setup
+from setuptools.command.build_ext import build_ext
+from setuptools.errors import CCompilerError, ExecError
 
 def read(*parts):
     """Read parts to use a e.g. long_description"""
@@ -16,6 +18,40 @@ def read(*parts):
     with codecs.open(os.path.join(here, *parts), 'r') as pfp:
         return pfp.read()
 
+class OptionalBuildExt(build_ext):
+    """
+    Builds the extensions, skipping those which fail to compile or link, e.g.
+    the cffi binding when the xNVMe headers or library are not found
+    """
+
+    def build_extensions(self):
+        for ext in list(self.extensions):
+            try:
+                self.build_extension(ext)
+            except (CCompilerError, ExecError) as exc:
+                self.warn(
+                    "skipping the optional extension '%s', failed building it: %s; "
+                    "see XNVME_INCLUDE_DIR and XNVME_LIBRARY_DIR in xnvme/cffi_build.py"
+                    % (ext.name, exc)
+                )
+                self.extensions.remove(ext)
+
+def cffi_modules():
+    """
+    The optional compiled binding, built when cffi is available and skipped
+    when it fails to build, the ctypes binding is used without it
+    """
+
+    try:
+        import cffi  # pylint: disable=unused-import,import-outside-toplevel
+    except ImportError:
+        return {}
+
+    return {
+        "cffi_modules": ["xnvme/cffi_build.py:FFIBUILDER"],
+        "cmdclass": {"build_ext": OptionalBuildExt},
+    }
+
 setup(
     name="pyxnvme",
     version="0.0.12",
@@ -33,6 +69,7 @@ setup(
         ("bin", glob.glob("bin/*")),
     ],
     options={'bdist_wheel':{'universal':True}},
+    extras_require={"cffi": ["cffi>=1.12"], "numpy": ["numpy"]},
     classifiers=[
         "Development Status :: 4 - Beta",
         "Environment :: Console",
@@ -44,4 +81,5 @@ setup(
         "Topic :: Software Development",
         "Topic :: Software Development :: Testing"
     ],
+    **cffi_modules()
 )
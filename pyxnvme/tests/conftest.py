@@ -0,0 +1,21 @@
+"""
+    Fixtures of the pyxnvme tests
+
+    Tests calling into the C API take the 'capi' fixture, and are skipped when
+    libxnvme-shared cannot be loaded, see xnvme.library for where it is
+    searched for, e.g. XNVME_LIBRARY_PATH.
+"""
+import pytest
+
+import xnvme
+
+@pytest.fixture(scope="session")
+def capi():
+    """The loaded xnvme.CAPI, skipping the test when the library is not found"""
+
+    try:
+        xnvme.CAPI.load()
+    except OSError as exc:
+        pytest.skip("libxnvme-shared: %s" % exc)
+
+    return xnvme.CAPI
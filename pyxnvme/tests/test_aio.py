@@ -0,0 +1,90 @@
+"""
+    Awaiting commands via xnvme.aio, on a File
+"""
+import asyncio
+import ctypes
+import importlib
+
+import pytest
+
+import xnvme
+
+@pytest.fixture
+def aio(capi):
+    """The xnvme.aio module, importing it loads the library"""
+
+    return importlib.import_module("xnvme.aio")
+
+@pytest.fixture
+def fd(capi, tmp_path):
+    """A File of a few logical blocks, to submit commands on"""
+
+    path = tmp_path / "data"
+    path.write_bytes(b"\0" * 65536)
+    with xnvme.File(str(path), "r+b") as rwfd:
+        yield rwfd
+
+def run(coro):
+    """
+    Run 'coro' on a new event loop, for at most ten seconds, returns its result
+    and the errors the loop handled
+    """
+
+    errors = []
+    loop = asyncio.new_event_loop()
+    loop.set_exception_handler(lambda loop, ctx: errors.append(ctx))
+    try:
+        return loop.run_until_complete(asyncio.wait_for(coro, 10)), errors
+    finally:
+        loop.close()
+
+def test_write_read(aio, fd):
+    """Data written is read back, via futures resolved on the loop"""
+
+    async def main():
+        async with aio.Queue(fd, 4) as queue:
+            await queue.write(1, 0, b"\x5a" * queue.lba_nbytes)
+            buf = await queue.read(1, 0)
+            return buf.tobytes() == b"\x5a" * queue.lba_nbytes
+
+    assert run(main()) == (True, [])
+
+def test_submit_failure(aio, fd):
+    """A command failing to submit fails its future, the reaper keeps running"""
+
+    async def main():
+        async with aio.Queue(fd, 4) as queue:
+            with pytest.raises(KeyError):
+                await queue.submit(0xFF, 0, 0)
+            with pytest.raises((TypeError, ctypes.ArgumentError)):
+                await queue.submit(xnvme.XNVME_SPEC_NVM_OPC_READ, 0, 0, object())
+            await queue.read(0, 0)
+            return queue._thread.is_alive()
+
+    assert run(main()) == (True, [])
+
+def test_submit_failure_cancelled(aio, fd):
+    """A cancelled future of a command failing to submit is left cancelled"""
+
+    async def main():
+        async with aio.Queue(fd, 4) as queue:
+            fut = queue.submit(0xFF, 0, 0)
+            fut.cancel()
+            await queue.read(0, 0)
+            return fut.cancelled()
+
+    assert run(main()) == (True, [])
+
+def test_loop_closed(aio, fd):
+    """The reaper tears down the queue when the loop closes with commands in flight"""
+
+    loop = asyncio.new_event_loop()
+    queue = aio.Queue(fd, 4, loop=loop)
+    loop.close()
+
+    with xnvme.Buffer(fd, queue.lba_nbytes) as buf:
+        queue.submit(xnvme.XNVME_SPEC_NVM_OPC_READ, 0, 0, buf)
+        queue.close()
+
+    assert not queue._thread.is_alive()
+    assert not queue.queue.handle
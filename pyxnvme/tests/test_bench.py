@@ -0,0 +1,53 @@
+"""
+    Benchmarks of xnvme.bench, run on a file
+"""
+import importlib
+
+import pytest
+
+@pytest.fixture
+def bench(capi):
+    """The xnvme.bench module, importing xnvme.queue which needs the library"""
+
+    return importlib.import_module("xnvme.bench")
+
+@pytest.fixture
+def path(tmp_path):
+    """A file of 1 MiB to run the workloads on"""
+
+    data = tmp_path / "data"
+    data.write_bytes(b"\0" * (1 << 20))
+
+    return str(data)
+
+@pytest.mark.parametrize("rw, qdepth, iface", [
+    ("randwrite", 4, None),
+    ("read", 1, "psync"),
+])
+def test_run(bench, path, rw, qdepth, iface):
+    """The latencies are summarized by a Histogram, as the statistics of a Queue"""
+
+    stats = importlib.import_module("xnvme.stats")
+
+    res = bench.run(path, rw, 4096, qdepth, iface, nios=64)
+
+    lat = res["lat_usec"]
+    assert res["ios"] == lat["count"] == 64
+    assert res["qdepth"] == qdepth
+    assert sorted(lat) == sorted(stats.Histogram().summary())
+    assert lat["min"] <= lat["p50"] <= lat["p99.99"] <= lat["max"]
+
+def test_matrix_errors(bench, path):
+    """Combinations which cannot run are yielded with an error"""
+
+    results = list(bench.matrix(path, ["randread"], [None], [1, 2], [4096, 1000], nios=8))
+
+    assert [res["bs"] for res in results] == [4096, 4096, 1000, 1000]
+    assert ["error" in res for res in results] == [False, False, True, True]
+
+def test_nbytes(bench):
+    """Sizes are given with a unit of k, m or g"""
+
+    assert [bench.nbytes(text) for text in ["512", "4k", "1M", "2g"]] == [
+        512, 4096, 1 << 20, 2 << 30
+    ]
@@ -0,0 +1,112 @@
+"""
+    Buffers and the BufferPool of xnvme.buf, allocated for a File
+"""
+import gc
+import sys
+import threading
+
+import pytest
+
+import xnvme
+from xnvme.buf import BufferPool, byteview
+
+@pytest.fixture
+def fd(capi, tmp_path):
+    """A File to allocate buffers for"""
+
+    with xnvme.File(str(tmp_path / "data"), "wb") as wfd:
+        yield wfd
+
+def test_buffer_as_bytes(fd):
+    """A Buffer is given as bytes-like via byteview(), and assigned from Buffers"""
+
+    with xnvme.Buffer(fd, 4096) as buf, xnvme.Buffer(fd, 4096) as other:
+        buf[:] = b"\x5a" * 4096
+        other[:] = buf
+        assert other.tobytes() == b"\x5a" * 4096
+        assert byteview(buf).tobytes() == b"\x5a" * 4096
+        assert len(byteview(b"ab")) == 2
+
+def test_pool_recycles(fd):
+    """Released buffers are handed out again, up to the high-water mark"""
+
+    pool = BufferPool(fd, 65536, hwm=2)
+    bufs = [pool.get(4096) for _ in range(3)]
+    for buf in bufs:
+        buf.close()
+    del bufs, buf
+
+    assert pool.cached() == 2
+    assert pool.stats["freed"] == 1
+    pool.get(4000).close()
+    assert pool.stats["hits"] == 1
+    pool.clear()
+    assert pool.cached() == 0
+
+def test_pool_release_by_other_thread(fd):
+    """Buffers released by a thread not taking any are shared with the others"""
+
+    pool = BufferPool(fd, 65536)
+    buf = pool.get(4096)
+    worker = threading.Thread(target=buf.close)
+    worker.start()
+    worker.join()
+    del buf
+
+    assert pool.cached() == 1
+    pool.get(4096).close()
+    assert pool.stats["hits"] == 1
+    pool.clear()
+
+def test_pool_reclaims_exited_threads(fd):
+    """The free buffers of a thread are returned to the allocator when it exits"""
+
+    pool = BufferPool(fd, 65536)
+
+    def work():
+        """Take and release buffers, leaving them on the free-list of the thread"""
+
+        for _ in range(4):
+            bufs = [pool.get(8192) for _ in range(4)]
+            for buf in bufs:
+                buf.close()
+
+    workers = [threading.Thread(target=work) for _ in range(8)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    gc.collect()
+
+    assert pool.cached() == 0
+
+def test_buffer_borrowed(fd, monkeypatch):
+    """A Buffer over memory given without a release-callable leaves it to its owner"""
+
+    unraisable = []
+    monkeypatch.setattr(sys, "unraisablehook", unraisable.append)
+    owner = xnvme.Buffer(fd, 4096)
+    borrowed = xnvme.Buffer(fd, 4096, addr=owner.addr)
+    borrowed[:4] = b"abcd"
+    borrowed.close()
+    del borrowed
+    gc.collect()
+
+    assert not unraisable
+    assert owner.tobytes()[:4] == b"abcd"
+    owner.close()
+
+def test_pool_release_after_close(capi, tmp_path, monkeypatch):
+    """Buffers released after the device is closed are left as is"""
+
+    unraisable = []
+    monkeypatch.setattr(sys, "unraisablehook", unraisable.append)
+    with xnvme.File(str(tmp_path / "data"), "wb") as wfd:
+        pool = BufferPool(wfd, 65536, hwm=0)
+        buf = pool.get(4096)
+    buf.close()
+    del buf
+    gc.collect()
+
+    assert not unraisable
+    assert pool.stats["freed"] == 1
@@ -0,0 +1,319 @@
+"""
+    Device, opened on a file, for commands with its queue replaced by a RecordingQueue
+"""
+import ctypes
+import errno
+import importlib
+import itertools
+import os
+import time
+
+import pytest
+
+import xnvme
+
+class RecordingQueue(object):
+    """Records the commands submitted, completing them when waited for"""
+
+    def __init__(self, fail_at=None):
+        self.fail_at = fail_at
+        self.cmds = []
+        self.outstanding = 0
+        self.waited = False
+        self._inflight = []
+
+    def submit(self, opcode, slba, nlb, buf=None, tag=None, sink=None, opts=0):
+        if len(self.cmds) == self.fail_at:
+            raise OSError("submit: failing command %d" % self.fail_at)
+        self.cmds.append((opcode, slba, nlb, opts))
+        self._inflight.append((tag, sink))
+        self.outstanding += 1
+
+    def wait(self):
+        queue = importlib.import_module("xnvme.queue")
+        for tag, sink in self._inflight:
+            sink.append(queue.Completion(tag, 0, 0, 0, 0))
+        self._inflight = []
+        self.outstanding = 0
+        self.waited = True
+
+@pytest.fixture
+def dev(capi, tmp_path):
+    """A Device on a file of 1 MiB, its queue replaced by a RecordingQueue"""
+
+    path = tmp_path / "data"
+    path.write_bytes(b"\0" * (1 << 20))
+    with xnvme.Device(str(path)) as fdev:
+        fdev._queue = RecordingQueue()
+        yield fdev
+        fdev._queue = None
+
+@pytest.fixture
+def device(capi):
+    """The xnvme.device module, importing xnvme.queue which needs the library"""
+
+    return importlib.import_module("xnvme.device")
+
+def test_attributes(dev, device, capi):
+    """The geometry is decoded into attributes, commands are limited by MDTS and 'nlb'"""
+
+    geo = capi.xnvme_dev_get_geo(dev).contents
+    for attr in device.GEO_ATTRS:
+        assert getattr(dev, attr) == getattr(geo, attr)
+    assert dev.nsid == capi.xnvme_dev_get_nsid(dev)
+
+    assert dev.cmd_nbytes % dev.lba_nbytes == 0
+    assert dev.cmd_nbytes <= device.NLB_MAX * dev.lba_nbytes
+    if dev.mdts_nbytes:
+        assert dev.cmd_nbytes <= dev.mdts_nbytes
+    assert repr(dev).startswith("Device(%r" % dev.uri)
+
+def test_identify_copied(dev, device, capi):
+    """The identify data is copied, and its strings decoded"""
+
+    ctrlr = capi.xnvme_dev_get_ctrlr(dev)
+    if not ctrlr:
+        assert dev.ctrlr is None and dev.serial == ""
+        return
+
+    assert ctypes.addressof(dev.ctrlr) != ctypes.addressof(ctrlr.contents)
+    assert bytes(dev.ctrlr) == bytes(ctrlr.contents)
+    assert dev.serial == device.decode(ctrlr.contents.sn)
+
+def test_decode(device):
+    """Identify strings are padded by spaces, or terminated"""
+
+    assert device.decode((ctypes.c_char * 8)(*b"SN 1   \0")) == "SN 1"
+    assert device.decode((ctypes.c_char * 8)(*b"ab\0cdefg")) == "ab"
+
+def test_options(device, tmp_path):
+    """Options are the members of 'struct xnvme_opts', others are rejected"""
+
+    opts = device.options(be="linux", nsid=2)
+    assert (opts.be, opts.nsid) == (b"linux", 2)
+
+    with pytest.raises(ValueError):
+        device.options(nonsense=1)
+    with pytest.raises(ValueError):
+        xnvme.Device(str(tmp_path / "data"), nonsense=1)
+
+def test_closed(capi, tmp_path):
+    """A closed Device cannot be given to the C API, and can be closed again"""
+
+    path = tmp_path / "data"
+    path.write_bytes(b"\0" * 4096)
+    fdev = xnvme.Device(str(path))
+    fdev.close()
+    fdev.close()
+
+    assert fdev.handle is None
+    with pytest.raises(ValueError):
+        getattr(fdev, "_as_parameter_")
+
+@pytest.fixture
+def filedev(capi, tmp_path):
+    """A Device on a file of 1 MiB, counting its commands, of at most 4 KiB"""
+
+    path = tmp_path / "data"
+    path.write_bytes(b"\0" * (1 << 20))
+    with xnvme.Device(str(path), qdepth=4, stats=True) as fdev:
+        fdev.cmd_nbytes = 4096
+        yield fdev
+
+def submitted(fdev):
+    """Returns the number of commands submitted on the queue of 'fdev'"""
+
+    return fdev.queue.stats.snapshot()["submitted"]
+
+def test_commands(dev):
+    """Transfers are split into commands of at most 'cmd_nbytes'"""
+
+    cmd_nlbs = dev.cmd_nbytes // dev.lba_nbytes
+    cmds = dev.commands(xnvme.XNVME_SPEC_NVM_OPC_READ, 512, 2 * dev.cmd_nbytes + 1024, 0x1000)
+
+    assert [(slba, nlb + 1, addr) for _, slba, nlb, addr in cmds] == [
+        (1, cmd_nlbs, 0x1000),
+        (1 + cmd_nlbs, cmd_nlbs, 0x1000 + dev.cmd_nbytes),
+        (1 + 2 * cmd_nlbs, 1024 // dev.lba_nbytes, 0x1000 + 2 * dev.cmd_nbytes),
+    ]
+    with pytest.raises(ValueError):
+        dev.commands(xnvme.XNVME_SPEC_NVM_OPC_READ, 0, dev.lba_nbytes + 1, 0x1000)
+
+def test_pread_pwrite(filedev):
+    """Data written across several commands is read back"""
+
+    data = os.urandom(5 * 4096 + 512)
+
+    assert filedev.pwrite(8192, data) == len(data)
+    assert submitted(filedev) == 6
+    assert filedev.pread(8192, len(data)).tobytes() == data
+    assert filedev.pread(8192 + 4096, 512).tobytes() == data[4096:4608]
+
+    with xnvme.Buffer(filedev, 512) as buf:
+        with pytest.raises(ValueError):
+            filedev.pread(0, 1024, buf)
+
+def test_coalescing(filedev):
+    """Adjacent writes are merged, up to 'max_nbytes', others are written as given"""
+
+    chunks = [os.urandom(512) for _ in range(8)]
+    with filedev.coalescing(window=60, max_nbytes=2048) as coalescer:
+        for idx, chunk in enumerate(chunks):
+            coalescer.pwrite(idx * 512, chunk)
+        coalescer.pwrite(65536, chunks[0])
+        coalescer.pwrite(131072, b"\x5a" * 8192)
+
+    assert coalescer.stats == {"writes": 9, "commands": 3}
+    assert submitted(filedev) == 3 + 2
+    assert filedev.pread(0, 4096).tobytes() == b"".join(chunks)
+    assert filedev.pread(65536, 512).tobytes() == chunks[0]
+    assert filedev.pread(131072, 8192).tobytes() == b"\x5a" * 8192
+
+def test_coalescing_window(filedev, monkeypatch):
+    """Writes given after the window are not merged"""
+
+    clock = itertools.count()
+    monkeypatch.setattr(time, "monotonic", lambda: float(next(clock)))
+
+    with filedev.coalescing(window=0.5) as coalescer:
+        coalescer.pwrite(0, b"\1" * 512)
+        coalescer.pwrite(512, b"\2" * 512)
+
+    assert coalescer.stats["commands"] == 2
+    with pytest.raises(ValueError):
+        filedev.coalescing(max_nbytes=filedev.cmd_nbytes * 2)
+
+class FailingSGLPool(object):
+    """An SGLPool failing to add Buffers with 'errnum', as it does on backends without SGLs"""
+
+    def __init__(self, errnum):
+        self.errnum = errnum
+        self.supported = True
+        self.calls = 0
+
+    def get(self, bufs):
+        self.calls += 1
+        if self.errnum == errno.ENOSYS:
+            self.supported = False
+        raise OSError(self.errnum, "xnvme_sgl_add(): failed")
+
+    def close(self):
+        pass
+
+def buffers(fdev, sizes):
+    """Returns Buffers of the given sizes, of random content"""
+
+    bufs = [xnvme.Buffer(fdev, nbytes) for nbytes in sizes]
+    for buf in bufs:
+        buf[:] = os.urandom(len(buf))
+
+    return bufs
+
+def test_vectored(filedev):
+    """Buffers written in order are read back into Buffers of other sizes"""
+
+    bufs = buffers(filedev, [512, 1024, 2560])
+    data = b"".join(buf.tobytes() for buf in bufs)
+    into = buffers(filedev, [2048, 2048])
+
+    assert filedev.pwritev(4096, bufs) == 4096
+    assert filedev.preadv(4096, into) == 4096
+    assert b"".join(buf.tobytes() for buf in into) == data
+    assert filedev.pread(4096, 4096).tobytes() == data
+
+    with pytest.raises(ValueError):
+        filedev.pwritev(0, buffers(filedev, [4096, 512]))
+
+def test_vectored_without_sgl(filedev):
+    """Without support for SGLs, the Buffers are gathered, and SGLs are not tried again"""
+
+    filedev._sglpool = FailingSGLPool(errno.ENOSYS)
+    bufs = buffers(filedev, [1024, 1024])
+
+    assert filedev.pwritev(0, bufs) == 2048
+    assert filedev.pwritev(2048, bufs) == 2048
+    assert filedev.sglpool.calls == 1
+    assert filedev.pread(0, 4096).tobytes() == b"".join(buf.tobytes() for buf in bufs) * 2
+
+    with pytest.raises(TypeError):
+        filedev.pwritev(0, [b"\0" * 512])
+
+def test_vectored_sgl_failing(filedev):
+    """Errors of building the SGL, other than ENOSYS, are raised"""
+
+    filedev._sglpool = FailingSGLPool(errno.EFAULT)
+
+    with pytest.raises(OSError) as exc:
+        filedev.preadv(0, buffers(filedev, [512]))
+    assert exc.value.errno == errno.EFAULT
+    assert filedev.sglpool.supported
+
+@pytest.fixture
+def write_zeroes(dev, capi, monkeypatch):
+    """Returns a function making 'dev' support Write Zeroes, of the given WZSL"""
+
+    def support(wzsl, dlfeat=0):
+        dev.ctrlr = xnvme.xnvme_spec_idfy_ctrlr()
+        dev.ctrlr.oncs.write_zeroes = 1
+        dev.ns = xnvme.xnvme_spec_idfy_ns()
+        dev.ns.dlfeat.val = dlfeat
+
+        def idfy(ctx, csi, dbuf):
+            ctypes.memset(dbuf, 0, ctypes.sizeof(xnvme.xnvme_spec_idfy))
+            ctypes.cast(dbuf, ctypes.POINTER(ctypes.c_uint8))[1] = wzsl
+            return 0
+
+        monkeypatch.setattr(capi, "xnvme_adm_idfy_ctrlr_csi", idfy)
+
+    return support
+
+def test_zero_range_by_wzsl(dev, write_zeroes):
+    """Write Zeroes commands are of at most the Write Zeroes Size Limit"""
+
+    write_zeroes(1)
+    nlbs = (4096 << 1) // dev.lba_nbytes
+
+    assert dev.zero_range(0, (2 * nlbs + 3) * dev.lba_nbytes, deallocate=True) > 0
+
+    opcodes = set(opcode for opcode, _, _, _ in dev.queue.cmds)
+    assert opcodes == set([xnvme.XNVME_SPEC_NVM_OPC_WRITE_ZEROES])
+    assert [(slba, nlb + 1) for _, slba, nlb, _ in dev.queue.cmds] == [
+        (0, nlbs), (nlbs, nlbs), (2 * nlbs, 3)
+    ]
+    # The namespace does not support deallocating by Write Zeroes
+    assert all(not opts for _, _, _, opts in dev.queue.cmds)
+
+def test_zero_range_without_wzsl(dev, write_zeroes):
+    """Without a Write Zeroes Size Limit, commands are of the largest 'nlb'"""
+
+    write_zeroes(0, dlfeat=0x8)
+
+    dev.zero_range(0, dev.lba_nbytes * 100, deallocate=True)
+
+    assert [nlb + 1 for _, _, nlb, _ in dev.queue.cmds] == [100]
+    assert all(opts for _, _, _, opts in dev.queue.cmds)
+
+def test_zero_range_without_identify(dev):
+    """Without identify data, zeroes are written"""
+
+    dev.ctrlr = None
+    dev.ns = None
+
+    assert dev.zero_range(0, dev.cmd_nbytes + dev.lba_nbytes, deallocate=True) > 0
+
+    assert [(opcode, nlb + 1) for opcode, _, nlb, _ in dev.queue.cmds] == [
+        (xnvme.XNVME_SPEC_NVM_OPC_WRITE, dev.cmd_nbytes // dev.lba_nbytes),
+        (xnvme.XNVME_SPEC_NVM_OPC_WRITE, 1),
+    ]
+
+def test_zero_range_failing_submit(dev, write_zeroes):
+    """The commands submitted before a failing one are waited for"""
+
+    write_zeroes(1)
+    dev._queue = RecordingQueue(fail_at=2)
+
+    with pytest.raises(OSError):
+        dev.zero_range(0, dev.lba_nbytes * 100)
+
+    assert dev.queue.waited
+    assert not dev.queue.outstanding
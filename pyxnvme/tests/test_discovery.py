@@ -0,0 +1,124 @@
+"""
+    Enumerating devices by xnvme.discovery, and the device cache, on files
+"""
+import importlib
+import os
+
+import pytest
+
+@pytest.fixture
+def discovery(capi, tmp_path, monkeypatch):
+    """The xnvme.discovery module, its cache in 'tmp_path'"""
+
+    monkeypatch.setenv("XNVME_CACHE_DIR", str(tmp_path / "cache"))
+
+    return importlib.import_module("xnvme.discovery")
+
+@pytest.fixture
+def system(discovery, tmp_path, monkeypatch):
+    """
+    Returns the devices of a system made up of files, as a dict of the
+    (serial, firmware) by uri, and the list of devices probed, failing for
+    files which do not exist
+    """
+
+    keys = {}
+    probed = []
+    real_probe = discovery.probe
+    for name in ["nvme0n1", "nvme1n1", "nvme2n1"]:
+        path = tmp_path / name
+        path.write_bytes(b"\0" * 4096)
+        keys[str(path)] = None
+
+    def probe(uri, **opts):
+        probed.append(uri)
+        if not os.path.exists(uri):
+            raise OSError("xnvme_dev_open(): failed for '%s'" % uri)
+        info = real_probe(uri, **opts)
+        return info._replace(serial="SN-%s" % os.path.basename(uri))
+
+    monkeypatch.setattr(discovery, "candidates", lambda sys_uri, **opts: list(keys))
+    monkeypatch.setattr(discovery, "key", keys.get)
+    monkeypatch.setattr(discovery, "probe", probe)
+
+    def attach(uri):
+        """Set the key of 'uri' to that of the device as probed"""
+
+        keys[uri] = ("SN-%s" % os.path.basename(uri), probe(uri).firmware)
+        del probed[-1]
+
+    for uri in keys:
+        attach(uri)
+
+    return keys, probed
+
+def test_enumerate_cached(discovery, system):
+    """Devices are probed once, and again when changed, dropped when gone"""
+
+    keys, probed = system
+    uris = list(keys)
+
+    infos = discovery.enumerate()
+    assert [info.uri for info in infos] == uris
+    assert sorted(probed) == sorted(uris)
+    assert os.path.exists(discovery.cache_path())
+
+    del probed[:]
+    assert discovery.enumerate() == infos
+    assert not probed
+
+    keys[uris[1]] = ("SN-other", "FW")
+    del keys[uris[2]]
+    assert [info.uri for info in discovery.enumerate()] == uris[:2]
+    assert probed == [uris[1]]
+    assert sorted(discovery.load(discovery.cache_path())) == sorted(uris[:2])
+
+    del probed[:]
+    discovery.enumerate(rescan=True)
+    assert sorted(probed) == sorted(uris[:2])
+
+def test_enumerate_failing(discovery, system, tmp_path):
+    """Devices failing to open are dropped, unless given"""
+
+    keys, _ = system
+    missing = str(tmp_path / "missing" / "nvme9n1")
+    keys[missing] = None
+
+    assert missing not in [info.uri for info in discovery.enumerate()]
+    with pytest.raises(OSError):
+        discovery.enumerate([missing])
+
+def test_enumerate_uncached(discovery, system):
+    """Without the cache, it is neither read nor written"""
+
+    keys, probed = system
+
+    discovery.enumerate(cache=False)
+    discovery.enumerate(cache=False)
+
+    assert len(probed) == 2 * len(keys)
+    assert not os.path.exists(discovery.cache_path())
+
+def test_enumerate_scan(discovery, monkeypatch):
+    """Without candidates, xnvme_enumerate() is used when nothing is cached"""
+
+    scanned = []
+
+    def scan(sys_uri, **opts):
+        scanned.append(sys_uri)
+        return []
+
+    monkeypatch.setattr(discovery, "candidates", lambda sys_uri, **opts: None)
+    monkeypatch.setattr(discovery, "scan", scan)
+
+    assert discovery.enumerate(sys_uri="fab") == []
+    assert scanned == ["fab"]
+
+@pytest.mark.parametrize("content", ["{", '{"version": 0, "devices": {}}', '{"version": 1}'])
+def test_load_invalid(discovery, tmp_path, content):
+    """A cache which is corrupt, or of another version, is ignored"""
+
+    path = tmp_path / "devices.json"
+    path.write_text(content)
+
+    assert discovery.load(str(path)) == {}
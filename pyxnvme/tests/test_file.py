@@ -0,0 +1,81 @@
+"""
+    Reads and writes of xnvme.File
+"""
+import errno
+
+import pytest
+
+import xnvme
+
+def test_pread_stops_at_eof(capi, tmp_path):
+    """Reads are short at the end of the file and return zero beyond it"""
+
+    path = tmp_path / "data"
+    path.write_bytes(b"\x5a" * 4096)
+
+    with xnvme.File(str(path), "rb") as fd:
+        with xnvme.Buffer(fd, 8192) as buf:
+            assert fd.pread(buf, 8192, 0) == 4096
+            assert buf[:4096].tobytes() == b"\x5a" * 4096
+            assert fd.pread(buf, 4096, 4096) == 0
+        assert fd.read() == b"\x5a" * 4096
+        assert fd.read() == b""
+
+def test_pread_without_progress_returns(capi, tmp_path, monkeypatch):
+    """A read transferring nothing ends the read, rather than being retried"""
+
+    path = tmp_path / "data"
+    path.write_bytes(b"\x5a" * 4096)
+
+    with xnvme.File(str(path), "rb") as fd:
+        monkeypatch.setattr(fd, "command", lambda func, buf, nbytes, offset: 0)
+        assert fd.read(4096) == b""
+
+def test_pwrite_without_progress_raises(capi, tmp_path, monkeypatch):
+    """A write transferring nothing raises ENOSPC, rather than being retried"""
+
+    with xnvme.File(str(tmp_path / "data"), "wb") as fd:
+        monkeypatch.setattr(fd, "command", lambda func, buf, nbytes, offset: 0)
+        with pytest.raises(OSError) as exc:
+            fd.write(b"\x5a" * 4096)
+        assert exc.value.errno == errno.ENOSPC
+
+@pytest.mark.parametrize("readahead", [1, 4, 7])
+def test_buffered_read_ahead(capi, tmp_path, readahead):
+    """The queue of a BufferedFile holds 'readahead' chunks in flight, of any count"""
+
+    path = tmp_path / "data"
+    data = bytes(range(256)) * 64
+    path.write_bytes(data)
+
+    with xnvme.BufferedFile(str(path), "rb", 4096, readahead, readahead) as fd:
+        assert fd.queue.capacity > readahead
+        assert fd.read() == data
+
+def test_truncate_via_descriptor(capi, tmp_path):
+    """A File is truncated through its descriptor, also once its path is renamed"""
+
+    path = tmp_path / "data"
+    path.write_bytes(b"\x5a" * 8192)
+
+    with xnvme.File(str(path), "r+b") as fd:
+        path.rename(tmp_path / "renamed")
+        assert fd.truncate(4096) == 4096
+        assert fd.size == 4096
+
+    assert (tmp_path / "renamed").read_bytes() == b"\x5a" * 4096
+
+def test_buffered_direct_pads_with_zeroes(capi, tmp_path, monkeypatch):
+    """The last write of a direct BufferedFile is padded with zeroes, then truncated"""
+
+    path = tmp_path / "data"
+    data = b"\x5a" * 8192 + b"\xa5" * 100
+
+    with xnvme.BufferedFile(str(path), "wb", 8192, direct=True) as fd:
+        fd.write(data)
+        monkeypatch.setattr(fd.raw, "truncate", lambda size=None: size)
+        fd.flush()
+        assert path.read_bytes() == data + b"\0" * (4096 - 100)
+        monkeypatch.undo()
+
+    assert path.read_bytes() == data
@@ -0,0 +1,149 @@
+"""
+    The OpenMetrics exporter of xnvme.metrics, on a file, with its log pages made up
+"""
+import importlib
+import time
+import urllib.request
+
+import pytest
+
+import xnvme
+from xnvme.stats import PERCENTILES, QueueStats
+
+@pytest.fixture
+def metrics(capi):
+    """The xnvme.metrics module, importing xnvme.queue which needs the library"""
+
+    return importlib.import_module("xnvme.metrics")
+
+@pytest.fixture
+def logs(metrics, monkeypatch):
+    """
+    Returns the log pages, by lid, returned by get_log(), made up as a
+    health log and an error log of two errors; a lid set to None fails
+    """
+
+    pages = {}
+
+    health = xnvme.xnvme_spec_log_health_entry()
+    health.comp_temp = 310
+    health.pct_used = 7
+    health.data_units_read[:2] = [0x10, 0x01]
+    health.temp_sens[1] = 300
+    health.crit_comp_temp_time = 2
+    pages[xnvme.XNVME_SPEC_LOG_HEALTH] = health
+
+    erri = (xnvme.xnvme_spec_log_erri_entry * 4)()
+    erri[0].ecnt, erri[0].lba, erri[0].status.sc = 9, 4096, 0x81
+    erri[2].ecnt = 8
+    pages[xnvme.XNVME_SPEC_LOG_ERRI] = erri
+
+    def get_log(dev, lid, struct, count=1):
+        if pages[lid] is None:
+            raise OSError("xnvme_adm_log(): failed")
+        entries = (struct * count)()
+        size = min(len(bytes(pages[lid])), len(bytes(entries)))
+        memoryview(entries).cast("B")[:size] = bytes(pages[lid])[:size]
+        return entries
+
+    monkeypatch.setattr(metrics, "get_log", get_log)
+
+    return pages
+
+@pytest.fixture
+def exporter(metrics, logs, tmp_path):
+    """An Exporter of a Device on a file"""
+
+    path = tmp_path / "data"
+    path.write_bytes(b"\0" * 4096)
+    with metrics.Exporter([str(path)], interval=60) as exp:
+        yield exp
+
+def samples(text, name):
+    """Returns the sample lines of the metric 'name' in the OpenMetrics 'text'"""
+
+    return [line for line in text.splitlines() if line.startswith(name + "{")]
+
+def test_render(metrics):
+    """Families are rendered with sorted and escaped labels, ending with EOF"""
+
+    text = metrics.render([
+        ("xnvme_x", "counter", "Things", [("_total", {"b": "2", "a": "q\"\\\n"}, 3)]),
+    ])
+
+    assert text == "\n".join([
+        "# TYPE xnvme_x counter",
+        "# HELP xnvme_x Things",
+        "xnvme_x_total{a=\"q\\\"\\\\\\n\",b=\"2\"} 3",
+        "# EOF",
+    ]) + "\n"
+
+def test_logs(metrics, logs):
+    """The health log is decoded by field, the error log to the entries used"""
+
+    health = metrics.health(None)
+    assert health["comp_temp"] == 310
+    assert health["data_units_read"] == 0x110
+    assert health["temp_sens"][:2] == [0, 300]
+    assert not [name for name in health if name.startswith("rsvd")]
+
+    errors = metrics.errors(None, 4)
+    assert [(entry["ecnt"], entry["lba"], entry["sc"]) for entry in errors] == [
+        (9, 4096, 0x81), (8, 0, 0)
+    ]
+
+def test_exporter(exporter):
+    """The health, in base units, and the errors of the devices are exported"""
+
+    exporter.poll()
+    text = exporter.render()
+
+    assert samples(text, "xnvme_device_up")[0].endswith(" 1")
+    assert samples(text, "xnvme_temperature_celsius")[0].endswith(" 37")
+    assert samples(text, "xnvme_percentage_used_ratio")[0].endswith(" 0.07")
+    assert samples(text, "xnvme_data_read_bytes_total")[0].endswith(" %d" % (0x110 * 512000))
+    assert samples(text, "xnvme_critical_temperature_seconds_total")[0].endswith(" 120")
+    sensors = samples(text, "xnvme_temperature_sensor_celsius")
+    assert len(sensors) == 1 and "sensor=\"2\"" in sensors[0] and sensors[0].endswith(" 27")
+    assert samples(text, "xnvme_error_count")[0].endswith(" 9")
+    assert text.endswith("# EOF\n")
+
+def test_exporter_down(exporter, logs):
+    """A device failing to read its logs is exported as down, without its health"""
+
+    logs[xnvme.XNVME_SPEC_LOG_HEALTH] = None
+    exporter.poll()
+    text = exporter.render()
+
+    assert samples(text, "xnvme_device_up")[0].endswith(" 0")
+    assert not samples(text, "xnvme_temperature_celsius")
+
+def test_exporter_queues(exporter):
+    """The registered QueueStats are exported, the latencies as a summary in seconds"""
+
+    stats = QueueStats(512)
+    stats.submit(1, xnvme.XNVME_SPEC_NVM_OPC_READ, 4096)
+    stats.complete(1, False, time.monotonic_ns() + 2000000)
+    exporter.register("app", stats)
+
+    text = exporter.render()
+
+    assert samples(text, "xnvme_queue_completed_total") == [
+        "xnvme_queue_completed_total{queue=\"app\"} 1"
+    ]
+    assert samples(text, "xnvme_queue_bytes_total") == [
+        "xnvme_queue_bytes_total{opcode=\"read\",queue=\"app\"} 4096"
+    ]
+    quantiles = samples(text, "xnvme_queue_latency_seconds")
+    assert len(quantiles) == len(PERCENTILES)
+    assert all(0.0019 < float(line.split()[-1]) < 0.0021 for line in quantiles)
+
+def test_serve(exporter, metrics):
+    """The metrics are served over HTTP"""
+
+    host, port = exporter.serve(("127.0.0.1", 0))
+
+    with urllib.request.urlopen("http://%s:%d/metrics" % (host, port), timeout=10) as rsp:
+        assert rsp.headers["Content-Type"] == metrics.CONTENT_TYPE
+        assert rsp.read().decode().endswith("# EOF\n")
+    assert exporter.polls == 1
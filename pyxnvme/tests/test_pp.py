@@ -0,0 +1,28 @@
+"""
+    Regeneration of xnvme.pp by scripts/pp/generator.py
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+
+def test_pp_is_generated(tmp_path):
+    """The committed xnvme/pp.py is that emitted by: make gen-pyxnvme-pp"""
+
+    pytest.importorskip("jinja2")
+    pytest.importorskip("yaml")
+    generator = os.path.join(ROOT, "scripts", "pp", "generator.py")
+    if not os.path.exists(generator):
+        pytest.skip("scripts/pp/generator.py: not in a source tree")
+
+    output = str(tmp_path / "pp.py")
+    subprocess.check_call([
+        sys.executable, generator, "--templates", os.path.join("scripts", "pp"),
+        "--fmt", os.path.join("scripts", "pp", "xnvme_structs.yaml"), "--py-output", output,
+    ], cwd=ROOT)
+
+    with open(output) as generated, open(os.path.join(ROOT, "pyxnvme", "xnvme", "pp.py")) as pp:
+        assert generated.read() == pp.read()
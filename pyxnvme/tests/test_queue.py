@@ -0,0 +1,98 @@
+"""
+    Completions of xnvme.Queue
+"""
+import ctypes
+import importlib
+
+import pytest
+
+import xnvme
+
+@pytest.fixture
+def queue(capi):
+    """The xnvme.queue module, importing it loads the library"""
+
+    return importlib.import_module("xnvme.queue")
+
+def test_ring_holds_every_command_context(queue, tmp_path):
+    """The ring of the cffi-ring binding takes a completion of each command-context"""
+
+    if xnvme.FAST is None:
+        pytest.skip("the cffi binding, xnvme._libxnvme_cffi, is not built")
+
+    capacity, nbytes = 4, 512
+    path = tmp_path / "data"
+    path.write_bytes(b"".join(bytes([idx]) * nbytes for idx in range(capacity + 1)))
+
+    with xnvme.File(str(path), "rb") as fd:
+        que = queue.Queue(fd, capacity, harvest=True)
+        bufs = [xnvme.Buffer(fd, nbytes) for _ in range(capacity + 1)]
+        try:
+            assert que.binding.name == "cffi-ring"
+            assert que.binding._ring.capacity == capacity + 1
+
+            for idx, buf in enumerate(bufs):
+                que.submit_file(xnvme.XNVME_SPEC_FS_OPC_READ, idx * nbytes, nbytes, buf, idx)
+            que.wait()
+
+            cpls = que.reap()
+            assert sorted(cpl.tag for cpl in cpls) == list(range(capacity + 1))
+            assert all(cpl.result == nbytes and not (cpl.sc or cpl.sct) for cpl in cpls)
+            for idx, buf in enumerate(bufs):
+                assert buf.view.tobytes() == bytes([idx]) * nbytes
+            assert que.binding._ring.overflow == 0
+        finally:
+            que.term()
+            for buf in bufs:
+                buf.close()
+
+@pytest.fixture
+def filequeue(queue, tmp_path):
+    """A Queue of capacity 4 on a File of 64 KiB"""
+
+    path = tmp_path / "data"
+    path.write_bytes(b"\x5a" * 65536)
+    with xnvme.File(str(path), "r+b") as fd:
+        que = queue.Queue(fd, 4)
+        try:
+            yield fd, que
+        finally:
+            que.term()
+
+def test_failed_submissions_release_contexts(filequeue):
+    """The command-contexts of submissions failing, also by raising, are put back"""
+
+    fd, que = filequeue
+    read = xnvme.XNVME_SPEC_FS_OPC_READ
+
+    for _ in range(4 * que.capacity):
+        with pytest.raises((TypeError, ctypes.ArgumentError)):
+            que.submit(xnvme.XNVME_SPEC_NVM_OPC_READ, 0, 0, object())
+        with pytest.raises((TypeError, ctypes.ArgumentError)):
+            que.submit_file(read, 0, 512, object())
+    assert not que._inflight
+
+    bufs = [xnvme.Buffer(fd, 512) for _ in range(que.capacity + 1)]
+    try:
+        for idx, buf in enumerate(bufs):
+            que.submit_file(read, idx * 512, 512, buf, idx)
+        que.wait()
+        assert sorted(cpl.tag for cpl in que.reap()) == list(range(que.capacity + 1))
+    finally:
+        for buf in bufs:
+            buf.close()
+
+def test_positive_return_raises(filequeue):
+    """A command-constructor returning a positive value is not taken as submitted"""
+
+    fd, que = filequeue
+    read = xnvme.XNVME_SPEC_FS_OPC_READ
+    que._file_commands[read] = lambda ctx, payload, nbytes, offset: 1
+
+    with xnvme.Buffer(fd, 512) as buf:
+        for _ in range(2 * que.capacity):
+            with pytest.raises(OSError):
+                que.submit_file(read, 0, 512, buf)
+
+    assert not que._inflight
+    assert que.outstanding == 0
@@ -0,0 +1,59 @@
+"""
+    Planning of the Simple Copy commands of xnvme.scopy
+"""
+import importlib
+
+import pytest
+
+@pytest.fixture
+def scopy(capi):
+    """The xnvme.scopy module, importing it loads the library"""
+
+    return importlib.import_module("xnvme.scopy")
+
+def check(cmds, ranges, sdlba, lim):
+    """Assert that 'cmds' are within 'lim' and copy 'ranges', in order, from 'sdlba'"""
+
+    blocks = []
+    for dlba, entries in cmds:
+        assert dlba == sdlba + len(blocks)
+        assert 0 < len(entries) <= lim.msrc
+        assert all(0 < nlbs <= lim.mssrl for _, nlbs in entries)
+        assert sum(nlbs for _, nlbs in entries) <= lim.mcl
+        for slba, nlbs in entries:
+            blocks.extend(range(slba, slba + nlbs))
+
+    assert blocks == [lba for slba, nlbs in ranges for lba in range(slba, slba + nlbs)]
+
+def test_plan_splits_and_merges(scopy):
+    """Long ranges are split at 'mssrl', adjacent ranges are merged into one entry"""
+
+    lim = scopy.CopyLimits(3, 16, 40)
+    ranges = [(0, 8), (8, 8), (100, 50), (200, 1)]
+
+    cmds = scopy.plan(ranges, 1000, lim)
+
+    check(cmds, ranges, 1000, lim)
+    assert [dlba for dlba, _ in cmds] == [1000, 1040]
+    assert cmds[0][1] == [(0, 16), (100, 16), (116, 8)]
+
+@pytest.mark.parametrize("ranges", [
+    [(idx * 10, 1) for idx in range(7)],
+    [(0, 40), (100, 40)],
+    [(0, 39), (50, 2), (60, 1)],
+    [(0, 0x10000 + 1)],
+])
+def test_plan_limits(scopy, ranges):
+    """Commands are ended at 'msrc' entries and at 'mcl' logical blocks"""
+
+    lim = scopy.CopyLimits(3, 16, 40)
+
+    check(scopy.plan(ranges, 0, lim), ranges, 0, lim)
+
+def test_plan_nothing(scopy):
+    """No ranges, or only empty ones, plan no commands"""
+
+    lim = scopy.CopyLimits(3, 16, 40)
+
+    assert scopy.plan([], 0, lim) == []
+    assert scopy.plan([(10, 0)], 0, lim) == []
@@ -0,0 +1,65 @@
+"""
+    Histograms and QueueStats of xnvme.stats, and their rendering by xnvme.metrics
+"""
+import importlib
+import threading
+
+from xnvme.stats import Histogram, QueueStats
+
+def test_histogram_percentiles():
+    """Percentiles are within the relative error of the buckets"""
+
+    hist = Histogram()
+    for value in range(1, 100001):
+        hist.record(value)
+
+    for pct in [50.0, 90.0, 99.0, 99.9, 100.0]:
+        exact = 100000 * pct / 100
+        assert abs(hist.percentile(pct) - exact) <= exact / 2 ** hist.sub_bits
+
+    summary = hist.summary()
+    assert summary["count"] == 100000
+    assert summary["min"] == 1 and summary["max"] == 100000
+    assert summary["sum"] == 100000 * 100001 // 2
+
+def test_histogram_copy():
+    """A copy is not changed by values recorded afterwards"""
+
+    hist = Histogram()
+    hist.record(10)
+    copy = hist.copy()
+    hist.record(1000)
+
+    assert copy.count == 1 and copy.max == 10
+    assert sum(copy.counts) == 1
+
+def test_snapshot_during_completions(capi):
+    """Snapshots and rendering, from another thread, while completions add opcodes"""
+
+    metrics = importlib.import_module("xnvme.metrics")
+    stats = QueueStats(512)
+    done = threading.Event()
+
+    def complete():
+        """Complete commands of ever new opcodes, as new Histograms"""
+
+        key = 0
+        while not done.is_set():
+            for opcode in range(256):
+                stats.submit(key, opcode, 512)
+                stats.complete(key, False, stats._pending[key][2] + 1000)
+                key += 1
+            stats.reset()
+
+    worker = threading.Thread(target=complete)
+    worker.start()
+    try:
+        for _ in range(200):
+            metrics.render(metrics.stats_families({"q0": stats}))
+    finally:
+        done.set()
+        worker.join()
+
+    snap = stats.snapshot()
+    assert snap["outstanding"] == 0
+    assert snap["submitted"] == snap["completed"]
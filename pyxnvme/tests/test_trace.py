@@ -0,0 +1,86 @@
+"""
+    Recording and replaying traces of xnvme.trace
+"""
+import importlib
+import struct
+import threading
+
+import pytest
+
+@pytest.fixture
+def trace(capi):
+    """The xnvme.trace module, importing it loads the library"""
+
+    return importlib.import_module("xnvme.trace")
+
+def test_record_from_threads(trace, tmp_path):
+    """Records added concurrently, across batches, are all written"""
+
+    path = str(tmp_path / "app.trace")
+    nthreads, nrecords = 8, trace.BATCH + 100
+
+    with trace.TraceRecorder(path) as rec:
+        def record(qid):
+            """Record 'nrecords' commands of the queue 'qid'"""
+
+            for slba in range(nrecords):
+                rec.record(trace.Record(rec._begin, 1000, slba, 1, 0, qid, 0x2, 0, 0, 9))
+
+        workers = [threading.Thread(target=record, args=(qid,)) for qid in range(nthreads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+    records = list(trace.read(path))
+    assert len(records) == rec.nrecords == nthreads * nrecords
+    for qid in range(nthreads):
+        slbas = [rec.slba for rec in records if rec.qid == qid]
+        assert sorted(slbas) == list(range(nrecords))
+
+@pytest.mark.parametrize("qdepth", [0, 3, 48, 4096])
+def test_replay_qdepth(trace, qdepth):
+    """A queue-depth not accepted by xnvme_queue_init() is refused up front"""
+
+    with pytest.raises(ValueError, match="qdepth"):
+        trace.replay("app.trace", "/dev/nvme0n1", qdepth=qdepth)
+    with pytest.raises(SystemExit):
+        trace.parse_args(["app.trace", "/dev/nvme0n1", "--qdepth", str(qdepth)])
+
+    assert trace.parse_args(["app.trace", "/dev/nvme0n1", "--qdepth", "64"]).qdepth == 64
+
+def test_record_large_file_command(trace, tmp_path):
+    """File-commands of 4 GiB and more are recorded in full"""
+
+    path = str(tmp_path / "app.trace")
+    nbytes = 5 << 30
+
+    with trace.TraceRecorder(path) as rec:
+        rec.record(trace.Record(rec._begin, 1000, 1 << 40, 1, nbytes, 0, 0x2, 0, 0, 0))
+
+    assert [(rec.slba, rec.nlb) for rec in trace.read(path)] == [(1 << 40, nbytes)]
+
+def test_record_invalid_raises(trace, tmp_path):
+    """A record not fitting its fields raises when added, the batch is kept"""
+
+    path = str(tmp_path / "app.trace")
+
+    with trace.TraceRecorder(path) as rec:
+        rec.record(trace.Record(rec._begin, 1000, 0, 1, 7, 0, 0x2, 0, 0, 9))
+        with pytest.raises(struct.error):
+            rec.record(trace.Record(rec._begin, 1000, 0, 1, 7, 0, 0x2, 0x100, 0, 9))
+        rec.record(trace.Record(rec._begin, 1000, 8, 1, 7, 0, 0x2, 0, 0, 9))
+
+    assert [rec.slba for rec in trace.read(path)] == [0, 8]
+
+def test_read_version_1(trace, tmp_path):
+    """Trace files of version 1, with a 32-bit 'nlb', are read"""
+
+    path = tmp_path / "app.trace"
+    record = trace.RECORDS[1]
+    path.write_bytes(
+        trace.HEADER.pack(trace.MAGIC, 1, record.size)
+        + record.pack(10, 1000, 8, 1, 7, 0, 0x2, 0, 0, 9)
+    )
+
+    assert list(trace.read(str(path))) == [trace.Record(10, 1000, 8, 1, 7, 0, 0x2, 0, 0, 9)]
@@ -0,0 +1,108 @@
+"""
+    Copying files by xnvme.copy()
+"""
+import errno
+import importlib
+import os
+
+import pytest
+
+import xnvme
+
+@pytest.mark.parametrize("qdepth", [1, 3, 16])
+def test_copy(capi, tmp_path, qdepth):
+    """The input is copied whole, also at a queue-depth not a power of two"""
+
+    data = os.urandom((1 << 20) + 777)
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    src.write_bytes(data)
+
+    res = xnvme.copy(str(src), str(dst), iosize=65536, qdepth=qdepth)
+
+    assert dst.read_bytes() == data
+    assert res.nbytes == len(data)
+    assert res.nreads == res.nwrites == 17
+
+def test_copy_range(capi, tmp_path):
+    """A range is copied into an existing output, which is not truncated"""
+
+    data = os.urandom(1 << 20)
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    src.write_bytes(data)
+    dst.write_bytes(b"\0" * (1 << 20))
+
+    res = xnvme.copy(str(src), str(dst), 300000, 12288, 4096, iosize=65536, qdepth=4)
+
+    got = dst.read_bytes()
+    assert res.nbytes == 300000 and res.nreads == 5
+    assert got[4096:4096 + 300000] == data[12288:12288 + 300000]
+    assert got[:4096] == b"\0" * 4096 and len(got) == 1 << 20
+
+@pytest.fixture
+def short_writes(capi, monkeypatch):
+    """Returns a function making the writes of xnvme.copy() at most 'nbytes' each"""
+
+    xdd = importlib.import_module("xnvme.xdd")
+
+    def limit(nbytes):
+        class ShortQueue(xdd.Queue):
+            """A Queue writing at most 'nbytes' per file-command"""
+
+            def submit_file(self, opcode, offset, count, buf, tag=None, sink=None):
+                if opcode == xnvme.XNVME_SPEC_FS_OPC_WRITE:
+                    count = min(count, nbytes)
+                return super(ShortQueue, self).submit_file(opcode, offset, count, buf, tag, sink)
+
+        monkeypatch.setattr(xdd, "Queue", ShortQueue)
+
+    return limit
+
+def test_copy_short_writes(tmp_path, short_writes):
+    """Short writes are continued, and only the bytes written are counted"""
+
+    data = os.urandom(200000)
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    src.write_bytes(data)
+    short_writes(10000)
+
+    res = xnvme.copy(str(src), str(dst), iosize=65536, qdepth=2)
+
+    assert dst.read_bytes() == data
+    assert res.nbytes == len(data)
+    assert res.nwrites == 3 * 7 + 1
+
+def test_copy_no_progress(tmp_path, short_writes):
+    """A write making no progress raises ENOSPC"""
+
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    src.write_bytes(b"\x5a" * 65536)
+    short_writes(0)
+
+    with pytest.raises(OSError) as exc:
+        xnvme.copy(str(src), str(dst), iosize=16384, qdepth=2)
+    assert exc.value.errno == errno.ENOSPC
+
+def test_copy_direct_keeps_output(capi, tmp_path):
+    """The padding of the last direct write keeps the bytes of a larger output"""
+
+    data = os.urandom(5000)
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    src.write_bytes(data)
+    dst.write_bytes(b"\x11" * 65536)
+
+    res = xnvme.copy(str(src), str(dst), dst_offset=4096, iosize=4096, direct=True)
+
+    got = dst.read_bytes()
+    assert res.nbytes == len(data)
+    assert got == b"\x11" * 4096 + data + b"\x11" * (65536 - 4096 - len(data))
+
+def test_copy_direct_truncates(capi, tmp_path):
+    """The output of a direct copy ends with the copy, when it was not larger"""
+
+    data = os.urandom(5000)
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    src.write_bytes(data)
+
+    xnvme.copy(str(src), str(dst), iosize=4096, direct=True)
+
+    assert dst.read_bytes() == data
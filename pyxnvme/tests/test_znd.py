@@ -0,0 +1,376 @@
+"""
+    Zoned namespaces of xnvme.znd, on a zone report made up by the tests
+"""
+import ctypes
+import errno
+import importlib
+import sys
+
+import pytest
+
+import xnvme
+
+np = pytest.importorskip("numpy")
+
+ZSZE = 16
+LBA_NBYTES = 512
+
+@pytest.fixture
+def znd(capi):
+    """The xnvme.znd module, importing it loads the library"""
+
+    return importlib.import_module("xnvme.znd")
+
+class FakeQueue(object):
+    """Records the commands submitted, completing them when waited for"""
+
+    def __init__(self):
+        self.cmds = []
+        self._inflight = []
+
+    def submit(self, opcode, slba, nlb, buf=None, tag=None, sink=None, opts=0):
+        self.cmds.append((opcode, slba, nlb))
+        self._inflight.append((tag, sink))
+
+    def wait(self):
+        queue = importlib.import_module("xnvme.queue")
+        for tag, sink in self._inflight:
+            sink.append(queue.Completion(tag, 0, 0, 0, 0))
+        self._inflight = []
+
+class FakeDevice(object):
+    """The attributes of a Device used by the zoned helpers, without a device"""
+
+    uri = "fake"
+    nsect = ZSZE
+    lba_nbytes = LBA_NBYTES
+    cmd_nbytes = ZSZE * LBA_NBYTES
+    qdepth = 8
+
+    def __init__(self):
+        self.zones = None
+        self.queue = FakeQueue()
+
+    def commands(self, opcode, offset, nbytes, addr):
+        """The command of 'nbytes' at 'offset', as Device.commands() splits them"""
+
+        return [(opcode, offset // LBA_NBYTES, nbytes // LBA_NBYTES - 1, addr)]
+
+@pytest.fixture
+def zoned(znd, monkeypatch):
+    """
+    Returns a function making a FakeDevice with a ZoneStateCache of a zone
+    per (state, wp, zcap) given, and the list of zone management sent
+    """
+
+    sent = []
+    monkeypatch.setattr(
+        znd, "mgmt_send", lambda dev, zslba, action, *args: sent.append((zslba, action))
+    )
+
+    def make(zones):
+        rprt = np.zeros(len(zones), dtype=znd.report_dtype())
+        rprt["zt"] = znd.XNVME_SPEC_ZND_TYPE_SEQWR
+        rprt["zslba"] = np.arange(len(zones)) * ZSZE
+        rprt["zs"] = [state for state, _, _ in zones]
+        rprt["wp"] = rprt["zslba"] + [wp for _, wp, _ in zones]
+        rprt["zcap"] = [zcap for _, _, zcap in zones]
+        monkeypatch.setattr(znd, "report", lambda dev, *args: rprt.copy())
+
+        dev = FakeDevice()
+        dev.zones = znd.ZoneStateCache(dev)
+
+        return dev, sent
+
+    return make
+
+@pytest.fixture
+def limits(znd, capi, monkeypatch):
+    """Set the (open, active) resource limits of the namespace, and no ZASL"""
+
+    monkeypatch.setattr(capi, "xnvme_znd_dev_get_ctrlr", lambda dev: None)
+
+    def set_limits(mor, mar):
+        monkeypatch.setattr(znd, "resource_limits", lambda dev: (mor, mar))
+
+    return set_limits
+
+def descriptors(zones, zdext_nbytes=0):
+    """
+    Returns the zone report entries of the (zt, zs, za, zcap, zslba, wp) in
+    'zones', with the reserved nibbles next to 'zt' and 'zs' set, followed
+    by 'zdext_nbytes' of extension filled with the index of the zone
+    """
+
+    zd_nbytes = ctypes.sizeof(xnvme.xnvme_spec_znd_descr)
+    zrent_nbytes = zd_nbytes + zdext_nbytes
+    storage = (ctypes.c_uint8 * (len(zones) * zrent_nbytes))()
+    for idx, (zt, zs, za, zcap, zslba, wp) in enumerate(zones):
+        zdescr = xnvme.xnvme_spec_znd_descr.from_buffer(storage, idx * zrent_nbytes)
+        zdescr.zt, zdescr.rsvd0, zdescr.rsvd1, zdescr.zs = zt, 0xF, 0xF, zs
+        zdescr.za.val = za
+        zdescr.zcap, zdescr.zslba, zdescr.wp = zcap, zslba, wp
+        ctypes.memset(ctypes.addressof(zdescr) + zd_nbytes, idx, zdext_nbytes)
+
+    return storage, zrent_nbytes
+
+ZONES = [
+    (0x2, 0x1, 0x00, 16, 0, 0),
+    (0x2, 0xE, 0x81, 12, 16, 20),
+    (0x2, 0xF, 0x08, 0, 1 << 40, (1 << 40) + 7),
+]
+
+@pytest.mark.parametrize("zdext_nbytes", [0, 64])
+def test_decode(znd, zdext_nbytes):
+    """'zt' is the lower nibble of byte 0, 'zs' the upper nibble of byte 1"""
+
+    storage, zrent_nbytes = descriptors(ZONES, zdext_nbytes)
+    zd_nbytes = ctypes.sizeof(xnvme.xnvme_spec_znd_descr)
+
+    zones = znd.decode(
+        ctypes.addressof(storage), len(ZONES), zrent_nbytes, zd_nbytes, zdext_nbytes
+    )
+
+    assert zones.dtype == znd.report_dtype(zdext_nbytes)
+    for name, col in zip(["zt", "zs", "za", "zcap", "zslba", "wp"], zip(*ZONES)):
+        assert zones[name].tolist() == list(col)
+    if zdext_nbytes:
+        assert zones["ext"].tolist() == [[idx] * zdext_nbytes for idx in range(len(ZONES))]
+
+def test_report(znd, capi, monkeypatch):
+    """The report is decoded from the storage following its header, and freed"""
+
+    storage, zrent_nbytes = descriptors(ZONES, 64)
+    offset = xnvme.xnvme_znd_report.storage.offset
+    rprt = (ctypes.c_uint8 * (offset + len(storage)))()
+    ctypes.memmove(ctypes.addressof(rprt) + offset, storage, len(storage))
+    hdr = xnvme.xnvme_znd_report.from_buffer(rprt)
+    hdr.nentries = len(ZONES)
+    hdr.zd_nbytes = ctypes.sizeof(xnvme.xnvme_spec_znd_descr)
+    hdr.zdext_nbytes = 64
+    hdr.zrent_nbytes = zrent_nbytes
+
+    calls = []
+
+    def report_from_dev(dev, slba, limit, extended):
+        calls.append((slba, limit, extended))
+        return ctypes.pointer(hdr)
+
+    monkeypatch.setattr(capi, "xnvme_znd_report_from_dev", report_from_dev)
+    monkeypatch.setattr(capi, "xnvme_buf_virt_free", lambda ptr: calls.append("free"))
+
+    zones = znd.report(FakeDevice(), 16, 2)
+    assert zones.dtype.names == ("zt", "zs", "za", "zcap", "zslba", "wp")
+    assert zones["zs"].tolist() == [0x1, 0xE, 0xF]
+
+    hdr.extended = 1
+    zones = znd.report(FakeDevice(), extended=True)
+    assert zones["ext"].shape == (len(ZONES), 64)
+    assert calls == [(16, 2, 0), "free", (0, 0, 1), "free"]
+
+def test_numpy_missing(znd, monkeypatch):
+    """Without numpy, the zone report raises ImportError with a hint"""
+
+    monkeypatch.setitem(sys.modules, "numpy", None)
+
+    with pytest.raises(ImportError) as exc:
+        znd.report_dtype()
+    assert "pyxnvme[numpy]" in str(exc.value)
+
+def test_cache_find(znd, zoned):
+    """Zones are found by state, in the order they entered it, zones without capacity not"""
+
+    dev, _ = zoned([
+        (znd.ZS_EMPTY, 0, ZSZE), (znd.ZS_FULL, ZSZE, ZSZE), (znd.ZS_EMPTY, 0, 0),
+        (znd.ZS_EMPTY, 0, ZSZE), (znd.ZS_CLOSED, 3, ZSZE),
+    ])
+    zones = dev.zones
+
+    assert len(zones) == 5
+    assert zones.zcap_max == ZSZE
+    assert zones.zones(znd.ZS_EMPTY) == [0, 3 * ZSZE]
+    assert zones.find(znd.ZS_CLOSED) == 4 * ZSZE
+    assert zones.find(znd.ZS_EOPEN) is None
+    assert zones.get(4 * ZSZE + 5) == (znd.ZS_CLOSED, 4 * ZSZE + 3, ZSZE)
+    assert zones.zslba(4 * ZSZE + 5) == 4 * ZSZE
+
+    zones.written(0, 1)
+    zones.written(1, ZSZE - 1)
+    assert zones.zones(znd.ZS_FULL) == [ZSZE, 0]
+    assert zones.count(znd.ZS_EMPTY) == 1
+
+def test_cache_written(znd, zoned):
+    """Writes open empty and closed zones implicitly, and fill them up to their capacity"""
+
+    dev, _ = zoned([(znd.ZS_EMPTY, 0, 12), (znd.ZS_CLOSED, 4, 12), (znd.ZS_EMPTY, 0, 12)])
+    zones = dev.zones
+
+    zones.written(8, ZSZE - 2)
+    assert zones.get(0) == (znd.ZS_FULL, ZSZE, 12)
+    assert zones.get(ZSZE) == (znd.ZS_IOPEN, ZSZE + 6, 12)
+
+    zones.appended(ZSZE, 6)
+    assert zones.get(ZSZE) == (znd.ZS_FULL, ZSZE + 12, 12)
+
+    zones.appended(2 * ZSZE, 3)
+    assert zones.get(2 * ZSZE) == (znd.ZS_IOPEN, 2 * ZSZE + 3, 12)
+    assert zones.count(znd.ZS_FULL) == 2
+    assert zones.count(znd.ZS_CLOSED) == 0
+
+def test_cache_mgmt(znd, zoned):
+    """Zone management is sent, and updates the state of the zone"""
+
+    dev, sent = zoned([(znd.ZS_IOPEN, 5, ZSZE), (znd.ZS_EMPTY, 0, 12), (znd.ZS_FULL, ZSZE, ZSZE)])
+    zones = dev.zones
+
+    zones.close(0)
+    assert zones.get(0) == (znd.ZS_CLOSED, 5, ZSZE)
+    zones.open(0)
+    assert zones.get(0) == (znd.ZS_EOPEN, 5, ZSZE)
+    zones.reset(0)
+    assert zones.get(0) == (znd.ZS_EMPTY, 0, ZSZE)
+    zones.finish(ZSZE)
+    assert zones.get(ZSZE) == (znd.ZS_FULL, ZSZE + 12, 12)
+    zones.close(2 * ZSZE)
+    assert zones.get(2 * ZSZE)[0] == znd.ZS_FULL
+
+    assert sent == [
+        (0, znd.XNVME_SPEC_ZND_CMD_MGMT_SEND_CLOSE),
+        (0, znd.XNVME_SPEC_ZND_CMD_MGMT_SEND_OPEN),
+        (0, znd.XNVME_SPEC_ZND_CMD_MGMT_SEND_RESET),
+        (ZSZE, znd.XNVME_SPEC_ZND_CMD_MGMT_SEND_FINISH),
+        (2 * ZSZE, znd.XNVME_SPEC_ZND_CMD_MGMT_SEND_CLOSE),
+    ]
+    assert zones.zones(znd.ZS_EMPTY) == [0]
+    assert zones.zones(znd.ZS_FULL) == [2 * ZSZE, ZSZE]
+
+@pytest.fixture
+def changes(znd, capi, monkeypatch):
+    """
+    Returns a function setting the zones listed by the Changed Zone List log,
+    the descriptors of the zones are given by the tests via 'descrs'
+    """
+
+    log = xnvme.xnvme_spec_znd_log_changes()
+    descrs = {}
+    monkeypatch.setattr(capi, "xnvme_znd_log_changes_from_dev", lambda dev: ctypes.pointer(log))
+    monkeypatch.setattr(capi, "xnvme_buf_free", lambda dev, ptr: None)
+    monkeypatch.setattr(znd, "descr", lambda dev, zslba: descrs[zslba])
+
+    def change(zslbas, **zdescrs):
+        log.nidents = znd.LOG_CHANGES_OVERFLOW if zslbas is None else len(zslbas)
+        for idx, zslba in enumerate(zslbas or []):
+            log.idents[idx] = zslba
+        for zslba, (state, wp, zcap) in zdescrs.items():
+            zdescr = descrs[int(zslba[1:])] = xnvme.xnvme_spec_znd_descr()
+            zdescr.zs, zdescr.wp, zdescr.zcap = state, wp, zcap
+
+    return change
+
+def test_cache_update(znd, zoned, changes, monkeypatch):
+    """Zones changed by the device are refreshed, all of them when the log overflowed"""
+
+    dev, _ = zoned([(znd.ZS_IOPEN, 3, ZSZE), (znd.ZS_EMPTY, 0, ZSZE)])
+    zones = dev.zones
+
+    changes([0], z0=(znd.ZS_FULL, 3, 3))
+    assert zones.update() == [0]
+    assert zones.get(0) == (znd.ZS_FULL, 3, 3)
+    assert zones.count(znd.ZS_IOPEN) == 0
+
+    zones.written(ZSZE, 2)
+    changes(None)
+    assert zones.update() == [0, ZSZE]
+    assert zones.get(ZSZE) == (znd.ZS_EMPTY, ZSZE, ZSZE)
+
+def test_append_larger_than_zones(znd, zoned, limits):
+    """A record larger than any zone is rejected before any zone is opened"""
+
+    dev, sent = zoned([(znd.ZS_EMPTY, 0, 8)] * 4)
+    limits(None, None)
+
+    sched = znd.AppendScheduler(dev)
+    assert sched.max_nbytes == 8 * LBA_NBYTES
+    with pytest.raises(ValueError):
+        sched.append(b"\0" * 9 * LBA_NBYTES)
+
+    assert not sent
+    assert dev.zones.count(znd.ZS_EMPTY) == 4
+
+def test_append_counts_open_zones(znd, zoned, limits):
+    """Zones open, or active, on the device take from the resources of the scheduler"""
+
+    dev, _ = zoned([
+        (znd.ZS_IOPEN, 1, ZSZE), (znd.ZS_EOPEN, 1, ZSZE), (znd.ZS_CLOSED, 1, ZSZE),
+        (znd.ZS_EMPTY, 0, ZSZE), (znd.ZS_EMPTY, 0, ZSZE),
+    ])
+
+    limits(4, 6)
+    assert znd.AppendScheduler(dev).nzones == 2
+    limits(4, 4)
+    assert znd.AppendScheduler(dev).nzones == 1
+    limits(2, None)
+    with pytest.raises(OSError) as exc:
+        znd.AppendScheduler(dev)
+    assert exc.value.errno == errno.EBUSY
+
+@pytest.fixture
+def zrwa(znd, capi, zoned, monkeypatch, tmp_path):
+    """
+    Returns a function making a ZRWAWriter on a zone of 'zcap', with a ZRWA of
+    'zrwas' and flush-granule 'zrwafg', with the LBAs flushed, and a function
+    making Buffers of logical blocks
+    """
+
+    flushed = []
+    monkeypatch.setattr(znd, "zrwa_flush", lambda dev, lba: flushed.append(lba))
+    fd = xnvme.File(str(tmp_path / "bufs"), "wb")
+
+    def make(zcap, zrwas, zrwafg, keep=0):
+        zns = xnvme.xnvme_spec_znd_idfy_ns()
+        zns.ozcs.bits.zrwasup = 1
+        zns.zrwas = zrwas
+        zns.zrwafg = zrwafg
+        monkeypatch.setattr(capi, "xnvme_znd_dev_get_ns", lambda dev: ctypes.pointer(zns))
+
+        dev, _ = zoned([(znd.ZS_EMPTY, 0, zcap)] * 2)
+
+        return znd.ZRWAWriter(dev, 0, keep), flushed
+
+    def blocks(nlbs):
+        buf = xnvme.Buffer(fd, nlbs * LBA_NBYTES)
+        buf[:] = b"\x5a" * len(buf)
+        return buf
+
+    yield make, blocks
+    fd.close()
+
+def test_zrwa_flush_granules(znd, zrwa):
+    """Flushes end on a flush-granule, or the end of the zone"""
+
+    make, blocks = zrwa
+    writer, flushed = make(10, 12, 4)
+
+    writer.pwrite(0, blocks(9))
+    writer.flush()
+    assert flushed == [7]
+    assert writer.wp == 8
+
+    writer.pwrite(9 * LBA_NBYTES, blocks(1))
+    writer.flush()
+    assert flushed == [7, 9]
+    assert writer.wp == 10
+    assert writer.zones.get(0)[0] == znd.ZS_FULL
+
+def test_zrwa_commit_on_overflow(znd, zrwa):
+    """A write beyond the ZRWA commits what makes room for it, keeping 'keep'"""
+
+    make, blocks = zrwa
+    writer, flushed = make(16, 8, 2, keep=2)
+
+    writer.pwrite(0, blocks(8))
+    writer.pwrite(8 * LBA_NBYTES, blocks(4))
+    assert flushed == [5]
+    assert writer.wp == 6
+    writer.flush()
+    assert flushed == [5, 11]
@@ -2,56 +2,92 @@
     xNVMe libraries for Python
 
     Wrapping the shared version of xNVMe
+
+    Importing the package is cheap: the shared library is loaded on first use
+    of CAPI, see xnvme.library, and the generated bindings, the version and the
+    classes of the sub-modules are resolved on first access.
 """
-import ctypes
-import time
-import sys
-import os
-
-XNVME_SHARED_LIB_FN = "libxnvme-shared.so"
-
-CAPI = None
-if CAPI is None:
-    CAPI = ctypes.cdll.LoadLibrary(XNVME_SHARED_LIB_FN)
-
-VERSION_MAJOR = CAPI.xnvme_ver_major()
-VERSION_MINOR = CAPI.xnvme_ver_minor()
-VERSION_PATCH = CAPI.xnvme_ver_patch()
-VERSION = "%d.%d.%d" % (VERSION_MAJOR, VERSION_MINOR, VERSION_PATCH)
-
-class BackendAttributes(ctypes.Structure):
-
-    _fields_ = [
-        ("name", ctypes.c_char * 8),
-        ("scheme", ctypes.c_char * 7),
-        ("enabled", ctypes.c_uint8)
-    ]
-
-class BackendListing(ctypes.Structure):
-
-    _fields_ = [
-        ("capacity", ctypes.c_uint32),
-        ("count", ctypes.c_int32),
-        ("item", ctypes.POINTER(BackendAttributes)),
-    ]
-
-class Ident(ctypes.Structure):
-
-    _fields_ = [
-        ("nsid", ctypes.c_uint32),
-        ("nst", ctypes.c_uint8),
-        ("type", ctypes.c_uint8),
-        ("_pad0", ctypes.c_uint8),
-        ("be_attr", BackendAttributes),
-        ("_pad", ctypes.c_uint8 * 38),
-        ("uri", ctypes.c_char * 320),
-        ("be_uri", ctypes.c_char * 320)
-    ]
-
-class Enumeration(ctypes.Structure):
-
-    _fields_ = [
-        ("capacity", ctypes.c_uint32),
-        ("nentries", ctypes.c_uint32),
-        ("entries", ctypes.POINTER(Ident)),
-    ]
+import importlib
+
+from xnvme.library import XNVME_SHARED_LIB_FN, Library
+
+CAPI = Library(XNVME_SHARED_LIB_FN)
+
+# Attributes resolved on first access, by the module providing them
+LAZY = {
+    "AppendScheduler": "xnvme.znd",
+    "Buffer": "xnvme.buf",
+    "BufferPool": "xnvme.buf",
+    "BufferedFile": "xnvme.file",
+    "CommandError": "xnvme.queue",
+    "Device": "xnvme.device",
+    "DeviceInfo": "xnvme.discovery",
+    "Exporter": "xnvme.metrics",
+    "File": "xnvme.file",
+    "Histogram": "xnvme.stats",
+    "Completion": "xnvme.queue",
+    "Queue": "xnvme.queue",
+    "QueueStats": "xnvme.stats",
+    "SGL": "xnvme.sgl",
+    "SGLPool": "xnvme.sgl",
+    "TraceRecorder": "xnvme.trace",
+    "WriteCoalescer": "xnvme.device",
+    "ZRWAWriter": "xnvme.znd",
+    "ZoneStateCache": "xnvme.znd",
+    "copy": "xnvme.xdd",
+    "enumerate": "xnvme.discovery",
+}
+
+# Short-hands for the generated structures, see xnvme.libxnvme for the rest
+ALIASES = {
+    "BackendAttributes": "xnvme_be_attr",
+    "BackendListing": "xnvme_be_attr_list",
+    "Ident": "xnvme_ident",
+    "Geo": "xnvme_geo",
+    "SpecStatus": "xnvme_spec_status",
+    "SpecCpl": "xnvme_spec_cpl",
+    "CmdCtx": "xnvme_cmd_ctx",
+    "XNVME_QUEUE_CB": "xnvme_queue_cb",
+    "XNVME_ENUMERATE_CB": "xnvme_enumerate_cb",
+}
+
+def _resolve(name):
+    """Returns the value of the lazily resolved attribute 'name'"""
+
+    if name in LAZY:
+        return getattr(importlib.import_module(LAZY[name]), name)
+
+    if name in ["FFI", "FAST"]:
+        # The compiled hot-path binding, see xnvme/cffi_build.py, when it is built.
+        # The library is loaded first, such that it satisfies the dependency of
+        # the binding when located via XNVME_LIBRARY_PATH.
+        CAPI.load()
+        try:
+            module = importlib.import_module("xnvme._libxnvme_cffi")
+        except ImportError:
+            return None
+        return module.ffi if name == "FFI" else module.lib
+
+    if name in ["VERSION_MAJOR", "VERSION_MINOR", "VERSION_PATCH"]:
+        return getattr(CAPI, "xnvme_ver_%s" % name.split("_")[1].lower())()
+
+    if name == "VERSION":
+        return "%d.%d.%d" % tuple(
+            __getattr__(part) for part in ["VERSION_MAJOR", "VERSION_MINOR", "VERSION_PATCH"]
+        )
+
+    if name in ALIASES or name.startswith(("XNVME_", "xnvme_")):
+        libxnvme = importlib.import_module("xnvme.libxnvme")
+        if hasattr(libxnvme, ALIASES.get(name, name)):
+            return getattr(libxnvme, ALIASES.get(name, name))
+
+    raise AttributeError("module 'xnvme' has no attribute '%s'" % name)
+
+def __getattr__(name):
+    value = _resolve(name)
+    globals()[name] = value
+
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(LAZY) | set(ALIASES))
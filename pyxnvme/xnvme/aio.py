@@ -0,0 +1,174 @@
+"""
+    asyncio integration of xNVMe queues
+
+    A queue is owned by a reaper-thread which submits commands handed to it from
+    the event loop, pokes for completions, and hands the completions back to the
+    loop in bulk via call_soon_threadsafe(). Since ctypes releases the GIL while
+    in the C API, the event loop keeps running while the reaper polls, and one
+    process can multiplex many outstanding commands using coroutines. When a
+    poke reaps nothing, the reaper backs off, waiting up to IDLE_MAX seconds,
+    or until a command is submitted, before poking again.
+
+    Usage::
+
+        async with xnvme.aio.Queue(dev, capacity=64) as queue:
+            data = await queue.read(slba=0, nlb=7)
+            await queue.write(slba=8, nlb=7, buf=data)
+"""
+import asyncio
+import collections
+import threading
+
+from xnvme import (
+    CAPI,
+    XNVME_SPEC_NVM_OPC_READ,
+    XNVME_SPEC_NVM_OPC_WRITE,
+)
+from xnvme.buf import Buffer
+from xnvme.queue import CommandError, Queue as SyncQueue
+
+# Seconds waited by the reaper after a poke reaping nothing, doubling up to IDLE_MAX
+IDLE_MIN = 0.00001
+IDLE_MAX = 0.001
+
+def _fail(fut, exc):
+    """Set the exception 'exc' on the future 'fut', unless it was cancelled"""
+
+    if not fut.cancelled():
+        fut.set_exception(exc)
+
+def _resolve(cpls):
+    """Resolve the futures, carried as tags, of the given completions"""
+
+    for cpl in cpls:
+        fut = cpl.tag
+        if cpl.sc or cpl.sct:
+            _fail(fut, CommandError(cpl))
+        elif not fut.cancelled():
+            fut.set_result(cpl)
+
+class Queue(object):
+    """
+    Queue on the device-handle 'dev', usable from coroutines on the event 'loop'
+
+    The 'loop' defaults to the loop running when the first command is
+    submitted. All calls into the C queue happen on the reaper-thread.
+    """
+
+    def __init__(self, dev, capacity=64, opts=0, nsid=None, loop=None):
+        self.dev = dev
+        self.loop = loop
+        self.lba_nbytes = CAPI.xnvme_dev_get_geo(dev).contents.lba_nbytes
+        self.queue = SyncQueue(dev, capacity, opts, nsid)
+
+        self._pending = collections.deque()
+        self._done = []
+        self._wakeup = threading.Event()
+        self._stop = False
+
+        self._thread = threading.Thread(target=self._reaper, name="xnvme-aio")
+        self._thread.daemon = True
+        self._thread.start()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+    def _reaper(self):
+        """Run the reaper until closed, or the loop is, then tear down the queue"""
+
+        try:
+            self._reap()
+        except RuntimeError:
+            # The futures cannot be resolved once the loop is closed
+            if not self.loop.is_closed():
+                raise
+        finally:
+            try:
+                if self.queue.outstanding:
+                    self.queue.wait()
+            finally:
+                self.queue.term()
+
+    def _reap(self):
+        """Submit pending commands and poke for completions until closed"""
+
+        idle = 0
+        while True:
+            if not self._pending and not self.queue.outstanding:
+                if self._stop:
+                    break
+                self._wakeup.wait()
+                self._wakeup.clear()
+
+            while self._pending:
+                fut, opcode, slba, nlb, buf = self._pending.popleft()
+                try:
+                    self.queue.submit(opcode, slba, nlb, buf, fut, self._done)
+                except Exception as exc:  # pylint: disable=broad-except
+                    self.loop.call_soon_threadsafe(_fail, fut, exc)
+
+            if self.queue.outstanding:
+                if self.queue.poke():
+                    idle = 0
+                else:
+                    idle = min(max(idle * 2, IDLE_MIN), IDLE_MAX)
+                    self._wakeup.wait(idle)
+                    self._wakeup.clear()
+
+            if self._done:
+                cpls = self._done[:]
+                del self._done[:]
+                self.loop.call_soon_threadsafe(_resolve, cpls)
+
+    def submit(self, opcode, slba, nlb, buf=None):
+        """Returns a future resolving to the Completion of the submitted command"""
+
+        if self.loop is None:
+            self.loop = asyncio.get_running_loop()
+
+        fut = self.loop.create_future()
+        self._pending.append((fut, opcode, slba, nlb, buf))
+        self._wakeup.set()
+
+        return fut
+
+    async def read(self, slba, nlb, buf=None):
+        """
+        Read 'nlb' + 1 logical blocks starting at 'slba'
+
+        Without a 'buf' then the data is read into a newly allocated Buffer,
+        which is returned, otherwise the data is read into 'buf' and the
+        Completion is returned.
+        """
+
+        if buf is None:
+            buf = Buffer(self.dev, (nlb + 1) * self.lba_nbytes)
+            await self.submit(XNVME_SPEC_NVM_OPC_READ, slba, nlb, buf)
+            return buf
+
+        return await self.submit(XNVME_SPEC_NVM_OPC_READ, slba, nlb, buf)
+
+    async def write(self, slba, nlb, buf):
+        """
+        Write 'nlb' + 1 logical blocks from 'buf' starting at 'slba'
+
+        A bytes-like 'buf' is copied to a Buffer, whereas a Buffer, pointer or
+        ctypes object is used as-is. Returns the Completion.
+        """
+
+        if isinstance(buf, (bytes, bytearray, memoryview)):
+            data = buf
+            buf = Buffer(self.dev, (nlb + 1) * self.lba_nbytes)
+            buf[:len(data)] = data
+
+        return await self.submit(XNVME_SPEC_NVM_OPC_WRITE, slba, nlb, buf)
+
+    def close(self):
+        """Wait for outstanding commands, then stop the reaper and tear down the queue"""
+
+        self._stop = True
+        self._wakeup.set()
+        self._thread.join()
@@ -0,0 +1,273 @@
+"""
+    Benchmark of the synchronous and asynchronous interfaces
+
+    Runs a workload, random or sequential reads or writes of 'bs' bytes at a
+    queue-depth, on a device or regular file opened with a given interface,
+    and reports IOPS, bandwidth and latency percentiles::
+
+        res = xnvme.bench.run("/dev/nvme0n1", "randread", 4096, 32, iface="io_uring")
+        print(res["iops"], res["lat_usec"]["p99"])
+
+    Latencies are recorded in an xnvme.stats.Histogram, thus are summarized as
+    by the statistics of a Queue.
+
+    The interface is the 'sync' or 'async_' option of 'struct xnvme_opts', e.g.
+    "psync" or "io_uring". Commands on a synchronous interface are issued one
+    at a time, on an asynchronous interface via a Queue. With the "nil"
+    interface then commands complete without doing I/O, thus measuring the
+    cost of the host-side only, reproducibly.
+
+    A matrix of workloads, interfaces, queue-depths and block sizes is run from
+    the command-line, printing the results as JSON::
+
+        python3 -m xnvme.bench /dev/nvme0n1 --rw randread,randwrite \\
+            --iface io_uring,libaio,nil --qdepth 1,32 --bs 4k,128k
+"""
+import argparse
+import ctypes
+import itertools
+import json
+import random
+import sys
+import time
+
+from xnvme import CAPI, XNVME_SPEC_NVM_OPC_READ, XNVME_SPEC_NVM_OPC_WRITE
+from xnvme.buf import Buffer
+from xnvme.device import Device
+from xnvme.queue import CommandError, Completion, Queue, check
+from xnvme.stats import Histogram
+
+WORKLOADS = {
+    "randread": (XNVME_SPEC_NVM_OPC_READ, True),
+    "randwrite": (XNVME_SPEC_NVM_OPC_WRITE, True),
+    "read": (XNVME_SPEC_NVM_OPC_READ, False),
+    "write": (XNVME_SPEC_NVM_OPC_WRITE, False),
+}
+
+# Interfaces given by the 'sync' option, the others are given by 'async_'
+SYNC_INTERFACES = ["psync", "nvme", "block"]
+
+def offsets(rw, nblocks, seed):
+    """Returns an iterator of the block-offsets of the workload 'rw' in 'nblocks' blocks"""
+
+    if WORKLOADS[rw][1]:
+        rng = random.Random(seed)
+        return iter(lambda: rng.randrange(nblocks), None)
+
+    return itertools.cycle(range(nblocks))
+
+def run_sync(dev, opcode, blocks, nlb, buf, deadline, nios, lats):
+    """
+    Issue the commands one at a time, recording their latencies in the
+    Histogram 'lats', returns the failed completions
+    """
+
+    errors = []
+    func = CAPI.xnvme_nvm_read if opcode == XNVME_SPEC_NVM_OPC_READ else CAPI.xnvme_nvm_write
+    nsid = dev.nsid
+
+    while lats.count < nios and time.perf_counter() < deadline:
+        ctx = CAPI.xnvme_cmd_ctx_from_dev(dev)
+        begin = time.perf_counter_ns()
+        check(func(ctypes.byref(ctx), nsid, next(blocks) * (nlb + 1), nlb, buf, None), "sync")
+        lats.record(time.perf_counter_ns() - begin)
+        if ctx.cpl.status.sc or ctx.cpl.status.sct:
+            errors.append(
+                Completion(None, ctx.cpl.status.sc, ctx.cpl.status.sct, ctx.cpl.cdw0, 0)
+            )
+
+    return errors
+
+def run_async(dev, opcode, blocks, nlb, bufs, deadline, nios, lats):
+    """
+    Keep 'len(bufs)' commands in flight, recording their latencies in the
+    Histogram 'lats', returns the failed completions
+    """
+
+    errors = []
+    cpls = []
+    free = list(range(len(bufs)))
+    nsubmitted = 0
+
+    with Queue(dev, len(bufs)) as queue:
+        while True:
+            running = nsubmitted < nios and time.perf_counter() < deadline
+            if not running and len(free) == len(bufs):
+                break
+
+            while running and free and nsubmitted < nios:
+                slot = free.pop()
+                queue.submit(
+                    opcode, next(blocks) * (nlb + 1), nlb, bufs[slot],
+                    (slot, time.perf_counter_ns()), cpls
+                )
+                nsubmitted += 1
+
+            queue.poke()
+            if not cpls:
+                continue
+
+            now = time.perf_counter_ns()
+            for cpl in cpls:
+                slot, begin = cpl.tag
+                lats.record(now - begin)
+                free.append(slot)
+                if cpl.sc or cpl.sct:
+                    errors.append(cpl)
+            del cpls[:]
+
+    return errors
+
+def run(uri, rw="randread", bs=4096, qdepth=1, iface=None, runtime=5.0, nios=None,
+        size=None, seed=0, **opts):
+    """
+    Run the workload 'rw' of 'bs' bytes at 'qdepth', on the device or file
+    at 'uri' opened with the interface 'iface', returns the result as a dict
+
+    The workload runs for 'runtime' seconds, or until 'nios' commands are done,
+    within the first 'size' bytes, defaulting to all of them. Random offsets
+    are drawn with the given 'seed'. Further options for xnvme_dev_open() are
+    given as keywords, as for Device.
+    """
+
+    if rw not in WORKLOADS:
+        raise ValueError("rw: '%s' not in %s" % (rw, sorted(WORKLOADS)))
+    if iface in SYNC_INTERFACES:
+        opts["sync"] = iface
+    elif iface:
+        opts["async_"] = iface
+
+    with Device(uri, **opts) as dev:
+        if bs % dev.lba_nbytes or bs > dev.cmd_nbytes:
+            raise ValueError(
+                "bs: %d must be a multiple of lba_nbytes: %d, at most cmd_nbytes: %d" % (
+                    bs, dev.lba_nbytes, dev.cmd_nbytes
+                )
+            )
+
+        opcode = WORKLOADS[rw][0]
+        nblocks = min(size or dev.tbytes, dev.tbytes) // bs
+        if not nblocks:
+            raise ValueError("size: smaller than bs: %d" % bs)
+        blocks = offsets(rw, nblocks, seed)
+        nlb = bs // dev.lba_nbytes - 1
+        sync = iface in SYNC_INTERFACES
+
+        bufs = [Buffer(dev, bs) for _ in range(1 if sync else qdepth)]
+        try:
+            if opcode == XNVME_SPEC_NVM_OPC_WRITE:
+                data = random.Random(seed).getrandbits(bs * 8).to_bytes(bs, "little")
+                for buf in bufs:
+                    buf[:] = data
+
+            lats = Histogram()
+            begin = time.perf_counter()
+            if sync:
+                errors = run_sync(
+                    dev, opcode, blocks, nlb, bufs[0], begin + runtime, nios or sys.maxsize, lats
+                )
+            else:
+                errors = run_async(
+                    dev, opcode, blocks, nlb, bufs, begin + runtime, nios or sys.maxsize, lats
+                )
+            seconds = time.perf_counter() - begin
+        finally:
+            for buf in bufs:
+                buf.close()
+
+    if errors:
+        raise CommandError(errors[0])
+
+    return {
+        "uri": uri,
+        "rw": rw,
+        "bs": bs,
+        "qdepth": 1 if sync else qdepth,
+        "iface": iface,
+        "opts": opts,
+        "ios": lats.count,
+        "seconds": seconds,
+        "iops": lats.count / seconds,
+        "bw": lats.count * bs / seconds,
+        "lat_usec": lats.summary(1e-3),
+    }
+
+def matrix(uri, rws, ifaces, qdepths, bss, **kwargs):
+    """
+    Run every combination of the workloads 'rws', interfaces 'ifaces',
+    queue-depths 'qdepths' and block sizes 'bss', yielding the results
+
+    Synchronous interfaces are run at queue-depth one only. Combinations which
+    fail are yielded as dicts with an 'error' instead of the measurements.
+    """
+
+    for rw, iface, bs in itertools.product(rws, ifaces, bss):
+        depths = [1] if iface in SYNC_INTERFACES else qdepths
+        for qdepth in depths:
+            try:
+                yield run(uri, rw, bs, qdepth, iface, **kwargs)
+            except (OSError, ValueError) as exc:
+                yield {
+                    "uri": uri, "rw": rw, "bs": bs, "qdepth": qdepth, "iface": iface,
+                    "error": str(exc),
+                }
+
+def nbytes(text):
+    """Returns the number of bytes of e.g. '4k' or '1m'"""
+
+    units = {"k": 1 << 10, "m": 1 << 20, "g": 1 << 30}
+    text = text.strip().lower()
+    if text[-1:] in units:
+        return int(text[:-1]) * units[text[-1]]
+
+    return int(text)
+
+def parse_args(argv=None):
+    """Parse the command-line arguments"""
+
+    def listof(conv):
+        return lambda text: [conv(item) for item in text.split(",") if item]
+
+    prsr = argparse.ArgumentParser(
+        prog="python3 -m xnvme.bench", description=__doc__.strip().splitlines()[0]
+    )
+    prsr.add_argument("uri", help="Device or regular file")
+    prsr.add_argument("--rw", type=listof(str), default=["randread"],
+                      help="Workloads, of: %s" % ", ".join(sorted(WORKLOADS)))
+    prsr.add_argument("--iface", type=listof(str), default=[None],
+                      help="Interfaces, e.g. psync, thrpool, io_uring, nil")
+    prsr.add_argument("--qdepth", type=listof(int), default=[1], help="Queue-depths")
+    prsr.add_argument("--bs", type=listof(nbytes), default=[4096], help="Block sizes")
+    prsr.add_argument("--runtime", type=float, default=5.0, help="Seconds per run")
+    prsr.add_argument("--nios", type=int, default=None, help="Commands per run")
+    prsr.add_argument("--size", type=nbytes, default=None, help="Bytes of the device used")
+    prsr.add_argument("--seed", type=int, default=0, help="Seed of the random offsets")
+    prsr.add_argument("--be", default=None, help="Backend, e.g. linux or spdk")
+    prsr.add_argument("--opt", action="append", default=[],
+                      help="Further option of 'struct xnvme_opts', as key=value")
+
+    return prsr.parse_args(argv)
+
+def main(argv=None):
+    """Run the matrix given on the command-line, and print the results as JSON"""
+
+    args = parse_args(argv)
+
+    opts = {}
+    if args.be:
+        opts["be"] = args.be
+    for opt in args.opt:
+        key, _, val = opt.partition("=")
+        opts[key] = int(val) if val.isdigit() else val
+
+    results = list(matrix(
+        args.uri, args.rw, args.iface, args.qdepth, args.bs, runtime=args.runtime,
+        nios=args.nios, size=args.size, seed=args.seed, **opts
+    ))
+    json.dump(results, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+    return 1 if any("error" in res for res in results) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
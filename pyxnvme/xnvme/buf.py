@@ -0,0 +1,265 @@
+"""
+    Buffers for command payloads
+
+    Memory is allocated with xnvme_buf_alloc(), such that it is DMA-able and
+    correctly aligned for the backend of the device, and is exposed via the
+    Python buffer-protocol by the memoryview Buffer.view. Data can thus be
+    handed to e.g. numpy.frombuffer(), socket.sendmsg() or hashlib without
+    copying it. From Python 3.12 a Buffer is itself an exporter, thus can be
+    given in place of its view, earlier versions do not support the protocol
+    on classes defined in Python, and raise TypeError for it::
+
+        digest = hashlib.sha256(buf.view).hexdigest()
+
+    The functions of pyxnvme taking bytes-like data accept a Buffer on any
+    version, via byteview().
+"""
+import bisect
+import ctypes
+import functools
+import threading
+import weakref
+
+from xnvme import CAPI
+
+def alloc(dev, nbytes):
+    """Returns the address of 'nbytes' allocated with xnvme_buf_alloc()"""
+
+    addr = CAPI.xnvme_buf_alloc(dev, nbytes)
+    if not addr:
+        raise MemoryError("xnvme_buf_alloc(): failed allocating %d bytes" % nbytes)
+
+    return addr
+
+def byteview(data):
+    """Returns a memoryview of the bytes of 'data', a Buffer or bytes-like"""
+
+    if isinstance(data, Buffer):
+        return data.view
+
+    return memoryview(data).cast("B")
+
+def free(dev, addr):
+    """
+    Free 'addr' allocated for 'dev', unless 'dev' is a closed Device, then the
+    memory is left as is, since xnvme_buf_free() cannot be called without it
+    """
+
+    if getattr(dev, "handle", True):
+        CAPI.xnvme_buf_free(dev, addr)
+
+class Buffer(object):
+    """
+    Buffer of 'nbytes' allocated for use with the device-handle 'dev'
+
+    The memory is exported as a ctypes array, and is freed when the last export
+    of it is released, that is, views and slices of Buffer.view keep the memory
+    alive after Buffer.close(). A Buffer can be given directly as payload to the
+    C API, and must be released before the device is closed.
+
+    An allocator, such as BufferPool, can hand out memory it manages by giving
+    its 'addr' along with a 'release' callable invoked instead of
+    xnvme_buf_free() when the memory is no longer referenced. Without a
+    'release' the memory at 'addr' is left to its owner.
+    """
+
+    def __init__(self, dev, nbytes, addr=None, release=None):
+        if addr is None:
+            addr = alloc(dev, nbytes)
+            release = functools.partial(free, dev, addr)
+
+        self.dev = dev
+        self.nbytes = nbytes
+        self.addr = addr
+
+        self._array = (ctypes.c_uint8 * nbytes).from_address(addr)
+        if release is not None:
+            weakref.finalize(self._array, release)
+        self.view = memoryview(self._array).cast("B")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.nbytes
+
+    def __getitem__(self, key):
+        return self.view[key]
+
+    def __setitem__(self, key, value):
+        self.view[key] = value.view if isinstance(value, Buffer) else value
+
+    def __buffer__(self, flags):
+        """The buffer-protocol, as of Python 3.12, use Buffer.view on earlier versions"""
+
+        return memoryview(self._array).cast("B")
+
+    @property
+    def _as_parameter_(self):
+        return ctypes.c_void_p(self.addr)
+
+    def tobytes(self):
+        """Returns a copy of the buffer content"""
+
+        return self.view.tobytes()
+
+    def close(self):
+        """Drop the references held by this Buffer"""
+
+        self.view = None
+        self._array = None
+
+class FreeLists(dict):
+    """The free-lists, by size-class, of a thread using a BufferPool, compared by identity"""
+
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
+
+def drain(dev, freelists):
+    """Return the buffers on the given free-lists, of 'dev', to the backend allocator"""
+
+    for freelist in freelists:
+        while freelist:
+            free(dev, freelist.pop())
+
+class BufferPool(object):
+    """
+    Pool of buffers for the device-handle 'dev', in power-of-two size-classes
+
+    The size-classes range from 'min_nbytes' to 'max_nbytes', the latter
+    defaulting to the maximum data-transfer-size of the device. Requests larger
+    than the largest class are served directly by xnvme_buf_alloc().
+
+    Released buffers go back to a free-list of the releasing thread, thus
+    threads do not contend on the free-lists. Threads releasing buffers
+    without having taken any, e.g. a thread reaping completions, release them
+    to free-lists shared by all threads, under a lock, which get() takes from
+    when the free-list of the thread is empty. At most 'hwm' free buffers are
+    kept per size-class and free-list, beyond this high-water mark then
+    buffers are returned to the backend allocator, as are the free buffers of
+    a thread when it exits. The 'prewarm' argument is a mapping of nbytes to
+    count, allocated up front by the constructing thread.
+    """
+
+    def __init__(self, dev, max_nbytes=None, min_nbytes=4096, hwm=64, prewarm=None):
+        if max_nbytes is None:
+            max_nbytes = CAPI.xnvme_dev_get_geo(dev).contents.mdts_nbytes
+
+        self.dev = dev
+        self.hwm = hwm
+        self.classes = [min_nbytes]
+        while self.classes[-1] < max_nbytes:
+            self.classes.append(self.classes[-1] << 1)
+
+        self.stats = {"hits": 0, "misses": 0, "oversized": 0, "recycled": 0, "freed": 0}
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._freelists = weakref.WeakSet()
+        self._shared = dict((nbytes, []) for nbytes in self.classes)
+
+        for nbytes, count in (prewarm or {}).items():
+            self.prewarm(nbytes, count)
+
+    def _freelist(self, cls):
+        """Returns the free-list of the calling thread for the size-class 'cls'"""
+
+        try:
+            return self._local.freelists[cls]
+        except AttributeError:
+            freelists = FreeLists((nbytes, []) for nbytes in self.classes)
+            # Drained when the thread exits, dropping its thread-local
+            weakref.finalize(freelists, drain, self.dev, list(freelists.values())).atexit = False
+            self._local.freelists = freelists
+            with self._lock:
+                self._freelists.add(freelists)
+
+        return self._local.freelists[cls]
+
+    def _count(self, key):
+        """Increment the counter 'key' of BufferPool.stats"""
+
+        with self._lock:
+            self.stats[key] += 1
+
+    def _recycle(self, cls, addr):
+        """Release callback of pooled buffers"""
+
+        freelists = getattr(self._local, "freelists", None)
+        if freelists is not None:
+            if len(freelists[cls]) < self.hwm:
+                freelists[cls].append(addr)
+                self._count("recycled")
+                return
+        else:
+            with self._lock:
+                if len(self._shared[cls]) < self.hwm:
+                    self._shared[cls].append(addr)
+                    self.stats["recycled"] += 1
+                    return
+
+        free(self.dev, addr)
+        self._count("freed")
+
+    def size_class(self, nbytes):
+        """Returns the size-class for 'nbytes', None when larger than the largest class"""
+
+        idx = bisect.bisect_left(self.classes, nbytes)
+
+        return self.classes[idx] if idx < len(self.classes) else None
+
+    def get(self, nbytes):
+        """Returns a Buffer of 'nbytes', which is recycled by the pool once released"""
+
+        cls = self.size_class(nbytes)
+        if cls is None:
+            self._count("oversized")
+            return Buffer(self.dev, nbytes)
+
+        freelist = self._freelist(cls)
+        addr = freelist.pop() if freelist else None
+        if addr is None and self._shared[cls]:
+            with self._lock:
+                if self._shared[cls]:
+                    addr = self._shared[cls].pop()
+        if addr is None:
+            addr = alloc(self.dev, cls)
+            self._count("misses")
+        else:
+            self._count("hits")
+
+        return Buffer(self.dev, nbytes, addr, functools.partial(self._recycle, cls, addr))
+
+    def prewarm(self, nbytes, count):
+        """Fill the free-list, of the calling thread, holding 'nbytes' with 'count' buffers"""
+
+        cls = self.size_class(nbytes)
+        if cls is None:
+            raise ValueError("nbytes: %d exceeds the largest size-class" % nbytes)
+
+        freelist = self._freelist(cls)
+        for _ in range(max(0, min(count, self.hwm) - len(freelist))):
+            freelist.append(alloc(self.dev, cls))
+
+    def cached(self):
+        """Returns the number of free buffers held by the pool, across all threads"""
+
+        with self._lock:
+            freelists = list(self._freelists) + [self._shared]
+
+            return sum(len(fl) for fls in freelists for fl in fls.values())
+
+    def clear(self):
+        """
+        Return all free buffers to the backend allocator
+
+        Must be called, before the device is closed, when no other threads are
+        using the pool.
+        """
+
+        with self._lock:
+            drain(self.dev, [fl for fls in list(self._freelists) for fl in fls.values()])
+            drain(self.dev, self._shared.values())
@@ -0,0 +1,181 @@
+"""
+    Build-script for the optional cffi binding of the xNVMe hot-path
+
+    The binding is built in cffi API-mode, that is, compiled against the
+    headers and linked with the shared library, such that calls are made
+    without the argument conversion done by ctypes. Only the functions called
+    per command are declared here, everything else goes through xnvme.CAPI.
+
+    It is picked up by setup.py when cffi is installed, and skipped when it
+    fails to compile or link, or built in-place with:
+
+        python3 xnvme/cffi_build.py
+
+    The location of the headers and the library can be given via the
+    environment variables XNVME_INCLUDE_DIR and XNVME_LIBRARY_DIR.
+"""
+import os
+
+import cffi
+
+CDEF = """
+typedef int... off_t;
+
+struct xnvme_dev;
+struct xnvme_queue;
+
+struct xnvme_spec_status {
+    uint16_t val;
+    ...;
+};
+
+struct xnvme_spec_cpl {
+    uint32_t cdw0;
+    uint64_t result;
+    struct xnvme_spec_status status;
+    ...;
+};
+
+struct xnvme_cmd_ctx {
+    struct xnvme_spec_cpl cpl;
+    ...;
+};
+
+typedef void (*xnvme_queue_cb)(struct xnvme_cmd_ctx *ctx, void *opaque);
+
+int xnvme_ver_major(void);
+
+uint32_t xnvme_dev_get_nsid(const struct xnvme_dev *dev);
+
+uint32_t xnvme_queue_get_outstanding(struct xnvme_queue *queue);
+int xnvme_queue_poke(struct xnvme_queue *queue, uint32_t max);
+int xnvme_queue_wait(struct xnvme_queue *queue);
+struct xnvme_cmd_ctx *xnvme_queue_get_cmd_ctx(struct xnvme_queue *queue);
+int xnvme_queue_put_cmd_ctx(struct xnvme_queue *queue, struct xnvme_cmd_ctx *ctx);
+int xnvme_queue_set_cb(struct xnvme_queue *queue, xnvme_queue_cb cb, void *cb_arg);
+
+int xnvme_nvm_read(struct xnvme_cmd_ctx *ctx, uint32_t nsid, uint64_t slba, uint16_t nlb,
+                   void *dbuf, void *mbuf);
+int xnvme_nvm_write(struct xnvme_cmd_ctx *ctx, uint32_t nsid, uint64_t slba, uint16_t nlb,
+                    const void *dbuf, const void *mbuf);
+int xnvme_nvm_write_uncorrectable(struct xnvme_cmd_ctx *ctx, uint32_t nsid, uint64_t slba,
+                                  uint16_t nlb);
+int xnvme_nvm_write_zeroes(struct xnvme_cmd_ctx *ctx, uint32_t nsid, uint64_t sdlba,
+                           uint16_t nlb);
+
+int xnvme_nvm_scopy(struct xnvme_cmd_ctx *ctx, uint32_t nsid, uint64_t sdlba, void *ranges,
+                    uint8_t nr, int copy_fmt);
+
+int xnvme_file_pread(struct xnvme_cmd_ctx *ctx, void *buf, size_t count, off_t offset);
+int xnvme_file_pwrite(struct xnvme_cmd_ctx *ctx, void *buf, size_t count, off_t offset);
+
+int xnvme_znd_append(struct xnvme_cmd_ctx *ctx, uint32_t nsid, uint64_t zslba, uint16_t nlb,
+                     const void *dbuf, const void *mbuf);
+
+void xnvme_cffi_cmd_ctx_set_opts(struct xnvme_cmd_ctx *ctx, uint32_t opts);
+
+struct xnvme_cffi_cpl {
+    uint64_t key;
+    uint64_t result;
+    uint32_t cdw0;
+    uint16_t status;
+    uint16_t rsvd;
+};
+
+struct xnvme_cffi_ring {
+    uint32_t capacity;
+    uint32_t count;
+    uint32_t overflow;
+    struct xnvme_cffi_cpl *cpls;
+};
+
+void xnvme_cffi_ring_cb(struct xnvme_cmd_ctx *ctx, void *opaque);
+
+extern "Python" void xnvme_cffi_queue_cb(struct xnvme_cmd_ctx *ctx, void *opaque);
+"""
+
+SOURCE = """
+#include <libxnvme.h>
+#include <libxnvme_file.h>
+#include <libxnvme_nvm.h>
+#include <libxnvme_ver.h>
+#include <libxnvme_znd.h>
+
+/* xnvme.queue.XNVME_CMD_ASYNC and CMD_DEAC */
+#define XNVME_CFFI_CMD_ASYNC (0x1u << 1)
+#define XNVME_CFFI_CMD_DEAC (0x1u << 31)
+
+static void
+xnvme_cffi_cmd_ctx_set_opts(struct xnvme_cmd_ctx *ctx, uint32_t opts)
+{
+	ctx->opts = opts & ~XNVME_CFFI_CMD_DEAC;
+	ctx->cmd.common.psdt = XNVME_SPEC_PSDT_PRP;
+	ctx->cmd.write_zeroes.deac = (opts & XNVME_CFFI_CMD_DEAC) ? 1 : 0;
+}
+
+/* Completion of the command-context at 'key', as recorded in the ring */
+struct xnvme_cffi_cpl {
+	uint64_t key;
+	uint64_t result;
+	uint32_t cdw0;
+	uint16_t status;
+	uint16_t rsvd;
+};
+
+/*
+ * Completions recorded by xnvme_cffi_ring_cb(), 'capacity' is the number of
+ * command-contexts of the queue, one more than its capacity, as the ring is
+ * drained after each poke of the queue. Completions not fitting are counted
+ * in 'overflow', their command-contexts are not put back.
+ */
+struct xnvme_cffi_ring {
+	uint32_t capacity;
+	uint32_t count;
+	uint32_t overflow;
+	struct xnvme_cffi_cpl *cpls;
+};
+
+/*
+ * Queue-callback recording the completion of 'ctx' in the ring given as
+ * 'opaque', and putting 'ctx', with the default options, back in its queue
+ */
+static void
+xnvme_cffi_ring_cb(struct xnvme_cmd_ctx *ctx, void *opaque)
+{
+	struct xnvme_cffi_ring *ring = opaque;
+	struct xnvme_cffi_cpl *cpl;
+
+	if (ring->count >= ring->capacity) {
+		ring->overflow++;
+		return;
+	}
+	cpl = &ring->cpls[ring->count++];
+
+	cpl->key = (uintptr_t)ctx;
+	cpl->result = ctx->cpl.result;
+	cpl->cdw0 = ctx->cpl.cdw0;
+	cpl->status = ctx->cpl.status.val;
+
+	xnvme_cffi_cmd_ctx_set_opts(ctx, XNVME_CFFI_CMD_ASYNC);
+	xnvme_queue_put_cmd_ctx(ctx->async.queue, ctx);
+}
+"""
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+FFIBUILDER = cffi.FFI()
+FFIBUILDER.cdef(CDEF)
+FFIBUILDER.set_source(
+    "xnvme._libxnvme_cffi",
+    SOURCE,
+    libraries=["xnvme-shared"],
+    include_dirs=[
+        os.environ.get("XNVME_INCLUDE_DIR", os.path.join(HERE, "..", "..", "include"))
+    ],
+    library_dirs=[
+        path for path in [os.environ.get("XNVME_LIBRARY_DIR")] if path
+    ],
+)
+
+if __name__ == "__main__":
+    FFIBUILDER.compile(tmpdir=os.path.join(HERE, ".."), verbose=True)
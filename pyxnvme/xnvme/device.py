@@ -0,0 +1,619 @@
+"""
+    Device handles
+
+    A Device opens a device via xnvme_dev_open() and decodes its geometry and
+    identify data once, into plain attributes, such that deciding e.g. on the
+    size of a command does not call into the C API or decode C structs.
+
+    Usage::
+
+        with xnvme.Device("/dev/nvme0n1", be="linux") as dev:
+            print(dev.lba_nbytes, dev.mdts_nbytes, dev.nsect)
+            data = dev.pread(0, 1 << 20)
+"""
+import ctypes
+import errno
+import time
+
+from xnvme import (
+    CAPI,
+    XNVME_SPEC_CSI_NVM,
+    XNVME_SPEC_NVM_OPC_READ,
+    XNVME_SPEC_NVM_OPC_WRITE,
+    XNVME_SPEC_NVM_OPC_WRITE_ZEROES,
+    xnvme_spec_idfy,
+)
+from xnvme import scopy, znd
+from xnvme.buf import Buffer, BufferPool, byteview
+from xnvme.queue import CMD_DEAC, XNVME_CMD_UPLD_SGLD, CommandError, Queue
+from xnvme.sgl import SGLPool
+
+# Largest number of logical blocks of a command, 'nlb' is a zero-based uint16
+NLB_MAX = 0x10000
+
+# Unit of the Write Zeroes Size Limit, assuming the minimum memory page size
+WZSL_UNIT = 4096
+
+# Offset of WZSL in the Identify Controller data of the NVM command set
+WZSL_OFFSET = 1
+
+# Attributes copied from 'struct xnvme_geo'
+GEO_ATTRS = [
+    "npugrp", "npunit", "nzone", "nsect", "nbytes", "nbytes_oob", "tbytes", "ssw",
+    "mdts_nbytes", "lba_nbytes", "lba_extended",
+]
+
+def copy(ptr):
+    """Returns a copy of the struct pointed to by 'ptr', None when it is NULL"""
+
+    if not ptr:
+        return None
+
+    return type(ptr.contents).from_buffer_copy(ptr.contents)
+
+def check_cpls(cpls):
+    """Raise CommandError for the first of the given completions with an error-status"""
+
+    for cpl in cpls:
+        if cpl.sc or cpl.sct:
+            raise CommandError(cpl)
+
+def decode(field):
+    """Returns the string in the identify-field 'field', without space-padding"""
+
+    return bytes(field).split(b"\0", 1)[0].decode("ascii", "replace").strip()
+
+def write_zeroes_limit(dev):
+    """
+    Returns the largest number of logical blocks of a Write Zeroes on the
+    Device 'dev', by its Write Zeroes Size Limit, at most NLB_MAX
+
+    The limit is in the Identify Controller data of the NVM command set, when
+    the controller does not report it, or the backend cannot identify it,
+    then there is no limit but NLB_MAX.
+    """
+
+    with Buffer(dev, ctypes.sizeof(xnvme_spec_idfy)) as idfy:
+        ctx = CAPI.xnvme_cmd_ctx_from_dev(dev)
+        err = CAPI.xnvme_adm_idfy_ctrlr_csi(
+            ctypes.byref(ctx), XNVME_SPEC_CSI_NVM,
+            ctypes.cast(idfy.addr, ctypes.POINTER(xnvme_spec_idfy))
+        )
+        if err or ctx.cpl.status.sc or ctx.cpl.status.sct:
+            return NLB_MAX
+        wzsl = idfy[WZSL_OFFSET]
+
+    if not wzsl:
+        return NLB_MAX
+
+    return max(1, min(NLB_MAX, (WZSL_UNIT << wzsl) // dev.lba_nbytes))
+
+def options(**opts):
+    """Returns xnvme_opts_default() with the members given as keywords applied"""
+
+    copts = CAPI.xnvme_opts_default()
+    for key, val in opts.items():
+        if not hasattr(copts, key):
+            raise ValueError("opts: invalid key: '%s'" % key)
+        setattr(copts, key, val.encode() if isinstance(val, str) else val)
+
+    return copts
+
+def identify(handle):
+    """
+    Returns the geometry and identify data of the opened device 'handle', as a
+    dict of the attributes of a Device
+    """
+
+    attrs = {}
+
+    geo = CAPI.xnvme_dev_get_geo(handle).contents
+    attrs["geo_type"] = geo.type
+    for attr in GEO_ATTRS:
+        attrs[attr] = getattr(geo, attr)
+
+    attrs["nsid"] = CAPI.xnvme_dev_get_nsid(handle)
+    attrs["csi"] = CAPI.xnvme_dev_get_csi(handle)
+    ident = CAPI.xnvme_dev_get_ident(handle)
+    attrs["dtype"] = ident.contents.dtype if ident else None
+
+    ctrlr = attrs["ctrlr"] = copy(CAPI.xnvme_dev_get_ctrlr(handle))
+    attrs["serial"] = decode(ctrlr.sn) if ctrlr else ""
+    attrs["model"] = decode(ctrlr.mn) if ctrlr else ""
+    attrs["firmware"] = decode(ctrlr.fr) if ctrlr else ""
+
+    ns = attrs["ns"] = copy(CAPI.xnvme_dev_get_ns(handle))
+    attrs["nsze"] = ns.nsze if ns else geo.nsect
+    attrs["ncap"] = ns.ncap if ns else geo.nsect
+    attrs["nuse"] = ns.nuse if ns else 0
+
+    return attrs
+
+class Device(object):
+    """
+    Device opened from 'uri', with options for xnvme_dev_open() given as keywords
+
+    The keywords are names of the members of 'struct xnvme_opts', e.g. be="spdk"
+    or async_="io_uring", applied on top of xnvme_opts_default(). The Device
+    can be given anywhere the C API takes a 'struct xnvme_dev *'.
+
+    The identify data is kept as copies of the controller and namespace
+    structs, 'ctrlr' and 'ns', for the less commonly used fields.
+
+    I/O via pread()/pwrite() is done on a queue, of depth 'qdepth', created on
+    first use, with transfers split into commands of at most 'cmd_nbytes'.
+    Vectored I/O, preadv()/pwritev(), issues a single command with the
+    buffers given as a scatter-gather list. With 'stats' then the commands on
+    the queue are counted and timed, and with a TraceRecorder as 'trace' they
+    are recorded, see Queue, xnvme.stats and xnvme.trace.
+
+    On zoned devices, the state of the zones is kept by 'zones', a
+    ZoneStateCache created on first use, which is kept current with the
+    writes done through the Device.
+    """
+
+    __slots__ = [
+        "uri", "handle", "nsid", "csi", "dtype", "geo_type", "ctrlr", "ns",
+        "serial", "model", "firmware", "nsze", "ncap", "nuse", "cmd_nbytes",
+        "qdepth", "stats", "trace", "_queue", "_sglpool", "_zones", "_write_zeroes_nlbs",
+    ] + GEO_ATTRS
+
+    def __init__(self, uri, qdepth=64, stats=False, trace=None, **opts):
+        self.uri = uri
+        self.handle = None
+        self.qdepth = qdepth
+        self.stats = stats
+        self.trace = trace
+        self._queue = None
+        self._sglpool = None
+        self._zones = None
+        self._write_zeroes_nlbs = None
+
+        handle = CAPI.xnvme_dev_open(uri.encode(), ctypes.byref(options(**opts)))
+        if not handle:
+            raise OSError("xnvme_dev_open(): failed for '%s'" % uri)
+        self.handle = handle
+
+        for attr, val in identify(handle).items():
+            setattr(self, attr, val)
+
+        self.cmd_nbytes = NLB_MAX * self.lba_nbytes
+        if self.mdts_nbytes:
+            self.cmd_nbytes = min(
+                self.cmd_nbytes, self.mdts_nbytes - self.mdts_nbytes % self.lba_nbytes
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __repr__(self):
+        return "Device(%r, nsid=%r, lba_nbytes=%r, nsect=%r)" % (
+            self.uri, self.nsid, self.lba_nbytes, self.nsect
+        )
+
+    @property
+    def _as_parameter_(self):
+        if not self.handle:
+            raise ValueError("Device: '%s' is closed" % self.uri)
+
+        return ctypes.c_void_p(self.handle)
+
+    @property
+    def queue(self):
+        """The Queue used by pread() and pwrite(), created on first use"""
+
+        if self._queue is None:
+            self._queue = Queue(self, self.qdepth, stats=self.stats, trace=self.trace)
+
+        return self._queue
+
+    @property
+    def sglpool(self):
+        """The SGLPool used by preadv() and pwritev(), created on first use"""
+
+        if self._sglpool is None:
+            self._sglpool = SGLPool(self)
+
+        return self._sglpool
+
+    @property
+    def zones(self):
+        """The ZoneStateCache of the zones of the device, created on first use"""
+
+        if self._zones is None:
+            self._zones = znd.ZoneStateCache(self)
+
+        return self._zones
+
+    @property
+    def write_zeroes_nlbs(self):
+        """The largest number of logical blocks of a Write Zeroes, identified on first use"""
+
+        if self._write_zeroes_nlbs is None:
+            self._write_zeroes_nlbs = write_zeroes_limit(self)
+
+        return self._write_zeroes_nlbs
+
+    def written(self, cpls):
+        """
+        Account for the completed writes in 'cpls', tagged with their (slba,
+        nlbs), in the state of the zones, when it is kept
+
+        Zones written by a failed command are refreshed from the device, as
+        the command may have been partially done.
+        """
+
+        if self._zones is None:
+            return
+
+        for cpl in cpls:
+            slba, nlbs = cpl.tag
+            if cpl.sc or cpl.sct:
+                for zslba in range(self._zones.zslba(slba), slba + nlbs, self._zones.zsze):
+                    self._zones.refresh(zslba)
+            else:
+                self._zones.written(slba, nlbs)
+
+    def commands(self, opcode, offset, nbytes, addr):
+        """
+        Returns the commands transferring 'nbytes' at the byte 'offset', to or
+        from the memory at 'addr', split into commands of at most 'cmd_nbytes'
+        """
+
+        if offset % self.lba_nbytes or nbytes % self.lba_nbytes:
+            raise ValueError(
+                "offset: %d and nbytes: %d must be multiples of lba_nbytes: %d" % (
+                    offset, nbytes, self.lba_nbytes
+                )
+            )
+
+        return [
+            (
+                opcode,
+                (offset + off) // self.lba_nbytes,
+                min(self.cmd_nbytes, nbytes - off) // self.lba_nbytes - 1,
+                addr + off,
+            )
+            for off in range(0, nbytes, self.cmd_nbytes)
+        ]
+
+    def pread(self, offset, nbytes, buf=None):
+        """
+        Read 'nbytes' at the byte 'offset', returns the Buffer read into
+
+        The data is read into 'buf' when given, otherwise into a new Buffer.
+        Transfers larger than 'cmd_nbytes' are split into commands, which are
+        issued concurrently.
+        """
+
+        if buf is None:
+            buf = Buffer(self, nbytes)
+        if len(buf) < nbytes:
+            raise ValueError("buf: %d bytes, too small for nbytes: %d" % (len(buf), nbytes))
+
+        check_cpls(self.queue.submit_batch(
+            self.commands(XNVME_SPEC_NVM_OPC_READ, offset, nbytes, buf.addr)
+        ))
+
+        return buf
+
+    def pwrite(self, offset, data):
+        """
+        Write 'data', a Buffer or bytes-like, at the byte 'offset'
+
+        A Buffer is written as-is, anything else is copied to a Buffer first.
+        Transfers larger than 'cmd_nbytes' are split into commands, which are
+        issued concurrently. Returns the number of bytes written.
+        """
+
+        buf = data
+        if not isinstance(data, Buffer):
+            buf = Buffer(self, len(memoryview(data).cast("B")))
+            buf[:] = memoryview(data).cast("B")
+
+        try:
+            cmds = self.commands(XNVME_SPEC_NVM_OPC_WRITE, offset, len(buf), buf.addr)
+            cpls = self.queue.submit_batch(cmds)
+            self.written(
+                cpl._replace(tag=(cmd[1], cmd[2] + 1)) for cpl, cmd in zip(cpls, cmds)
+            )
+            check_cpls(cpls)
+        finally:
+            if buf is not data:
+                buf.close()
+
+        return len(buf)
+
+    def zero_range(self, offset, nbytes, deallocate=False):
+        """
+        Set 'nbytes' at the byte 'offset' to zero, returns the number of bytes
+        zeroed
+
+        The range is zeroed by Write Zeroes commands of at most
+        'write_zeroes_nlbs' logical blocks, issued at the depth of the queue,
+        and with 'deallocate' then the blocks are also deallocated, when the
+        namespace supports the Deallocate bit of Write Zeroes. Without support
+        for Write Zeroes, or without its identify data, then zeroes are written.
+        The commands are waited for, and accounted in the zones, also when
+        submitting one fails.
+        """
+
+        if offset % self.lba_nbytes or nbytes % self.lba_nbytes:
+            raise ValueError(
+                "offset: %d and nbytes: %d must be multiples of lba_nbytes: %d" % (
+                    offset, nbytes, self.lba_nbytes
+                )
+            )
+        if not nbytes:
+            return 0
+
+        opts = 0
+        zeroes = None
+        if self.ctrlr is not None and self.ctrlr.oncs.write_zeroes:
+            opcode, nlbs_max = XNVME_SPEC_NVM_OPC_WRITE_ZEROES, self.write_zeroes_nlbs
+            if deallocate and self.ns is not None and self.ns.dlfeat.bits.write_zero_deallocate:
+                opts = CMD_DEAC
+        else:
+            zeroes = Buffer(self, min(nbytes, self.cmd_nbytes))
+            ctypes.memset(zeroes.addr, 0, len(zeroes))
+            opcode, nlbs_max = XNVME_SPEC_NVM_OPC_WRITE, len(zeroes) // self.lba_nbytes
+
+        cpls = []
+        slba = offset // self.lba_nbytes
+        elba = (offset + nbytes) // self.lba_nbytes
+        try:
+            for lba in range(slba, elba, nlbs_max):
+                nlbs = min(nlbs_max, elba - lba)
+                self.queue.submit(opcode, lba, nlbs - 1, zeroes, (lba, nlbs), cpls, opts)
+        finally:
+            try:
+                self.queue.wait()
+                self.written(cpls)
+            finally:
+                if zeroes is not None:
+                    zeroes.close()
+        check_cpls(cpls)
+
+        return nbytes
+
+    def vectored(self, opcode, offset, bufs):
+        """
+        Transfer the Buffers in 'bufs' at the byte 'offset' with a single command,
+        via an SGL, or via one Buffer gathering them when the backend does not
+        support SGLs
+        """
+
+        bufs = list(bufs)
+        if self.sglpool.supported:
+            try:
+                return self.scattered(opcode, offset, bufs)
+            except OSError as exc:
+                if exc.errno != errno.ENOSYS:
+                    raise
+
+        return self.gathered(opcode, offset, bufs)
+
+    def scattered(self, opcode, offset, bufs):
+        """Transfer the Buffers in 'bufs' at the byte 'offset' with an SGL"""
+
+        sgl = self.sglpool.get(bufs)
+        opcode, slba, nlb, _ = self.vectored_command(opcode, offset, sgl.nbytes)
+
+        cpls = []
+        self.queue.submit(opcode, slba, nlb, sgl, (slba, nlb + 1), cpls, XNVME_CMD_UPLD_SGLD)
+        self.queue.wait()
+        if opcode == XNVME_SPEC_NVM_OPC_WRITE:
+            self.written(cpls)
+        check_cpls(cpls)
+
+        return sgl.nbytes
+
+    def gathered(self, opcode, offset, bufs):
+        """Transfer the Buffers in 'bufs' at the byte 'offset' via a Buffer of them all"""
+
+        if not all(isinstance(buf, Buffer) for buf in bufs):
+            raise TypeError("bufs: must be Buffers, allocated for the device")
+
+        nbytes = sum(len(buf) for buf in bufs)
+        self.vectored_command(opcode, offset, nbytes)
+
+        with Buffer(self, nbytes) as gather:
+            if opcode == XNVME_SPEC_NVM_OPC_WRITE:
+                off = 0
+                for buf in bufs:
+                    gather[off:off + len(buf)] = buf
+                    off += len(buf)
+                self.pwrite(offset, gather)
+            else:
+                self.pread(offset, nbytes, gather)
+                off = 0
+                for buf in bufs:
+                    buf[:] = gather[off:off + len(buf)]
+                    off += len(buf)
+
+        return nbytes
+
+    def vectored_command(self, opcode, offset, nbytes):
+        """Returns the single command of 'opcode' transferring 'nbytes' at 'offset'"""
+
+        cmds = self.commands(opcode, offset, nbytes, 0)
+        if len(cmds) != 1:
+            raise ValueError("bufs: %d bytes exceeds cmd_nbytes: %d" % (nbytes, self.cmd_nbytes))
+
+        return cmds[0]
+
+    def preadv(self, offset, bufs):
+        """
+        Read into the Buffers in 'bufs', in order, from the byte 'offset'
+
+        The Buffers must be allocated for this device, their total size must be
+        a multiple of lba_nbytes and at most cmd_nbytes. They are read into by a
+        single command with an SGL when the backend supports it, that is SPDK,
+        otherwise into one Buffer which is then copied to them. Returns the
+        number of bytes read.
+        """
+
+        return self.vectored(XNVME_SPEC_NVM_OPC_READ, offset, bufs)
+
+    def pwritev(self, offset, bufs):
+        """
+        Write the Buffers in 'bufs', in order, at the byte 'offset'
+
+        With an SGL, that is on SPDK, the Buffers are written without gathering
+        them into one, on other backends they are copied into one Buffer first.
+        As for preadv(), they must be allocated for this device, and their total
+        size must be a multiple of lba_nbytes and at most cmd_nbytes. Returns
+        the number of bytes written.
+        """
+
+        return self.vectored(XNVME_SPEC_NVM_OPC_WRITE, offset, bufs)
+
+    def zone_report(self, slba=0, limit=0, extended=False):
+        """
+        Returns the zone report, from the zone starting at 'slba', of 'limit'
+        zones, zero meaning all, as a NumPy structured array
+
+        The records have the fields zt, zs, za, zcap, zslba and wp, and with
+        'extended' the zone descriptor extension as 'ext'. See xnvme.znd.
+        """
+
+        return znd.report(self, slba, limit, extended)
+
+    def zrwa(self, zslba, keep=0):
+        """Returns a ZRWAWriter of the zone at 'zslba', see xnvme.znd.ZRWAWriter"""
+
+        return znd.ZRWAWriter(self, zslba, keep)
+
+    def copy_ranges(self, ranges, sdlba, offload=None):
+        """
+        Copy the source 'ranges', (slba, nlbs) tuples, to consecutive LBAs from
+        'sdlba', via Simple Copy when supported, see xnvme.scopy
+        """
+
+        return scopy.copy_ranges(self, ranges, sdlba, offload)
+
+    def coalescing(self, window=0.001, max_nbytes=None):
+        """Returns a WriteCoalescer on this device, see WriteCoalescer"""
+
+        return WriteCoalescer(self, window, max_nbytes)
+
+    def close(self):
+        """Close the device, after which it cannot be used"""
+
+        if self._queue is not None:
+            self._queue.term()
+            self._queue = None
+
+        if self._sglpool is not None:
+            self._sglpool.close()
+            self._sglpool = None
+
+        self._zones = None
+
+        if self.handle:
+            CAPI.xnvme_dev_close(self.handle)
+            self.handle = None
+
+class WriteCoalescer(object):
+    """
+    Merges adjacent writes to the Device 'dev' into larger commands
+
+    A write starting where the pending write ends is appended to it, when
+    given within 'window' seconds of the first write of the pending write and
+    while the merged write does not exceed 'max_nbytes', defaulting to
+    'cmd_nbytes' of the device. Otherwise the pending write is submitted and
+    the new write becomes the pending write.
+
+    Writes are submitted without waiting for them, errors are raised by
+    flush(), which submits the pending write and waits for all writes, and is
+    called when leaving the context.
+    """
+
+    def __init__(self, dev, window=0.001, max_nbytes=None):
+        self.dev = dev
+        self.window = window
+        self.max_nbytes = max_nbytes or dev.cmd_nbytes
+        if self.max_nbytes % dev.lba_nbytes or self.max_nbytes > dev.cmd_nbytes:
+            raise ValueError("max_nbytes: %d invalid for the device" % self.max_nbytes)
+
+        self.stats = {"writes": 0, "commands": 0}
+
+        self._pool = BufferPool(dev, self.max_nbytes, min(self.max_nbytes, 4096))
+        self._cpls = []
+        self._buf = None
+        self._offset = 0
+        self._nbytes = 0
+        self._started = 0.0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _submit(self):
+        """Submit the pending write, when there is one"""
+
+        if self._buf is None:
+            return
+
+        cmd, = self.dev.commands(
+            XNVME_SPEC_NVM_OPC_WRITE, self._offset, self._nbytes, self._buf.addr
+        )
+        # The Buffer is the payload, the queue thus references it until completion
+        self.dev.queue.submit(
+            cmd[0], cmd[1], cmd[2], self._buf, (cmd[1], cmd[2] + 1), self._cpls
+        )
+        self.stats["commands"] += 1
+        self._buf = None
+
+    def pwrite(self, offset, data):
+        """Write the bytes-like 'data' at the byte 'offset', returns len(data)"""
+
+        data = byteview(data)
+        nbytes = len(data)
+        if offset % self.dev.lba_nbytes or nbytes % self.dev.lba_nbytes:
+            raise ValueError("offset and len(data) must be multiples of lba_nbytes")
+        if nbytes > self.max_nbytes:
+            self.flush()
+            return self.dev.pwrite(offset, data)
+
+        now = time.monotonic()
+        if self._buf is not None and (
+                offset != self._offset + self._nbytes
+                or self._nbytes + nbytes > self.max_nbytes
+                or now - self._started > self.window):
+            self._submit()
+
+        if self._buf is None:
+            self._buf = self._pool.get(self.max_nbytes)
+            self._offset = offset
+            self._nbytes = 0
+            self._started = now
+
+        self._buf[self._nbytes:self._nbytes + nbytes] = data
+        self._nbytes += nbytes
+        self.stats["writes"] += 1
+
+        return nbytes
+
+    def flush(self):
+        """Submit the pending write, then wait for all writes and check their status"""
+
+        self._submit()
+        self.dev.queue.wait()
+
+        cpls, self._cpls = self._cpls, []
+        self.dev.written(cpls)
+        check_cpls(cpls)
+
+    def close(self):
+        """Flush, then release the buffers held by the coalescer"""
+
+        try:
+            self.flush()
+        finally:
+            self._pool.clear()
@@ -0,0 +1,242 @@
+"""
+    Device discovery
+
+    Enumerating the devices of a system via xnvme_enumerate() opens them one
+    after the other. Here the namespaces of the Linux backend are instead
+    listed from sysfs, as xnvme_enumerate() lists them but without opening
+    them, and the result of identifying them is kept in a cache on disk, such
+    that enumerate() only opens the devices which are new or changed, and opens
+    those concurrently. A device is considered unchanged when its serial number
+    and firmware revision, as read without opening it, match those cached.
+    Usage::
+
+        for info in xnvme.enumerate():
+            print(info.uri, info.serial, info.lba_nbytes, info.nsect)
+
+    The cache is stored in XNVME_CACHE_DIR, defaulting to 'pyxnvme' in the
+    user cache directory.
+"""
+import collections
+import concurrent.futures
+import ctypes
+import json
+import os
+import re
+import stat
+
+from xnvme import CAPI, XNVME_ENUMERATE_CB, XNVME_ENUMERATE_DEV_CLOSE
+from xnvme.device import GEO_ATTRS, Device, decode, identify, options
+
+DeviceInfo = collections.namedtuple("DeviceInfo", [
+    "uri", "nsid", "csi", "dtype", "geo_type", "serial", "model", "firmware",
+    "nsze", "ncap", "nuse",
+] + GEO_ATTRS)
+
+# Bumped when the cached records change
+CACHE_VERSION = 1
+
+# Where the Linux backend looks for block-devices and char-devices
+SYS_BLOCK = "/sys/block"
+DEV = "/dev"
+
+def cache_path():
+    """Returns the path of the device cache"""
+
+    cache_dir = os.environ.get("XNVME_CACHE_DIR")
+    if not cache_dir:
+        cache_dir = os.path.join(
+            os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "pyxnvme"
+        )
+
+    return os.path.join(cache_dir, "devices.json")
+
+def load(path):
+    """Returns the DeviceInfo records cached in 'path', by uri, empty when there is none"""
+
+    try:
+        with open(path) as cfd:
+            cached = json.load(cfd)
+    except (OSError, ValueError):
+        return {}
+
+    if cached.get("version") != CACHE_VERSION:
+        return {}
+
+    try:
+        return dict((uri, DeviceInfo(**rec)) for uri, rec in cached["devices"].items())
+    except (KeyError, TypeError):
+        return {}
+
+def save(path, infos):
+    """Store the DeviceInfo records 'infos' in the cache at 'path'"""
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    tmp = "%s.%d" % (path, os.getpid())
+    with open(tmp, "w") as cfd:
+        json.dump(
+            {
+                "version": CACHE_VERSION,
+                "devices": dict((info.uri, info._asdict()) for info in infos),
+            },
+            cfd,
+            indent=2,
+        )
+    os.replace(tmp, path)
+
+def key(uri):
+    """
+    Returns the (serial, firmware) of the NVMe device at 'uri', as read from
+    sysfs, without opening the device; None when not available
+    """
+
+    name = os.path.basename(uri)
+    for path in ["/sys/block/%s/device" % name, "/sys/class/nvme-generic/%s/device" % name]:
+        try:
+            with open(os.path.join(path, "serial")) as sfd:
+                serial = sfd.read().strip()
+            with open(os.path.join(path, "firmware_rev")) as ffd:
+                firmware = ffd.read().strip()
+        except OSError:
+            continue
+
+        return serial, firmware
+
+    return None
+
+def info(attrs):
+    """Returns the DeviceInfo of the Device, or identify() dict, 'attrs'"""
+
+    if isinstance(attrs, dict):
+        return DeviceInfo(**dict((field, attrs[field]) for field in DeviceInfo._fields))
+
+    return DeviceInfo(*[getattr(attrs, field) for field in DeviceInfo._fields])
+
+def probe(uri, **opts):
+    """Open the device at 'uri', returns its DeviceInfo"""
+
+    with Device(uri, **opts) as dev:
+        return info(dev)
+
+def candidates(sys_uri=None, **opts):
+    """
+    Returns the uris of the namespaces which xnvme_enumerate() finds via the
+    Linux backend, the block-devices in sysfs and the char-devices in /dev,
+    without opening them; None when enumerating the system at 'sys_uri', via
+    another backend given by the option 'be', or when there is no sysfs
+    """
+
+    if sys_uri or opts.get("be", "linux") != "linux" or not os.path.isdir(SYS_BLOCK):
+        return None
+
+    def isdev(name, check):
+        """Returns whether the entry 'name' in DEV is a device passing 'check'"""
+
+        try:
+            return check(os.stat(os.path.join(DEV, name)).st_mode)
+        except OSError:
+            return False
+
+    uris = []
+    for name in sorted(os.listdir(SYS_BLOCK)):
+        if "nvme" in name and not re.match(r"nvme\d+n\d+p\d+", name) and isdev(name, stat.S_ISBLK):
+            uris.append(os.path.join(DEV, name))
+    for name in sorted(os.listdir(DEV)):
+        if re.match(r"ng\d+n\d+", name) and isdev(name, stat.S_ISCHR):
+            uris.append(os.path.join(DEV, name))
+
+    return uris
+
+def scan(sys_uri=None, **opts):
+    """Returns the DeviceInfo of the devices found by xnvme_enumerate()"""
+
+    infos = []
+    errors = []
+
+    def enumerate_cb(dev, _):
+        """Record the device, and signal the backend to close it, also on error"""
+
+        try:
+            attrs = identify(dev)
+            attrs["uri"] = decode(CAPI.xnvme_dev_get_ident(dev).contents.uri)
+            infos.append(info(attrs))
+        except Exception as exc:  # pylint: disable=broad-except
+            errors.append(exc)
+
+        return XNVME_ENUMERATE_DEV_CLOSE
+
+    CAPI.xnvme_enumerate(
+        sys_uri.encode() if sys_uri else None,
+        ctypes.byref(options(**opts)),
+        XNVME_ENUMERATE_CB(enumerate_cb),
+        None,
+    )
+    if errors:
+        raise errors[0]
+
+    return infos
+
+def enumerate(  # pylint: disable=redefined-builtin
+        uris=None, sys_uri=None, cache=True, rescan=False, workers=None, **opts):
+    """
+    Returns the DeviceInfo of the devices at 'uris', defaulting to those
+    listed by candidates()
+
+    Cached records are used for devices whose serial number and firmware
+    revision are unchanged, unless 'rescan', the other devices are opened
+    concurrently, by a pool of 'workers' threads, and the cache is updated:
+    devices no longer listed, or which fail to open, are dropped. Failing to
+    open a device given in 'uris' raises OSError. When candidates() cannot
+    list the devices, then the cached devices are used, and xnvme_enumerate()
+    when none are cached or with 'rescan'. With 'cache' False, then the cache
+    is neither read nor written. The options for opening devices are given as
+    keywords, as for Device.
+    """
+
+    path = cache_path() if cache else None
+    cached = load(path) if path else {}
+
+    given = uris is not None
+    if not given:
+        uris = candidates(sys_uri, **opts)
+    if uris is None:
+        if rescan or not cached:
+            infos = scan(sys_uri, **opts)
+            if path:
+                save(path, infos)
+            return infos
+        uris = list(cached)
+
+    found = {}
+    stale = []
+    for uri in uris:
+        rec = None if rescan else cached.get(uri)
+        if rec is not None and key(uri) == (rec.serial, rec.firmware):
+            found[uri] = rec
+        else:
+            stale.append(uri)
+
+    if stale:
+        with concurrent.futures.ThreadPoolExecutor(workers or min(32, len(stale))) as pool:
+            futures = dict((uri, pool.submit(probe, uri, **opts)) for uri in stale)
+        for uri, future in futures.items():
+            try:
+                found[uri] = future.result()
+            except OSError:
+                if given:
+                    raise
+
+    infos = [found[uri] for uri in uris if uri in found]
+    if path:
+        if given:
+            fresh = dict(cached)
+            fresh.update(found)
+            for uri in stale:
+                if uri not in found:
+                    fresh.pop(uri, None)
+        else:
+            fresh = dict((info.uri, info) for info in infos)
+        if fresh != cached:
+            save(path, fresh.values())
+
+    return infos
@@ -0,0 +1,453 @@
+"""
+    File I/O
+
+    Files opened via xnvme_file_open(), as Python file objects, such that code
+    taking a file object, e.g. tarfile or shutil.copyfileobj(), does its I/O
+    through xNVMe, also for files opened with O_DIRECT::
+
+        with xnvme.BufferedFile("/mnt/data/blob", "rb", direct=True) as src:
+            with open("blob", "wb") as dst:
+                shutil.copyfileobj(src, dst, 1 << 20)
+
+    A File is unbuffered, each read or write is one synchronous command. A
+    BufferedFile transfers the file in chunks on a queue: reading ahead of
+    sequential reads, and writing behind, without waiting for the writes. The
+    queue uses the asynchronous interface given by the 'async_' option, e.g.
+    "thrpool", "posix" or "io_uring".
+"""
+import ctypes
+import errno
+import io
+import os
+
+from xnvme import CAPI, XNVME_SPEC_FS_OPC_READ, XNVME_SPEC_FS_OPC_WRITE
+from xnvme.buf import Buffer, BufferPool, byteview
+from xnvme.device import options
+from xnvme.queue import CommandError, Completion, Queue, check
+
+# Alignment of offsets and transfers of files opened with O_DIRECT
+DIRECT_ALIGN = 4096
+
+# Offset of the file-descriptor in the backend state of a file, it is the first
+# member of e.g. 'struct xnvme_be_linux_state', after two handles on Windows
+FD_OFFSET = 2 * ctypes.sizeof(ctypes.c_void_p) if os.name == "nt" else 0
+
+def flags(mode):
+    """Returns the open-flags, as 'struct xnvme_opts' members, of the file-mode 'mode'"""
+
+    base = mode.replace("b", "")
+    oflags = {
+        "r": {"rdonly": 1},
+        "w": {"wronly": 1, "create": 1, "truncate": 1},
+        "x": {"wronly": 1, "create": 1},
+        "r+": {"rdwr": 1},
+        "w+": {"rdwr": 1, "create": 1, "truncate": 1},
+    }.get(base)
+    if oflags is None:
+        raise ValueError("mode: '%s' not supported" % mode)
+
+    return oflags
+
+class File(io.RawIOBase):
+    """
+    The file at 'path' opened via xnvme_file_open(), unbuffered
+
+    The 'mode' is that of open(), without appending, and with 'direct' then
+    the file is opened with O_DIRECT, requiring offsets and sizes of reads
+    and writes to be multiples of DIRECT_ALIGN. Further options are given as
+    keywords, as for Device.
+
+    Reads and writes are done directly on Buffers given to readinto() and
+    write(), other bytes-like objects go through a Buffer of the File.
+    """
+
+    def __init__(self, path, mode="rb", direct=False, **opts):
+        super(File, self).__init__()
+
+        oflags = flags(mode)
+        if direct:
+            oflags["direct"] = 1
+        oflags.update(opts)
+
+        self.path = path
+        self.mode = mode
+        self.direct = direct
+        self.handle = CAPI.xnvme_file_open(path.encode(), ctypes.byref(options(**oflags)))
+        if not self.handle:
+            raise OSError("xnvme_file_open(): failed for '%s'" % path)
+
+        geo = CAPI.xnvme_dev_get_geo(self.handle).contents
+        self.size = geo.tbytes
+        self.cmd_nbytes = geo.mdts_nbytes
+        self._readable = "r" in mode or "+" in mode
+        self._writable = "r" not in mode or "+" in mode
+        self._pos = 0
+        self._pool = BufferPool(self, self.cmd_nbytes)
+
+    @property
+    def _as_parameter_(self):
+        if not self.handle:
+            raise ValueError("I/O operation on closed file")
+
+        return ctypes.c_void_p(self.handle)
+
+    def readable(self):
+        return self._readable
+
+    def writable(self):
+        return self._writable
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += self.size
+        if offset < 0:
+            raise ValueError("negative seek position %d" % offset)
+        self._pos = offset
+
+        return self._pos
+
+    def command(self, func, buf, nbytes, offset):
+        """Issue the file-command 'func' synchronously, returns the bytes transferred"""
+
+        ctx = CAPI.xnvme_file_get_cmd_ctx(self)
+        check(getattr(CAPI, func)(ctypes.byref(ctx), buf, nbytes, offset), func)
+        if ctx.cpl.status.sc or ctx.cpl.status.sct:
+            raise CommandError(
+                Completion(
+                    None, ctx.cpl.status.sc, ctx.cpl.status.sct, ctx.cpl.cdw0, ctx.cpl.result
+                )
+            )
+
+        return ctx.cpl.result
+
+    def pread(self, buf, nbytes, offset):
+        """
+        Read at most 'nbytes' at 'offset' into the Buffer 'buf', returns the bytes
+        read, which are fewer than 'nbytes' at the end of the file
+        """
+
+        nread = 0
+        while nread < nbytes:
+            count = min(self.cmd_nbytes, nbytes - nread)
+            res = self.command("xnvme_file_pread", buf.addr + nread, count, offset + nread)
+            nread += res
+            if res < count:
+                break
+
+        return nread
+
+    def pwrite(self, buf, nbytes, offset):
+        """
+        Write 'nbytes' of the Buffer 'buf' at 'offset', returns the bytes written
+
+        Short writes are continued, a write making no progress, e.g. on a full
+        file-system, raises OSError with ENOSPC.
+        """
+
+        nwritten = 0
+        while nwritten < nbytes:
+            count = min(self.cmd_nbytes, nbytes - nwritten)
+            res = self.command("xnvme_file_pwrite", buf.addr + nwritten, count, offset + nwritten)
+            if not res:
+                self.size = max(self.size, offset + nwritten)
+                raise OSError(
+                    errno.ENOSPC, "xnvme_file_pwrite(): wrote 0 of %d bytes at offset %d"
+                    % (count, offset + nwritten), self.path
+                )
+            nwritten += res
+        self.size = max(self.size, offset + nwritten)
+
+        return nwritten
+
+    def readinto(self, b):
+        if isinstance(b, Buffer):
+            nread = self.pread(b, len(b), self._pos)
+        else:
+            view = memoryview(b).cast("B")
+            with self._pool.get(len(view)) as buf:
+                nread = self.pread(buf, len(view), self._pos)
+                view[:nread] = buf[:nread]
+        self._pos += nread
+
+        return nread
+
+    def write(self, b):
+        if isinstance(b, Buffer):
+            nwritten = self.pwrite(b, len(b), self._pos)
+        else:
+            view = memoryview(b).cast("B")
+            with self._pool.get(len(view)) as buf:
+                buf[:len(view)] = view
+                nwritten = self.pwrite(buf, len(view), self._pos)
+        self._pos += nwritten
+
+        return nwritten
+
+    def fileno(self):
+        """Returns the file-descriptor of the file, as opened by the backend"""
+
+        return ctypes.c_int.from_address(
+            CAPI.xnvme_dev_get_be_state(self) + FD_OFFSET
+        ).value
+
+    def truncate(self, size=None):
+        """Resize the file to 'size' bytes, defaulting to the position, via its descriptor"""
+
+        if size is None:
+            size = self._pos
+        os.ftruncate(self.fileno(), size)
+        self.size = size
+
+        return size
+
+    def sync(self):
+        """Flush the file to stable storage, via xnvme_file_sync()"""
+
+        check(CAPI.xnvme_file_sync(self), "xnvme_file_sync")
+
+    def close(self):
+        if self.handle:
+            self._pool.clear()
+            CAPI.xnvme_file_close(self.handle)
+            self.handle = None
+        super(File, self).close()
+
+class BufferedFile(io.BufferedIOBase):
+    """
+    The file at 'path' opened via xnvme_file_open(), for reading, mode "rb",
+    or writing, mode "wb", in chunks of 'chunk_nbytes' on a queue
+
+    Reading: the chunks holding the data read are read on the queue, and when
+    reading sequentially, the following 'readahead' chunks are read ahead.
+
+    Writing: data is gathered into chunks, each chunk is submitted once full,
+    without waiting for it, with at most 'writebehind' chunks in flight.
+    flush() writes the partial chunk and waits for the writes, the partial
+    chunk is kept and written again as it fills. Files opened with 'direct'
+    are written in multiples of DIRECT_ALIGN and truncated to the size written.
+
+    Options for xnvme_file_open() are given as keywords, as for Device, e.g.
+    async_="io_uring".
+    """
+
+    def __init__(self, path, mode="rb", chunk_nbytes=1 << 20, readahead=4, writebehind=4,
+                 direct=False, **opts):
+        super(BufferedFile, self).__init__()
+
+        if mode.replace("b", "") not in ("r", "w"):
+            raise ValueError("mode: '%s' not supported, must be 'rb' or 'wb'" % mode)
+        if chunk_nbytes % DIRECT_ALIGN:
+            raise ValueError("chunk_nbytes: must be a multiple of %d" % DIRECT_ALIGN)
+
+        self.raw = File(path, mode, direct, **opts)
+        self.chunk_nbytes = chunk_nbytes
+        self.readahead = readahead
+        self.writebehind = writebehind
+        # The power of two holding the chunks in flight, as xnvme_queue_init() requires
+        self.queue = Queue(self.raw, 1 << max(readahead, writebehind).bit_length())
+
+        self._pos = 0
+        self._pool = BufferPool(self.raw, chunk_nbytes, chunk_nbytes)
+        self._cpls = []
+        self._errors = []
+
+        # Reading: chunks by index, as [Buffer, Completion], the latter None while in flight
+        self._chunks = {}
+        self._last = -1
+
+        # Writing: the partial chunk
+        self._buf = None
+        self._fill = 0
+
+    def readable(self):
+        return self.raw.readable()
+
+    def writable(self):
+        return self.raw.writable()
+
+    def seekable(self):
+        return self.readable()
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if not self.seekable():
+            raise io.UnsupportedOperation("seek")
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += self.raw.size
+        if offset < 0:
+            raise ValueError("negative seek position %d" % offset)
+        self._pos = offset
+
+        return self._pos
+
+    def _reap(self):
+        """Poke the queue for completions, and record them"""
+
+        self.queue.poke()
+
+        cpls, self._cpls = self._cpls, []
+        for cpl in cpls:
+            if cpl.sc or cpl.sct:
+                self._errors.append(cpl)
+            if cpl.tag is not None:
+                cpl.tag[1] = cpl
+
+        if self._errors:
+            errors, self._errors = self._errors, []
+            raise CommandError(errors[0])
+
+    def _fetch(self, idx):
+        """Submit the read of the chunk 'idx', unless it is read or beyond the end"""
+
+        if idx in self._chunks or idx * self.chunk_nbytes >= self.raw.size:
+            return
+
+        # The chunk is its own tag, thus a chunk dropped while in flight is not
+        # mistaken for one read again at the same index
+        chunk = self._chunks[idx] = [self._pool.get(self.chunk_nbytes), None]
+        self.queue.submit_file(
+            XNVME_SPEC_FS_OPC_READ, idx * self.chunk_nbytes, self.chunk_nbytes, chunk[0], chunk,
+            self._cpls
+        )
+
+    def _chunk(self, idx):
+        """Returns the Buffer of the chunk 'idx' and the number of bytes in it"""
+
+        sequential = idx in (self._last, self._last + 1)
+        self._last = idx
+
+        # Drop the chunks behind, and those outside the window read ahead
+        window = range(idx, idx + (self.readahead if sequential else 0) + 1)
+        for stale in [stale for stale in self._chunks if stale not in window]:
+            del self._chunks[stale]
+
+        for ahead in window:
+            self._fetch(ahead)
+        if idx not in self._chunks:
+            return None, 0
+
+        while self._chunks[idx][1] is None:
+            self._reap()
+
+        buf, cpl = self._chunks[idx]
+
+        return buf, cpl.result
+
+    def readinto(self, b):
+        if not self.readable():
+            raise io.UnsupportedOperation("read")
+
+        view = byteview(b)
+        nread = 0
+        while nread < len(view):
+            idx, off = divmod(self._pos, self.chunk_nbytes)
+            buf, valid = self._chunk(idx)
+            count = min(valid - off, len(view) - nread)
+            if count <= 0:
+                break
+            view[nread:nread + count] = buf[off:off + count]
+            nread += count
+            self._pos += count
+
+        return nread
+
+    readinto1 = readinto
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = max(0, self.raw.size - self._pos)
+
+        data = bytearray(size)
+        nread = self.readinto(data)
+        del data[nread:]
+
+        return bytes(data)
+
+    read1 = read
+
+    def _submit(self, nbytes):
+        """Submit the write of 'nbytes' of the partial chunk, at its offset"""
+
+        offset = self._pos - self._fill
+        while self.queue.outstanding >= self.writebehind:
+            self._reap()
+
+        self.queue.submit_file(
+            XNVME_SPEC_FS_OPC_WRITE, offset, nbytes, self._buf, None, self._cpls
+        )
+        self.raw.size = max(self.raw.size, offset + nbytes)
+
+    def write(self, b):
+        if not self.writable():
+            raise io.UnsupportedOperation("write")
+
+        view = byteview(b)
+        nwritten = 0
+        while nwritten < len(view):
+            if self._buf is None:
+                self._buf = self._pool.get(self.chunk_nbytes)
+                self._fill = 0
+
+            count = min(self.chunk_nbytes - self._fill, len(view) - nwritten)
+            self._buf[self._fill:self._fill + count] = view[nwritten:nwritten + count]
+            self._fill += count
+            self._pos += count
+            nwritten += count
+
+            if self._fill == self.chunk_nbytes:
+                self._submit(self._fill)
+                self._buf = None
+
+        return nwritten
+
+    def flush(self):
+        if self.raw.closed or not self.writable():
+            return
+
+        if self._buf is not None and self._fill:
+            nbytes = self._fill
+            if self.raw.direct:
+                # The padding is zeroed, rather than writing what the pool left in it
+                nbytes += -nbytes % DIRECT_ALIGN
+                ctypes.memset(self._buf.addr + self._fill, 0, nbytes - self._fill)
+            self._submit(nbytes)
+
+        self.queue.wait()
+        self._reap()
+
+        if self.raw.size > self._pos:
+            self.raw.truncate(self._pos)
+
+    def sync(self):
+        """Flush, then flush the file to stable storage"""
+
+        self.flush()
+        self.raw.sync()
+
+    def close(self):
+        if self.closed:
+            return
+
+        try:
+            self.flush()
+        finally:
+            if self.queue.outstanding:
+                self.queue.wait()
+            self.queue.term()
+            self._chunks.clear()
+            self._buf = None
+            self._pool.clear()
+            self.raw.close()
+            super(BufferedFile, self).close()
@@ -0,0 +1,81 @@
+"""
+    Locating and loading the xNVMe shared library
+
+    The library is loaded on first use of a symbol, such that 'import xnvme'
+    does not pay for loading it, and its dependencies, in processes not calling
+    into it. The library is searched for in:
+
+    * XNVME_LIBRARY_PATH, the path to the library or a directory containing it
+    * The 'bin' directories receiving the data-files of setup.py, that is,
+      in the system, environment and user prefix
+    * The search-path of the dynamic loader
+"""
+import os
+import site
+import sys
+
+XNVME_SHARED_LIB_FN = "libxnvme-shared.so"
+
+def candidates(name=XNVME_SHARED_LIB_FN):
+    """Returns the paths to try loading the library from, in order"""
+
+    override = os.environ.get("XNVME_LIBRARY_PATH")
+    if override:
+        return [os.path.join(override, name) if os.path.isdir(override) else override]
+
+    paths = []
+    for prefix in [sys.prefix, sys.exec_prefix, site.getuserbase()]:
+        path = os.path.join(prefix, "bin", name)
+        if path not in paths and os.path.exists(path):
+            paths.append(path)
+
+    return paths + [name]
+
+class Library(object):
+    """
+    The shared library 'name', loaded on first access of one of its symbols
+
+    Functions get the argtypes and restype from the generated bindings, and
+    are cached as attributes of the Library once resolved, thus the lookup of a
+    symbol is only done once.
+    """
+
+    def __init__(self, name=XNVME_SHARED_LIB_FN):
+        self._name = name
+        self.path = None
+        self.cdll = None
+
+    def load(self):
+        """Load the library, when not already loaded, and return the ctypes.CDLL"""
+
+        import ctypes  # pylint: disable=import-outside-toplevel
+
+        if self.cdll is not None:
+            return self.cdll
+
+        errors = []
+        for path in candidates(self._name):
+            try:
+                cdll = ctypes.CDLL(path)
+            except OSError as exc:
+                errors.append(str(exc))
+                continue
+
+            # Concurrent loads yield the same handle from the dynamic loader
+            self.path, self.cdll = path, cdll
+            return self.cdll
+
+        raise OSError("Cannot load %s; %s" % (self._name, "; ".join(errors)))
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        from xnvme.libxnvme import PROTOTYPES  # pylint: disable=import-outside-toplevel
+
+        func = getattr(self.cdll or self.load(), name)
+        if name in PROTOTYPES:
+            func.restype, func.argtypes = PROTOTYPES[name]
+        setattr(self, name, func)
+
+        return func
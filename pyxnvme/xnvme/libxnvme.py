@@ -0,0 +1,2384 @@
+"""
+    ctypes bindings for the xNVMe C API
+
+    Autogenerated by scripts/ctypes_generator.py from:
+
+    * libxnvme.h
+    * libxnvme_3p.h
+    * libxnvme_adm.h
+    * libxnvme_be.h
+    * libxnvme_buf.h
+    * libxnvme_dev.h
+    * libxnvme_file.h
+    * libxnvme_geo.h
+    * libxnvme_ident.h
+    * libxnvme_lba.h
+    * libxnvme_nvm.h
+    * libxnvme_pp.h
+    * libxnvme_sgl.h
+    * libxnvme_spec.h
+    * libxnvme_spec_fs.h
+    * libxnvme_spec_pp.h
+    * libxnvme_util.h
+    * libxnvme_ver.h
+    * libxnvme_znd.h
+
+    Do not edit, re-generate with: make gen-pyxnvme-ctypes
+"""
+# pylint: disable=invalid-name,too-few-public-methods,line-too-long
+import ctypes
+
+
+XNVME_ENUMERATE_DEV_CLOSE = 1
+XNVME_ENUMERATE_DEV_KEEP_OPEN = 0
+XNVME_GEO_CONVENTIONAL = 1
+XNVME_GEO_UNKNOWN = 0
+XNVME_GEO_ZONED = 2
+XNVME_IDENT_OPTS_LEN = 160
+XNVME_IDENT_OPT_MAX = 20
+XNVME_IDENT_SCHM_LEN = 5
+XNVME_IDENT_TRGT_LEN = 155
+XNVME_IDENT_URI_LEN = 384
+XNVME_IDENT_URI_LEN_MIN = 6
+XNVME_NVM_SCOPY_FMT_SRCLEN = 256
+XNVME_NVM_SCOPY_FMT_ZERO = 1
+XNVME_PR_DEF = 0
+XNVME_PR_TERSE = 2
+XNVME_PR_YAML = 1
+XNVME_QUEUE_IOPOLL = 1
+XNVME_QUEUE_SQPOLL = 2
+XNVME_SPEC_ADM_OPC_GFEAT = 10
+XNVME_SPEC_ADM_OPC_IDFY = 6
+XNVME_SPEC_ADM_OPC_LOG = 2
+XNVME_SPEC_ADM_OPC_SFEAT = 9
+XNVME_SPEC_CSI_FS = 31
+XNVME_SPEC_CSI_NVM = 0
+XNVME_SPEC_CSI_ZONED = 2
+XNVME_SPEC_CTRLR_FR_LEN = 8
+XNVME_SPEC_CTRLR_MN_LEN = 40
+XNVME_SPEC_CTRLR_SN_LEN = 20
+XNVME_SPEC_FEAT_ARBITRATION = 1
+XNVME_SPEC_FEAT_ERROR_RECOVERY = 5
+XNVME_SPEC_FEAT_LBA_RANGETYPE = 3
+XNVME_SPEC_FEAT_NQUEUES = 7
+XNVME_SPEC_FEAT_PWR_MGMT = 2
+XNVME_SPEC_FEAT_SEL_CURRENT = 0
+XNVME_SPEC_FEAT_SEL_DEFAULT = 1
+XNVME_SPEC_FEAT_SEL_SAVED = 2
+XNVME_SPEC_FEAT_SEL_SUPPORTED = 3
+XNVME_SPEC_FEAT_TEMP_THRESHOLD = 4
+XNVME_SPEC_FEAT_VWCACHE = 6
+XNVME_SPEC_FLAG_FORCE_UNIT_ACCESS = 16384
+XNVME_SPEC_FLAG_LIMITED_RETRY = 32768
+XNVME_SPEC_FLAG_PRINFO_PRACT = 8192
+XNVME_SPEC_FLAG_PRINFO_PRCHK_APP = 2048
+XNVME_SPEC_FLAG_PRINFO_PRCHK_GUARD = 4096
+XNVME_SPEC_FLAG_PRINFO_PRCHK_REF = 1024
+XNVME_SPEC_FS_OPC_FLUSH = 173
+XNVME_SPEC_FS_OPC_READ = 220
+XNVME_SPEC_FS_OPC_WRITE = 172
+XNVME_SPEC_IDFY_CS_IOCSC_LEN = 512
+XNVME_SPEC_IDFY_CTRLR = 1
+XNVME_SPEC_IDFY_CTRLR_IOCS = 6
+XNVME_SPEC_IDFY_CTRLR_NS = 18
+XNVME_SPEC_IDFY_CTRLR_PRI = 20
+XNVME_SPEC_IDFY_CTRLR_SEC = 21
+XNVME_SPEC_IDFY_CTRLR_SUB = 19
+XNVME_SPEC_IDFY_IOCS = 28
+XNVME_SPEC_IDFY_NS = 0
+XNVME_SPEC_IDFY_NSDSCR = 3
+XNVME_SPEC_IDFY_NSGRAN = 22
+XNVME_SPEC_IDFY_NSLIST = 2
+XNVME_SPEC_IDFY_NSLIST_ALLOC = 16
+XNVME_SPEC_IDFY_NSLIST_ALLOC_IOCS = 26
+XNVME_SPEC_IDFY_NSLIST_IOCS = 7
+XNVME_SPEC_IDFY_NS_ALLOC = 17
+XNVME_SPEC_IDFY_NS_ALLOC_IOCS = 27
+XNVME_SPEC_IDFY_NS_IOCS = 5
+XNVME_SPEC_IDFY_SETL = 4
+XNVME_SPEC_IDFY_UUIDL = 23
+XNVME_SPEC_LOG_CHNS = 4
+XNVME_SPEC_LOG_CSAE = 5
+XNVME_SPEC_LOG_ERRI = 1
+XNVME_SPEC_LOG_FW = 3
+XNVME_SPEC_LOG_HEALTH = 2
+XNVME_SPEC_LOG_RSVD = 0
+XNVME_SPEC_LOG_SELFTEST = 6
+XNVME_SPEC_LOG_TELECTRLR = 8
+XNVME_SPEC_LOG_TELEHOST = 7
+XNVME_SPEC_LOG_ZND_CHANGES = 191
+XNVME_SPEC_NVM_CMD_CPL_SC_WRITE_TO_RONLY = 130
+XNVME_SPEC_NVM_OPC_FLUSH = 0
+XNVME_SPEC_NVM_OPC_FMT = 128
+XNVME_SPEC_NVM_OPC_READ = 2
+XNVME_SPEC_NVM_OPC_SANITIZE = 132
+XNVME_SPEC_NVM_OPC_SCOPY = 25
+XNVME_SPEC_NVM_OPC_WRITE = 1
+XNVME_SPEC_NVM_OPC_WRITE_UNCORRECTABLE = 4
+XNVME_SPEC_NVM_OPC_WRITE_ZEROES = 8
+XNVME_SPEC_NVM_SCOPY_NENTRY_MAX = 128
+XNVME_SPEC_PSDT_PRP = 0
+XNVME_SPEC_PSDT_SGL_MPTR_CONTIGUOUS = 1
+XNVME_SPEC_PSDT_SGL_MPTR_SGL = 2
+XNVME_SPEC_SGL_DESCR_SUBTYPE_ADDRESS = 0
+XNVME_SPEC_SGL_DESCR_SUBTYPE_OFFSET = 1
+XNVME_SPEC_SGL_DESCR_TYPE_BIT_BUCKET = 1
+XNVME_SPEC_SGL_DESCR_TYPE_DATA_BLOCK = 0
+XNVME_SPEC_SGL_DESCR_TYPE_KEYED_DATA_BLOCK = 4
+XNVME_SPEC_SGL_DESCR_TYPE_LAST_SEGMENT = 3
+XNVME_SPEC_SGL_DESCR_TYPE_SEGMENT = 2
+XNVME_SPEC_SGL_DESCR_TYPE_VENDOR_SPECIFIC = 15
+XNVME_SPEC_ZND_CMD_MGMT_RECV_ACTION_REPORT = 0
+XNVME_SPEC_ZND_CMD_MGMT_RECV_ACTION_REPORT_EXTENDED = 1
+XNVME_SPEC_ZND_CMD_MGMT_RECV_SF_ALL = 0
+XNVME_SPEC_ZND_CMD_MGMT_RECV_SF_CLOSED = 4
+XNVME_SPEC_ZND_CMD_MGMT_RECV_SF_EMPTY = 1
+XNVME_SPEC_ZND_CMD_MGMT_RECV_SF_EOPEN = 3
+XNVME_SPEC_ZND_CMD_MGMT_RECV_SF_FULL = 5
+XNVME_SPEC_ZND_CMD_MGMT_RECV_SF_IOPEN = 2
+XNVME_SPEC_ZND_CMD_MGMT_RECV_SF_OFFLINE = 7
+XNVME_SPEC_ZND_CMD_MGMT_RECV_SF_RONLY = 6
+XNVME_SPEC_ZND_CMD_MGMT_SEND_CLOSE = 1
+XNVME_SPEC_ZND_CMD_MGMT_SEND_DESCRIPTOR = 16
+XNVME_SPEC_ZND_CMD_MGMT_SEND_FINISH = 2
+XNVME_SPEC_ZND_CMD_MGMT_SEND_FLUSH = 17
+XNVME_SPEC_ZND_CMD_MGMT_SEND_OFFLINE = 5
+XNVME_SPEC_ZND_CMD_MGMT_SEND_OPEN = 3
+XNVME_SPEC_ZND_CMD_MGMT_SEND_RESET = 4
+XNVME_SPEC_ZND_MGMT_OPEN_WITH_ZRWA = 1
+XNVME_SPEC_ZND_OPC_APPEND = 125
+XNVME_SPEC_ZND_OPC_MGMT_RECV = 122
+XNVME_SPEC_ZND_OPC_MGMT_SEND = 121
+XNVME_SPEC_ZND_SC_BOUNDARY_ERROR = 184
+XNVME_SPEC_ZND_SC_INVALID_FORMAT = 127
+XNVME_SPEC_ZND_SC_INVALID_TRANS = 191
+XNVME_SPEC_ZND_SC_INVALID_WRITE = 188
+XNVME_SPEC_ZND_SC_INVALID_ZONE_OP = 182
+XNVME_SPEC_ZND_SC_IS_FULL = 185
+XNVME_SPEC_ZND_SC_IS_OFFLINE = 187
+XNVME_SPEC_ZND_SC_IS_READONLY = 186
+XNVME_SPEC_ZND_SC_NOZRWA = 183
+XNVME_SPEC_ZND_SC_TOO_MANY_ACTIVE = 189
+XNVME_SPEC_ZND_SC_TOO_MANY_OPEN = 190
+XNVME_SPEC_ZND_STATE_CLOSED = 4
+XNVME_SPEC_ZND_STATE_EMPTY = 1
+XNVME_SPEC_ZND_STATE_EOPEN = 3
+XNVME_SPEC_ZND_STATE_FULL = 14
+XNVME_SPEC_ZND_STATE_IOPEN = 2
+XNVME_SPEC_ZND_STATE_OFFLINE = 15
+XNVME_SPEC_ZND_STATE_RONLY = 13
+XNVME_SPEC_ZND_TYPE_SEQWR = 2
+XNVME_STATUS_CODE_TYPE_CMDSPEC = 1
+XNVME_STATUS_CODE_TYPE_GENERIC = 0
+XNVME_STATUS_CODE_TYPE_MEDIA = 2
+XNVME_STATUS_CODE_TYPE_PATH = 3
+XNVME_STATUS_CODE_TYPE_VENDOR = 7
+XNVME_UNIVERSAL_SECT_SH = 9
+ZND_CHANGES_LEN = 511
+
+xnvme_enumerate_action = {
+    0: "XNVME_ENUMERATE_DEV_KEEP_OPEN",
+    1: "XNVME_ENUMERATE_DEV_CLOSE",
+}
+xnvme_geo_type = {
+    0: "XNVME_GEO_UNKNOWN",
+    1: "XNVME_GEO_CONVENTIONAL",
+    2: "XNVME_GEO_ZONED",
+}
+xnvme_nvm_scopy_fmt = {
+    1: "XNVME_NVM_SCOPY_FMT_ZERO",
+    256: "XNVME_NVM_SCOPY_FMT_SRCLEN",
+}
+xnvme_nvme_sgl_descriptor_type = {
+    0: "XNVME_SPEC_SGL_DESCR_TYPE_DATA_BLOCK",
+    1: "XNVME_SPEC_SGL_DESCR_TYPE_BIT_BUCKET",
+    2: "XNVME_SPEC_SGL_DESCR_TYPE_SEGMENT",
+    3: "XNVME_SPEC_SGL_DESCR_TYPE_LAST_SEGMENT",
+    4: "XNVME_SPEC_SGL_DESCR_TYPE_KEYED_DATA_BLOCK",
+    15: "XNVME_SPEC_SGL_DESCR_TYPE_VENDOR_SPECIFIC",
+}
+xnvme_pr = {
+    0: "XNVME_PR_DEF",
+    1: "XNVME_PR_YAML",
+    2: "XNVME_PR_TERSE",
+}
+xnvme_queue_opts = {
+    1: "XNVME_QUEUE_IOPOLL",
+    2: "XNVME_QUEUE_SQPOLL",
+}
+xnvme_spec_adm_opc = {
+    2: "XNVME_SPEC_ADM_OPC_LOG",
+    6: "XNVME_SPEC_ADM_OPC_IDFY",
+    9: "XNVME_SPEC_ADM_OPC_SFEAT",
+    10: "XNVME_SPEC_ADM_OPC_GFEAT",
+}
+xnvme_spec_csi = {
+    0: "XNVME_SPEC_CSI_NVM",
+    2: "XNVME_SPEC_CSI_ZONED",
+}
+xnvme_spec_feat_id = {
+    1: "XNVME_SPEC_FEAT_ARBITRATION",
+    2: "XNVME_SPEC_FEAT_PWR_MGMT",
+    3: "XNVME_SPEC_FEAT_LBA_RANGETYPE",
+    4: "XNVME_SPEC_FEAT_TEMP_THRESHOLD",
+    5: "XNVME_SPEC_FEAT_ERROR_RECOVERY",
+    6: "XNVME_SPEC_FEAT_VWCACHE",
+    7: "XNVME_SPEC_FEAT_NQUEUES",
+}
+xnvme_spec_feat_sel = {
+    0: "XNVME_SPEC_FEAT_SEL_CURRENT",
+    1: "XNVME_SPEC_FEAT_SEL_DEFAULT",
+    2: "XNVME_SPEC_FEAT_SEL_SAVED",
+    3: "XNVME_SPEC_FEAT_SEL_SUPPORTED",
+}
+xnvme_spec_flag = {
+    32768: "XNVME_SPEC_FLAG_LIMITED_RETRY",
+    16384: "XNVME_SPEC_FLAG_FORCE_UNIT_ACCESS",
+    1024: "XNVME_SPEC_FLAG_PRINFO_PRCHK_REF",
+    2048: "XNVME_SPEC_FLAG_PRINFO_PRCHK_APP",
+    4096: "XNVME_SPEC_FLAG_PRINFO_PRCHK_GUARD",
+    8192: "XNVME_SPEC_FLAG_PRINFO_PRACT",
+}
+xnvme_spec_fs_opcs = {
+    173: "XNVME_SPEC_FS_OPC_FLUSH",
+    172: "XNVME_SPEC_FS_OPC_WRITE",
+    220: "XNVME_SPEC_FS_OPC_READ",
+}
+xnvme_spec_idfy_cns = {
+    0: "XNVME_SPEC_IDFY_NS",
+    1: "XNVME_SPEC_IDFY_CTRLR",
+    2: "XNVME_SPEC_IDFY_NSLIST",
+    3: "XNVME_SPEC_IDFY_NSDSCR",
+    4: "XNVME_SPEC_IDFY_SETL",
+    5: "XNVME_SPEC_IDFY_NS_IOCS",
+    6: "XNVME_SPEC_IDFY_CTRLR_IOCS",
+    7: "XNVME_SPEC_IDFY_NSLIST_IOCS",
+    16: "XNVME_SPEC_IDFY_NSLIST_ALLOC",
+    17: "XNVME_SPEC_IDFY_NS_ALLOC",
+    18: "XNVME_SPEC_IDFY_CTRLR_NS",
+    19: "XNVME_SPEC_IDFY_CTRLR_SUB",
+    20: "XNVME_SPEC_IDFY_CTRLR_PRI",
+    21: "XNVME_SPEC_IDFY_CTRLR_SEC",
+    22: "XNVME_SPEC_IDFY_NSGRAN",
+    23: "XNVME_SPEC_IDFY_UUIDL",
+    26: "XNVME_SPEC_IDFY_NSLIST_ALLOC_IOCS",
+    27: "XNVME_SPEC_IDFY_NS_ALLOC_IOCS",
+    28: "XNVME_SPEC_IDFY_IOCS",
+}
+xnvme_spec_log_lpi = {
+    0: "XNVME_SPEC_LOG_RSVD",
+    1: "XNVME_SPEC_LOG_ERRI",
+    2: "XNVME_SPEC_LOG_HEALTH",
+    3: "XNVME_SPEC_LOG_FW",
+    4: "XNVME_SPEC_LOG_CHNS",
+    5: "XNVME_SPEC_LOG_CSAE",
+    6: "XNVME_SPEC_LOG_SELFTEST",
+    7: "XNVME_SPEC_LOG_TELEHOST",
+    8: "XNVME_SPEC_LOG_TELECTRLR",
+}
+xnvme_spec_nvm_cmd_cpl_sc = {
+    130: "XNVME_SPEC_NVM_CMD_CPL_SC_WRITE_TO_RONLY",
+}
+xnvme_spec_nvm_opc = {
+    0: "XNVME_SPEC_NVM_OPC_FLUSH",
+    1: "XNVME_SPEC_NVM_OPC_WRITE",
+    2: "XNVME_SPEC_NVM_OPC_READ",
+    4: "XNVME_SPEC_NVM_OPC_WRITE_UNCORRECTABLE",
+    8: "XNVME_SPEC_NVM_OPC_WRITE_ZEROES",
+    25: "XNVME_SPEC_NVM_OPC_SCOPY",
+    128: "XNVME_SPEC_NVM_OPC_FMT",
+    132: "XNVME_SPEC_NVM_OPC_SANITIZE",
+}
+xnvme_spec_psdt = {
+    0: "XNVME_SPEC_PSDT_PRP",
+    1: "XNVME_SPEC_PSDT_SGL_MPTR_CONTIGUOUS",
+    2: "XNVME_SPEC_PSDT_SGL_MPTR_SGL",
+}
+xnvme_spec_sgl_descriptor_subtype = {
+    0: "XNVME_SPEC_SGL_DESCR_SUBTYPE_ADDRESS",
+    1: "XNVME_SPEC_SGL_DESCR_SUBTYPE_OFFSET",
+}
+xnvme_spec_status_code_type = {
+    0: "XNVME_STATUS_CODE_TYPE_GENERIC",
+    1: "XNVME_STATUS_CODE_TYPE_CMDSPEC",
+    2: "XNVME_STATUS_CODE_TYPE_MEDIA",
+    3: "XNVME_STATUS_CODE_TYPE_PATH",
+    7: "XNVME_STATUS_CODE_TYPE_VENDOR",
+}
+xnvme_spec_znd_cmd_mgmt_recv_action = {
+    0: "XNVME_SPEC_ZND_CMD_MGMT_RECV_ACTION_REPORT",
+    1: "XNVME_SPEC_ZND_CMD_MGMT_RECV_ACTION_REPORT_EXTENDED",
+}
+xnvme_spec_znd_cmd_mgmt_recv_action_sf = {
+    0: "XNVME_SPEC_ZND_CMD_MGMT_RECV_SF_ALL",
+    1: "XNVME_SPEC_ZND_CMD_MGMT_RECV_SF_EMPTY",
+    2: "XNVME_SPEC_ZND_CMD_MGMT_RECV_SF_IOPEN",
+    3: "XNVME_SPEC_ZND_CMD_MGMT_RECV_SF_EOPEN",
+    4: "XNVME_SPEC_ZND_CMD_MGMT_RECV_SF_CLOSED",
+    5: "XNVME_SPEC_ZND_CMD_MGMT_RECV_SF_FULL",
+    6: "XNVME_SPEC_ZND_CMD_MGMT_RECV_SF_RONLY",
+    7: "XNVME_SPEC_ZND_CMD_MGMT_RECV_SF_OFFLINE",
+}
+xnvme_spec_znd_cmd_mgmt_send_action = {
+    1: "XNVME_SPEC_ZND_CMD_MGMT_SEND_CLOSE",
+    2: "XNVME_SPEC_ZND_CMD_MGMT_SEND_FINISH",
+    3: "XNVME_SPEC_ZND_CMD_MGMT_SEND_OPEN",
+    4: "XNVME_SPEC_ZND_CMD_MGMT_SEND_RESET",
+    5: "XNVME_SPEC_ZND_CMD_MGMT_SEND_OFFLINE",
+    16: "XNVME_SPEC_ZND_CMD_MGMT_SEND_DESCRIPTOR",
+    17: "XNVME_SPEC_ZND_CMD_MGMT_SEND_FLUSH",
+}
+xnvme_spec_znd_log_lid = {
+    191: "XNVME_SPEC_LOG_ZND_CHANGES",
+}
+xnvme_spec_znd_mgmt_send_action_so = {
+    1: "XNVME_SPEC_ZND_MGMT_OPEN_WITH_ZRWA",
+}
+xnvme_spec_znd_opc = {
+    121: "XNVME_SPEC_ZND_OPC_MGMT_SEND",
+    122: "XNVME_SPEC_ZND_OPC_MGMT_RECV",
+    125: "XNVME_SPEC_ZND_OPC_APPEND",
+}
+xnvme_spec_znd_state = {
+    1: "XNVME_SPEC_ZND_STATE_EMPTY",
+    2: "XNVME_SPEC_ZND_STATE_IOPEN",
+    3: "XNVME_SPEC_ZND_STATE_EOPEN",
+    4: "XNVME_SPEC_ZND_STATE_CLOSED",
+    13: "XNVME_SPEC_ZND_STATE_RONLY",
+    14: "XNVME_SPEC_ZND_STATE_FULL",
+    15: "XNVME_SPEC_ZND_STATE_OFFLINE",
+}
+xnvme_spec_znd_status_code = {
+    127: "XNVME_SPEC_ZND_SC_INVALID_FORMAT",
+    182: "XNVME_SPEC_ZND_SC_INVALID_ZONE_OP",
+    183: "XNVME_SPEC_ZND_SC_NOZRWA",
+    184: "XNVME_SPEC_ZND_SC_BOUNDARY_ERROR",
+    185: "XNVME_SPEC_ZND_SC_IS_FULL",
+    186: "XNVME_SPEC_ZND_SC_IS_READONLY",
+    187: "XNVME_SPEC_ZND_SC_IS_OFFLINE",
+    188: "XNVME_SPEC_ZND_SC_INVALID_WRITE",
+    189: "XNVME_SPEC_ZND_SC_TOO_MANY_ACTIVE",
+    190: "XNVME_SPEC_ZND_SC_TOO_MANY_OPEN",
+    191: "XNVME_SPEC_ZND_SC_INVALID_TRANS",
+}
+xnvme_spec_znd_type = {
+    2: "XNVME_SPEC_ZND_TYPE_SEQWR",
+}
+
+
+class __xnvme_opts_0_0(ctypes.Structure):
+    pass
+
+class __xnvme_spec_cmd_common_0_0(ctypes.Structure):
+    pass
+
+class __xnvme_spec_cmd_common_0_1(ctypes.Structure):
+    pass
+
+class __xnvme_spec_cmd_gfeat_0_0(ctypes.Structure):
+    pass
+
+class __xnvme_spec_cmd_sfeat_0_0(ctypes.Structure):
+    pass
+
+class __xnvme_spec_cpl_0_0(ctypes.Structure):
+    pass
+
+class __xnvme_spec_cs_vector_0_0(ctypes.Structure):
+    pass
+
+class __xnvme_spec_feat_0_0(ctypes.Structure):
+    pass
+
+class __xnvme_spec_feat_0_1(ctypes.Structure):
+    pass
+
+class __xnvme_spec_feat_0_2(ctypes.Structure):
+    pass
+
+class __xnvme_spec_idfy_ctrlr_0_0(ctypes.Structure):
+    pass
+
+class __xnvme_spec_idfy_ctrlr_10_0(ctypes.Structure):
+    pass
+
+class __xnvme_spec_idfy_ctrlr_11_0(ctypes.Structure):
+    pass
+
+class __xnvme_spec_idfy_ctrlr_12_0(ctypes.Structure):
+    pass
+
+class __xnvme_spec_idfy_ctrlr_13_0(ctypes.Structure):
+    pass
+
+class __xnvme_spec_idfy_ctrlr_14_0(ctypes.Structure):
+    pass
+
+class __xnvme_spec_idfy_ctrlr_15_0(ctypes.Structure):
+    pass
+
+class __xnvme_spec_idfy_ctrlr_16_0(ctypes.Structure):
+    pass
+
+class __xnvme_spec_idfy_ctrlr_17_0(ctypes.Structure):
+    pass
+
+class __xnvme_spec_idfy_ctrlr_18_0(ctypes.Structure):
+    pass
+
+class __xnvme_spec_idfy_ctrlr_1_0(ctypes.Structure):
+    pass
+
+class __xnvme_spec_idfy_ctrlr_2_0(ctypes.Structure):
+    pass
+
+class __xnvme_spec_idfy_ctrlr_3_0(ctypes.Structure):
+    pass
+
+class __xnvme_spec_idfy_ctrlr_4_0(ctypes.Structure):
+    pass
+
+class __xnvme_spec_idfy_ctrlr_5_0(ctypes.Structure):
+    pass
+
+class __xnvme_spec_idfy_ctrlr_6_0(ctypes.Structure):
+    pass
+
+class __xnvme_spec_idfy_ctrlr_7_0(ctypes.Structure):
+    pass
+
+class __xnvme_spec_idfy_ctrlr_8_0(ctypes.Structure):
+    pass
+
+class __xnvme_spec_idfy_ctrlr_9_0(ctypes.Structure):
+    pass
+
+class __xnvme_spec_idfy_ns_3_0(ctypes.Structure):
+    pass
+
+class __xnvme_spec_idfy_ns_4_0(ctypes.Structure):
+    pass
+
+class __xnvme_spec_idfy_ns_6_0(ctypes.Structure):
+    pass
+
+class __xnvme_spec_idfy_ns_7_0(ctypes.Structure):
+    pass
+
+class __xnvme_spec_idfy_ns_8_0(ctypes.Structure):
+    pass
+
+class __xnvme_spec_nvm_idfy_ctrlr_0_0(ctypes.Structure):
+    pass
+
+class __xnvme_spec_nvm_idfy_ctrlr_1_0(ctypes.Structure):
+    pass
+
+class __xnvme_spec_sgl_descriptor_0_0(ctypes.Structure):
+    pass
+
+class __xnvme_spec_sgl_descriptor_0_1(ctypes.Structure):
+    pass
+
+class __xnvme_spec_status_0_0(ctypes.Structure):
+    pass
+
+class __xnvme_spec_znd_descr_0_0(ctypes.Structure):
+    pass
+
+class __xnvme_spec_znd_idfy_ns_0_0(ctypes.Structure):
+    pass
+
+class __xnvme_spec_znd_idfy_ns_1_0(ctypes.Structure):
+    pass
+
+class __xnvme_spec_znd_idfy_ns_2_0(ctypes.Structure):
+    pass
+
+class _xnvme_cmd_ctx_0(ctypes.Structure):
+    pass
+
+class _xnvme_lba_range_0(ctypes.Structure):
+    pass
+
+class _xnvme_opts_0(ctypes.Union):
+    pass
+
+class _xnvme_opts_1(ctypes.Structure):
+    pass
+
+class _xnvme_spec_cmd_0(ctypes.Union):
+    pass
+
+class _xnvme_spec_cmd_common_0(ctypes.Union):
+    pass
+
+class _xnvme_spec_cmd_gfeat_0(ctypes.Union):
+    pass
+
+class _xnvme_spec_cmd_sfeat_0(ctypes.Union):
+    pass
+
+class _xnvme_spec_cpl_0(ctypes.Union):
+    pass
+
+class _xnvme_spec_cs_vector_0(ctypes.Union):
+    pass
+
+class _xnvme_spec_feat_0(ctypes.Union):
+    pass
+
+class _xnvme_spec_fs_idfy_ctrlr_0(ctypes.Structure):
+    pass
+
+class _xnvme_spec_fs_idfy_ctrlr_1(ctypes.Structure):
+    pass
+
+class _xnvme_spec_fs_idfy_ctrlr_2(ctypes.Structure):
+    pass
+
+class _xnvme_spec_fs_idfy_ctrlr_3(ctypes.Structure):
+    pass
+
+class _xnvme_spec_idfy_0(ctypes.Union):
+    pass
+
+class _xnvme_spec_idfy_ctrlr_0(ctypes.Union):
+    pass
+
+class _xnvme_spec_idfy_ctrlr_1(ctypes.Union):
+    pass
+
+class _xnvme_spec_idfy_ctrlr_10(ctypes.Union):
+    pass
+
+class _xnvme_spec_idfy_ctrlr_11(ctypes.Union):
+    pass
+
+class _xnvme_spec_idfy_ctrlr_12(ctypes.Union):
+    pass
+
+class _xnvme_spec_idfy_ctrlr_13(ctypes.Union):
+    pass
+
+class _xnvme_spec_idfy_ctrlr_14(ctypes.Union):
+    pass
+
+class _xnvme_spec_idfy_ctrlr_15(ctypes.Union):
+    pass
+
+class _xnvme_spec_idfy_ctrlr_16(ctypes.Union):
+    pass
+
+class _xnvme_spec_idfy_ctrlr_17(ctypes.Union):
+    pass
+
+class _xnvme_spec_idfy_ctrlr_18(ctypes.Structure):
+    pass
+
+class _xnvme_spec_idfy_ctrlr_2(ctypes.Union):
+    pass
+
+class _xnvme_spec_idfy_ctrlr_3(ctypes.Union):
+    pass
+
+class _xnvme_spec_idfy_ctrlr_4(ctypes.Union):
+    pass
+
+class _xnvme_spec_idfy_ctrlr_5(ctypes.Union):
+    pass
+
+class _xnvme_spec_idfy_ctrlr_6(ctypes.Union):
+    pass
+
+class _xnvme_spec_idfy_ctrlr_7(ctypes.Union):
+    pass
+
+class _xnvme_spec_idfy_ctrlr_8(ctypes.Union):
+    pass
+
+class _xnvme_spec_idfy_ctrlr_9(ctypes.Union):
+    pass
+
+class _xnvme_spec_idfy_ns_0(ctypes.Structure):
+    pass
+
+class _xnvme_spec_idfy_ns_1(ctypes.Structure):
+    pass
+
+class _xnvme_spec_idfy_ns_2(ctypes.Structure):
+    pass
+
+class _xnvme_spec_idfy_ns_3(ctypes.Union):
+    pass
+
+class _xnvme_spec_idfy_ns_4(ctypes.Union):
+    pass
+
+class _xnvme_spec_idfy_ns_5(ctypes.Structure):
+    pass
+
+class _xnvme_spec_idfy_ns_6(ctypes.Union):
+    pass
+
+class _xnvme_spec_idfy_ns_7(ctypes.Union):
+    pass
+
+class _xnvme_spec_idfy_ns_8(ctypes.Union):
+    pass
+
+class _xnvme_spec_nvm_cmd_0(ctypes.Union):
+    pass
+
+class _xnvme_spec_nvm_idfy_0(ctypes.Union):
+    pass
+
+class _xnvme_spec_nvm_idfy_ctrlr_0(ctypes.Union):
+    pass
+
+class _xnvme_spec_nvm_idfy_ctrlr_1(ctypes.Union):
+    pass
+
+class _xnvme_spec_sgl_descriptor_0(ctypes.Union):
+    pass
+
+class _xnvme_spec_status_0(ctypes.Union):
+    pass
+
+class _xnvme_spec_vs_register_0(ctypes.Structure):
+    pass
+
+class _xnvme_spec_znd_cmd_0(ctypes.Union):
+    pass
+
+class _xnvme_spec_znd_descr_0(ctypes.Union):
+    pass
+
+class _xnvme_spec_znd_idfy_0(ctypes.Union):
+    pass
+
+class _xnvme_spec_znd_idfy_ns_0(ctypes.Union):
+    pass
+
+class _xnvme_spec_znd_idfy_ns_1(ctypes.Union):
+    pass
+
+class _xnvme_spec_znd_idfy_ns_2(ctypes.Union):
+    pass
+
+class xnvme_be_attr(ctypes.Structure):
+    """struct xnvme_be_attr"""
+
+class xnvme_be_attr_list(ctypes.Structure):
+    """struct xnvme_be_attr_list"""
+
+class xnvme_cmd_ctx(ctypes.Structure):
+    """struct xnvme_cmd_ctx"""
+
+class xnvme_geo(ctypes.Structure):
+    """struct xnvme_geo"""
+
+class xnvme_ident(ctypes.Structure):
+    """struct xnvme_ident"""
+
+class xnvme_lba_range(ctypes.Structure):
+    """struct xnvme_lba_range"""
+
+class xnvme_opts(ctypes.Structure):
+    """struct xnvme_opts"""
+
+class xnvme_spec_cmd(ctypes.Structure):
+    """struct xnvme_spec_cmd"""
+
+class xnvme_spec_cmd_common(ctypes.Structure):
+    """struct xnvme_spec_cmd_common"""
+
+class xnvme_spec_cmd_format(ctypes.Structure):
+    """struct xnvme_spec_cmd_format"""
+
+class xnvme_spec_cmd_gfeat(ctypes.Structure):
+    """struct xnvme_spec_cmd_gfeat"""
+
+class xnvme_spec_cmd_idfy(ctypes.Structure):
+    """struct xnvme_spec_cmd_idfy"""
+
+class xnvme_spec_cmd_log(ctypes.Structure):
+    """struct xnvme_spec_cmd_log"""
+
+class xnvme_spec_cmd_nvm(ctypes.Structure):
+    """struct xnvme_spec_cmd_nvm"""
+
+class xnvme_spec_cmd_sanitize(ctypes.Structure):
+    """struct xnvme_spec_cmd_sanitize"""
+
+class xnvme_spec_cmd_sfeat(ctypes.Structure):
+    """struct xnvme_spec_cmd_sfeat"""
+
+class xnvme_spec_cpl(ctypes.Structure):
+    """struct xnvme_spec_cpl"""
+
+class xnvme_spec_cs_vector(ctypes.Structure):
+    """struct xnvme_spec_cs_vector"""
+
+class xnvme_spec_ctrlr_bar(ctypes.Structure):
+    """struct xnvme_spec_ctrlr_bar"""
+
+class xnvme_spec_dsm_range(ctypes.Structure):
+    """struct xnvme_spec_dsm_range"""
+
+class xnvme_spec_feat(ctypes.Structure):
+    """struct xnvme_spec_feat"""
+
+class xnvme_spec_fs_idfy_ctrlr(ctypes.Structure):
+    """struct xnvme_spec_fs_idfy_ctrlr"""
+
+class xnvme_spec_fs_idfy_ns(ctypes.Structure):
+    """struct xnvme_spec_fs_idfy_ns"""
+
+class xnvme_spec_idfy(ctypes.Structure):
+    """struct xnvme_spec_idfy"""
+
+class xnvme_spec_idfy_cs(ctypes.Structure):
+    """struct xnvme_spec_idfy_cs"""
+
+class xnvme_spec_idfy_ctrlr(ctypes.Structure):
+    """struct xnvme_spec_idfy_ctrlr"""
+
+class xnvme_spec_idfy_ns(ctypes.Structure):
+    """struct xnvme_spec_idfy_ns"""
+
+class xnvme_spec_lbaf(ctypes.Structure):
+    """struct xnvme_spec_lbaf"""
+
+class xnvme_spec_log_erri_entry(ctypes.Structure):
+    """struct xnvme_spec_log_erri_entry"""
+
+class xnvme_spec_log_health_entry(ctypes.Structure):
+    """struct xnvme_spec_log_health_entry"""
+
+class xnvme_spec_nvm_cmd(ctypes.Structure):
+    """struct xnvme_spec_nvm_cmd"""
+
+class xnvme_spec_nvm_cmd_scopy(ctypes.Structure):
+    """struct xnvme_spec_nvm_cmd_scopy"""
+
+class xnvme_spec_nvm_cmd_scopy_fmt_srclen(ctypes.Structure):
+    """struct xnvme_spec_nvm_cmd_scopy_fmt_srclen"""
+
+class xnvme_spec_nvm_idfy(ctypes.Structure):
+    """struct xnvme_spec_nvm_idfy"""
+
+class xnvme_spec_nvm_idfy_ctrlr(ctypes.Structure):
+    """struct xnvme_spec_nvm_idfy_ctrlr"""
+
+class xnvme_spec_nvm_idfy_ns(ctypes.Structure):
+    """struct xnvme_spec_nvm_idfy_ns"""
+
+class xnvme_spec_nvm_scopy_fmt_zero(ctypes.Structure):
+    """struct xnvme_spec_nvm_scopy_fmt_zero"""
+
+class xnvme_spec_nvm_scopy_source_range(ctypes.Structure):
+    """struct xnvme_spec_nvm_scopy_source_range"""
+
+class xnvme_spec_nvm_write_zeroes(ctypes.Structure):
+    """struct xnvme_spec_nvm_write_zeroes"""
+
+class xnvme_spec_power_state(ctypes.Structure):
+    """struct xnvme_spec_power_state"""
+
+class xnvme_spec_sgl_descriptor(ctypes.Structure):
+    """struct xnvme_spec_sgl_descriptor"""
+
+class xnvme_spec_status(ctypes.Structure):
+    """struct xnvme_spec_status"""
+
+class xnvme_spec_vs_register(ctypes.Union):
+    """union xnvme_spec_vs_register"""
+
+class xnvme_spec_znd_cmd(ctypes.Structure):
+    """struct xnvme_spec_znd_cmd"""
+
+class xnvme_spec_znd_cmd_append(ctypes.Structure):
+    """struct xnvme_spec_znd_cmd_append"""
+
+class xnvme_spec_znd_cmd_mgmt_recv(ctypes.Structure):
+    """struct xnvme_spec_znd_cmd_mgmt_recv"""
+
+class xnvme_spec_znd_cmd_mgmt_send(ctypes.Structure):
+    """struct xnvme_spec_znd_cmd_mgmt_send"""
+
+class xnvme_spec_znd_descr(ctypes.Structure):
+    """struct xnvme_spec_znd_descr"""
+
+class xnvme_spec_znd_idfy(ctypes.Structure):
+    """struct xnvme_spec_znd_idfy"""
+
+class xnvme_spec_znd_idfy_ctrlr(ctypes.Structure):
+    """struct xnvme_spec_znd_idfy_ctrlr"""
+
+class xnvme_spec_znd_idfy_lbafe(ctypes.Structure):
+    """struct xnvme_spec_znd_idfy_lbafe"""
+
+class xnvme_spec_znd_idfy_ns(ctypes.Structure):
+    """struct xnvme_spec_znd_idfy_ns"""
+
+class xnvme_spec_znd_log_changes(ctypes.Structure):
+    """struct xnvme_spec_znd_log_changes"""
+
+class xnvme_spec_znd_report_hdr(ctypes.Structure):
+    """struct xnvme_spec_znd_report_hdr"""
+
+class xnvme_timer(ctypes.Structure):
+    """struct xnvme_timer"""
+
+class xnvme_znd_report(ctypes.Structure):
+    """struct xnvme_znd_report"""
+
+xnvme_enumerate_cb = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p, ctypes.c_void_p)
+xnvme_queue_cb = ctypes.CFUNCTYPE(None, ctypes.POINTER(xnvme_cmd_ctx), ctypes.c_void_p)
+
+
+__xnvme_opts_0_0._fields_ = [
+    ("rdonly", ctypes.c_uint32, 1),
+    ("wronly", ctypes.c_uint32, 1),
+    ("rdwr", ctypes.c_uint32, 1),
+    ("create", ctypes.c_uint32, 1),
+    ("truncate", ctypes.c_uint32, 1),
+    ("direct", ctypes.c_uint32, 1),
+    ("_rsvd", ctypes.c_uint32, 26),
+]
+
+__xnvme_spec_cmd_common_0_0._fields_ = [
+    ("prp1", ctypes.c_uint64),
+    ("prp2", ctypes.c_uint64),
+]
+
+__xnvme_spec_cmd_common_0_1._fields_ = [
+    ("data", ctypes.c_uint64),
+    ("metadata_len", ctypes.c_uint32),
+    ("data_len", ctypes.c_uint32),
+]
+
+__xnvme_spec_cmd_gfeat_0_0._fields_ = [
+    ("fid", ctypes.c_uint32, 8),
+    ("sel", ctypes.c_uint32, 3),
+    ("rsvd10", ctypes.c_uint32, 21),
+]
+
+__xnvme_spec_cmd_sfeat_0_0._fields_ = [
+    ("fid", ctypes.c_uint32, 8),
+    ("rsvd10", ctypes.c_uint32, 23),
+    ("save", ctypes.c_uint32, 1),
+]
+
+__xnvme_spec_cpl_0_0._fields_ = [
+    ("cdw0", ctypes.c_uint32),
+    ("rsvd1", ctypes.c_uint32),
+]
+
+__xnvme_spec_cs_vector_0_0._fields_ = [
+    ("nvm", ctypes.c_uint64, 1),
+    ("rsvd1", ctypes.c_uint64, 1),
+    ("zns", ctypes.c_uint64, 1),
+    ("rsvd", ctypes.c_uint64, 61),
+]
+
+__xnvme_spec_feat_0_0._fields_ = [
+    ("tmpth", ctypes.c_uint32, 16),
+    ("tmpsel", ctypes.c_uint32, 4),
+    ("thsel", ctypes.c_uint32, 3),
+]
+
+__xnvme_spec_feat_0_1._fields_ = [
+    ("tler", ctypes.c_uint32, 16),
+    ("dulbe", ctypes.c_uint32, 1),
+    ("rsvd", ctypes.c_uint32, 15),
+]
+
+__xnvme_spec_feat_0_2._fields_ = [
+    ("nsqa", ctypes.c_uint32, 16),
+    ("ncqa", ctypes.c_uint32, 16),
+]
+
+__xnvme_spec_idfy_ctrlr_0_0._fields_ = [
+    ("multi_port", ctypes.c_uint8, 1),
+    ("multi_host", ctypes.c_uint8, 1),
+    ("sr_iov", ctypes.c_uint8, 1),
+    ("reserved", ctypes.c_uint8, 5),
+]
+
+__xnvme_spec_idfy_ctrlr_10_0._fields_ = [
+    ("supported", ctypes.c_uint16, 1),
+    ("reserved", ctypes.c_uint16, 15),
+]
+
+__xnvme_spec_idfy_ctrlr_11_0._fields_ = [
+    ("crypto_erase", ctypes.c_uint32, 1),
+    ("block_erase", ctypes.c_uint32, 1),
+    ("overwrite", ctypes.c_uint32, 1),
+    ("reserved", ctypes.c_uint32, 29),
+]
+
+__xnvme_spec_idfy_ctrlr_12_0._fields_ = [
+    ("min", ctypes.c_uint8, 4),
+    ("max", ctypes.c_uint8, 4),
+]
+
+__xnvme_spec_idfy_ctrlr_13_0._fields_ = [
+    ("min", ctypes.c_uint8, 4),
+    ("max", ctypes.c_uint8, 4),
+]
+
+__xnvme_spec_idfy_ctrlr_14_0._fields_ = [
+    ("compare", ctypes.c_uint16, 1),
+    ("write_unc", ctypes.c_uint16, 1),
+    ("dsm", ctypes.c_uint16, 1),
+    ("write_zeroes", ctypes.c_uint16, 1),
+    ("set_features_save", ctypes.c_uint16, 1),
+    ("reservations", ctypes.c_uint16, 1),
+    ("timestamp", ctypes.c_uint16, 1),
+    ("reserved", ctypes.c_uint16, 9),
+]
+
+__xnvme_spec_idfy_ctrlr_15_0._fields_ = [
+    ("format_all_ns", ctypes.c_uint8, 1),
+    ("erase_all_ns", ctypes.c_uint8, 1),
+    ("crypto_erase_supported", ctypes.c_uint8, 1),
+    ("reserved", ctypes.c_uint8, 5),
+]
+
+__xnvme_spec_idfy_ctrlr_16_0._fields_ = [
+    ("present", ctypes.c_uint8, 1),
+    ("flush_broadcast", ctypes.c_uint8, 2),
+    ("reserved", ctypes.c_uint8, 5),
+]
+
+__xnvme_spec_idfy_ctrlr_17_0._fields_ = [
+    ("supported", ctypes.c_uint32, 2),
+    ("keyed_sgl", ctypes.c_uint32, 1),
+    ("reserved1", ctypes.c_uint32, 13),
+    ("bit_bucket_descriptor", ctypes.c_uint32, 1),
+    ("metadata_pointer", ctypes.c_uint32, 1),
+    ("oversized_sgl", ctypes.c_uint32, 1),
+    ("metadata_address", ctypes.c_uint32, 1),
+    ("sgl_offset", ctypes.c_uint32, 1),
+    ("transport_sgl", ctypes.c_uint32, 1),
+    ("reserved2", ctypes.c_uint32, 10),
+]
+
+__xnvme_spec_idfy_ctrlr_18_0._fields_ = [
+    ("ctrlr_model", ctypes.c_uint8, 1),
+    ("reserved", ctypes.c_uint8, 7),
+]
+
+__xnvme_spec_idfy_ctrlr_1_0._fields_ = [
+    ("reserved1", ctypes.c_uint32, 8),
+    ("ns_attribute_notices", ctypes.c_uint32, 1),
+    ("fw_activation_notices", ctypes.c_uint32, 1),
+    ("reserved2", ctypes.c_uint32, 17),
+    ("zone_changes", ctypes.c_uint32, 1),
+    ("reserved3", ctypes.c_uint32, 4),
+]
+
+__xnvme_spec_idfy_ctrlr_2_0._fields_ = [
+    ("host_id_exhid_supported", ctypes.c_uint32, 1),
+    ("non_operational_power_state_permissive_mode", ctypes.c_uint32, 1),
+    ("reserved", ctypes.c_uint32, 30),
+]
+
+__xnvme_spec_idfy_ctrlr_3_0._fields_ = [
+    ("security", ctypes.c_uint16, 1),
+    ("format", ctypes.c_uint16, 1),
+    ("firmware", ctypes.c_uint16, 1),
+    ("ns_manage", ctypes.c_uint16, 1),
+    ("device_self_test", ctypes.c_uint16, 1),
+    ("directives", ctypes.c_uint16, 1),
+    ("nvme_mi", ctypes.c_uint16, 1),
+    ("virtualization_management", ctypes.c_uint16, 1),
+    ("doorbell_buffer_config", ctypes.c_uint16, 1),
+    ("oacs_rsvd", ctypes.c_uint16, 7),
+]
+
+__xnvme_spec_idfy_ctrlr_4_0._fields_ = [
+    ("slot1_ro", ctypes.c_uint8, 1),
+    ("num_slots", ctypes.c_uint8, 3),
+    ("activation_without_reset", ctypes.c_uint8, 1),
+    ("frmw_rsvd", ctypes.c_uint8, 3),
+]
+
+__xnvme_spec_idfy_ctrlr_5_0._fields_ = [
+    ("ns_smart", ctypes.c_uint8, 1),
+    ("celp", ctypes.c_uint8, 1),
+    ("edlp", ctypes.c_uint8, 1),
+    ("telemetry", ctypes.c_uint8, 1),
+    ("pel", ctypes.c_uint8, 1),
+    ("lpa_rsvd", ctypes.c_uint8, 3),
+]
+
+__xnvme_spec_idfy_ctrlr_6_0._fields_ = [
+    ("spec_format", ctypes.c_uint8, 1),
+    ("avscc_rsvd", ctypes.c_uint8, 7),
+]
+
+__xnvme_spec_idfy_ctrlr_7_0._fields_ = [
+    ("supported", ctypes.c_uint8, 1),
+    ("apsta_rsvd", ctypes.c_uint8, 7),
+]
+
+__xnvme_spec_idfy_ctrlr_8_0._fields_ = [
+    ("num_rpmb_units", ctypes.c_uint8, 3),
+    ("auth_method", ctypes.c_uint8, 3),
+    ("reserved1", ctypes.c_uint8, 2),
+    ("reserved2", ctypes.c_uint8),
+    ("total_size", ctypes.c_uint8),
+    ("access_size", ctypes.c_uint8),
+]
+
+__xnvme_spec_idfy_ctrlr_9_0._fields_ = [
+    ("one_only", ctypes.c_uint8, 1),
+    ("reserved", ctypes.c_uint8, 7),
+]
+
+__xnvme_spec_idfy_ns_3_0._fields_ = [
+    ("pit1", ctypes.c_uint8, 1),
+    ("pit2", ctypes.c_uint8, 1),
+    ("pit3", ctypes.c_uint8, 1),
+    ("md_start", ctypes.c_uint8, 1),
+    ("md_end", ctypes.c_uint8, 1),
+]
+
+__xnvme_spec_idfy_ns_4_0._fields_ = [
+    ("pit", ctypes.c_uint8, 3),
+    ("md_start", ctypes.c_uint8, 1),
+    ("reserved4", ctypes.c_uint8, 4),
+]
+
+__xnvme_spec_idfy_ns_6_0._fields_ = [
+    ("persist", ctypes.c_uint8, 1),
+    ("write_exclusive", ctypes.c_uint8, 1),
+    ("exclusive_access", ctypes.c_uint8, 1),
+    ("write_exclusive_reg_only", ctypes.c_uint8, 1),
+    ("exclusive_access_reg_only", ctypes.c_uint8, 1),
+    ("write_exclusive_all_reg", ctypes.c_uint8, 1),
+    ("exclusive_access_all_reg", ctypes.c_uint8, 1),
+    ("ignore_existing_key", ctypes.c_uint8, 1),
+]
+
+__xnvme_spec_idfy_ns_7_0._fields_ = [
+    ("percentage_remaining", ctypes.c_uint8, 7),
+    ("fpi_supported", ctypes.c_uint8, 1),
+]
+
+__xnvme_spec_idfy_ns_8_0._fields_ = [
+    ("read_value", ctypes.c_uint8, 3),
+    ("write_zero_deallocate", ctypes.c_uint8, 1),
+    ("guard_value", ctypes.c_uint8, 1),
+    ("reserved", ctypes.c_uint8, 3),
+]
+
+__xnvme_spec_nvm_idfy_ctrlr_0_0._fields_ = [
+    ("compare", ctypes.c_uint16, 1),
+    ("write_unc", ctypes.c_uint16, 1),
+    ("dsm", ctypes.c_uint16, 1),
+    ("write_zeroes", ctypes.c_uint16, 1),
+    ("set_features_save", ctypes.c_uint16, 1),
+    ("reservations", ctypes.c_uint16, 1),
+    ("timestamp", ctypes.c_uint16, 1),
+    ("verify", ctypes.c_uint16, 1),
+    ("copy", ctypes.c_uint16, 1),
+    ("reserved", ctypes.c_uint16, 7),
+]
+
+__xnvme_spec_nvm_idfy_ctrlr_1_0._fields_ = [
+    ("copy_fmt0", ctypes.c_uint16, 1),
+    ("rsvd", ctypes.c_uint16, 15),
+]
+
+__xnvme_spec_sgl_descriptor_0_0._fields_ = [
+    ("rsvd", ctypes.c_uint64, 56),
+    ("subtype", ctypes.c_uint64, 4),
+    ("type", ctypes.c_uint64, 4),
+]
+
+__xnvme_spec_sgl_descriptor_0_1._fields_ = [
+    ("len", ctypes.c_uint64, 32),
+    ("rsvd", ctypes.c_uint64, 24),
+    ("subtype", ctypes.c_uint64, 4),
+    ("type", ctypes.c_uint64, 4),
+]
+
+__xnvme_spec_status_0_0._fields_ = [
+    ("p", ctypes.c_uint16, 1),
+    ("sc", ctypes.c_uint16, 8),
+    ("sct", ctypes.c_uint16, 3),
+    ("rsvd2", ctypes.c_uint16, 2),
+    ("m", ctypes.c_uint16, 1),
+    ("dnr", ctypes.c_uint16, 1),
+]
+
+__xnvme_spec_znd_descr_0_0._fields_ = [
+    ("zfc", ctypes.c_uint8, 1),
+    ("zfr", ctypes.c_uint8, 1),
+    ("rzr", ctypes.c_uint8, 1),
+    ("zrwav", ctypes.c_uint8, 1),
+    ("rsvd3", ctypes.c_uint8, 3),
+    ("zdev", ctypes.c_uint8, 1),
+]
+
+__xnvme_spec_znd_idfy_ns_0_0._fields_ = [
+    ("vzcap", ctypes.c_uint16, 1),
+    ("zae", ctypes.c_uint16, 1),
+    ("rsvd", ctypes.c_uint16, 14),
+]
+
+__xnvme_spec_znd_idfy_ns_1_0._fields_ = [
+    ("razb", ctypes.c_uint16, 1),
+    ("zrwasup", ctypes.c_uint16, 1),
+    ("rsvd", ctypes.c_uint16, 14),
+]
+
+__xnvme_spec_znd_idfy_ns_2_0._fields_ = [
+    ("expflushsup", ctypes.c_uint8, 1),
+    ("rsvd0", ctypes.c_uint8, 7),
+]
+
+_xnvme_cmd_ctx_0._fields_ = [
+    ("queue", ctypes.c_void_p),
+    ("cb", xnvme_queue_cb),
+    ("cb_arg", ctypes.c_void_p),
+]
+
+_xnvme_lba_range_0._fields_ = [
+    ("is_zoned", ctypes.c_uint32, 1),
+    ("is_valid", ctypes.c_uint32, 1),
+    ("rsvd", ctypes.c_uint32, 30),
+]
+
+_xnvme_opts_0._anonymous_ = ["__xnvme_opts_0_0"]
+_xnvme_opts_0._fields_ = [
+    ("__xnvme_opts_0_0", __xnvme_opts_0_0),
+    ("oflags", ctypes.c_uint32),
+]
+
+_xnvme_opts_1._fields_ = [
+    ("value", ctypes.c_uint32, 31),
+    ("given", ctypes.c_uint32, 1),
+]
+
+_xnvme_spec_sgl_descriptor_0._fields_ = [
+    ("generic", __xnvme_spec_sgl_descriptor_0_0),
+    ("unkeyed", __xnvme_spec_sgl_descriptor_0_1),
+]
+
+xnvme_spec_sgl_descriptor._anonymous_ = ["_xnvme_spec_sgl_descriptor_0"]
+xnvme_spec_sgl_descriptor._fields_ = [
+    ("addr", ctypes.c_uint64),
+    ("_xnvme_spec_sgl_descriptor_0", _xnvme_spec_sgl_descriptor_0),
+]
+
+_xnvme_spec_cmd_common_0._fields_ = [
+    ("prp", __xnvme_spec_cmd_common_0_0),
+    ("sgl", xnvme_spec_sgl_descriptor),
+    ("lnx_ioctl", __xnvme_spec_cmd_common_0_1),
+]
+
+xnvme_spec_cmd_common._fields_ = [
+    ("opcode", ctypes.c_uint16, 8),
+    ("fuse", ctypes.c_uint16, 2),
+    ("rsvd", ctypes.c_uint16, 4),
+    ("psdt", ctypes.c_uint16, 2),
+    ("cid", ctypes.c_uint16),
+    ("nsid", ctypes.c_uint32),
+    ("cdw02", ctypes.c_uint32),
+    ("cdw03", ctypes.c_uint32),
+    ("mptr", ctypes.c_uint64),
+    ("dptr", _xnvme_spec_cmd_common_0),
+    ("ndt", ctypes.c_uint32),
+    ("ndm", ctypes.c_uint32),
+    ("cdw12", ctypes.c_uint32),
+    ("cdw13", ctypes.c_uint32),
+    ("cdw14", ctypes.c_uint32),
+    ("cdw15", ctypes.c_uint32),
+]
+
+xnvme_spec_cmd_sanitize._fields_ = [
+    ("cdw00_09", ctypes.c_uint32 * 10),
+    ("sanact", ctypes.c_uint32, 3),
+    ("ause", ctypes.c_uint32, 1),
+    ("owpass", ctypes.c_uint32, 4),
+    ("oipbp", ctypes.c_uint32, 1),
+    ("nodas", ctypes.c_uint32, 1),
+    ("rsvd", ctypes.c_uint32, 22),
+    ("ovrpat", ctypes.c_uint32),
+    ("cdw12_15", ctypes.c_uint32 * 4),
+]
+
+xnvme_spec_cmd_format._fields_ = [
+    ("cdw00_09", ctypes.c_uint32 * 10),
+    ("lbaf", ctypes.c_uint32, 4),
+    ("mset", ctypes.c_uint32, 1),
+    ("pi", ctypes.c_uint32, 3),
+    ("pil", ctypes.c_uint32, 1),
+    ("ses", ctypes.c_uint32, 3),
+    ("zf", ctypes.c_uint32, 2),
+    ("rsvd", ctypes.c_uint32, 18),
+    ("cdw11_15", ctypes.c_uint32 * 5),
+]
+
+xnvme_spec_cmd_log._fields_ = [
+    ("cdw00_09", ctypes.c_uint32 * 10),
+    ("lid", ctypes.c_uint32, 8),
+    ("lsp", ctypes.c_uint32, 4),
+    ("rsvd10", ctypes.c_uint32, 3),
+    ("rae", ctypes.c_uint32, 1),
+    ("numdl", ctypes.c_uint32, 16),
+    ("numdu", ctypes.c_uint32, 16),
+    ("rsvd11", ctypes.c_uint32, 16),
+    ("lpol", ctypes.c_uint32),
+    ("lpou", ctypes.c_uint32),
+    ("cdw14_15", ctypes.c_uint32 * 2),
+]
+
+_xnvme_spec_cmd_gfeat_0._anonymous_ = ["__xnvme_spec_cmd_gfeat_0_0"]
+_xnvme_spec_cmd_gfeat_0._fields_ = [
+    ("__xnvme_spec_cmd_gfeat_0_0", __xnvme_spec_cmd_gfeat_0_0),
+    ("val", ctypes.c_uint32),
+]
+
+xnvme_spec_cmd_gfeat._fields_ = [
+    ("cdw00_09", ctypes.c_uint32 * 10),
+    ("cdw10", _xnvme_spec_cmd_gfeat_0),
+    ("cdw11_15", ctypes.c_uint32 * 5),
+]
+
+_xnvme_spec_cmd_sfeat_0._anonymous_ = ["__xnvme_spec_cmd_sfeat_0_0"]
+_xnvme_spec_cmd_sfeat_0._fields_ = [
+    ("__xnvme_spec_cmd_sfeat_0_0", __xnvme_spec_cmd_sfeat_0_0),
+    ("val", ctypes.c_uint32),
+]
+
+_xnvme_spec_feat_0._fields_ = [
+    ("temp_threshold", __xnvme_spec_feat_0_0),
+    ("error_recovery", __xnvme_spec_feat_0_1),
+    ("nqueues", __xnvme_spec_feat_0_2),
+    ("val", ctypes.c_uint32),
+]
+
+xnvme_spec_feat._anonymous_ = ["_xnvme_spec_feat_0"]
+xnvme_spec_feat._fields_ = [
+    ("_xnvme_spec_feat_0", _xnvme_spec_feat_0),
+]
+
+xnvme_spec_cmd_sfeat._fields_ = [
+    ("cdw00_09", ctypes.c_uint32 * 10),
+    ("cdw10", _xnvme_spec_cmd_sfeat_0),
+    ("feat", xnvme_spec_feat),
+    ("cdw12_15", ctypes.c_uint32 * 4),
+]
+
+xnvme_spec_cmd_idfy._fields_ = [
+    ("cdw00_09", ctypes.c_uint32 * 10),
+    ("cns", ctypes.c_uint32, 8),
+    ("rsvd1", ctypes.c_uint32, 8),
+    ("cntid", ctypes.c_uint32, 16),
+    ("nvmsetid", ctypes.c_uint32, 16),
+    ("rsvd2", ctypes.c_uint32, 8),
+    ("csi", ctypes.c_uint32, 8),
+    ("cdw12_13", ctypes.c_uint32 * 2),
+    ("uuid", ctypes.c_uint32, 7),
+    ("rsvd3", ctypes.c_uint32, 25),
+    ("cdw15", ctypes.c_uint32),
+]
+
+xnvme_spec_cmd_nvm._fields_ = [
+    ("cdw00_09", ctypes.c_uint32 * 10),
+    ("slba", ctypes.c_uint64),
+    ("nlb", ctypes.c_uint32, 16),
+    ("rsvd", ctypes.c_uint32, 4),
+    ("dtype", ctypes.c_uint32, 4),
+    ("rsvd2", ctypes.c_uint32, 2),
+    ("prinfo", ctypes.c_uint32, 4),
+    ("fua", ctypes.c_uint32, 1),
+    ("lr", ctypes.c_uint32, 1),
+    ("cdw13_15", ctypes.c_uint32 * 3),
+]
+
+xnvme_spec_nvm_cmd_scopy._fields_ = [
+    ("cdw00_09", ctypes.c_uint32 * 10),
+    ("sdlba", ctypes.c_uint64),
+    ("nr", ctypes.c_uint32, 8),
+    ("df", ctypes.c_uint32, 4),
+    ("prinfor", ctypes.c_uint32, 4),
+    ("rsvd1", ctypes.c_uint32, 4),
+    ("dtype", ctypes.c_uint32, 4),
+    ("rsvd2", ctypes.c_uint32, 2),
+    ("prinfow", ctypes.c_uint32, 4),
+    ("fua", ctypes.c_uint32, 1),
+    ("lr", ctypes.c_uint32, 1),
+    ("rsvd3", ctypes.c_uint32, 16),
+    ("dspec", ctypes.c_uint32, 16),
+    ("ilbrt", ctypes.c_uint32),
+    ("lbat", ctypes.c_uint32, 16),
+    ("lbatm", ctypes.c_uint32, 16),
+]
+
+xnvme_spec_nvm_write_zeroes._fields_ = [
+    ("cdw00_09", ctypes.c_uint32 * 10),
+    ("slba", ctypes.c_uint64),
+    ("nlb", ctypes.c_uint32, 16),
+    ("rsvd1", ctypes.c_uint32, 8),
+    ("deac", ctypes.c_uint32, 1),
+    ("prinfo", ctypes.c_uint32, 4),
+    ("fua", ctypes.c_uint32, 1),
+    ("lr", ctypes.c_uint32, 1),
+    ("cdw_13", ctypes.c_uint32),
+    ("ilbrt", ctypes.c_uint32, 32),
+    ("lbat", ctypes.c_uint32, 16),
+    ("lbatm", ctypes.c_uint32, 16),
+]
+
+xnvme_spec_znd_cmd_mgmt_send._fields_ = [
+    ("cdw00_09", ctypes.c_uint32 * 10),
+    ("slba", ctypes.c_uint64),
+    ("nrange", ctypes.c_uint32),
+    ("zsa", ctypes.c_uint32, 8),
+    ("select_all", ctypes.c_uint32, 1),
+    ("zsaso", ctypes.c_uint32, 1),
+    ("rsvd", ctypes.c_uint32, 22),
+    ("cdw14_15", ctypes.c_uint32 * 2),
+]
+
+xnvme_spec_znd_cmd_mgmt_recv._fields_ = [
+    ("cdw00_09", ctypes.c_uint32 * 10),
+    ("slba", ctypes.c_uint64),
+    ("ndwords", ctypes.c_uint32),
+    ("zra", ctypes.c_uint32, 8),
+    ("zrasf", ctypes.c_uint32, 8),
+    ("partial", ctypes.c_uint32, 1),
+    ("rsvd", ctypes.c_uint32, 15),
+    ("addrs_dst", ctypes.c_uint64),
+]
+
+xnvme_spec_znd_cmd_append._fields_ = [
+    ("cdw00_09", ctypes.c_uint32 * 10),
+    ("zslba", ctypes.c_uint64),
+    ("nlb", ctypes.c_uint32, 16),
+    ("rsvd", ctypes.c_uint32, 4),
+    ("dtype", ctypes.c_uint32, 4),
+    ("prinfo", ctypes.c_uint32, 4),
+    ("rsvd2", ctypes.c_uint32, 2),
+    ("fua", ctypes.c_uint32, 1),
+    ("lr", ctypes.c_uint32, 1),
+    ("cdw13_15", ctypes.c_uint32 * 3),
+]
+
+_xnvme_spec_znd_cmd_0._fields_ = [
+    ("mgmt_send", xnvme_spec_znd_cmd_mgmt_send),
+    ("mgmt_recv", xnvme_spec_znd_cmd_mgmt_recv),
+    ("append", xnvme_spec_znd_cmd_append),
+]
+
+xnvme_spec_znd_cmd._anonymous_ = ["_xnvme_spec_znd_cmd_0"]
+xnvme_spec_znd_cmd._fields_ = [
+    ("_xnvme_spec_znd_cmd_0", _xnvme_spec_znd_cmd_0),
+]
+
+_xnvme_spec_cmd_0._fields_ = [
+    ("common", xnvme_spec_cmd_common),
+    ("sanitize", xnvme_spec_cmd_sanitize),
+    ("format", xnvme_spec_cmd_format),
+    ("log", xnvme_spec_cmd_log),
+    ("gfeat", xnvme_spec_cmd_gfeat),
+    ("sfeat", xnvme_spec_cmd_sfeat),
+    ("idfy", xnvme_spec_cmd_idfy),
+    ("nvm", xnvme_spec_cmd_nvm),
+    ("scopy", xnvme_spec_nvm_cmd_scopy),
+    ("write_zeroes", xnvme_spec_nvm_write_zeroes),
+    ("znd", xnvme_spec_znd_cmd),
+]
+
+_xnvme_spec_cpl_0._anonymous_ = ["__xnvme_spec_cpl_0_0"]
+_xnvme_spec_cpl_0._fields_ = [
+    ("__xnvme_spec_cpl_0_0", __xnvme_spec_cpl_0_0),
+    ("result", ctypes.c_uint64),
+]
+
+_xnvme_spec_cs_vector_0._anonymous_ = ["__xnvme_spec_cs_vector_0_0"]
+_xnvme_spec_cs_vector_0._fields_ = [
+    ("__xnvme_spec_cs_vector_0_0", __xnvme_spec_cs_vector_0_0),
+    ("val", ctypes.c_uint64),
+]
+
+_xnvme_spec_fs_idfy_ctrlr_0._fields_ = [
+    ("direct", ctypes.c_uint64, 1),
+    ("rsvd", ctypes.c_uint64, 63),
+]
+
+_xnvme_spec_fs_idfy_ctrlr_1._fields_ = [
+    ("file_data_size", ctypes.c_uint64),
+    ("file_name_len", ctypes.c_uint64),
+    ("path_name_len", ctypes.c_uint64),
+    ("number_of_files", ctypes.c_uint64),
+]
+
+_xnvme_spec_fs_idfy_ctrlr_2._fields_ = [
+    ("permissions_posix", ctypes.c_uint64, 1),
+    ("permissions_acl", ctypes.c_uint64, 1),
+    ("stamp_creation", ctypes.c_uint64, 1),
+    ("stamp_access", ctypes.c_uint64, 1),
+    ("stamp_change", ctypes.c_uint64, 1),
+    ("stamp_archive", ctypes.c_uint64, 1),
+    ("hardlinks", ctypes.c_uint64, 1),
+    ("symlinks", ctypes.c_uint64, 1),
+    ("case_sensitive", ctypes.c_uint64, 1),
+    ("case_preserving", ctypes.c_uint64, 1),
+    ("journaling_block", ctypes.c_uint64, 1),
+    ("journaling_meta", ctypes.c_uint64, 1),
+    ("snapshotting", ctypes.c_uint64, 1),
+    ("compressed", ctypes.c_uint64, 1),
+    ("encrypted", ctypes.c_uint64, 1),
+    ("rsvd", ctypes.c_uint64, 48),
+]
+
+_xnvme_spec_fs_idfy_ctrlr_3._fields_ = [
+    ("min", ctypes.c_uint32),
+    ("max", ctypes.c_uint32),
+    ("opt", ctypes.c_uint32),
+]
+
+_xnvme_spec_idfy_ctrlr_0._anonymous_ = ["__xnvme_spec_idfy_ctrlr_0_0"]
+_xnvme_spec_idfy_ctrlr_0._fields_ = [
+    ("__xnvme_spec_idfy_ctrlr_0_0", __xnvme_spec_idfy_ctrlr_0_0),
+    ("val", ctypes.c_uint8),
+]
+
+_xnvme_spec_vs_register_0._fields_ = [
+    ("ter", ctypes.c_uint32, 8),
+    ("mnr", ctypes.c_uint32, 8),
+    ("mjr", ctypes.c_uint32, 16),
+]
+
+xnvme_spec_vs_register._fields_ = [
+    ("bits", _xnvme_spec_vs_register_0),
+    ("val", ctypes.c_uint32),
+]
+
+_xnvme_spec_idfy_ctrlr_1._anonymous_ = ["__xnvme_spec_idfy_ctrlr_1_0"]
+_xnvme_spec_idfy_ctrlr_1._fields_ = [
+    ("__xnvme_spec_idfy_ctrlr_1_0", __xnvme_spec_idfy_ctrlr_1_0),
+    ("val", ctypes.c_uint32),
+]
+
+_xnvme_spec_idfy_ctrlr_2._anonymous_ = ["__xnvme_spec_idfy_ctrlr_2_0"]
+_xnvme_spec_idfy_ctrlr_2._fields_ = [
+    ("__xnvme_spec_idfy_ctrlr_2_0", __xnvme_spec_idfy_ctrlr_2_0),
+    ("val", ctypes.c_uint32),
+]
+
+_xnvme_spec_idfy_ctrlr_3._anonymous_ = ["__xnvme_spec_idfy_ctrlr_3_0"]
+_xnvme_spec_idfy_ctrlr_3._fields_ = [
+    ("__xnvme_spec_idfy_ctrlr_3_0", __xnvme_spec_idfy_ctrlr_3_0),
+    ("val", ctypes.c_uint16),
+]
+
+_xnvme_spec_idfy_ctrlr_4._anonymous_ = ["__xnvme_spec_idfy_ctrlr_4_0"]
+_xnvme_spec_idfy_ctrlr_4._fields_ = [
+    ("__xnvme_spec_idfy_ctrlr_4_0", __xnvme_spec_idfy_ctrlr_4_0),
+    ("val", ctypes.c_uint8),
+]
+
+_xnvme_spec_idfy_ctrlr_5._anonymous_ = ["__xnvme_spec_idfy_ctrlr_5_0"]
+_xnvme_spec_idfy_ctrlr_5._fields_ = [
+    ("__xnvme_spec_idfy_ctrlr_5_0", __xnvme_spec_idfy_ctrlr_5_0),
+    ("val", ctypes.c_uint8),
+]
+
+_xnvme_spec_idfy_ctrlr_6._anonymous_ = ["__xnvme_spec_idfy_ctrlr_6_0"]
+_xnvme_spec_idfy_ctrlr_6._fields_ = [
+    ("__xnvme_spec_idfy_ctrlr_6_0", __xnvme_spec_idfy_ctrlr_6_0),
+    ("val", ctypes.c_uint8),
+]
+
+_xnvme_spec_idfy_ctrlr_7._anonymous_ = ["__xnvme_spec_idfy_ctrlr_7_0"]
+_xnvme_spec_idfy_ctrlr_7._fields_ = [
+    ("__xnvme_spec_idfy_ctrlr_7_0", __xnvme_spec_idfy_ctrlr_7_0),
+    ("val", ctypes.c_uint8),
+]
+
+_xnvme_spec_idfy_ctrlr_8._anonymous_ = ["__xnvme_spec_idfy_ctrlr_8_0"]
+_xnvme_spec_idfy_ctrlr_8._fields_ = [
+    ("__xnvme_spec_idfy_ctrlr_8_0", __xnvme_spec_idfy_ctrlr_8_0),
+    ("val", ctypes.c_uint32),
+]
+
+_xnvme_spec_idfy_ctrlr_9._fields_ = [
+    ("bits", __xnvme_spec_idfy_ctrlr_9_0),
+    ("val", ctypes.c_uint8),
+]
+
+_xnvme_spec_idfy_ctrlr_10._fields_ = [
+    ("bits", __xnvme_spec_idfy_ctrlr_10_0),
+    ("val", ctypes.c_uint16),
+]
+
+_xnvme_spec_idfy_ctrlr_11._fields_ = [
+    ("bits", __xnvme_spec_idfy_ctrlr_11_0),
+    ("val", ctypes.c_uint32),
+]
+
+_xnvme_spec_idfy_ctrlr_12._anonymous_ = ["__xnvme_spec_idfy_ctrlr_12_0"]
+_xnvme_spec_idfy_ctrlr_12._fields_ = [
+    ("__xnvme_spec_idfy_ctrlr_12_0", __xnvme_spec_idfy_ctrlr_12_0),
+    ("val", ctypes.c_uint8),
+]
+
+_xnvme_spec_idfy_ctrlr_13._anonymous_ = ["__xnvme_spec_idfy_ctrlr_13_0"]
+_xnvme_spec_idfy_ctrlr_13._fields_ = [
+    ("__xnvme_spec_idfy_ctrlr_13_0", __xnvme_spec_idfy_ctrlr_13_0),
+    ("val", ctypes.c_uint8),
+]
+
+_xnvme_spec_idfy_ctrlr_14._anonymous_ = ["__xnvme_spec_idfy_ctrlr_14_0"]
+_xnvme_spec_idfy_ctrlr_14._fields_ = [
+    ("__xnvme_spec_idfy_ctrlr_14_0", __xnvme_spec_idfy_ctrlr_14_0),
+    ("val", ctypes.c_uint16),
+]
+
+_xnvme_spec_idfy_ctrlr_15._anonymous_ = ["__xnvme_spec_idfy_ctrlr_15_0"]
+_xnvme_spec_idfy_ctrlr_15._fields_ = [
+    ("__xnvme_spec_idfy_ctrlr_15_0", __xnvme_spec_idfy_ctrlr_15_0),
+    ("val", ctypes.c_uint8),
+]
+
+_xnvme_spec_idfy_ctrlr_16._anonymous_ = ["__xnvme_spec_idfy_ctrlr_16_0"]
+_xnvme_spec_idfy_ctrlr_16._fields_ = [
+    ("__xnvme_spec_idfy_ctrlr_16_0", __xnvme_spec_idfy_ctrlr_16_0),
+    ("val", ctypes.c_uint8),
+]
+
+_xnvme_spec_idfy_ctrlr_17._anonymous_ = ["__xnvme_spec_idfy_ctrlr_17_0"]
+_xnvme_spec_idfy_ctrlr_17._fields_ = [
+    ("__xnvme_spec_idfy_ctrlr_17_0", __xnvme_spec_idfy_ctrlr_17_0),
+    ("val", ctypes.c_uint32),
+]
+
+_xnvme_spec_idfy_ctrlr_18._fields_ = [
+    ("ioccsz", ctypes.c_uint32),
+    ("iorcsz", ctypes.c_uint32),
+    ("icdoff", ctypes.c_uint16),
+    ("ctrattr", __xnvme_spec_idfy_ctrlr_18_0),
+    ("msdbd", ctypes.c_uint8),
+    ("reserved", ctypes.c_uint8 * 244),
+]
+
+xnvme_spec_power_state._fields_ = [
+    ("mp", ctypes.c_uint16),
+    ("reserved1", ctypes.c_uint8),
+    ("mps", ctypes.c_uint8, 1),
+    ("nops", ctypes.c_uint8, 1),
+    ("reserved2", ctypes.c_uint8, 6),
+    ("enlat", ctypes.c_uint32),
+    ("exlat", ctypes.c_uint32),
+    ("rrt", ctypes.c_uint8, 5),
+    ("reserved3", ctypes.c_uint8, 3),
+    ("rrl", ctypes.c_uint8, 5),
+    ("reserved4", ctypes.c_uint8, 3),
+    ("rwt", ctypes.c_uint8, 5),
+    ("reserved5", ctypes.c_uint8, 3),
+    ("rwl", ctypes.c_uint8, 5),
+    ("reserved6", ctypes.c_uint8, 3),
+    ("reserved7", ctypes.c_uint8 * 16),
+]
+
+xnvme_spec_idfy_ctrlr._fields_ = [
+    ("vid", ctypes.c_uint16),
+    ("ssvid", ctypes.c_uint16),
+    ("sn", ctypes.c_int8 * 20),
+    ("mn", ctypes.c_int8 * 40),
+    ("fr", ctypes.c_uint8 * 8),
+    ("rab", ctypes.c_uint8),
+    ("ieee", ctypes.c_uint8 * 3),
+    ("cmic", _xnvme_spec_idfy_ctrlr_0),
+    ("mdts", ctypes.c_uint8),
+    ("cntlid", ctypes.c_uint16),
+    ("ver", xnvme_spec_vs_register),
+    ("rtd3r", ctypes.c_uint32),
+    ("rtd3e", ctypes.c_uint32),
+    ("oaes", _xnvme_spec_idfy_ctrlr_1),
+    ("ctratt", _xnvme_spec_idfy_ctrlr_2),
+    ("reserved_100", ctypes.c_uint8 * 12),
+    ("fguid", ctypes.c_uint8 * 16),
+    ("reserved_128", ctypes.c_uint8 * 128),
+    ("oacs", _xnvme_spec_idfy_ctrlr_3),
+    ("acl", ctypes.c_uint8),
+    ("aerl", ctypes.c_uint8),
+    ("frmw", _xnvme_spec_idfy_ctrlr_4),
+    ("lpa", _xnvme_spec_idfy_ctrlr_5),
+    ("elpe", ctypes.c_uint8),
+    ("npss", ctypes.c_uint8),
+    ("avscc", _xnvme_spec_idfy_ctrlr_6),
+    ("apsta", _xnvme_spec_idfy_ctrlr_7),
+    ("wctemp", ctypes.c_uint16),
+    ("cctemp", ctypes.c_uint16),
+    ("mtfa", ctypes.c_uint16),
+    ("hmpre", ctypes.c_uint32),
+    ("hmmin", ctypes.c_uint32),
+    ("tnvmcap", ctypes.c_uint64 * 2),
+    ("unvmcap", ctypes.c_uint64 * 2),
+    ("rpmbs", _xnvme_spec_idfy_ctrlr_8),
+    ("edstt", ctypes.c_uint16),
+    ("dsto", _xnvme_spec_idfy_ctrlr_9),
+    ("fwug", ctypes.c_uint8),
+    ("kas", ctypes.c_uint16),
+    ("hctma", _xnvme_spec_idfy_ctrlr_10),
+    ("mntmt", ctypes.c_uint16),
+    ("mxtmt", ctypes.c_uint16),
+    ("sanicap", _xnvme_spec_idfy_ctrlr_11),
+    ("reserved3", ctypes.c_uint8 * 180),
+    ("sqes", _xnvme_spec_idfy_ctrlr_12),
+    ("cqes", _xnvme_spec_idfy_ctrlr_13),
+    ("maxcmd", ctypes.c_uint16),
+    ("nn", ctypes.c_uint32),
+    ("oncs", _xnvme_spec_idfy_ctrlr_14),
+    ("fuses", ctypes.c_uint16),
+    ("fna", _xnvme_spec_idfy_ctrlr_15),
+    ("vwc", _xnvme_spec_idfy_ctrlr_16),
+    ("awun", ctypes.c_uint16),
+    ("awupf", ctypes.c_uint16),
+    ("nvscc", ctypes.c_uint8),
+    ("reserved531", ctypes.c_uint8),
+    ("acwu", ctypes.c_uint16),
+    ("reserved534", ctypes.c_uint16),
+    ("sgls", _xnvme_spec_idfy_ctrlr_17),
+    ("mnan", ctypes.c_uint32),
+    ("reserved4", ctypes.c_uint8 * 224),
+    ("subnqn", ctypes.c_uint8 * 256),
+    ("reserved5", ctypes.c_uint8 * 768),
+    ("nvmf_specific", _xnvme_spec_idfy_ctrlr_18),
+    ("psd", xnvme_spec_power_state * 32),
+    ("vs", ctypes.c_uint8 * 1024),
+]
+
+_xnvme_spec_idfy_ns_0._fields_ = [
+    ("thin_prov", ctypes.c_uint8, 1),
+    ("ns_atomic_write_unit", ctypes.c_uint8, 1),
+    ("dealloc_or_unwritten_error", ctypes.c_uint8, 1),
+    ("guid_never_reused", ctypes.c_uint8, 1),
+    ("reserved1", ctypes.c_uint8, 4),
+]
+
+_xnvme_spec_idfy_ns_1._fields_ = [
+    ("format", ctypes.c_uint8, 4),
+    ("extended", ctypes.c_uint8, 1),
+    ("reserved2", ctypes.c_uint8, 3),
+]
+
+_xnvme_spec_idfy_ns_2._fields_ = [
+    ("extended", ctypes.c_uint8, 1),
+    ("pointer", ctypes.c_uint8, 1),
+    ("reserved3", ctypes.c_uint8, 6),
+]
+
+_xnvme_spec_idfy_ns_3._anonymous_ = ["__xnvme_spec_idfy_ns_3_0"]
+_xnvme_spec_idfy_ns_3._fields_ = [
+    ("__xnvme_spec_idfy_ns_3_0", __xnvme_spec_idfy_ns_3_0),
+    ("val", ctypes.c_uint8),
+]
+
+_xnvme_spec_idfy_ns_4._anonymous_ = ["__xnvme_spec_idfy_ns_4_0"]
+_xnvme_spec_idfy_ns_4._fields_ = [
+    ("__xnvme_spec_idfy_ns_4_0", __xnvme_spec_idfy_ns_4_0),
+    ("val", ctypes.c_uint8),
+]
+
+_xnvme_spec_idfy_ns_5._fields_ = [
+    ("can_share", ctypes.c_uint8, 1),
+    ("reserved", ctypes.c_uint8, 7),
+]
+
+_xnvme_spec_idfy_ns_6._anonymous_ = ["__xnvme_spec_idfy_ns_6_0"]
+_xnvme_spec_idfy_ns_6._fields_ = [
+    ("__xnvme_spec_idfy_ns_6_0", __xnvme_spec_idfy_ns_6_0),
+    ("val", ctypes.c_uint8),
+]
+
+_xnvme_spec_idfy_ns_7._anonymous_ = ["__xnvme_spec_idfy_ns_7_0"]
+_xnvme_spec_idfy_ns_7._fields_ = [
+    ("__xnvme_spec_idfy_ns_7_0", __xnvme_spec_idfy_ns_7_0),
+    ("val", ctypes.c_uint8),
+]
+
+_xnvme_spec_idfy_ns_8._fields_ = [
+    ("bits", __xnvme_spec_idfy_ns_8_0),
+    ("val", ctypes.c_uint8),
+]
+
+xnvme_spec_lbaf._fields_ = [
+    ("ms", ctypes.c_uint16),
+    ("ds", ctypes.c_uint8),
+    ("rp", ctypes.c_uint8, 2),
+    ("rsvd", ctypes.c_uint8, 6),
+]
+
+xnvme_spec_idfy_ns._fields_ = [
+    ("nsze", ctypes.c_uint64),
+    ("ncap", ctypes.c_uint64),
+    ("nuse", ctypes.c_uint64),
+    ("nsfeat", _xnvme_spec_idfy_ns_0),
+    ("nlbaf", ctypes.c_uint8),
+    ("flbas", _xnvme_spec_idfy_ns_1),
+    ("mc", _xnvme_spec_idfy_ns_2),
+    ("dpc", _xnvme_spec_idfy_ns_3),
+    ("dps", _xnvme_spec_idfy_ns_4),
+    ("nmic", _xnvme_spec_idfy_ns_5),
+    ("nsrescap", _xnvme_spec_idfy_ns_6),
+    ("fpi", _xnvme_spec_idfy_ns_7),
+    ("dlfeat", _xnvme_spec_idfy_ns_8),
+    ("nawun", ctypes.c_uint16),
+    ("nawupf", ctypes.c_uint16),
+    ("nacwu", ctypes.c_uint16),
+    ("nabsn", ctypes.c_uint16),
+    ("nabo", ctypes.c_uint16),
+    ("nabspf", ctypes.c_uint16),
+    ("noiob", ctypes.c_uint16),
+    ("nvmcap", ctypes.c_uint64 * 2),
+    ("reserved64", ctypes.c_uint8 * 40),
+    ("nguid", ctypes.c_uint8 * 16),
+    ("eui64", ctypes.c_uint64),
+    ("lbaf", xnvme_spec_lbaf * 16),
+    ("rsvd3776", ctypes.c_uint8 * 3648),
+    ("vendor_specific", ctypes.c_uint8 * 256),
+]
+
+xnvme_spec_cs_vector._anonymous_ = ["_xnvme_spec_cs_vector_0"]
+xnvme_spec_cs_vector._fields_ = [
+    ("_xnvme_spec_cs_vector_0", _xnvme_spec_cs_vector_0),
+]
+
+xnvme_spec_idfy_cs._fields_ = [
+    ("iocsc", xnvme_spec_cs_vector * 512),
+]
+
+_xnvme_spec_idfy_0._fields_ = [
+    ("ctrlr", xnvme_spec_idfy_ctrlr),
+    ("ns", xnvme_spec_idfy_ns),
+    ("cs", xnvme_spec_idfy_cs),
+]
+
+_xnvme_spec_nvm_cmd_0._fields_ = [
+    ("scopy", xnvme_spec_nvm_cmd_scopy),
+]
+
+xnvme_spec_idfy._anonymous_ = ["_xnvme_spec_idfy_0"]
+xnvme_spec_idfy._fields_ = [
+    ("_xnvme_spec_idfy_0", _xnvme_spec_idfy_0),
+]
+
+_xnvme_spec_nvm_idfy_ctrlr_0._anonymous_ = ["__xnvme_spec_nvm_idfy_ctrlr_0_0"]
+_xnvme_spec_nvm_idfy_ctrlr_0._fields_ = [
+    ("__xnvme_spec_nvm_idfy_ctrlr_0_0", __xnvme_spec_nvm_idfy_ctrlr_0_0),
+    ("val", ctypes.c_uint16),
+]
+
+_xnvme_spec_nvm_idfy_ctrlr_1._anonymous_ = ["__xnvme_spec_nvm_idfy_ctrlr_1_0"]
+_xnvme_spec_nvm_idfy_ctrlr_1._fields_ = [
+    ("__xnvme_spec_nvm_idfy_ctrlr_1_0", __xnvme_spec_nvm_idfy_ctrlr_1_0),
+    ("val", ctypes.c_uint16),
+]
+
+xnvme_spec_nvm_idfy_ctrlr._fields_ = [
+    ("byte0_519", ctypes.c_uint8 * 520),
+    ("oncs", _xnvme_spec_nvm_idfy_ctrlr_0),
+    ("byte522_533", ctypes.c_uint8 * 12),
+    ("ocfs", _xnvme_spec_nvm_idfy_ctrlr_1),
+    ("byte536_4095", ctypes.c_uint8 * 3559),
+]
+
+xnvme_spec_nvm_idfy_ns._fields_ = [
+    ("byte0_73", ctypes.c_uint8 * 74),
+    ("mssrl", ctypes.c_uint16),
+    ("mcl", ctypes.c_uint32),
+    ("msrc", ctypes.c_uint8),
+    ("byte81_4095", ctypes.c_uint8 * 4014),
+]
+
+_xnvme_spec_nvm_idfy_0._fields_ = [
+    ("base", xnvme_spec_idfy),
+    ("ctrlr", xnvme_spec_nvm_idfy_ctrlr),
+    ("ns", xnvme_spec_nvm_idfy_ns),
+]
+
+_xnvme_spec_status_0._anonymous_ = ["__xnvme_spec_status_0_0"]
+_xnvme_spec_status_0._fields_ = [
+    ("__xnvme_spec_status_0_0", __xnvme_spec_status_0_0),
+    ("val", ctypes.c_uint16),
+]
+
+_xnvme_spec_znd_descr_0._anonymous_ = ["__xnvme_spec_znd_descr_0_0"]
+_xnvme_spec_znd_descr_0._fields_ = [
+    ("__xnvme_spec_znd_descr_0_0", __xnvme_spec_znd_descr_0_0),
+    ("val", ctypes.c_uint8),
+]
+
+xnvme_spec_znd_idfy_ctrlr._fields_ = [
+    ("zasl", ctypes.c_uint8),
+    ("rsvd8", ctypes.c_uint8 * 4095),
+]
+
+_xnvme_spec_znd_idfy_ns_0._fields_ = [
+    ("bits", __xnvme_spec_znd_idfy_ns_0_0),
+    ("val", ctypes.c_uint16),
+]
+
+_xnvme_spec_znd_idfy_ns_1._fields_ = [
+    ("bits", __xnvme_spec_znd_idfy_ns_1_0),
+    ("val", ctypes.c_uint16),
+]
+
+_xnvme_spec_znd_idfy_ns_2._fields_ = [
+    ("bits", __xnvme_spec_znd_idfy_ns_2_0),
+    ("val", ctypes.c_uint8),
+]
+
+xnvme_spec_znd_idfy_lbafe._fields_ = [
+    ("zsze", ctypes.c_uint64),
+    ("zdes", ctypes.c_uint8),
+    ("rsvd", ctypes.c_uint8 * 7),
+]
+
+xnvme_spec_znd_idfy_ns._fields_ = [
+    ("zoc", _xnvme_spec_znd_idfy_ns_0),
+    ("ozcs", _xnvme_spec_znd_idfy_ns_1),
+    ("mar", ctypes.c_uint32),
+    ("mor", ctypes.c_uint32),
+    ("rrl", ctypes.c_uint32),
+    ("frl", ctypes.c_uint32),
+    ("rsvd12", ctypes.c_uint8 * 24),
+    ("numzrwa", ctypes.c_uint32),
+    ("zrwafg", ctypes.c_uint16),
+    ("zrwas", ctypes.c_uint16),
+    ("zrwacap", _xnvme_spec_znd_idfy_ns_2),
+    ("rsvd53", ctypes.c_uint8 * 2763),
+    ("lbafe", xnvme_spec_znd_idfy_lbafe * 16),
+    ("rsvd3072", ctypes.c_uint8 * 768),
+    ("vs", ctypes.c_uint8 * 256),
+]
+
+_xnvme_spec_znd_idfy_0._fields_ = [
+    ("base", xnvme_spec_idfy),
+    ("zctrlr", xnvme_spec_znd_idfy_ctrlr),
+    ("zns", xnvme_spec_znd_idfy_ns),
+]
+
+xnvme_be_attr._fields_ = [
+    ("name", ctypes.c_char_p),
+    ("enabled", ctypes.c_uint8),
+    ("_rsvd", ctypes.c_uint8 * 15),
+]
+
+xnvme_be_attr_list._fields_ = [
+    ("capacity", ctypes.c_uint32),
+    ("count", ctypes.c_int),
+    ("item", xnvme_be_attr * 0),
+]
+
+xnvme_spec_cmd._anonymous_ = ["_xnvme_spec_cmd_0"]
+xnvme_spec_cmd._fields_ = [
+    ("_xnvme_spec_cmd_0", _xnvme_spec_cmd_0),
+]
+
+xnvme_spec_status._anonymous_ = ["_xnvme_spec_status_0"]
+xnvme_spec_status._fields_ = [
+    ("_xnvme_spec_status_0", _xnvme_spec_status_0),
+]
+
+xnvme_spec_cpl._anonymous_ = ["_xnvme_spec_cpl_0"]
+xnvme_spec_cpl._fields_ = [
+    ("_xnvme_spec_cpl_0", _xnvme_spec_cpl_0),
+    ("sqhd", ctypes.c_uint16),
+    ("sqid", ctypes.c_uint16),
+    ("cid", ctypes.c_uint16),
+    ("status", xnvme_spec_status),
+]
+
+xnvme_cmd_ctx._fields_ = [
+    ("cmd", xnvme_spec_cmd),
+    ("cpl", xnvme_spec_cpl),
+    ("dev", ctypes.c_void_p),
+    ("async_", _xnvme_cmd_ctx_0),
+    ("opts", ctypes.c_uint32),
+    ("be_rsvd", ctypes.c_uint8 * 4),
+    ("link", ctypes.c_void_p),
+]
+
+xnvme_geo._fields_ = [
+    ("type", ctypes.c_int),
+    ("npugrp", ctypes.c_uint32),
+    ("npunit", ctypes.c_uint32),
+    ("nzone", ctypes.c_uint32),
+    ("nsect", ctypes.c_uint64),
+    ("nbytes", ctypes.c_uint32),
+    ("nbytes_oob", ctypes.c_uint32),
+    ("tbytes", ctypes.c_uint64),
+    ("ssw", ctypes.c_uint64),
+    ("mdts_nbytes", ctypes.c_uint32),
+    ("lba_nbytes", ctypes.c_uint32),
+    ("lba_extended", ctypes.c_uint8),
+    ("_rsvd", ctypes.c_uint8 * 7),
+]
+
+xnvme_ident._fields_ = [
+    ("uri", ctypes.c_char * 384),
+    ("dtype", ctypes.c_uint32),
+    ("nsid", ctypes.c_uint32),
+    ("csi", ctypes.c_uint8),
+    ("rsvd", ctypes.c_uint8 * 3),
+]
+
+xnvme_lba_range._fields_ = [
+    ("slba", ctypes.c_uint64),
+    ("elba", ctypes.c_uint64),
+    ("naddrs", ctypes.c_uint32),
+    ("nbytes", ctypes.c_uint64),
+    ("attr", _xnvme_lba_range_0),
+]
+
+xnvme_opts._anonymous_ = ["_xnvme_opts_0"]
+xnvme_opts._fields_ = [
+    ("be", ctypes.c_char_p),
+    ("dev", ctypes.c_char_p),
+    ("mem", ctypes.c_char_p),
+    ("sync", ctypes.c_char_p),
+    ("async_", ctypes.c_char_p),
+    ("admin", ctypes.c_char_p),
+    ("nsid", ctypes.c_uint32),
+    ("_xnvme_opts_0", _xnvme_opts_0),
+    ("create_mode", ctypes.c_uint32),
+    ("poll_io", ctypes.c_uint8),
+    ("poll_sq", ctypes.c_uint8),
+    ("register_files", ctypes.c_uint8),
+    ("register_buffers", ctypes.c_uint8),
+    ("css", _xnvme_opts_1),
+    ("use_cmb_sqs", ctypes.c_uint32),
+    ("shm_id", ctypes.c_uint32),
+    ("main_core", ctypes.c_uint32),
+    ("core_mask", ctypes.c_char_p),
+    ("adrfam", ctypes.c_char_p),
+    ("spdk_fabrics", ctypes.c_uint32),
+]
+
+xnvme_spec_ctrlr_bar._pack_ = 1
+xnvme_spec_ctrlr_bar._fields_ = [
+    ("cap", ctypes.c_uint64),
+    ("vs", ctypes.c_uint32),
+    ("intms", ctypes.c_uint32),
+    ("intmc", ctypes.c_uint32),
+    ("cc", ctypes.c_uint32),
+    ("rsvd24", ctypes.c_uint32),
+    ("csts", ctypes.c_uint32),
+    ("nssr", ctypes.c_uint32),
+    ("aqa", ctypes.c_uint32),
+    ("asq", ctypes.c_uint64),
+    ("acq", ctypes.c_uint64),
+    ("cmbloc", ctypes.c_uint32),
+    ("cmbsz", ctypes.c_uint32),
+    ("bpinfo", ctypes.c_uint32),
+    ("bprsel", ctypes.c_uint32),
+    ("bpmbl", ctypes.c_uint64),
+    ("cmbmsc", ctypes.c_uint64),
+    ("cmbsts", ctypes.c_uint32),
+    ("rsvd92", ctypes.c_uint8 * 3492),
+    ("pmrcap", ctypes.c_uint32),
+    ("pmrctl", ctypes.c_uint32),
+    ("pmrsts", ctypes.c_uint32),
+    ("pmrebs", ctypes.c_uint32),
+    ("pmrswtp", ctypes.c_uint32),
+    ("pmrmscl", ctypes.c_uint32),
+    ("pmrmscu", ctypes.c_uint32),
+    ("css", ctypes.c_uint8 * 484),
+]
+
+xnvme_spec_dsm_range._fields_ = [
+    ("cattr", ctypes.c_uint32),
+    ("nlb", ctypes.c_uint32),
+    ("slba", ctypes.c_uint64),
+]
+
+xnvme_spec_fs_idfy_ctrlr._fields_ = [
+    ("byte0_519", ctypes.c_uint8 * 520),
+    ("caps", _xnvme_spec_fs_idfy_ctrlr_0),
+    ("limits", _xnvme_spec_fs_idfy_ctrlr_1),
+    ("properties", _xnvme_spec_fs_idfy_ctrlr_2),
+    ("iosizes", _xnvme_spec_fs_idfy_ctrlr_3),
+    ("rsvd", ctypes.c_uint8 * 3509),
+    ("ac", ctypes.c_uint8),
+    ("dc", ctypes.c_uint8),
+]
+
+xnvme_spec_fs_idfy_ns._fields_ = [
+    ("nsze", ctypes.c_uint64),
+    ("ncap", ctypes.c_uint64),
+    ("nuse", ctypes.c_uint64),
+    ("rsvd", ctypes.c_uint8 * 3816),
+    ("vendor_specific", ctypes.c_uint8 * 254),
+    ("ac", ctypes.c_uint8),
+    ("dc", ctypes.c_uint8),
+]
+
+xnvme_spec_log_erri_entry._fields_ = [
+    ("ecnt", ctypes.c_uint64),
+    ("sqid", ctypes.c_uint16),
+    ("cid", ctypes.c_uint16),
+    ("status", xnvme_spec_status),
+    ("eloc", ctypes.c_uint16),
+    ("lba", ctypes.c_uint64),
+    ("nsid", ctypes.c_uint32),
+    ("ven_si", ctypes.c_uint8),
+    ("trtype", ctypes.c_uint8),
+    ("reserved30", ctypes.c_uint8 * 2),
+    ("cmd_si", ctypes.c_uint64),
+    ("trtype_si", ctypes.c_uint16),
+    ("reserved42", ctypes.c_uint8 * 22),
+]
+
+xnvme_spec_log_health_entry._pack_ = 1
+xnvme_spec_log_health_entry._fields_ = [
+    ("crit_warn", ctypes.c_uint8),
+    ("comp_temp", ctypes.c_uint16),
+    ("avail_spare", ctypes.c_uint8),
+    ("avail_spare_thresh", ctypes.c_uint8),
+    ("pct_used", ctypes.c_uint8),
+    ("eg_crit_warn_sum", ctypes.c_uint8),
+    ("rsvd8", ctypes.c_uint8 * 25),
+    ("data_units_read", ctypes.c_uint8 * 16),
+    ("data_units_written", ctypes.c_uint8 * 16),
+    ("host_read_cmds", ctypes.c_uint8 * 16),
+    ("host_write_cmds", ctypes.c_uint8 * 16),
+    ("ctrlr_busy_time", ctypes.c_uint8 * 16),
+    ("pwr_cycles", ctypes.c_uint8 * 16),
+    ("pwr_on_hours", ctypes.c_uint8 * 16),
+    ("unsafe_shutdowns", ctypes.c_uint8 * 16),
+    ("mdi_errs", ctypes.c_uint8 * 16),
+    ("nr_err_logs", ctypes.c_uint8 * 16),
+    ("warn_comp_temp_time", ctypes.c_uint32),
+    ("crit_comp_temp_time", ctypes.c_uint32),
+    ("temp_sens", ctypes.c_uint16 * 8),
+    ("tmt1tc", ctypes.c_uint32),
+    ("tmt2tc", ctypes.c_uint32),
+    ("tttmt1", ctypes.c_uint32),
+    ("tttmt2", ctypes.c_uint32),
+    ("rsvd", ctypes.c_uint8 * 280),
+]
+
+xnvme_spec_nvm_cmd._anonymous_ = ["_xnvme_spec_nvm_cmd_0"]
+xnvme_spec_nvm_cmd._fields_ = [
+    ("_xnvme_spec_nvm_cmd_0", _xnvme_spec_nvm_cmd_0),
+]
+
+xnvme_spec_nvm_cmd_scopy_fmt_srclen._fields_ = [
+    ("start", ctypes.c_uint64),
+    ("len", ctypes.c_uint64),
+]
+
+xnvme_spec_nvm_idfy._anonymous_ = ["_xnvme_spec_nvm_idfy_0"]
+xnvme_spec_nvm_idfy._fields_ = [
+    ("_xnvme_spec_nvm_idfy_0", _xnvme_spec_nvm_idfy_0),
+]
+
+xnvme_spec_nvm_scopy_fmt_zero._fields_ = [
+    ("rsvd0", ctypes.c_uint8 * 8),
+    ("slba", ctypes.c_uint64),
+    ("nlb", ctypes.c_uint32, 16),
+    ("rsvd20", ctypes.c_uint32, 16),
+    ("eilbrt", ctypes.c_uint32),
+    ("elbatm", ctypes.c_uint32),
+    ("elbat", ctypes.c_uint32),
+]
+
+xnvme_spec_nvm_scopy_source_range._fields_ = [
+    ("entry", xnvme_spec_nvm_scopy_fmt_zero * 128),
+]
+
+xnvme_spec_znd_descr._fields_ = [
+    ("zt", ctypes.c_uint8, 4),
+    ("rsvd0", ctypes.c_uint8, 4),
+    ("rsvd1", ctypes.c_uint8, 4),
+    ("zs", ctypes.c_uint8, 4),
+    ("za", _xnvme_spec_znd_descr_0),
+    ("rsvd7", ctypes.c_uint8 * 5),
+    ("zcap", ctypes.c_uint64),
+    ("zslba", ctypes.c_uint64),
+    ("wp", ctypes.c_uint64),
+    ("rsvd63", ctypes.c_uint8 * 32),
+]
+
+xnvme_spec_znd_idfy._anonymous_ = ["_xnvme_spec_znd_idfy_0"]
+xnvme_spec_znd_idfy._fields_ = [
+    ("_xnvme_spec_znd_idfy_0", _xnvme_spec_znd_idfy_0),
+]
+
+xnvme_spec_znd_log_changes._fields_ = [
+    ("nidents", ctypes.c_uint16),
+    ("rsvd2", ctypes.c_uint8 * 6),
+    ("idents", ctypes.c_uint64 * 511),
+]
+
+xnvme_spec_znd_report_hdr._fields_ = [
+    ("nzones", ctypes.c_uint64),
+    ("rsvd", ctypes.c_uint8 * 56),
+]
+
+xnvme_timer._fields_ = [
+    ("start", ctypes.c_uint64),
+    ("stop", ctypes.c_uint64),
+]
+
+xnvme_znd_report._fields_ = [
+    ("nzones", ctypes.c_uint64),
+    ("zd_nbytes", ctypes.c_uint32),
+    ("zdext_nbytes", ctypes.c_uint32),
+    ("zslba", ctypes.c_uint64),
+    ("zelba", ctypes.c_uint64),
+    ("nentries", ctypes.c_uint32),
+    ("extended", ctypes.c_uint8),
+    ("_pad", ctypes.c_uint8 * 3),
+    ("zrent_nbytes", ctypes.c_uint64),
+    ("report_nbytes", ctypes.c_uint64),
+    ("entries_nbytes", ctypes.c_uint64),
+    ("storage", ctypes.c_uint8 * 0),
+]
+
+SIZES = {
+    "xnvme_geo": 64,
+    "xnvme_ident": 396,
+    "xnvme_spec_cmd": 64,
+    "xnvme_spec_cmd_common": 64,
+    "xnvme_spec_cmd_format": 64,
+    "xnvme_spec_cmd_gfeat": 64,
+    "xnvme_spec_cmd_idfy": 64,
+    "xnvme_spec_cmd_log": 64,
+    "xnvme_spec_cmd_nvm": 64,
+    "xnvme_spec_cmd_sanitize": 64,
+    "xnvme_spec_cmd_sfeat": 64,
+    "xnvme_spec_cpl": 16,
+    "xnvme_spec_cs_vector": 8,
+    "xnvme_spec_feat": 4,
+    "xnvme_spec_fs_idfy_ctrlr": 4096,
+    "xnvme_spec_fs_idfy_ns": 4096,
+    "xnvme_spec_idfy": 4096,
+    "xnvme_spec_idfy_cs": 4096,
+    "xnvme_spec_idfy_ctrlr": 4096,
+    "xnvme_spec_idfy_ns": 4096,
+    "xnvme_spec_lbaf": 4,
+    "xnvme_spec_log_erri_entry": 64,
+    "xnvme_spec_log_health_entry": 512,
+    "xnvme_spec_nvm_cmd": 64,
+    "xnvme_spec_nvm_cmd_scopy": 64,
+    "xnvme_spec_nvm_idfy": 4096,
+    "xnvme_spec_nvm_idfy_ctrlr": 4096,
+    "xnvme_spec_nvm_idfy_ns": 4096,
+    "xnvme_spec_nvm_scopy_fmt_zero": 32,
+    "xnvme_spec_nvm_scopy_source_range": 4096,
+    "xnvme_spec_nvm_write_zeroes": 64,
+    "xnvme_spec_power_state": 32,
+    "xnvme_spec_sgl_descriptor": 16,
+    "xnvme_spec_status": 2,
+    "xnvme_spec_vs_register": 4,
+    "xnvme_spec_znd_cmd": 64,
+    "xnvme_spec_znd_cmd_append": 64,
+    "xnvme_spec_znd_cmd_mgmt_recv": 64,
+    "xnvme_spec_znd_cmd_mgmt_send": 64,
+    "xnvme_spec_znd_descr": 64,
+    "xnvme_spec_znd_idfy": 4096,
+    "xnvme_spec_znd_idfy_ctrlr": 4096,
+    "xnvme_spec_znd_idfy_lbafe": 16,
+    "xnvme_spec_znd_idfy_ns": 4096,
+    "xnvme_spec_znd_log_changes": 4096,
+    "xnvme_spec_znd_report_hdr": 64,
+    "xnvme_znd_report": 64,
+}
+
+PROTOTYPES = {
+    "xnvme_3p_ver_fpr": (ctypes.c_int, [ctypes.c_void_p, ctypes.POINTER(ctypes.c_char_p), ctypes.c_int]),
+    "xnvme_3p_ver_pr": (ctypes.c_int, [ctypes.POINTER(ctypes.c_char_p), ctypes.c_int]),
+    "xnvme_adm_format": (ctypes.c_int, [ctypes.POINTER(xnvme_cmd_ctx), ctypes.c_uint32, ctypes.c_uint8, ctypes.c_uint8, ctypes.c_uint8, ctypes.c_uint8, ctypes.c_uint8, ctypes.c_uint8]),
+    "xnvme_adm_gfeat": (ctypes.c_int, [ctypes.POINTER(xnvme_cmd_ctx), ctypes.c_uint32, ctypes.c_uint8, ctypes.c_uint8, ctypes.c_void_p, ctypes.c_size_t]),
+    "xnvme_adm_idfy": (ctypes.c_int, [ctypes.POINTER(xnvme_cmd_ctx), ctypes.c_uint8, ctypes.c_uint16, ctypes.c_uint8, ctypes.c_uint16, ctypes.c_uint8, ctypes.POINTER(xnvme_spec_idfy)]),
+    "xnvme_adm_idfy_ctrlr": (ctypes.c_int, [ctypes.POINTER(xnvme_cmd_ctx), ctypes.POINTER(xnvme_spec_idfy)]),
+    "xnvme_adm_idfy_ctrlr_csi": (ctypes.c_int, [ctypes.POINTER(xnvme_cmd_ctx), ctypes.c_uint8, ctypes.POINTER(xnvme_spec_idfy)]),
+    "xnvme_adm_idfy_ns": (ctypes.c_int, [ctypes.POINTER(xnvme_cmd_ctx), ctypes.c_uint32, ctypes.POINTER(xnvme_spec_idfy)]),
+    "xnvme_adm_idfy_ns_csi": (ctypes.c_int, [ctypes.POINTER(xnvme_cmd_ctx), ctypes.c_uint32, ctypes.c_uint8, ctypes.POINTER(xnvme_spec_idfy)]),
+    "xnvme_adm_log": (ctypes.c_int, [ctypes.POINTER(xnvme_cmd_ctx), ctypes.c_uint8, ctypes.c_uint8, ctypes.c_uint64, ctypes.c_uint32, ctypes.c_uint8, ctypes.c_void_p, ctypes.c_uint32]),
+    "xnvme_adm_sfeat": (ctypes.c_int, [ctypes.POINTER(xnvme_cmd_ctx), ctypes.c_uint32, ctypes.c_uint8, ctypes.c_uint32, ctypes.c_uint8, ctypes.c_void_p, ctypes.c_size_t]),
+    "xnvme_be_attr_fpr": (ctypes.c_int, [ctypes.c_void_p, ctypes.POINTER(xnvme_be_attr), ctypes.c_int]),
+    "xnvme_be_attr_list_bundled": (ctypes.c_int, [ctypes.POINTER(ctypes.POINTER(xnvme_be_attr_list))]),
+    "xnvme_be_attr_list_fpr": (ctypes.c_int, [ctypes.c_void_p, ctypes.POINTER(xnvme_be_attr_list), ctypes.c_int]),
+    "xnvme_be_attr_list_pr": (ctypes.c_int, [ctypes.POINTER(xnvme_be_attr_list), ctypes.c_int]),
+    "xnvme_be_attr_pr": (ctypes.c_int, [ctypes.POINTER(xnvme_be_attr), ctypes.c_int]),
+    "xnvme_buf_alloc": (ctypes.c_void_p, [ctypes.c_void_p, ctypes.c_size_t]),
+    "xnvme_buf_free": (None, [ctypes.c_void_p, ctypes.c_void_p]),
+    "xnvme_buf_phys_alloc": (ctypes.c_void_p, [ctypes.c_void_p, ctypes.c_size_t, ctypes.POINTER(ctypes.c_uint64)]),
+    "xnvme_buf_phys_free": (None, [ctypes.c_void_p, ctypes.c_void_p]),
+    "xnvme_buf_phys_realloc": (ctypes.c_void_p, [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t, ctypes.POINTER(ctypes.c_uint64)]),
+    "xnvme_buf_realloc": (ctypes.c_void_p, [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t]),
+    "xnvme_buf_virt_alloc": (ctypes.c_void_p, [ctypes.c_size_t, ctypes.c_size_t]),
+    "xnvme_buf_virt_free": (None, [ctypes.c_void_p]),
+    "xnvme_buf_vtophys": (ctypes.c_int, [ctypes.c_void_p, ctypes.c_void_p, ctypes.POINTER(ctypes.c_uint64)]),
+    "xnvme_cmd_ctx_clear": (None, [ctypes.POINTER(xnvme_cmd_ctx)]),
+    "xnvme_cmd_ctx_from_dev": (xnvme_cmd_ctx, [ctypes.c_void_p]),
+    "xnvme_cmd_ctx_from_queue": (ctypes.POINTER(xnvme_cmd_ctx), [ctypes.c_void_p]),
+    "xnvme_cmd_ctx_pr": (None, [ctypes.POINTER(xnvme_cmd_ctx), ctypes.c_int]),
+    "xnvme_cmd_pass": (ctypes.c_int, [ctypes.POINTER(xnvme_cmd_ctx), ctypes.c_void_p, ctypes.c_size_t, ctypes.c_void_p, ctypes.c_size_t]),
+    "xnvme_cmd_pass_admin": (ctypes.c_int, [ctypes.POINTER(xnvme_cmd_ctx), ctypes.c_void_p, ctypes.c_size_t, ctypes.c_void_p, ctypes.c_size_t]),
+    "xnvme_dev_close": (None, [ctypes.c_void_p]),
+    "xnvme_dev_fpr": (ctypes.c_int, [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_int]),
+    "xnvme_dev_get_be_state": (ctypes.c_void_p, [ctypes.c_void_p]),
+    "xnvme_dev_get_csi": (ctypes.c_uint8, [ctypes.c_void_p]),
+    "xnvme_dev_get_ctrlr": (ctypes.POINTER(xnvme_spec_idfy_ctrlr), [ctypes.c_void_p]),
+    "xnvme_dev_get_ctrlr_css": (ctypes.POINTER(xnvme_spec_idfy_ctrlr), [ctypes.c_void_p]),
+    "xnvme_dev_get_geo": (ctypes.POINTER(xnvme_geo), [ctypes.c_void_p]),
+    "xnvme_dev_get_ident": (ctypes.POINTER(xnvme_ident), [ctypes.c_void_p]),
+    "xnvme_dev_get_ns": (ctypes.POINTER(xnvme_spec_idfy_ns), [ctypes.c_void_p]),
+    "xnvme_dev_get_ns_css": (ctypes.POINTER(xnvme_spec_idfy_ns), [ctypes.c_void_p]),
+    "xnvme_dev_get_nsid": (ctypes.c_uint32, [ctypes.c_void_p]),
+    "xnvme_dev_get_ssw": (ctypes.c_uint64, [ctypes.c_void_p]),
+    "xnvme_dev_open": (ctypes.c_void_p, [ctypes.c_char_p, ctypes.POINTER(xnvme_opts)]),
+    "xnvme_dev_pr": (ctypes.c_int, [ctypes.c_void_p, ctypes.c_int]),
+    "xnvme_enumerate": (ctypes.c_int, [ctypes.c_char_p, ctypes.POINTER(xnvme_opts), xnvme_enumerate_cb, ctypes.c_void_p]),
+    "xnvme_enumeration_fpp": (ctypes.c_int, [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_int]),
+    "xnvme_enumeration_fpr": (ctypes.c_int, [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_int]),
+    "xnvme_enumeration_pp": (ctypes.c_int, [ctypes.c_void_p, ctypes.c_int]),
+    "xnvme_enumeration_pr": (ctypes.c_int, [ctypes.c_void_p, ctypes.c_int]),
+    "xnvme_file_close": (ctypes.c_int, [ctypes.c_void_p]),
+    "xnvme_file_get_cmd_ctx": (xnvme_cmd_ctx, [ctypes.c_void_p]),
+    "xnvme_file_open": (ctypes.c_void_p, [ctypes.c_char_p, ctypes.POINTER(xnvme_opts)]),
+    "xnvme_file_pread": (ctypes.c_int, [ctypes.POINTER(xnvme_cmd_ctx), ctypes.c_void_p, ctypes.c_size_t, ctypes.c_int64]),
+    "xnvme_file_pwrite": (ctypes.c_int, [ctypes.POINTER(xnvme_cmd_ctx), ctypes.c_void_p, ctypes.c_size_t, ctypes.c_int64]),
+    "xnvme_file_sync": (ctypes.c_int, [ctypes.c_void_p]),
+    "xnvme_geo_fpr": (ctypes.c_int, [ctypes.c_void_p, ctypes.POINTER(xnvme_geo), ctypes.c_int]),
+    "xnvme_geo_pr": (ctypes.c_int, [ctypes.POINTER(xnvme_geo), ctypes.c_int]),
+    "xnvme_ident_fpr": (ctypes.c_int, [ctypes.c_void_p, ctypes.POINTER(xnvme_ident), ctypes.c_int]),
+    "xnvme_ident_from_uri": (ctypes.c_int, [ctypes.c_char_p, ctypes.POINTER(xnvme_ident)]),
+    "xnvme_ident_pr": (ctypes.c_int, [ctypes.POINTER(xnvme_ident), ctypes.c_int]),
+    "xnvme_lba_fpr": (ctypes.c_int, [ctypes.c_void_p, ctypes.c_uint64, ctypes.c_int]),
+    "xnvme_lba_fprn": (ctypes.c_int, [ctypes.c_void_p, ctypes.POINTER(ctypes.c_uint64), ctypes.c_uint16, ctypes.c_int]),
+    "xnvme_lba_pr": (ctypes.c_int, [ctypes.c_uint64, ctypes.c_int]),
+    "xnvme_lba_prn": (ctypes.c_int, [ctypes.POINTER(ctypes.c_uint64), ctypes.c_uint16, ctypes.c_int]),
+    "xnvme_lba_range_fpr": (ctypes.c_int, [ctypes.c_void_p, ctypes.POINTER(xnvme_lba_range), ctypes.c_int]),
+    "xnvme_lba_range_from_offset_nbytes": (xnvme_lba_range, [ctypes.c_void_p, ctypes.c_uint64, ctypes.c_uint64]),
+    "xnvme_lba_range_from_slba_elba": (xnvme_lba_range, [ctypes.c_void_p, ctypes.c_uint64, ctypes.c_uint64]),
+    "xnvme_lba_range_from_slba_naddrs": (xnvme_lba_range, [ctypes.c_void_p, ctypes.c_uint64, ctypes.c_uint64]),
+    "xnvme_lba_range_from_zdescr": (xnvme_lba_range, [ctypes.c_void_p, ctypes.POINTER(xnvme_spec_znd_descr)]),
+    "xnvme_lba_range_pr": (ctypes.c_int, [ctypes.POINTER(xnvme_lba_range), ctypes.c_int]),
+    "xnvme_nvm_read": (ctypes.c_int, [ctypes.POINTER(xnvme_cmd_ctx), ctypes.c_uint32, ctypes.c_uint64, ctypes.c_uint16, ctypes.c_void_p, ctypes.c_void_p]),
+    "xnvme_nvm_sanitize": (ctypes.c_int, [ctypes.POINTER(xnvme_cmd_ctx), ctypes.c_uint8, ctypes.c_uint8, ctypes.c_uint32, ctypes.c_uint8, ctypes.c_uint8, ctypes.c_uint8]),
+    "xnvme_nvm_scopy": (ctypes.c_int, [ctypes.POINTER(xnvme_cmd_ctx), ctypes.c_uint32, ctypes.c_uint64, ctypes.POINTER(xnvme_spec_nvm_scopy_fmt_zero), ctypes.c_uint8, ctypes.c_int]),
+    "xnvme_nvm_write": (ctypes.c_int, [ctypes.POINTER(xnvme_cmd_ctx), ctypes.c_uint32, ctypes.c_uint64, ctypes.c_uint16, ctypes.c_void_p, ctypes.c_void_p]),
+    "xnvme_nvm_write_uncorrectable": (ctypes.c_int, [ctypes.POINTER(xnvme_cmd_ctx), ctypes.c_uint32, ctypes.c_uint64, ctypes.c_uint16]),
+    "xnvme_nvm_write_zeroes": (ctypes.c_int, [ctypes.POINTER(xnvme_cmd_ctx), ctypes.c_uint32, ctypes.c_uint64, ctypes.c_uint16]),
+    "xnvme_opts_default": (xnvme_opts, []),
+    "xnvme_queue_get_capacity": (ctypes.c_uint32, [ctypes.c_void_p]),
+    "xnvme_queue_get_cmd_ctx": (ctypes.POINTER(xnvme_cmd_ctx), [ctypes.c_void_p]),
+    "xnvme_queue_get_outstanding": (ctypes.c_uint32, [ctypes.c_void_p]),
+    "xnvme_queue_init": (ctypes.c_int, [ctypes.c_void_p, ctypes.c_uint16, ctypes.c_int, ctypes.POINTER(ctypes.c_void_p)]),
+    "xnvme_queue_poke": (ctypes.c_int, [ctypes.c_void_p, ctypes.c_uint32]),
+    "xnvme_queue_put_cmd_ctx": (ctypes.c_int, [ctypes.c_void_p, ctypes.POINTER(xnvme_cmd_ctx)]),
+    "xnvme_queue_set_cb": (ctypes.c_int, [ctypes.c_void_p, xnvme_queue_cb, ctypes.c_void_p]),
+    "xnvme_queue_term": (ctypes.c_int, [ctypes.c_void_p]),
+    "xnvme_queue_wait": (ctypes.c_int, [ctypes.c_void_p]),
+    "xnvme_sgl_add": (ctypes.c_int, [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t]),
+    "xnvme_sgl_alloc": (ctypes.c_void_p, [ctypes.c_void_p]),
+    "xnvme_sgl_create": (ctypes.c_void_p, [ctypes.c_void_p, ctypes.c_int]),
+    "xnvme_sgl_destroy": (None, [ctypes.c_void_p, ctypes.c_void_p]),
+    "xnvme_sgl_free": (None, [ctypes.c_void_p, ctypes.c_void_p]),
+    "xnvme_sgl_pool_create": (ctypes.c_void_p, [ctypes.c_void_p]),
+    "xnvme_sgl_pool_destroy": (None, [ctypes.c_void_p]),
+    "xnvme_sgl_reset": (None, [ctypes.c_void_p]),
+    "xnvme_spec_adm_opc_str": (ctypes.c_char_p, [ctypes.c_int]),
+    "xnvme_spec_cmd_fpr": (ctypes.c_int, [ctypes.c_void_p, ctypes.POINTER(xnvme_spec_cmd), ctypes.c_int]),
+    "xnvme_spec_cmd_pr": (ctypes.c_int, [ctypes.POINTER(xnvme_spec_cmd), ctypes.c_int]),
+    "xnvme_spec_csi_str": (ctypes.c_char_p, [ctypes.c_int]),
+    "xnvme_spec_feat_fpr": (ctypes.c_int, [ctypes.c_void_p, ctypes.c_uint8, xnvme_spec_feat, ctypes.c_int]),
+    "xnvme_spec_feat_id_str": (ctypes.c_char_p, [ctypes.c_int]),
+    "xnvme_spec_feat_pr": (ctypes.c_int, [ctypes.c_uint8, xnvme_spec_feat, ctypes.c_int]),
+    "xnvme_spec_feat_sel_str": (ctypes.c_char_p, [ctypes.c_int]),
+    "xnvme_spec_flag_str": (ctypes.c_char_p, [ctypes.c_int]),
+    "xnvme_spec_idfy_cns_str": (ctypes.c_char_p, [ctypes.c_int]),
+    "xnvme_spec_idfy_cs_fpr": (ctypes.c_int, [ctypes.c_void_p, ctypes.POINTER(xnvme_spec_idfy_cs), ctypes.c_int]),
+    "xnvme_spec_idfy_cs_pr": (ctypes.c_int, [ctypes.POINTER(xnvme_spec_idfy_cs), ctypes.c_int]),
+    "xnvme_spec_idfy_ctrl_fpr": (ctypes.c_int, [ctypes.c_void_p, ctypes.POINTER(xnvme_spec_idfy_ctrlr), ctypes.c_int]),
+    "xnvme_spec_idfy_ctrl_pr": (ctypes.c_int, [ctypes.POINTER(xnvme_spec_idfy_ctrlr), ctypes.c_int]),
+    "xnvme_spec_idfy_ctrlr_fpr": (ctypes.c_int, [ctypes.c_void_p, ctypes.POINTER(xnvme_spec_nvm_idfy_ctrlr), ctypes.c_int]),
+    "xnvme_spec_idfy_ns_fpr": (ctypes.c_int, [ctypes.c_void_p, ctypes.POINTER(xnvme_spec_idfy_ns), ctypes.c_int]),
+    "xnvme_spec_idfy_ns_pr": (ctypes.c_int, [ctypes.POINTER(xnvme_spec_idfy_ns), ctypes.c_int]),
+    "xnvme_spec_log_erri_fpr": (ctypes.c_int, [ctypes.c_void_p, ctypes.POINTER(xnvme_spec_log_erri_entry), ctypes.c_int, ctypes.c_int]),
+    "xnvme_spec_log_erri_pr": (ctypes.c_int, [ctypes.POINTER(xnvme_spec_log_erri_entry), ctypes.c_int, ctypes.c_int]),
+    "xnvme_spec_log_health_fpr": (ctypes.c_int, [ctypes.c_void_p, ctypes.POINTER(xnvme_spec_log_health_entry), ctypes.c_int]),
+    "xnvme_spec_log_health_pr": (ctypes.c_int, [ctypes.POINTER(xnvme_spec_log_health_entry), ctypes.c_int]),
+    "xnvme_spec_log_lpi_str": (ctypes.c_char_p, [ctypes.c_int]),
+    "xnvme_spec_nvm_cmd_cpl_sc_str": (ctypes.c_char_p, [ctypes.c_int]),
+    "xnvme_spec_nvm_idfy_ctrlr_pr": (ctypes.c_int, [ctypes.POINTER(xnvme_spec_nvm_idfy_ctrlr), ctypes.c_int]),
+    "xnvme_spec_nvm_idfy_ns_fpr": (ctypes.c_int, [ctypes.c_void_p, ctypes.POINTER(xnvme_spec_nvm_idfy_ns), ctypes.c_int]),
+    "xnvme_spec_nvm_idfy_ns_pr": (ctypes.c_int, [ctypes.POINTER(xnvme_spec_nvm_idfy_ns), ctypes.c_int]),
+    "xnvme_spec_nvm_opc_str": (ctypes.c_char_p, [ctypes.c_int]),
+    "xnvme_spec_nvm_scopy_fmt_zero_fpr": (ctypes.c_int, [ctypes.c_void_p, ctypes.POINTER(xnvme_spec_nvm_scopy_fmt_zero), ctypes.c_int]),
+    "xnvme_spec_nvm_scopy_fmt_zero_pr": (ctypes.c_int, [ctypes.POINTER(xnvme_spec_nvm_scopy_fmt_zero), ctypes.c_int]),
+    "xnvme_spec_nvm_scopy_source_range_fpr": (ctypes.c_int, [ctypes.c_void_p, ctypes.POINTER(xnvme_spec_nvm_scopy_source_range), ctypes.c_uint8, ctypes.c_int]),
+    "xnvme_spec_nvm_scopy_source_range_pr": (ctypes.c_int, [ctypes.POINTER(xnvme_spec_nvm_scopy_source_range), ctypes.c_uint8, ctypes.c_int]),
+    "xnvme_spec_psdt_str": (ctypes.c_char_p, [ctypes.c_int]),
+    "xnvme_spec_sgl_descriptor_subtype_str": (ctypes.c_char_p, [ctypes.c_int]),
+    "xnvme_spec_znd_cmd_mgmt_recv_action_sf_str": (ctypes.c_char_p, [ctypes.c_int]),
+    "xnvme_spec_znd_cmd_mgmt_recv_action_str": (ctypes.c_char_p, [ctypes.c_int]),
+    "xnvme_spec_znd_cmd_mgmt_send_action_str": (ctypes.c_char_p, [ctypes.c_int]),
+    "xnvme_spec_znd_descr_fpr": (ctypes.c_int, [ctypes.c_void_p, ctypes.POINTER(xnvme_spec_znd_descr), ctypes.c_int]),
+    "xnvme_spec_znd_descr_fpr_yaml": (ctypes.c_int, [ctypes.c_void_p, ctypes.POINTER(xnvme_spec_znd_descr), ctypes.c_int, ctypes.c_char_p]),
+    "xnvme_spec_znd_descr_pr": (ctypes.c_int, [ctypes.POINTER(xnvme_spec_znd_descr), ctypes.c_int]),
+    "xnvme_spec_znd_idfy_ctrlr_fpr": (ctypes.c_int, [ctypes.c_void_p, ctypes.POINTER(xnvme_spec_znd_idfy_ctrlr), ctypes.c_int]),
+    "xnvme_spec_znd_idfy_ctrlr_pr": (ctypes.c_int, [ctypes.POINTER(xnvme_spec_znd_idfy_ctrlr), ctypes.c_int]),
+    "xnvme_spec_znd_idfy_lbafe_fpr": (ctypes.c_int, [ctypes.c_void_p, ctypes.POINTER(xnvme_spec_znd_idfy_lbafe), ctypes.c_int]),
+    "xnvme_spec_znd_idfy_ns_fpr": (ctypes.c_int, [ctypes.c_void_p, ctypes.POINTER(xnvme_spec_znd_idfy_ns), ctypes.c_int]),
+    "xnvme_spec_znd_idfy_ns_pr": (ctypes.c_int, [ctypes.POINTER(xnvme_spec_znd_idfy_ns), ctypes.c_int]),
+    "xnvme_spec_znd_log_changes_fpr": (ctypes.c_int, [ctypes.c_void_p, ctypes.POINTER(xnvme_spec_znd_log_changes), ctypes.c_int]),
+    "xnvme_spec_znd_log_changes_pr": (ctypes.c_int, [ctypes.POINTER(xnvme_spec_znd_log_changes), ctypes.c_int]),
+    "xnvme_spec_znd_log_lid_str": (ctypes.c_char_p, [ctypes.c_int]),
+    "xnvme_spec_znd_mgmt_send_action_so_str": (ctypes.c_char_p, [ctypes.c_int]),
+    "xnvme_spec_znd_opc_str": (ctypes.c_char_p, [ctypes.c_int]),
+    "xnvme_spec_znd_report_hdr_fpr": (ctypes.c_int, [ctypes.c_void_p, ctypes.POINTER(xnvme_spec_znd_report_hdr), ctypes.c_int]),
+    "xnvme_spec_znd_report_hdr_pr": (ctypes.c_int, [ctypes.POINTER(xnvme_spec_znd_report_hdr), ctypes.c_int]),
+    "xnvme_spec_znd_state_str": (ctypes.c_char_p, [ctypes.c_int]),
+    "xnvme_spec_znd_status_code_str": (ctypes.c_char_p, [ctypes.c_int]),
+    "xnvme_spec_znd_type_str": (ctypes.c_char_p, [ctypes.c_int]),
+    "xnvme_ver_fpr": (ctypes.c_int, [ctypes.c_void_p, ctypes.c_int]),
+    "xnvme_ver_major": (ctypes.c_int, []),
+    "xnvme_ver_minor": (ctypes.c_int, []),
+    "xnvme_ver_patch": (ctypes.c_int, []),
+    "xnvme_ver_pr": (ctypes.c_int, [ctypes.c_int]),
+    "xnvme_znd_append": (ctypes.c_int, [ctypes.POINTER(xnvme_cmd_ctx), ctypes.c_uint32, ctypes.c_uint64, ctypes.c_uint16, ctypes.c_void_p, ctypes.c_void_p]),
+    "xnvme_znd_descr_from_dev": (ctypes.c_int, [ctypes.c_void_p, ctypes.c_uint64, ctypes.POINTER(xnvme_spec_znd_descr)]),
+    "xnvme_znd_descr_from_dev_in_state": (ctypes.c_int, [ctypes.c_void_p, ctypes.c_int, ctypes.POINTER(xnvme_spec_znd_descr)]),
+    "xnvme_znd_dev_get_ctrlr": (ctypes.POINTER(xnvme_spec_znd_idfy_ctrlr), [ctypes.c_void_p]),
+    "xnvme_znd_dev_get_lbafe": (ctypes.POINTER(xnvme_spec_znd_idfy_lbafe), [ctypes.c_void_p]),
+    "xnvme_znd_dev_get_ns": (ctypes.POINTER(xnvme_spec_znd_idfy_ns), [ctypes.c_void_p]),
+    "xnvme_znd_log_changes_from_dev": (ctypes.POINTER(xnvme_spec_znd_log_changes), [ctypes.c_void_p]),
+    "xnvme_znd_mgmt_recv": (ctypes.c_int, [ctypes.POINTER(xnvme_cmd_ctx), ctypes.c_uint32, ctypes.c_uint64, ctypes.c_int, ctypes.c_int, ctypes.c_uint8, ctypes.c_void_p, ctypes.c_uint32]),
+    "xnvme_znd_mgmt_send": (ctypes.c_int, [ctypes.POINTER(xnvme_cmd_ctx), ctypes.c_uint32, ctypes.c_uint64, ctypes.c_bool, ctypes.c_int, ctypes.c_int, ctypes.c_void_p]),
+    "xnvme_znd_report_find_arbitrary": (ctypes.c_int, [ctypes.POINTER(xnvme_znd_report), ctypes.c_int, ctypes.POINTER(ctypes.c_uint64), ctypes.c_int]),
+    "xnvme_znd_report_fpr": (ctypes.c_int, [ctypes.c_void_p, ctypes.POINTER(xnvme_znd_report), ctypes.c_int]),
+    "xnvme_znd_report_from_dev": (ctypes.POINTER(xnvme_znd_report), [ctypes.c_void_p, ctypes.c_uint64, ctypes.c_size_t, ctypes.c_uint8]),
+    "xnvme_znd_report_pr": (ctypes.c_int, [ctypes.POINTER(xnvme_znd_report), ctypes.c_int]),
+    "xnvme_znd_stat": (ctypes.c_int, [ctypes.c_void_p, ctypes.c_int, ctypes.POINTER(ctypes.c_uint64)]),
+    "xnvme_znd_zrwa_flush": (ctypes.c_int, [ctypes.POINTER(xnvme_cmd_ctx), ctypes.c_uint32, ctypes.c_uint64]),
+}
+
+def load(capi):
+    """Set argtypes and restype, on the given CDLL, for the functions in PROTOTYPES"""
+
+    for name, (restype, argtypes) in PROTOTYPES.items():
+        func = getattr(capi, name, None)
+        if func is None:  # Declared in the headers, not exported by the library
+            continue
+
+        func.restype = restype
+        func.argtypes = argtypes
+
+    return capi
@@ -0,0 +1,380 @@
+"""
+    OpenMetrics exporter
+
+    The SMART / Health Information and the Error Information log pages of
+    devices are polled, decoded, and served along with the counters of
+    QueueStats as OpenMetrics text, for Prometheus to scrape::
+
+        exporter = xnvme.Exporter(interval=15.0)
+        exporter.register("app", dev.queue.stats)
+        exporter.serve(("127.0.0.1", 9456))
+
+    The devices default to those given by xnvme.enumerate(). Each is opened
+    once and kept open, such that polling issues two admin commands per
+    device on its admin queue, and nothing is forked or opened per scrape.
+    Polling is done by a background thread every 'interval' seconds, and a
+    scrape renders the values of the last poll.
+
+    The exporter is also run from the command-line::
+
+        python3 -m xnvme.metrics --port 9456 --interval 15
+"""
+import argparse
+import ctypes
+import http.server
+import sys
+import threading
+
+from xnvme import (
+    CAPI,
+    XNVME_SPEC_LOG_ERRI,
+    XNVME_SPEC_LOG_HEALTH,
+    xnvme_spec_log_erri_entry,
+    xnvme_spec_log_health_entry,
+)
+from xnvme.buf import Buffer
+from xnvme.device import Device
+from xnvme.discovery import enumerate as enumerate_devices
+from xnvme.queue import CommandError, Completion, check
+from xnvme.stats import PERCENTILES
+
+XNVME_NSID_ALL = 0xFFFFFFFF
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# Metrics of the health log: the field, name, type, help and the factor to base units
+HEALTH_METRICS = [
+    ("crit_warn", "critical_warning", "gauge", "Critical warning bits", 1),
+    ("comp_temp", "temperature_celsius", "gauge", "Composite temperature", 1),
+    ("avail_spare", "available_spare_ratio", "gauge", "Available spare", 0.01),
+    ("avail_spare_thresh", "available_spare_threshold_ratio", "gauge",
+     "Available spare threshold", 0.01),
+    ("pct_used", "percentage_used_ratio", "gauge", "Endurance used", 0.01),
+    ("data_units_read", "data_read_bytes", "counter", "Data read", 512000),
+    ("data_units_written", "data_written_bytes", "counter", "Data written", 512000),
+    ("host_read_cmds", "host_read_commands", "counter", "Read commands completed", 1),
+    ("host_write_cmds", "host_write_commands", "counter", "Write commands completed", 1),
+    ("ctrlr_busy_time", "controller_busy_seconds", "counter", "Controller busy time", 60),
+    ("pwr_cycles", "power_cycles", "counter", "Power cycles", 1),
+    ("pwr_on_hours", "power_on_seconds", "counter", "Power on time", 3600),
+    ("unsafe_shutdowns", "unsafe_shutdowns", "counter", "Unsafe shutdowns", 1),
+    ("mdi_errs", "media_errors", "counter", "Media and data integrity errors", 1),
+    ("nr_err_logs", "error_log_entries", "counter", "Error information log entries", 1),
+    ("warn_comp_temp_time", "warning_temperature_seconds", "counter",
+     "Time above the warning composite temperature threshold", 60),
+    ("crit_comp_temp_time", "critical_temperature_seconds", "counter",
+     "Time above the critical composite temperature threshold", 60),
+]
+
+def value(field):
+    """Returns the value of a field of a log page, arrays of bytes as little-endian integers"""
+
+    if isinstance(field, ctypes.Array):
+        if field._type_ is ctypes.c_uint8:
+            return int.from_bytes(bytes(field), "little")
+        return list(field)
+
+    return field
+
+def get_log(dev, lid, struct, count=1):
+    """Returns 'count' of the 'struct' entries of the log page 'lid' of the Device 'dev'"""
+
+    nbytes = ctypes.sizeof(struct) * count
+    buf = Buffer(dev, nbytes)
+    try:
+        ctx = CAPI.xnvme_cmd_ctx_from_dev(dev)
+        check(
+            CAPI.xnvme_adm_log(
+                ctypes.byref(ctx), lid, 0, 0, XNVME_NSID_ALL, 0, buf.addr, nbytes
+            ),
+            "xnvme_adm_log"
+        )
+        if ctx.cpl.status.sc or ctx.cpl.status.sct:
+            raise CommandError(
+                Completion(None, ctx.cpl.status.sc, ctx.cpl.status.sct, ctx.cpl.cdw0, 0)
+            )
+        return (struct * count).from_buffer_copy(buf.view)
+    finally:
+        buf.close()
+
+def health(dev):
+    """Returns the fields of the SMART / Health Information log of 'dev', as a dict"""
+
+    entry = get_log(dev, XNVME_SPEC_LOG_HEALTH, xnvme_spec_log_health_entry)[0]
+
+    return dict(
+        (name, value(getattr(entry, name)))
+        for name, _ in xnvme_spec_log_health_entry._fields_ if not name.startswith("rsvd")
+    )
+
+def errors(dev, count=None):
+    """
+    Returns the used entries of the Error Information log of 'dev', as dicts,
+    reading 'count' entries, defaulting to the number supported by 'dev'
+    """
+
+    if count is None:
+        count = dev.ctrlr.elpe + 1 if dev.ctrlr else 1
+    entries = get_log(dev, XNVME_SPEC_LOG_ERRI, xnvme_spec_log_erri_entry, count)
+
+    return [
+        {
+            "ecnt": entry.ecnt, "sqid": entry.sqid, "cid": entry.cid,
+            "sc": entry.status.sc, "sct": entry.status.sct, "lba": entry.lba,
+            "nsid": entry.nsid,
+        }
+        for entry in entries if entry.ecnt
+    ]
+
+def escape(text):
+    """Returns 'text' escaped as a label value"""
+
+    return str(text).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+def render(families):
+    """
+    Returns the OpenMetrics text of 'families', (name, type, help, samples)
+    tuples, with samples being (suffix, labels, value) tuples
+    """
+
+    lines = []
+    for name, mtype, mhelp, samples in families:
+        lines.append("# TYPE %s %s" % (name, mtype))
+        lines.append("# HELP %s %s" % (name, mhelp))
+        for suffix, labels, val in samples:
+            lines.append("%s%s{%s} %s" % (name, suffix, ",".join(
+                "%s=\"%s\"" % (key, escape(lval)) for key, lval in sorted(labels.items())
+            ), val))
+    lines.append("# EOF")
+
+    return "\n".join(lines) + "\n"
+
+def stats_families(queues):
+    """Returns the metric families of the snapshots of the QueueStats by name in 'queues'"""
+
+    snaps = [(name, stats.snapshot()) for name, stats in sorted(queues.items())]
+    families = []
+    for key, mtype, mhelp in [
+            ("submitted", "counter", "Commands submitted"),
+            ("completed", "counter", "Commands completed"),
+            ("errors", "counter", "Commands completed with an error status"),
+            ("outstanding", "gauge", "Commands outstanding"),
+            ("outstanding_max", "gauge", "Most commands outstanding"),
+    ]:
+        families.append(("xnvme_queue_%s" % key, mtype, mhelp, [
+            ("_total" if mtype == "counter" else "", {"queue": name}, snap[key])
+            for name, snap in snaps
+        ]))
+
+    families.append(("xnvme_queue_bytes", "counter", "Bytes of the completed commands", [
+        ("_total", {"queue": name, "opcode": opcode}, nbytes)
+        for name, snap in snaps for opcode, nbytes in sorted(snap["bytes"].items())
+    ]))
+
+    samples = []
+    for name, snap in snaps:
+        for opcode, summary in sorted(snap["latency_usec"].items()):
+            labels = {"queue": name, "opcode": opcode}
+            for pct in PERCENTILES:
+                samples.append(("", dict(labels, quantile="%g" % (pct / 100)),
+                                summary["p%g" % pct] / 1e6))
+            samples.append(("_sum", labels, summary["sum"] / 1e6))
+            samples.append(("_count", labels, summary["count"]))
+    families.append((
+        "xnvme_queue_latency_seconds", "summary", "Latency of the completed commands", samples
+    ))
+
+    return families
+
+class Exporter(object):
+    """
+    Polls the health and error logs of the devices at 'uris', every 'interval'
+    seconds, and renders them, with the registered QueueStats, as OpenMetrics
+
+    The 'uris' default to the devices of xnvme.enumerate(), devices failing to
+    open are left out. Options for xnvme_dev_open() are given as keywords, as
+    for Device.
+    """
+
+    def __init__(self, uris=None, interval=10.0, **opts):
+        if uris is None:
+            uris = [info.uri for info in enumerate_devices(**opts)]
+
+        self.interval = interval
+        self.devices = []
+        for uri in uris:
+            try:
+                self.devices.append(Device(uri, **opts))
+            except OSError:
+                continue
+
+        self.queues = {}
+        self.polls = 0
+        self._logs = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._server = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def register(self, name, stats):
+        """Export the counters of the QueueStats 'stats', labelled queue='name'"""
+
+        with self._lock:
+            self.queues[name] = stats
+
+    def poll(self):
+        """Read the logs of the devices, a device failing to do so is exported as down"""
+
+        logs = {}
+        for dev in self.devices:
+            try:
+                logs[dev.uri] = (health(dev), errors(dev))
+            except OSError:
+                logs[dev.uri] = None
+
+        with self._lock:
+            self._logs = logs
+            self.polls += 1
+
+    def families(self):
+        """Returns the metric families of the last poll and of the registered QueueStats"""
+
+        with self._lock:
+            logs = dict(self._logs)
+            queues = dict(self.queues)
+
+        labels = dict(
+            (dev.uri, {"device": dev.uri, "serial": dev.serial, "model": dev.model})
+            for dev in self.devices
+        )
+        families = [("xnvme_device_up", "gauge", "Whether the logs of the device were read", [
+            ("", labels[uri], int(log is not None)) for uri, log in sorted(logs.items())
+        ])]
+        read = [(uri, log) for uri, log in sorted(logs.items()) if log is not None]
+
+        for field, name, mtype, mhelp, factor in HEALTH_METRICS:
+            families.append(("xnvme_%s" % name, mtype, mhelp, [
+                (
+                    "_total" if mtype == "counter" else "", labels[uri],
+                    (log[0][field] - 273 if field == "comp_temp" else log[0][field]) * factor
+                )
+                for uri, log in read
+            ]))
+        families.append((
+            "xnvme_temperature_sensor_celsius", "gauge", "Temperature sensors", [
+                ("", dict(labels[uri], sensor=str(idx + 1)), kelvin - 273)
+                for uri, log in read
+                for idx, kelvin in enumerate(log[0]["temp_sens"]) if kelvin
+            ]
+        ))
+        families.append(("xnvme_error_count", "gauge", "Highest error count logged", [
+            ("", labels[uri], max([entry["ecnt"] for entry in log[1]] or [0]))
+            for uri, log in read
+        ]))
+
+        return families + stats_families(queues)
+
+    def render(self):
+        """Returns the OpenMetrics text of the last poll and of the registered QueueStats"""
+
+        return render(self.families())
+
+    def start(self):
+        """Poll now, and every 'interval' seconds from a background thread"""
+
+        self.poll()
+
+        def run():
+            while not self._stop.wait(self.interval):
+                self.poll()
+
+        self._thread = threading.Thread(target=run, name="xnvme-metrics", daemon=True)
+        self._thread.start()
+
+    def serve(self, address=("127.0.0.1", 9456), block=False):
+        """
+        Start polling and serve the metrics over HTTP at 'address', from a
+        background thread, or from the calling one with 'block'
+        """
+
+        exporter = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            """Serves the metrics on any path"""
+
+            def do_GET(self):  # pylint: disable=invalid-name
+                """Respond with the rendered metrics"""
+
+                body = exporter.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):  # pylint: disable=arguments-differ
+                """Requests are not logged"""
+
+        if self._thread is None:
+            self.start()
+        self._server = http.server.ThreadingHTTPServer(address, Handler)
+        if block:
+            self._server.serve_forever()
+        else:
+            threading.Thread(
+                target=self._server.serve_forever, name="xnvme-metrics-http", daemon=True
+            ).start()
+
+        return self._server.server_address
+
+    def close(self):
+        """Stop polling and serving, and close the devices"""
+
+        self._stop.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        for dev in self.devices:
+            dev.close()
+        self.devices = []
+
+def parse_args(argv=None):
+    """Parse the command-line arguments"""
+
+    prsr = argparse.ArgumentParser(
+        prog="python3 -m xnvme.metrics", description="Serve device health as OpenMetrics"
+    )
+    prsr.add_argument("uri", nargs="*", help="Devices, defaulting to those enumerated")
+    prsr.add_argument("--address", default="127.0.0.1", help="Address to listen on")
+    prsr.add_argument("--port", type=int, default=9456, help="Port to listen on")
+    prsr.add_argument("--interval", type=float, default=10.0, help="Seconds between polls")
+    prsr.add_argument("--be", default=None, help="Backend, e.g. linux or spdk")
+
+    return prsr.parse_args(argv)
+
+def main(argv=None):
+    """Serve the metrics of the devices given on the command-line, until interrupted"""
+
+    args = parse_args(argv)
+
+    opts = {"be": args.be} if args.be else {}
+    with Exporter(args.uri or None, args.interval, **opts) as exporter:
+        try:
+            exporter.serve((args.address, args.port), block=True)
+        except KeyboardInterrupt:
+            pass
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
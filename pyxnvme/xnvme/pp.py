@@ -0,0 +1,361 @@
+"""
+    Structured values of the xNVMe structs printed by the pp-helpers
+
+    Autogenerated by scripts/pp/generator.py from: xnvme_structs.yaml
+
+    A <struct>_to_dict() function per struct returns the members printed by
+    the C <struct>_fpr() / _yaml() helpers, as Python values, from the ctypes
+    Structure of xnvme.libxnvme, e.g. the result of Device.ctrlr or of
+    xnvme_dev_get_geo(). Enums are given by their names, and 128-bit counters
+    as integers. Do not edit, re-generate with: make gen-pyxnvme-pp
+"""
+# pylint: disable=invalid-name,line-too-long,too-many-lines
+import ctypes
+
+from xnvme import libxnvme
+
+def enum(names, val):
+    """Returns the name of the enum-value 'val', in 'names', or 'val' when unknown"""
+
+    return names.get(val, val)
+
+def string(val):
+    """Returns the NUL-terminated, or padded, characters of 'val' as a str"""
+
+    if val is None:
+        return None
+    if not isinstance(val, bytes):
+        val = bytes(bytearray(item & 0xFF for item in val))
+
+    return val.split(b"\0", 1)[0].decode("ascii", "replace").rstrip()
+
+def uint(val):
+    """Returns the little-endian unsigned integer of the array of bytes 'val'"""
+
+    return int.from_bytes(bytes(val), "little")
+
+def value(val):
+    """Returns 'val' as Python values: structs and unions as dicts, arrays as lists"""
+
+    if isinstance(val, (ctypes.Structure, ctypes.Union)):
+        members = {}
+        for field in val._fields_:
+            if field[0] in getattr(val, "_anonymous_", []):
+                members.update(value(getattr(val, field[0])))
+            elif not field[0].startswith(("rsvd", "_rsvd", "reserved")):
+                members[field[0]] = value(getattr(val, field[0]))
+        return members
+    if isinstance(val, ctypes.Array):
+        return [value(item) for item in val]
+
+    return val
+
+def xnvme_geo_to_dict(geo):
+    """Returns the members of the 'struct xnvme_geo' 'geo' as a dict"""
+
+    return {
+        "type": enum(libxnvme.xnvme_geo_type, geo.type),
+        "npugrp": geo.npugrp,
+        "npunit": geo.npunit,
+        "nzone": geo.nzone,
+        "nsect": geo.nsect,
+        "nbytes": geo.nbytes,
+        "nbytes_oob": geo.nbytes_oob,
+        "tbytes": geo.tbytes,
+        "mdts_nbytes": geo.mdts_nbytes,
+        "lba_nbytes": geo.lba_nbytes,
+        "lba_extended": geo.lba_extended,
+    }
+
+def xnvme_ident_to_dict(ident):
+    """Returns the members of the 'struct xnvme_ident' 'ident' as a dict"""
+
+    return {
+        "uri": string(ident.uri),
+    }
+
+def xnvme_spec_log_erri_entry_to_dict(entry):
+    """Returns the members of the 'struct xnvme_spec_log_erri_entry' 'entry' as a dict"""
+
+    return {
+        "ecnt": entry.ecnt,
+        "sqid": entry.sqid,
+        "cid": entry.cid,
+        "status": value(entry.status),
+        "eloc": entry.eloc,
+        "lba": entry.lba,
+        "nsid": entry.nsid,
+        "ven_si": entry.ven_si,
+        "trtype": entry.trtype,
+        "cmd_si": entry.cmd_si,
+        "trtype_si": entry.trtype_si,
+    }
+
+def xnvme_spec_znd_descr_to_dict(descr):
+    """Returns the members of the 'struct xnvme_spec_znd_descr' 'descr' as a dict"""
+
+    return {
+        "zslba": descr.zslba,
+        "wp": descr.wp,
+        "zcap": descr.zcap,
+        "zt": descr.zt,
+        "zs": enum(libxnvme.xnvme_spec_znd_state, descr.zs),
+        "za": value(descr.za),
+    }
+
+def xnvme_spec_nvm_scopy_fmt_zero_to_dict(entry):
+    """Returns the members of the 'struct xnvme_spec_nvm_scopy_fmt_zero' 'entry' as a dict"""
+
+    return {
+        "slba": entry.slba,
+        "nlb": entry.nlb,
+        "eilbrt": entry.eilbrt,
+        "elbatm": entry.elbatm,
+        "elbat": entry.elbat,
+    }
+
+def xnvme_spec_log_health_entry_to_dict(log):
+    """Returns the members of the 'struct xnvme_spec_log_health_entry' 'log' as a dict"""
+
+    return {
+        "crit_warn": log.crit_warn,
+        "comp_temp": log.comp_temp,
+        "avail_spare": log.avail_spare,
+        "avail_spare_thresh": log.avail_spare_thresh,
+        "pct_used": log.pct_used,
+        "eg_crit_warn_sum": log.eg_crit_warn_sum,
+        "data_units_read": uint(log.data_units_read),
+        "data_units_written": uint(log.data_units_written),
+        "host_read_cmds": uint(log.host_read_cmds),
+        "host_write_cmds": uint(log.host_write_cmds),
+        "ctrlr_busy_time": uint(log.ctrlr_busy_time),
+        "pwr_cycles": uint(log.pwr_cycles),
+        "pwr_on_hours": uint(log.pwr_on_hours),
+        "unsafe_shutdowns": uint(log.unsafe_shutdowns),
+        "nr_err_logs": uint(log.nr_err_logs),
+        "warn_comp_temp_time": log.warn_comp_temp_time,
+        "crit_comp_temp_time": log.crit_comp_temp_time,
+        "temp_sens": value(log.temp_sens),
+        "tmt1tc": log.tmt1tc,
+        "tmt2tc": log.tmt2tc,
+        "tttmt1": log.tttmt1,
+        "tttmt2": log.tttmt2,
+    }
+
+def xnvme_spec_idfy_ctrlr_to_dict(idfy):
+    """Returns the members of the 'struct xnvme_spec_idfy_ctrlr' 'idfy' as a dict"""
+
+    return {
+        "vid": idfy.vid,
+        "ssvid": idfy.ssvid,
+        "sn": string(idfy.sn),
+        "mn": string(idfy.mn),
+        "fr": string(idfy.fr),
+        "rab": idfy.rab,
+        "ieee": value(idfy.ieee),
+        "cmic": {"val": idfy.cmic.val},
+        "mdts": idfy.mdts,
+        "cntlid": idfy.cntlid,
+        "ver": {"val": idfy.ver.val},
+        "rtd3r": idfy.rtd3r,
+        "rtd3e": idfy.rtd3e,
+        "oaes": {"val": idfy.oaes.val},
+        "ctratt": {"val": idfy.ctratt.val},
+        "oacs": {"val": idfy.oacs.val},
+        "acl": idfy.acl,
+        "aerl": idfy.aerl,
+        "frmw": value(idfy.frmw),
+        "lpa": {"ns_smart": idfy.lpa.ns_smart, "celp": idfy.lpa.celp, "edlp": idfy.lpa.edlp, "telemetry": idfy.lpa.telemetry, "val": idfy.lpa.val},
+        "elpe": idfy.elpe,
+        "npss": idfy.npss,
+        "avscc": {"val": idfy.avscc.val},
+        "apsta": {"val": idfy.apsta.val},
+        "wctemp": idfy.wctemp,
+        "cctemp": idfy.cctemp,
+        "mtfa": idfy.mtfa,
+        "hmpre": idfy.hmpre,
+        "hmmin": idfy.hmmin,
+        "tnvmcap": value(idfy.tnvmcap),
+        "unvmcap": value(idfy.unvmcap),
+        "rpmbs": {"val": idfy.rpmbs.val},
+        "edstt": idfy.edstt,
+        "dsto": {"val": idfy.dsto.val},
+        "fwug": idfy.fwug,
+        "kas": idfy.kas,
+        "hctma": {"val": idfy.hctma.val},
+        "mntmt": idfy.mntmt,
+        "mxtmt": idfy.mxtmt,
+        "sanicap": {"val": idfy.sanicap.val},
+        "sqes": {"val": idfy.sqes.val},
+        "cqes": {"val": idfy.cqes.val},
+        "maxcmd": idfy.maxcmd,
+        "nn": idfy.nn,
+        "oncs": {"val": idfy.oncs.val},
+        "fuses": idfy.fuses,
+        "fna": {"val": idfy.fna.val},
+        "vwc": {"val": idfy.vwc.val},
+        "awun": idfy.awun,
+        "awupf": idfy.awupf,
+        "nvscc": idfy.nvscc,
+        "acwu": idfy.acwu,
+        "sgls": {"val": idfy.sgls.val},
+        "subnqn": string(idfy.subnqn),
+    }
+
+def xnvme_spec_idfy_ns_to_dict(idfy):
+    """Returns the members of the 'struct xnvme_spec_idfy_ns' 'idfy' as a dict"""
+
+    return {
+        "nsze": idfy.nsze,
+        "ncap": idfy.ncap,
+        "nuse": idfy.nuse,
+        "nlbaf": idfy.nlbaf,
+        "nsfeat": {"thin_prov": idfy.nsfeat.thin_prov, "ns_atomic_write_unit": idfy.nsfeat.ns_atomic_write_unit, "dealloc_or_unwritten_error": idfy.nsfeat.dealloc_or_unwritten_error, "guid_never_reused": idfy.nsfeat.guid_never_reused, "reserved1": idfy.nsfeat.reserved1},
+        "flbas": {"format": idfy.flbas.format, "extended": idfy.flbas.extended, "reserved2": idfy.flbas.reserved2},
+        "mc": {"extended": idfy.mc.extended, "pointer": idfy.mc.pointer, "reserved3": idfy.mc.reserved3},
+        "dpc": {"val": idfy.dpc.val},
+        "dps": {"val": idfy.dps.val},
+        "nsrescap": {"val": idfy.nsrescap.val},
+        "fpi": {"val": idfy.fpi.val},
+        "dlfeat": {"val": idfy.dlfeat.val},
+        "nawun": idfy.nawun,
+        "nawupf": idfy.nawupf,
+        "nacwu": idfy.nacwu,
+        "nabsn": idfy.nabsn,
+        "nabspf": idfy.nabspf,
+        "noiob": idfy.noiob,
+        "nvmcap": value(idfy.nvmcap),
+        "nguid": value(idfy.nguid),
+        "eui64": idfy.eui64,
+        "lbaf": [{"ms": item.ms, "ds": item.ds, "rp": item.rp} for item in idfy.lbaf[:16]],
+    }
+
+def xnvme_spec_nvm_idfy_ctrlr_to_dict(idfy):
+    """Returns the members of the 'struct xnvme_spec_nvm_idfy_ctrlr' 'idfy' as a dict"""
+
+    return {
+        "oncs": {"compare": idfy.oncs.compare, "write_unc": idfy.oncs.write_unc, "dsm": idfy.oncs.dsm, "set_features_save": idfy.oncs.set_features_save, "reservations": idfy.oncs.reservations, "timestamp": idfy.oncs.timestamp, "verify": idfy.oncs.verify, "copy": idfy.oncs.copy},
+        "ocfs": {"copy_fmt0": idfy.ocfs.copy_fmt0},
+    }
+
+def xnvme_spec_nvm_idfy_ns_to_dict(idfy):
+    """Returns the members of the 'struct xnvme_spec_nvm_idfy_ns' 'idfy' as a dict"""
+
+    return {
+        "mcl": idfy.mcl,
+        "mssrl": idfy.mssrl,
+        "msrc": idfy.msrc,
+    }
+
+def xnvme_spec_znd_report_hdr_to_dict(hdr):
+    """Returns the members of the 'struct xnvme_spec_znd_report_hdr' 'hdr' as a dict"""
+
+    return {
+        "nzones": hdr.nzones,
+    }
+
+def xnvme_spec_znd_idfy_ctrlr_to_dict(zctrlr):
+    """Returns the members of the 'struct xnvme_spec_znd_idfy_ctrlr' 'zctrlr' as a dict"""
+
+    return {
+        "zasl": zctrlr.zasl,
+    }
+
+def xnvme_spec_znd_idfy_lbafe_to_dict(zonef):
+    """Returns the members of the 'struct xnvme_spec_znd_idfy_lbafe' 'zonef' as a dict"""
+
+    return {
+        "zsze": zonef.zsze,
+        "zdes": zonef.zdes,
+    }
+
+def xnvme_spec_znd_idfy_ns_to_dict(zns):
+    """Returns the members of the 'struct xnvme_spec_znd_idfy_ns' 'zns' as a dict"""
+
+    return {
+        "zoc": value(zns.zoc),
+        "ozcs": value(zns.ozcs),
+        "mar": zns.mar,
+        "mor": zns.mor,
+        "rrl": zns.rrl,
+        "frl": zns.frl,
+    }
+
+def xnvme_spec_znd_log_changes_to_dict(changes):
+    """Returns the members of the 'struct xnvme_spec_znd_log_changes' 'changes' as a dict"""
+
+    return {
+        "nidents": changes.nidents,
+        "idents": [value(item) for item in changes.idents[:changes.nidents]],
+    }
+
+def xnvme_lba_range_to_dict(range_):
+    """Returns the members of the 'struct xnvme_lba_range' 'range_' as a dict"""
+
+    return {
+        "slba": range_.slba,
+        "elba": range_.elba,
+        "naddrs": range_.naddrs,
+        "nbytes": range_.nbytes,
+        "attr": {"is_valid": range_.attr.is_valid},
+    }
+
+def xnvme_znd_report_to_dict(report):
+    """Returns the members of the 'struct xnvme_znd_report' 'report' as a dict"""
+
+    return {
+        "report_nbytes": report.report_nbytes,
+        "entries_nbytes": report.entries_nbytes,
+        "zd_nbytes": report.zd_nbytes,
+        "zdext_nbytes": report.zdext_nbytes,
+        "zrent_nbytes": report.zrent_nbytes,
+        "zslba": report.zslba,
+        "zelba": report.zelba,
+        "nzones": report.nzones,
+        "nentries": report.nentries,
+        "extended": report.extended,
+    }
+
+def xnvme_be_attr_to_dict(attr):
+    """Returns the members of the 'struct xnvme_be_attr' 'attr' as a dict"""
+
+    return {
+        "name": string(attr.name),
+        "enabled": attr.enabled,
+    }
+
+def xnvme_be_attr_list_to_dict(list_):
+    """Returns the members of the 'struct xnvme_be_attr_list' 'list_' as a dict"""
+
+    return {
+        "count": list_.count,
+        "capacity": list_.capacity,
+    }
+
+# The _to_dict() functions by the name of the struct
+TO_DICT = {
+    "xnvme_geo": xnvme_geo_to_dict,
+    "xnvme_ident": xnvme_ident_to_dict,
+    "xnvme_spec_log_erri_entry": xnvme_spec_log_erri_entry_to_dict,
+    "xnvme_spec_znd_descr": xnvme_spec_znd_descr_to_dict,
+    "xnvme_spec_nvm_scopy_fmt_zero": xnvme_spec_nvm_scopy_fmt_zero_to_dict,
+    "xnvme_spec_log_health_entry": xnvme_spec_log_health_entry_to_dict,
+    "xnvme_spec_idfy_ctrlr": xnvme_spec_idfy_ctrlr_to_dict,
+    "xnvme_spec_idfy_ns": xnvme_spec_idfy_ns_to_dict,
+    "xnvme_spec_nvm_idfy_ctrlr": xnvme_spec_nvm_idfy_ctrlr_to_dict,
+    "xnvme_spec_nvm_idfy_ns": xnvme_spec_nvm_idfy_ns_to_dict,
+    "xnvme_spec_znd_report_hdr": xnvme_spec_znd_report_hdr_to_dict,
+    "xnvme_spec_znd_idfy_ctrlr": xnvme_spec_znd_idfy_ctrlr_to_dict,
+    "xnvme_spec_znd_idfy_lbafe": xnvme_spec_znd_idfy_lbafe_to_dict,
+    "xnvme_spec_znd_idfy_ns": xnvme_spec_znd_idfy_ns_to_dict,
+    "xnvme_spec_znd_log_changes": xnvme_spec_znd_log_changes_to_dict,
+    "xnvme_lba_range": xnvme_lba_range_to_dict,
+    "xnvme_znd_report": xnvme_znd_report_to_dict,
+    "xnvme_be_attr": xnvme_be_attr_to_dict,
+    "xnvme_be_attr_list": xnvme_be_attr_list_to_dict,
+}
+
+def to_dict(obj):
+    """Returns the members of the ctypes Structure 'obj' as a dict, via its _to_dict()"""
+
+    return TO_DICT[type(obj).__name__](obj)
\ No newline at end of file
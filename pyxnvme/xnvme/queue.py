@@ -0,0 +1,565 @@
+"""
+    Asynchronous command-queues
+
+    Wraps 'struct xnvme_queue' such that a batch of commands is submitted with a
+    single call from Python, keeping the queue filled until every command in the
+    batch has completed
+
+    The calls made per command go through the compiled cffi binding when it is
+    built, see xnvme/cffi_build.py, and through ctypes otherwise. With the cffi
+    binding, completions are harvested by a C callback into a ring, which is
+    drained with a single call after each poke, thus no Python code runs per
+    completion on the C side.
+"""
+import collections
+import ctypes
+import errno
+import os
+import struct
+import time
+
+from xnvme import (
+    CAPI,
+    FAST,
+    FFI,
+    XNVME_NVM_SCOPY_FMT_ZERO,
+    XNVME_QUEUE_CB,
+    XNVME_SPEC_FS_OPC_READ,
+    XNVME_SPEC_FS_OPC_WRITE,
+    XNVME_SPEC_NVM_OPC_READ,
+    XNVME_SPEC_NVM_OPC_SCOPY,
+    XNVME_SPEC_NVM_OPC_WRITE,
+    XNVME_SPEC_NVM_OPC_WRITE_UNCORRECTABLE,
+    XNVME_SPEC_NVM_OPC_WRITE_ZEROES,
+    XNVME_SPEC_PSDT_PRP,
+    XNVME_SPEC_ZND_OPC_APPEND,
+)
+from xnvme.stats import QueueStats
+
+# Command-constructors by opcode; those flagged False take no payload
+COMMANDS = {
+    XNVME_SPEC_NVM_OPC_READ: ("xnvme_nvm_read", True),
+    XNVME_SPEC_NVM_OPC_WRITE: ("xnvme_nvm_write", True),
+    XNVME_SPEC_NVM_OPC_WRITE_ZEROES: ("xnvme_nvm_write_zeroes", False),
+    XNVME_SPEC_NVM_OPC_WRITE_UNCORRECTABLE: ("xnvme_nvm_write_uncorrectable", False),
+    XNVME_SPEC_ZND_OPC_APPEND: ("xnvme_znd_append", True),
+}
+
+# File-commands by opcode, these take a byte offset and count instead of slba and nlb
+FILE_COMMANDS = {
+    XNVME_SPEC_FS_OPC_READ: "xnvme_file_pread",
+    XNVME_SPEC_FS_OPC_WRITE: "xnvme_file_pwrite",
+}
+
+# Command-options, from include/xnvme_cmd.h which is not among the public headers
+XNVME_CMD_SYNC = 0x1 << 0
+XNVME_CMD_ASYNC = 0x1 << 1
+XNVME_CMD_UPLD_SGLD = 0x1 << 2
+XNVME_CMD_UPLD_SGLM = 0x1 << 3
+
+# Capacities of xnvme_queue_init() are powers of two below this
+CAPACITY_MAX = 4096
+
+# Not a command-option of the C API, sets the Deallocate bit of a Write Zeroes
+# command, thus it is cleared along with the options once the command completes
+CMD_DEAC = 0x1 << 31
+
+# The 'result' is the combined cdw0 and cdw1, e.g. the LBA assigned to a zone append
+Completion = collections.namedtuple("Completion", ["tag", "sc", "sct", "cdw0", "result"])
+
+class CommandError(OSError):
+    """Raised for a command completing with an error-status, 'cpl' is its Completion"""
+
+    def __init__(self, cpl):
+        super(CommandError, self).__init__(
+            errno.EIO, "command failed with sc: %#x, sct: %#x" % (cpl.sc, cpl.sct)
+        )
+        self.cpl = cpl
+
+def check(err, func):
+    """Raise OSError when 'err', as returned by the C API 'func', is a negative errno"""
+
+    if err < 0:
+        raise OSError(-err, "%s(): %s" % (func, os.strerror(-err)))
+
+    return err
+
+def check_submitted(err, func):
+    """
+    Raise OSError unless 'err', as returned by the command-constructor 'func'
+    of a submission, is zero, as any other value means it was not submitted
+    """
+
+    if err:
+        check(err, func)
+        raise OSError(errno.EIO, "%s(): unexpected return %d" % (func, err))
+
+def check_capacity(capacity, name="capacity"):
+    """Raise ValueError unless 'capacity' is a capacity accepted by xnvme_queue_init()"""
+
+    if capacity < 1 or capacity & (capacity - 1) or capacity >= CAPACITY_MAX:
+        raise ValueError(
+            "%s: %d, must be a power of two below %d" % (name, capacity, CAPACITY_MAX)
+        )
+
+    return capacity
+
+class CTypesBinding(object):
+    """The per-command calls of a Queue via ctypes"""
+
+    api = CAPI
+    name = "ctypes"
+    null = None
+
+    def __init__(self, queue):
+        self.handle = queue.handle
+        self._cb = XNVME_QUEUE_CB(queue._on_completion)
+        CAPI.xnvme_queue_set_cb(self.handle, self._cb, None)
+
+    @staticmethod
+    def key(ctx):
+        """Returns the address of the command-context 'ctx'"""
+
+        return ctypes.cast(ctx, ctypes.c_void_p).value
+
+    @staticmethod
+    def status(ctx):
+        """Returns the (sc, sct, cdw0, result) of the completion in 'ctx'"""
+
+        cpl = ctx.contents.cpl
+
+        return cpl.status.sc, cpl.status.sct, cpl.cdw0, cpl.result
+
+    @staticmethod
+    def set_opts(ctx, opts):
+        """
+        Set the command-options of 'ctx', resetting its data-pointer to PRP,
+        and its Deallocate bit unless given by CMD_DEAC
+        """
+
+        ctx = ctx.contents
+        ctx.opts = opts & ~CMD_DEAC
+        ctx.cmd.common.psdt = XNVME_SPEC_PSDT_PRP
+        ctx.cmd.write_zeroes.deac = 1 if opts & CMD_DEAC else 0
+
+    @staticmethod
+    def payload(buf):
+        """Returns 'buf' as an argument to the command-constructors"""
+
+        return buf
+
+    def drain(self, queue):
+        """Completions are dispatched by the callback, thus there is nothing to drain"""
+
+class CFFIBinding(object):
+    """The per-command calls of a Queue via the compiled cffi binding"""
+
+    api = FAST
+    name = "cffi"
+    null = FFI.NULL if FFI is not None else None
+
+    def __init__(self, queue):
+        self.handle = FFI.cast("struct xnvme_queue *", queue.handle.value)
+        self._arg = FFI.new_handle(queue)
+        FAST.xnvme_queue_set_cb(self.handle, FAST.xnvme_cffi_queue_cb, self._arg)
+
+    @staticmethod
+    def key(ctx):
+        """Returns the address of the command-context 'ctx'"""
+
+        return int(FFI.cast("uintptr_t", ctx))
+
+    @staticmethod
+    def status(ctx):
+        """Returns the (sc, sct, cdw0, result) of the completion in 'ctx'"""
+
+        cpl = ctx.cpl
+        val = cpl.status.val
+
+        return (val >> 1) & 0xFF, (val >> 9) & 0x7, cpl.cdw0, cpl.result
+
+    @staticmethod
+    def set_opts(ctx, opts):
+        """
+        Set the command-options of 'ctx', resetting its data-pointer to PRP,
+        and its Deallocate bit unless given by CMD_DEAC
+        """
+
+        FAST.xnvme_cffi_cmd_ctx_set_opts(ctx, opts)
+
+    @staticmethod
+    def payload(buf):
+        """Returns 'buf', a Buffer, address, ctypes object or bytes-like, as 'void *'"""
+
+        if buf is None:
+            return FFI.NULL
+
+        param = getattr(buf, "_as_parameter_", buf)
+        if isinstance(param, int):
+            return FFI.cast("void *", param)
+        if isinstance(param, (ctypes._SimpleCData, ctypes._Pointer, ctypes.Array)):
+            return FFI.cast("void *", ctypes.cast(param, ctypes.c_void_p).value or 0)
+
+        return FFI.from_buffer(buf)
+
+    def drain(self, queue):
+        """Completions are dispatched by the callback, thus there is nothing to drain"""
+
+class RingBinding(CFFIBinding):
+    """
+    The per-command calls of a Queue via the compiled cffi binding, with the
+    completions recorded by the C callback xnvme_cffi_ring_cb() into a ring
+
+    The ring holds as many completions as the queue has command-contexts,
+    one more than its capacity, see xnvme_queue_init(), and is drained after
+    each poke, thus it cannot overflow: a command-context put back by the
+    callback is only used again once the ring is drained. Should it overflow
+    nonetheless, the callback drops the completion, and drain() raises
+    RuntimeError rather than writing past the ring.
+    """
+
+    name = "cffi-ring"
+
+    # The layout of 'struct xnvme_cffi_cpl'
+    CPL = struct.Struct("=QQIHH")
+
+    def __init__(self, queue):  # pylint: disable=super-init-not-called
+        self.handle = FFI.cast("struct xnvme_queue *", queue.handle.value)
+        self._cpls = FFI.new("struct xnvme_cffi_cpl[]", queue.capacity + 1)
+        self._ring = FFI.new(
+            "struct xnvme_cffi_ring *", {"capacity": queue.capacity + 1, "cpls": self._cpls}
+        )
+        FAST.xnvme_queue_set_cb(
+            self.handle, FFI.addressof(FAST, "xnvme_cffi_ring_cb"), self._ring
+        )
+
+    def drain(self, queue):
+        """Record the completions in the ring in their sinks, and empty it"""
+
+        count = self._ring.count
+        if not count:
+            return
+
+        inflight = queue._inflight
+        stats = queue.stats
+        trace = queue.trace
+        now = time.monotonic_ns() if stats is not None or trace is not None else 0
+        cpls = FFI.buffer(self._cpls, count * self.CPL.size)
+        for key, result, cdw0, status, _ in self.CPL.iter_unpack(cpls):
+            sink, tag, _, _ = inflight.pop(key)
+            sc, sct = (status >> 1) & 0xFF, (status >> 9) & 0x7
+            if stats is not None:
+                stats.complete(key, sc or sct, now)
+            if trace is not None:
+                trace.complete(key, sc, sct, now)
+            if sink is None:
+                sink = queue.completions
+            sink.append(Completion(tag, sc, sct, cdw0, result))
+        self._ring.count = 0
+
+        overflow = self._ring.overflow
+        if overflow:
+            self._ring.overflow = 0
+            raise RuntimeError(
+                "xnvme_cffi_ring_cb(): %d completions overflowed the ring of %d"
+                % (overflow, self._ring.capacity)
+            )
+
+if FFI is not None:
+    @FFI.def_extern()
+    def xnvme_cffi_queue_cb(ctx, opaque):
+        """Dispatch completions to the Queue given as 'opaque'"""
+
+        FFI.from_handle(opaque)._on_completion(ctx, None)
+
+class Queue(object):
+    """
+    Queue of the given 'capacity' on the device-handle 'dev'
+
+    Commands are given as (opcode, slba, nlb, buf) tuples, with 'nlb' being
+    zero-based as in the C API. Completions are reaped by a single callback
+    registered on the queue, recording a Completion and recycling the command
+    context, thus nothing is allocated per command on the C side.
+
+    With 'fast' then the cffi binding is used, defaulting to whether it is
+    built. With 'harvest', requiring the cffi binding and the default with it,
+    then the callback is the C function xnvme_cffi_ring_cb(), recording the
+    completions into a ring which is drained in bulk after each poke, instead
+    of calling into Python per completion.
+
+    With 'stats' then the commands are counted, and their latencies recorded,
+    in the QueueStats at Queue.stats, see xnvme.stats; given a QueueStats then
+    it is shared with other queues, otherwise Queue.stats is None, and nothing
+    is recorded. Likewise, given a TraceRecorder as 'trace', the commands are
+    recorded in its trace file, see xnvme.trace.
+    """
+
+    def __init__(self, dev, capacity=32, opts=0, nsid=None, fast=None, harvest=None,
+                 stats=False, trace=None):
+        if fast is None:
+            fast = FAST is not None
+        if fast and FAST is None:
+            raise ValueError("fast: the cffi binding, xnvme._libxnvme_cffi, is not built")
+        if harvest is None:
+            harvest = fast
+        if harvest and not fast:
+            raise ValueError("harvest: requires the cffi binding")
+
+        self.dev = dev
+        self.nsid = CAPI.xnvme_dev_get_nsid(dev) if nsid is None else nsid
+        self.capacity = check_capacity(capacity)
+        self.handle = ctypes.c_void_p()
+
+        check(
+            CAPI.xnvme_queue_init(dev, capacity, opts, ctypes.byref(self.handle)),
+            "xnvme_queue_init"
+        )
+
+        self.completions = []
+        self._inflight = {}
+        self.stats = None
+        self.trace = None
+        if stats or trace is not None:
+            lba_nbytes = CAPI.xnvme_dev_get_geo(dev).contents.lba_nbytes
+            if stats:
+                self.stats = stats if isinstance(stats, QueueStats) else QueueStats(lba_nbytes)
+            if trace is not None:
+                self.trace = trace.attach(lba_nbytes)
+        self.binding = (
+            RingBinding if harvest else CFFIBinding if fast else CTypesBinding
+        )(self)
+        self._commands = dict(
+            (opcode, (getattr(self.binding.api, func), has_payload))
+            for opcode, (func, has_payload) in COMMANDS.items()
+        )
+        self._file_commands = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.term()
+
+    def _on_completion(self, ctx, _):
+        """Record the completion of 'ctx' in its sink and put it back in the pool"""
+
+        key = self.binding.key(ctx)
+        sink, tag, _, opts = self._inflight.pop(key)
+        sc, sct, cdw0, result = self.binding.status(ctx)
+        if self.stats is not None or self.trace is not None:
+            now = time.monotonic_ns()
+            if self.stats is not None:
+                self.stats.complete(key, sc or sct, now)
+            if self.trace is not None:
+                self.trace.complete(key, sc, sct, now)
+        if sink is None:
+            sink = self.completions
+        sink.append(Completion(tag, sc, sct, cdw0, result))
+
+        # Contexts are not reset by the pool, thus restore the defaults
+        if opts:
+            self.binding.set_opts(ctx, XNVME_CMD_ASYNC)
+
+        self.binding.api.xnvme_queue_put_cmd_ctx(self.binding.handle, ctx)
+
+    @property
+    def outstanding(self):
+        """Number of commands submitted but not yet reaped"""
+
+        return self.binding.api.xnvme_queue_get_outstanding(self.binding.handle)
+
+    def get_cmd_ctx(self):
+        """Returns a command-context, poking for completions while the pool is empty"""
+
+        ctx = self.binding.api.xnvme_queue_get_cmd_ctx(self.binding.handle)
+        while not ctx:
+            self.poke()
+            ctx = self.binding.api.xnvme_queue_get_cmd_ctx(self.binding.handle)
+
+        return ctx
+
+    def _release(self, ctx, key, opts=0):
+        """Put back the command-context 'ctx', at 'key', of a command not submitted"""
+
+        del self._inflight[key]
+        if opts:
+            self.binding.set_opts(ctx, XNVME_CMD_ASYNC)
+        self.binding.api.xnvme_queue_put_cmd_ctx(self.binding.handle, ctx)
+
+    def submit(self, opcode, slba, nlb, buf=None, tag=None, sink=None, opts=0):
+        """
+        Submit a single command without waiting for it; the Completion carrying
+        'tag' is appended to 'sink', defaulting to Queue.completions
+
+        The command-options 'opts', e.g. XNVME_CMD_UPLD_SGLD for a payload
+        given as an SGL, or CMD_DEAC for a Write Zeroes deallocating, are set
+        on the command-context for this command only.
+        """
+
+        func, has_payload = self._commands[opcode]
+        ctx = self.get_cmd_ctx()
+        key = self.binding.key(ctx)
+        # The payload is referenced until completion, such that e.g. a Buffer
+        # is not freed while the device transfers to or from it
+        self._inflight[key] = (sink, tag, buf, opts)
+        if opts:
+            self.binding.set_opts(ctx, XNVME_CMD_ASYNC | opts)
+
+        try:
+            if has_payload:
+                buf = self.binding.payload(buf)
+            while True:
+                if has_payload:
+                    err = func(ctx, self.nsid, slba, nlb, buf, self.binding.null)
+                else:
+                    err = func(ctx, self.nsid, slba, nlb)
+                if err not in (-errno.EBUSY, -errno.EAGAIN):
+                    break
+                self.poke()
+        except Exception:
+            self._release(ctx, key, opts)
+            raise
+
+        if err:
+            self._release(ctx, key, opts)
+            check_submitted(err, COMMANDS[opcode][0])
+
+        if self.stats is not None:
+            self.stats.submit(key, opcode, (nlb + 1) * self.stats.lba_nbytes)
+        if self.trace is not None:
+            self.trace.submit(key, opcode, self.nsid, slba, nlb)
+
+        return tag
+
+    def submit_file(self, opcode, offset, nbytes, buf, tag=None, sink=None):
+        """
+        Submit a file-command, XNVME_SPEC_FS_OPC_READ or WRITE, of 'nbytes' at
+        the byte 'offset' of the file the queue is on, without waiting for it;
+        the 'result' of its Completion is the number of bytes transferred
+        """
+
+        func = self._file_commands.get(opcode)
+        if func is None:
+            func = self._file_commands[opcode] = getattr(
+                self.binding.api, FILE_COMMANDS[opcode]
+            )
+
+        ctx = self.get_cmd_ctx()
+        key = self.binding.key(ctx)
+        self._inflight[key] = (sink, tag, buf, 0)
+
+        try:
+            payload = self.binding.payload(buf)
+            while True:
+                err = func(ctx, payload, nbytes, offset)
+                if err not in (-errno.EBUSY, -errno.EAGAIN):
+                    break
+                self.poke()
+        except Exception:
+            self._release(ctx, key)
+            raise
+
+        if err:
+            self._release(ctx, key)
+            check_submitted(err, FILE_COMMANDS[opcode])
+
+        if self.stats is not None:
+            self.stats.submit(key, opcode, nbytes)
+        if self.trace is not None:
+            self.trace.submit(key, opcode, self.nsid, offset, nbytes)
+
+        return tag
+
+    def submit_copy(self, sdlba, ranges, nr, tag=None, sink=None):
+        """
+        Submit a Simple Copy of the source ranges in 'ranges', an array of
+        'struct xnvme_spec_nvm_scopy_fmt_zero', to the LBA 'sdlba', without
+        waiting for it; 'nr' is the zero-based number of ranges, as in the C API
+        """
+
+        ctx = self.get_cmd_ctx()
+        key = self.binding.key(ctx)
+        self._inflight[key] = (sink, tag, ranges, 0)
+
+        try:
+            payload = self.binding.payload(ranges)
+            while True:
+                err = self.binding.api.xnvme_nvm_scopy(
+                    ctx, self.nsid, sdlba, payload, nr, XNVME_NVM_SCOPY_FMT_ZERO
+                )
+                if err not in (-errno.EBUSY, -errno.EAGAIN):
+                    break
+                self.poke()
+        except Exception:
+            self._release(ctx, key)
+            raise
+
+        if err:
+            self._release(ctx, key)
+            check_submitted(err, "xnvme_nvm_scopy")
+
+        if self.stats is not None:
+            self.stats.submit(key, XNVME_SPEC_NVM_OPC_SCOPY, 0)
+        if self.trace is not None:
+            self.trace.submit(key, XNVME_SPEC_NVM_OPC_SCOPY, self.nsid, sdlba, nr)
+
+        return tag
+
+    def submit_batch(self, cmds):
+        """
+        Submit every command in 'cmds' and wait for all of them to complete
+
+        The queue is kept at its capacity while submitting, and completions are
+        reaped as they make room. Returns a list of Completion in the order of
+        'cmds', each tagged with its index in 'cmds'.
+        """
+
+        sink = []
+        for tag, (opcode, slba, nlb, buf) in enumerate(cmds):
+            self.submit(opcode, slba, nlb, buf, tag, sink)
+
+        while len(sink) < len(cmds):
+            self.wait()
+
+        cpls = [None] * len(cmds)
+        for cpl in sink:
+            cpls[cpl.tag] = cpl
+
+        return cpls
+
+    def poke(self, max_cpl=0):
+        """Process at most 'max_cpl' completions, zero means all available"""
+
+        nreaped = check(
+            self.binding.api.xnvme_queue_poke(self.binding.handle, max_cpl),
+            "xnvme_queue_poke"
+        )
+        self.binding.drain(self)
+
+        return nreaped
+
+    def wait(self):
+        """Process completions until no commands are outstanding"""
+
+        nreaped = check(
+            self.binding.api.xnvme_queue_wait(self.binding.handle), "xnvme_queue_wait"
+        )
+        self.binding.drain(self)
+
+        return nreaped
+
+    def reap(self):
+        """Returns and clears the completions recorded in Queue.completions"""
+
+        cpls, self.completions = self.completions, []
+
+        return cpls
+
+    def term(self):
+        """Tear down the queue, after which it cannot be used"""
+
+        if self.handle:
+            err = CAPI.xnvme_queue_term(self.handle)
+            self.handle = ctypes.c_void_p()
+            self.binding = None
+            check(err, "xnvme_queue_term")
@@ -0,0 +1,180 @@
+"""
+    Simple Copy
+
+    Copies of LBA ranges done by the device, via xnvme_nvm_scopy(), such that
+    the data is not transferred to and from host memory::
+
+        with xnvme.Device("/dev/ng0n1") as dev:
+            dev.copy_ranges([(0, 8), (64, 8), (1024, 256)], 4096)
+
+    The source ranges are packed into as few commands as the limits of the
+    namespace allow: the Maximum Source Range Count (MSRC), the Maximum Single
+    Source Range Length (MSSRL) and the Maximum Copy Length (MCL). The commands
+    are issued concurrently on the queue of the Device. Without support for
+    Copy, and source-range format zero, by the controller, then the ranges are
+    copied by reading them and writing them instead.
+"""
+import collections
+import ctypes
+import errno
+
+from xnvme import (
+    XNVME_SPEC_NVM_OPC_READ,
+    XNVME_SPEC_NVM_SCOPY_NENTRY_MAX,
+    xnvme_spec_nvm_idfy_ctrlr,
+    xnvme_spec_nvm_idfy_ns,
+    xnvme_spec_nvm_scopy_fmt_zero,
+    xnvme_spec_nvm_scopy_source_range,
+)
+from xnvme.buf import Buffer
+from xnvme.queue import CommandError
+
+# Largest number of logical blocks of a source range, 'nlb' is a zero-based uint16
+NLB_MAX = 0x10000
+
+# Status of commands not supported by the controller, Generic Command Status
+SC_INVALID_OPCODE = 0x1
+
+# Bytes copied by each read and write in place of a Simple Copy
+FALLBACK_NBYTES = 8 << 20
+
+CopyLimits = collections.namedtuple("CopyLimits", ["msrc", "mssrl", "mcl"])
+
+def limits(dev):
+    """
+    Returns the CopyLimits of the Device 'dev', as one-based numbers of source
+    ranges and logical blocks, None when it does not support Simple Copy
+    """
+
+    ctrlr = xnvme_spec_nvm_idfy_ctrlr.from_buffer_copy(dev.ctrlr)
+    if not (ctrlr.oncs.copy and ctrlr.ocfs.copy_fmt0):
+        return None
+
+    ns = xnvme_spec_nvm_idfy_ns.from_buffer_copy(dev.ns)
+    msrc = min(ns.msrc + 1, XNVME_SPEC_NVM_SCOPY_NENTRY_MAX)
+    mssrl = min(ns.mssrl or NLB_MAX, NLB_MAX)
+
+    return CopyLimits(msrc, mssrl, ns.mcl or msrc * mssrl)
+
+def fallback_limits(dev):
+    """Returns the CopyLimits of copying by reading and writing on the Device 'dev'"""
+
+    mssrl = dev.cmd_nbytes // dev.lba_nbytes
+
+    return CopyLimits(
+        XNVME_SPEC_NVM_SCOPY_NENTRY_MAX, mssrl, max(mssrl, FALLBACK_NBYTES // dev.lba_nbytes)
+    )
+
+def plan(ranges, sdlba, lim):
+    """
+    Returns the commands copying the source 'ranges', (slba, nlbs) tuples, to
+    consecutive LBAs from 'sdlba', within the CopyLimits 'lim'
+
+    The commands are (sdlba, entries) tuples, with 'entries' being (slba, nlbs)
+    tuples of at most 'mssrl' logical blocks; ranges longer than this are split,
+    and adjacent ranges are merged.
+    """
+
+    cmds = []
+    entries = []
+    total = 0
+
+    for slba, nlbs in ranges:
+        while nlbs:
+            if len(entries) == lim.msrc or total == lim.mcl:
+                cmds.append((sdlba, entries))
+                sdlba += total
+                entries = []
+                total = 0
+
+            count = min(nlbs, lim.mssrl, lim.mcl - total)
+            if entries and sum(entries[-1]) == slba and entries[-1][1] + count <= lim.mssrl:
+                entries[-1] = (entries[-1][0], entries[-1][1] + count)
+            else:
+                entries.append((slba, count))
+            total += count
+            slba += count
+            nlbs -= count
+
+    if entries:
+        cmds.append((sdlba, entries))
+
+    return cmds
+
+def fallback(dev, cmds):
+    """Do the planned commands 'cmds' by reading the source ranges, and writing them"""
+
+    for sdlba, entries in cmds:
+        buf = Buffer(dev, sum(nlbs for _, nlbs in entries) * dev.lba_nbytes)
+        try:
+            reads = []
+            off = 0
+            for slba, nlbs in entries:
+                reads.extend(dev.commands(
+                    XNVME_SPEC_NVM_OPC_READ, slba * dev.lba_nbytes, nlbs * dev.lba_nbytes,
+                    buf.addr + off
+                ))
+                off += nlbs * dev.lba_nbytes
+
+            for cpl in dev.queue.submit_batch(reads):
+                if cpl.sc or cpl.sct:
+                    raise CommandError(cpl)
+
+            dev.pwrite(sdlba * dev.lba_nbytes, buf)
+        finally:
+            buf.close()
+
+def copy_ranges(dev, ranges, sdlba, offload=None):
+    """
+    Copy the source 'ranges', (slba, nlbs) tuples, of the Device 'dev' to
+    consecutive LBAs from 'sdlba', returns the number of logical blocks copied
+
+    With 'offload' True, then the copy is done by the device via Simple Copy,
+    raising OSError(EOPNOTSUPP) when not supported, with False then by reading
+    and writing; by default via Simple Copy when supported. Commands failing
+    as not supported by the controller are redone by reading and writing.
+    """
+
+    ranges = [(slba, nlbs) for slba, nlbs in ranges if nlbs]
+    lim = limits(dev)
+    if offload is None:
+        offload = lim is not None
+    if offload and lim is None:
+        raise OSError(errno.EOPNOTSUPP, "Simple Copy is not supported by: '%s'" % dev.uri)
+
+    if not offload:
+        fallback(dev, plan(ranges, sdlba, fallback_limits(dev)))
+        return sum(nlbs for _, nlbs in ranges)
+
+    cmds = plan(ranges, sdlba, lim)
+
+    # The source ranges of each command in a page of their own
+    stride = ctypes.sizeof(xnvme_spec_nvm_scopy_source_range)
+    buf = Buffer(dev, len(cmds) * stride)
+    try:
+        cpls = []
+        for idx, (dlba, entries) in enumerate(cmds):
+            srcs = (xnvme_spec_nvm_scopy_fmt_zero * len(entries)).from_buffer(
+                buf.view, idx * stride
+            )
+            for src, (slba, nlbs) in zip(srcs, entries):
+                src.slba = slba
+                src.nlb = nlbs - 1
+            dev.queue.submit_copy(dlba, srcs, len(entries) - 1, idx, cpls)
+        dev.queue.wait()
+    finally:
+        buf.close()
+
+    redo = set(cpl.tag for cpl in cpls if cpl.sct == 0 and cpl.sc == SC_INVALID_OPCODE)
+    done = [cpl for cpl in cpls if cpl.tag not in redo]
+    dev.written(
+        cpl._replace(tag=(cmds[cpl.tag][0], sum(nlbs for _, nlbs in cmds[cpl.tag][1])))
+        for cpl in done
+    )
+    for cpl in done:
+        if cpl.sc or cpl.sct:
+            raise CommandError(cpl)
+
+    fallback(dev, [cmds[idx] for idx in sorted(redo)])
+
+    return sum(nlbs for _, nlbs in ranges)
@@ -0,0 +1,116 @@
+"""
+    Scatter-gather lists
+
+    An SGL describes the payload of a single command as a list of Buffers, thus
+    scattered data is transferred without gathering it into one Buffer first.
+    SGLs are taken from an 'struct xnvme_sgl_pool' and go back to it once
+    the SGL is no longer referenced, e.g. when the command using it completes.
+
+    The descriptors of an SGL hold the physical addresses of the Buffers, as
+    given by xnvme_buf_vtophys(), which only backends allocating DMA-able
+    memory themselves provide, that is SPDK. Other backends, e.g. Linux and
+    POSIX, fail with ENOSYS.
+"""
+import ctypes
+import errno
+import os
+import weakref
+
+from xnvme import CAPI
+from xnvme.buf import Buffer
+
+# Descriptors supported by xnvme_sgl_add(), a single last-segment of one page
+SGL_NDESCR_MAX = 256
+
+class SGL(object):
+    """
+    Scatter-gather list of the Buffers in 'bufs', 'nbytes' in total
+
+    Given as payload to a command submitted with XNVME_CMD_UPLD_SGLD. The
+    Buffers are referenced by the SGL, and thus by the command using it.
+    """
+
+    def __init__(self, pool, handle, bufs):
+        self.handle = handle
+        self.bufs = bufs
+        self.nbytes = sum(len(buf) for buf in bufs)
+
+        weakref.finalize(self, pool.put, handle)
+
+    @property
+    def _as_parameter_(self):
+        return self.handle
+
+def add_error(dev, buf):
+    """
+    Returns the OSError of xnvme_sgl_add() having failed for the Buffer 'buf',
+    of the errno of translating its address, as xnvme_sgl_add() returns -1
+    """
+
+    err = CAPI.xnvme_buf_vtophys(dev, buf, ctypes.byref(ctypes.c_uint64()))
+    errnum = -err if err < 0 else errno.ENOMEM
+
+    return OSError(
+        errnum, "xnvme_sgl_add(): failed adding %d bytes: %s" % (len(buf), os.strerror(errnum))
+    )
+
+class SGLPool(object):
+    """
+    Pool of scatter-gather lists for the device-handle 'dev'
+
+    The 'supported' attribute is cleared once adding a Buffer failed with
+    ENOSYS, that is, the backend of the device does not support SGLs.
+    """
+
+    def __init__(self, dev):
+        self.dev = dev
+        self.supported = True
+        self.handle = CAPI.xnvme_sgl_pool_create(dev)
+        if not self.handle:
+            raise MemoryError("xnvme_sgl_pool_create(): failed")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get(self, bufs):
+        """Returns an SGL of the given Buffers"""
+
+        bufs = list(bufs)
+        if not 0 < len(bufs) <= SGL_NDESCR_MAX:
+            raise ValueError("bufs: %d buffers, must be 1..%d" % (len(bufs), SGL_NDESCR_MAX))
+        if not all(isinstance(buf, Buffer) for buf in bufs):
+            raise TypeError("bufs: must be Buffers, allocated for the device")
+
+        handle = CAPI.xnvme_sgl_alloc(self.handle)
+        if not handle:
+            raise MemoryError("xnvme_sgl_alloc(): failed")
+
+        sgl = SGL(self, handle, bufs)
+        for buf in bufs:
+            if CAPI.xnvme_sgl_add(self.dev, handle, buf, len(buf)):
+                exc = add_error(self.dev, buf)
+                if exc.errno == errno.ENOSYS:
+                    self.supported = False
+                raise exc
+
+        return sgl
+
+    def put(self, handle):
+        """Return the SGL 'handle' to the pool, unless the pool is closed"""
+
+        if self.handle:
+            CAPI.xnvme_sgl_free(self.handle, handle)
+
+    def close(self):
+        """
+        Destroy the pool and the SGLs it holds, after which it cannot be used
+
+        SGLs released after closing the pool are not returned to it.
+        """
+
+        if self.handle:
+            CAPI.xnvme_sgl_pool_destroy(self.handle)
+            self.handle = None
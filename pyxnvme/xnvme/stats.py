@@ -0,0 +1,220 @@
+"""
+    I/O statistics
+
+    Counters and latency histograms of the commands on a Queue, recorded when
+    the Queue is created with 'stats', and read as a snapshot::
+
+        with xnvme.Device("/dev/nvme0n1", stats=True) as dev:
+            ...
+            snap = dev.queue.stats.snapshot()
+            print(snap["completed"], snap["latency_usec"]["read"]["p99.9"])
+
+    Latencies are the nanoseconds from a command having been submitted until
+    its completion is reaped by a poke of the Queue, thus as seen by the
+    application. They are recorded in histograms of log-linear buckets, as in
+    HdrHistogram, of a fixed relative error, such that recording is a few
+    integer operations and tail percentiles are exact within the error.
+
+    Snapshots, and resets, are safe to take from other threads than the one
+    driving the Queue, e.g. that of an xnvme.Exporter.
+"""
+import threading
+import time
+
+from xnvme import (
+    XNVME_SPEC_FS_OPC_READ,
+    XNVME_SPEC_FS_OPC_WRITE,
+    XNVME_SPEC_NVM_OPC_READ,
+    XNVME_SPEC_NVM_OPC_SCOPY,
+    XNVME_SPEC_NVM_OPC_WRITE,
+    XNVME_SPEC_NVM_OPC_WRITE_UNCORRECTABLE,
+    XNVME_SPEC_NVM_OPC_WRITE_ZEROES,
+    XNVME_SPEC_ZND_OPC_APPEND,
+)
+
+# Names of the opcodes in snapshots
+OPCODES = {
+    XNVME_SPEC_NVM_OPC_READ: "read",
+    XNVME_SPEC_NVM_OPC_WRITE: "write",
+    XNVME_SPEC_NVM_OPC_WRITE_ZEROES: "write_zeroes",
+    XNVME_SPEC_NVM_OPC_WRITE_UNCORRECTABLE: "write_uncorrectable",
+    XNVME_SPEC_NVM_OPC_SCOPY: "copy",
+    XNVME_SPEC_ZND_OPC_APPEND: "append",
+    XNVME_SPEC_FS_OPC_READ: "file_read",
+    XNVME_SPEC_FS_OPC_WRITE: "file_write",
+}
+
+PERCENTILES = [50.0, 90.0, 99.0, 99.9, 99.99]
+
+class Histogram(object):
+    """
+    Histogram of non-negative integers, in buckets of 2**'sub_bits' linear
+    sub-buckets per power of two, thus of a relative error below 2**-'sub_bits'
+    """
+
+    def __init__(self, sub_bits=5):
+        self.sub_bits = sub_bits
+        self.counts = [0] * ((64 - sub_bits) << sub_bits)
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    def index(self, value):
+        """Returns the index of the bucket of 'value'"""
+
+        shift = value.bit_length() - self.sub_bits - 1
+        if shift <= 0:
+            return value
+
+        return (shift << self.sub_bits) + (value >> shift)
+
+    def lower(self, idx):
+        """Returns the smallest value of the bucket at 'idx'"""
+
+        shift = (idx >> self.sub_bits) - 1
+        if shift <= 0:
+            return idx
+
+        return (idx - (shift << self.sub_bits)) << shift
+
+    def record(self, value):
+        """Record the 'value'"""
+
+        self.counts[self.index(value)] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def copy(self):
+        """Returns a copy of the Histogram"""
+
+        hist = Histogram.__new__(Histogram)
+        hist.__dict__.update(self.__dict__)
+        hist.counts = list(self.counts)
+
+        return hist
+
+    def merge(self, other):
+        """Add the values recorded by the Histogram 'other'"""
+
+        if other.sub_bits != self.sub_bits:
+            raise ValueError("sub_bits: %d != %d" % (other.sub_bits, self.sub_bits))
+
+        self.counts = [mine + theirs for mine, theirs in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        self.max = max(self.max, other.max)
+
+    def percentile(self, pct):
+        """Returns the value at the percentile 'pct', as the lower bound of its bucket"""
+
+        if not self.count:
+            return 0
+
+        rank = max(1, -(-self.count * pct // 100))
+        seen = 0
+        for idx, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(max(self.lower(idx), self.min), self.max)
+
+        return self.max
+
+    def summary(self, scale=1.0):
+        """Returns the count, sum, min, max, mean and PERCENTILES, multiplied by 'scale'"""
+
+        summary = {
+            "count": self.count,
+            "sum": self.total * scale,
+            "min": (self.min or 0) * scale,
+            "max": self.max * scale,
+            "mean": self.total / self.count * scale if self.count else 0.0,
+        }
+        for pct in PERCENTILES:
+            summary["p%g" % pct] = self.percentile(pct) * scale
+
+        return summary
+
+class QueueStats(object):
+    """
+    Counters and per-opcode latency Histograms of the commands of a Queue on
+    a device of 'lba_nbytes'
+
+    Only commands submitted successfully are counted. The 'bytes' of NVM
+    commands are those of their logical blocks, of file-commands those given,
+    and of copies zero, as these transfer no data to or from the host.
+
+    Recording and snapshots are serialized by a lock, the histograms are
+    copied under it and summarized without holding it.
+    """
+
+    def __init__(self, lba_nbytes):
+        self.lba_nbytes = lba_nbytes
+        self._lock = threading.Lock()
+        self._pending = {}
+        self.reset()
+
+    def reset(self):
+        """Zero the counters and histograms, the outstanding commands are kept"""
+
+        with self._lock:
+            self.submitted = 0
+            self.completed = 0
+            self.errors = 0
+            self.outstanding_max = 0
+            self.bytes = {}
+            self.latency = {}
+
+    def submit(self, key, opcode, nbytes):
+        """Record the submission of the command, of 'nbytes', in the context at 'key'"""
+
+        with self._lock:
+            self._pending[key] = (opcode, nbytes, time.monotonic_ns())
+            self.submitted += 1
+            if len(self._pending) > self.outstanding_max:
+                self.outstanding_max = len(self._pending)
+
+    def complete(self, key, failed, now):
+        """Record the completion, at the monotonic nanoseconds 'now', of the command at 'key'"""
+
+        with self._lock:
+            opcode, nbytes, begin = self._pending.pop(key)
+            self.completed += 1
+            if failed:
+                self.errors += 1
+                return
+
+            hist = self.latency.get(opcode)
+            if hist is None:
+                hist = self.latency[opcode] = Histogram()
+            hist.record(now - begin)
+            self.bytes[opcode] = self.bytes.get(opcode, 0) + nbytes
+
+    def snapshot(self):
+        """Returns the counters, bytes and latencies, in microseconds, by opcode-name"""
+
+        with self._lock:
+            snap = {
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "errors": self.errors,
+                "outstanding": len(self._pending),
+                "outstanding_max": self.outstanding_max,
+                "bytes": dict(
+                    (OPCODES.get(opcode, str(opcode)), nbytes)
+                    for opcode, nbytes in self.bytes.items()
+                ),
+            }
+            latency = [(opcode, hist.copy()) for opcode, hist in self.latency.items()]
+
+        snap["latency_usec"] = dict(
+            (OPCODES.get(opcode, str(opcode)), hist.summary(1e-3)) for opcode, hist in latency
+        )
+
+        return snap
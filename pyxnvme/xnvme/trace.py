@@ -0,0 +1,293 @@
+"""
+    Command traces
+
+    The commands submitted on Queues are recorded, by a TraceRecorder given as
+    'trace', into a binary trace file, which is replayed on another device or
+    backend by replay()::
+
+        with xnvme.TraceRecorder("app.trace") as rec:
+            with xnvme.Device("/dev/nvme0n1", trace=rec) as dev:
+                ...
+
+        res = xnvme.trace.replay("app.trace", "/dev/nvme1n1", speed=2.0, qdepth=32)
+        print(res.ncmds, res.stats["latency_usec"]["read"]["p99"])
+
+    The file is a header followed by a record per command, of the fields of
+    'struct xnvme_spec_cmd' printed by xnvme_spec_cmd_pr() which describe the
+    I/O: opcode, nsid, slba and nlb, along with the queue it was submitted on,
+    the nanoseconds from the start of the trace to its submission, its latency
+    and its status. For file-commands, 'slba' and 'nlb' are the byte offset and
+    size. Records are packed on completion and written in batches, thus the
+    cost per command is packing a struct.
+
+    Replay is also available from the command-line, printing the result as
+    JSON::
+
+        python3 -m xnvme.trace app.trace /dev/nvme1n1 --speed 2 --qdepth 32
+"""
+import argparse
+import collections
+import json
+import struct
+import sys
+import threading
+import time
+
+from xnvme.buf import Buffer
+from xnvme.device import Device
+from xnvme.queue import COMMANDS, Queue, check_capacity
+from xnvme.stats import QueueStats
+
+MAGIC = b"XNVMETRC"
+VERSION = 2
+
+# The magic, version and size of a record
+HEADER = struct.Struct("<8sHH")
+
+# The fields of a record, as packed by RECORD
+FIELDS = [
+    "ts", "lat", "slba", "nsid", "nlb", "qid", "opcode", "sc", "sct", "lbads",
+]
+RECORD = struct.Struct("<QIQIQHBBBBxx")
+
+# The records of each version read, version 1 has a 32-bit 'nlb'
+RECORDS = {1: struct.Struct("<QIQIIHBBBBxx"), VERSION: RECORD}
+
+# Records buffered by a TraceRecorder before they are written to the file
+BATCH = 4096
+
+Record = collections.namedtuple("Record", FIELDS)
+
+ReplayResult = collections.namedtuple("ReplayResult", [
+    "ncmds", "nskipped", "seconds", "lag_max", "stats",
+])
+
+class QueueTrace(object):
+    """The recording of the commands of a single Queue, see TraceRecorder.attach()"""
+
+    def __init__(self, recorder, qid, lba_nbytes):
+        self.recorder = recorder
+        self.qid = qid
+        self.lbads = lba_nbytes.bit_length() - 1
+        self._pending = {}
+
+    def submit(self, key, opcode, nsid, slba, nlb):
+        """Record the submission of the command in the context at 'key'"""
+
+        self._pending[key] = (time.monotonic_ns(), opcode, nsid, slba, nlb)
+
+    def complete(self, key, sc, sct, now):
+        """Record the completion, at the monotonic nanoseconds 'now', of the command at 'key'"""
+
+        begin, opcode, nsid, slba, nlb = self._pending.pop(key)
+        self.recorder.record(Record(
+            begin, min(now - begin, 0xFFFFFFFF), slba, nsid, nlb, self.qid, opcode, sc, sct,
+            self.lbads
+        ))
+
+class TraceRecorder(object):
+    """
+    Records the commands of the Queues it is attached to, into the trace file
+    at 'path'
+
+    The timestamps of the records are relative to the creation of the
+    recorder. Commands still outstanding when the recorder is closed are not
+    recorded. A recorder is shared by Queues driven by different threads,
+    recording and writing the records is serialized by a lock.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.nqueues = 0
+        self.nrecords = 0
+        self._begin = time.monotonic_ns()
+        self._lock = threading.Lock()
+        self._batch = []
+        self._file = open(path, "wb")
+        self._file.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def attach(self, lba_nbytes):
+        """Returns the QueueTrace of a Queue on a device of 'lba_nbytes'"""
+
+        with self._lock:
+            self.nqueues += 1
+
+            return QueueTrace(self, self.nqueues - 1, lba_nbytes)
+
+    def record(self, rec):
+        """Add the Record 'rec', its timestamp being monotonic nanoseconds"""
+
+        data = RECORD.pack(*rec._replace(ts=rec.ts - self._begin))
+        with self._lock:
+            if self._file.closed:
+                return
+            self._batch.append(data)
+            if len(self._batch) >= BATCH:
+                self._write()
+
+    def _write(self):
+        """Write the buffered, packed, records to the file, with the lock held"""
+
+        self._file.write(b"".join(self._batch))
+        self.nrecords += len(self._batch)
+        self._batch = []
+
+    def flush(self):
+        """Write the buffered records to the file"""
+
+        with self._lock:
+            if not self._file.closed:
+                self._write()
+
+    def close(self):
+        """Write the buffered records and close the file"""
+
+        with self._lock:
+            if not self._file.closed:
+                self._write()
+                self._file.close()
+
+def read(path):
+    """Returns an iterator of the Records in the trace file at 'path'"""
+
+    with open(path, "rb") as tfile:
+        magic, version, size = HEADER.unpack(tfile.read(HEADER.size))
+        record = RECORDS.get(version)
+        if magic != MAGIC or record is None or size != record.size:
+            raise ValueError(
+                "'%s': not a trace file of version %s" % (path, ", ".join(map(str, RECORDS)))
+            )
+
+        while True:
+            data = tfile.read(record.size * BATCH)
+            if not data:
+                break
+            for fields in record.iter_unpack(data):
+                yield Record(*fields)
+
+def replay(path, uri, speed=1.0, qdepth=None, **opts):
+    """
+    Replay the commands of the trace file at 'path' on the device at 'uri',
+    returns a ReplayResult
+
+    Commands are submitted at their original time divided by 'speed', or as
+    fast as the queues allow with a 'speed' of zero, on a Queue of 'qdepth'
+    per Queue recorded, defaulting to that of the Device; as for any Queue, it
+    must be a power of two below 4096, otherwise ValueError is raised. The
+    byte offset and size of a command are kept across devices of different LBA
+    size, and commands beyond the end of the namespace are wrapped onto it.
+    Payloads are read into, and written from, a scratch buffer, and commands
+    other than those of xnvme.queue.COMMANDS, e.g. Simple Copy and
+    file-commands, are skipped.
+
+    The 'lag_max' is the largest delay, in seconds, of a submission on its
+    schedule, and 'stats' is the snapshot of a QueueStats of all the queues.
+    Options for xnvme_dev_open() are given as keywords, as for Device.
+    """
+
+    if qdepth is not None:
+        check_capacity(qdepth, "qdepth")
+
+    records = sorted(read(path), key=lambda rec: rec.ts)
+
+    with Device(uri, **opts) as dev:
+        stats = QueueStats(dev.lba_nbytes)
+        buf = Buffer(dev, dev.cmd_nbytes)
+        queues = {}
+        discard = collections.deque(maxlen=0)
+        ncmds = nskipped = lag_max = 0
+
+        begin = time.monotonic_ns()
+        try:
+            for rec in records:
+                if rec.opcode not in COMMANDS:
+                    nskipped += 1
+                    continue
+
+                queue = queues.get(rec.qid)
+                if queue is None:
+                    queue = queues[rec.qid] = Queue(dev, qdepth or dev.qdepth, stats=stats)
+
+                if speed:
+                    due = begin + int(rec.ts / speed)
+                    now = time.monotonic_ns()
+                    while now < due:
+                        for pending in queues.values():
+                            pending.poke()
+                        now = time.monotonic_ns()
+                    lag_max = max(lag_max, now - due)
+
+                nblocks = min(
+                    max(((rec.nlb + 1) << rec.lbads) // dev.lba_nbytes, 1),
+                    dev.cmd_nbytes // dev.lba_nbytes
+                )
+                slba = (rec.slba << rec.lbads) // dev.lba_nbytes
+                if slba + nblocks > dev.nsze:
+                    slba %= dev.nsze - nblocks + 1
+
+                queue.submit(
+                    rec.opcode, slba, nblocks - 1, buf if COMMANDS[rec.opcode][1] else None,
+                    None, discard
+                )
+                ncmds += 1
+
+            for queue in queues.values():
+                queue.wait()
+        finally:
+            for queue in queues.values():
+                queue.term()
+            buf.close()
+        seconds = (time.monotonic_ns() - begin) / 1e9
+
+    return ReplayResult(ncmds, nskipped, seconds, lag_max / 1e9, stats.snapshot())
+
+def parse_args(argv=None):
+    """Parse the command-line arguments"""
+
+    prsr = argparse.ArgumentParser(
+        prog="python3 -m xnvme.trace", description="Replay a trace of commands on a device"
+    )
+    prsr.add_argument("trace", help="Trace file, as written by xnvme.TraceRecorder")
+    prsr.add_argument("uri", help="Device to replay the trace on")
+    prsr.add_argument("--speed", type=float, default=1.0,
+                      help="Multiple of the original timing, zero for as fast as possible")
+    prsr.add_argument("--qdepth", type=int, default=None, help="Depth of each queue")
+    prsr.add_argument("--be", default=None, help="Backend, e.g. linux or spdk")
+    prsr.add_argument("--opt", action="append", default=[],
+                      help="Further option of 'struct xnvme_opts', as key=value")
+
+    args = prsr.parse_args(argv)
+    if args.qdepth is not None:
+        try:
+            check_capacity(args.qdepth, "--qdepth")
+        except ValueError as exc:
+            prsr.error(str(exc))
+
+    return args
+
+def main(argv=None):
+    """Replay the trace given on the command-line, and print the result as JSON"""
+
+    args = parse_args(argv)
+
+    opts = {}
+    if args.be:
+        opts["be"] = args.be
+    for opt in args.opt:
+        key, _, val = opt.partition("=")
+        opts[key] = int(val) if val.isdigit() else val
+
+    res = replay(args.trace, args.uri, args.speed, args.qdepth, **opts)
+    json.dump(res._asdict(), sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+    return 1 if res.stats["errors"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+"""
+    Copying bytes from input to output
+
+    The equivalent of 'xdd copy-async', see tools/xdd.c, as a function::
+
+        res = xnvme.copy("/dev/nvme0n1", "/dev/nvme1n1", direct=True)
+        print("%d bytes at %.1f MB/s" % (res.nbytes, res.bandwidth / 1e6))
+
+    Input and output are opened via xnvme_file_open(), thus regular files and
+    block devices alike. Reads are submitted on a queue of the input, and each
+    completed read is written, from the same buffer, on a queue of the output.
+    The buffers are the slots of a single ring of twice 'qdepth' times
+    'iosize' bytes, such that 'qdepth' reads and 'qdepth' writes are in flight
+    at once, a slot is read into again once its write has completed, thus the
+    data is not copied on the host and the memory used is bounded. The ring is
+    allocated for the input and used by the output as well, thus the two must
+    be opened via the same backend, as files are.
+"""
+import collections
+import ctypes
+import errno
+import os
+import stat
+import time
+
+from xnvme import XNVME_SPEC_FS_OPC_READ, XNVME_SPEC_FS_OPC_WRITE
+from xnvme.buf import Buffer
+from xnvme.file import DIRECT_ALIGN, File
+from xnvme.queue import CommandError, Queue
+
+IOSIZE_DEF = 128 * 1024
+QDEPTH_DEF = 16
+
+CopyResult = collections.namedtuple("CopyResult", [
+    "nbytes", "seconds", "bandwidth", "nreads", "nwrites",
+])
+
+def fill(dst, addr, nbytes, offset, dst_size):
+    """
+    Fill the padding of 'nbytes', at 'addr', of a direct write at the byte
+    'offset' of 'dst', with the bytes of the output of 'dst_size' bytes there,
+    zeroes beyond it, such that the padding does not change the output
+    """
+
+    ctypes.memset(addr, 0, nbytes)
+    if offset >= dst_size:
+        return
+
+    # Direct reads are of whole blocks, the padding starts within the one at 'block'
+    block = offset - offset % DIRECT_ALIGN
+    with Buffer(dst, DIRECT_ALIGN) as buf:
+        nread = dst.pread(buf, DIRECT_ALIGN, block)
+        head = offset - block
+        if nread > head:
+            ctypes.memmove(addr, buf.addr + head, min(nbytes, nread - head))
+
+def copy(src_uri, dst_uri, nbytes=None, src_offset=0, dst_offset=0, iosize=IOSIZE_DEF,
+         qdepth=QDEPTH_DEF, direct=False, **opts):
+    """
+    Copy 'nbytes' at the byte 'src_offset' of 'src_uri' to 'dst_offset' of
+    'dst_uri', returns a CopyResult
+
+    The 'nbytes' default to the rest of the input, the output is created when
+    it does not exist, and is not truncated. At most 'qdepth' commands of
+    'iosize' bytes are in flight on each of the input and the output. With
+    'direct' then both are opened with O_DIRECT, requiring the offsets and
+    'iosize' to be multiples of DIRECT_ALIGN, the last read and write are
+    then padded to DIRECT_ALIGN, with the bytes of the output past the end of
+    the copy, or zeroes, and a regular output file is truncated to the end of
+    the copy, unless it was larger.
+
+    Options for xnvme_file_open() are given as keywords, as for Device, e.g.
+    async_="io_uring". Copying stops at the end of the input, and on the first
+    failed command, raising CommandError once the commands in flight complete.
+    Short writes are continued, a write making no progress, e.g. on a full
+    file-system, raises OSError with ENOSPC.
+    """
+
+    if direct and any(val % DIRECT_ALIGN for val in (iosize, src_offset, dst_offset)):
+        raise ValueError("direct: iosize and offsets must be multiples of %d" % DIRECT_ALIGN)
+
+    with File(src_uri, "rb", direct, **opts) as src, \
+         File(dst_uri, "r+b", direct, create=1, **opts) as dst:
+        if nbytes is None:
+            nbytes = max(0, src.size - src_offset)
+        dst_size = dst.size
+
+        # Queues of the power of two holding 'qdepth', as xnvme_queue_init() requires
+        capacity = 1 << (max(1, qdepth) - 1).bit_length()
+        nslots = max(1, min(2 * qdepth, -(-nbytes // iosize)))
+        ring = Buffer(src, iosize * nslots)
+        rqueue = Queue(src, capacity)
+        wqueue = Queue(dst, capacity)
+
+        reads = []
+        writes = []
+        free = list(range(nslots))
+        ready = collections.deque()
+        failure = None
+        nreads = nwrites = copied = 0
+        ofz = 0
+        end = nbytes
+
+        begin = time.monotonic()
+        try:
+            while (ofz < end and failure is None) or ready or rqueue.outstanding \
+                    or wqueue.outstanding:
+                # Fill the free slots with reads
+                while free and ofz < end and failure is None and rqueue.outstanding < qdepth:
+                    slot = free.pop()
+                    count = min(iosize, end - ofz)
+                    rqueue.submit_file(
+                        XNVME_SPEC_FS_OPC_READ, src_offset + ofz,
+                        count + (-count % DIRECT_ALIGN if direct else 0),
+                        ring.addr + slot * iosize, (slot, ofz, count), reads
+                    )
+                    nreads += 1
+                    ofz += count
+
+                rqueue.poke()
+                wqueue.poke()
+
+                # Slots read are ready to be written, as (slot, pos, skip, count)
+                cpls = reads[:]
+                del reads[:]
+                for cpl in cpls:
+                    slot, pos, count = cpl.tag
+                    nread = min(cpl.result, count)
+                    if (cpl.sc or cpl.sct) and failure is None:
+                        failure = CommandError(cpl)
+                    if nread < count:
+                        end = min(end, pos + nread)
+                    if failure is not None or not nread:
+                        free.append(slot)
+                        continue
+                    ready.append((slot, pos, 0, nread))
+
+                # Write the data read, from the slot it was read into
+                if failure is not None:
+                    free.extend(slot for slot, _, _, _ in ready)
+                    ready.clear()
+                while ready and wqueue.outstanding < qdepth:
+                    slot, pos, skip, count = ready.popleft()
+                    addr = ring.addr + slot * iosize + skip
+                    pad = -count % DIRECT_ALIGN if direct else 0
+                    if pad:
+                        fill(dst, addr + count, pad, dst_offset + pos + count, dst_size)
+                    wqueue.submit_file(
+                        XNVME_SPEC_FS_OPC_WRITE, dst_offset + pos, count + pad, addr,
+                        (slot, pos, skip, count), writes
+                    )
+                    nwrites += 1
+
+                # Slots written are free to read into, short writes are continued
+                cpls = writes[:]
+                del writes[:]
+                for cpl in cpls:
+                    slot, pos, skip, count = cpl.tag
+                    nwritten = 0 if cpl.sc or cpl.sct else min(cpl.result, count)
+                    copied += nwritten
+                    if failure is None and (cpl.sc or cpl.sct):
+                        failure = CommandError(cpl)
+                    elif failure is None and not nwritten:
+                        failure = OSError(
+                            errno.ENOSPC, "xnvme_file_pwrite(): wrote 0 of %d bytes at offset %d"
+                            % (count, dst_offset + pos), dst_uri
+                        )
+                    if failure is None and nwritten < count:
+                        ready.appendleft(
+                            (slot, pos + nwritten, skip + nwritten, count - nwritten)
+                        )
+                        continue
+                    free.append(slot)
+        finally:
+            rqueue.wait()
+            wqueue.wait()
+            rqueue.term()
+            wqueue.term()
+            ring.close()
+        seconds = time.monotonic() - begin
+
+        if failure is not None:
+            raise failure
+
+        if direct and copied % DIRECT_ALIGN and stat.S_ISREG(os.fstat(dst.fileno()).st_mode):
+            dst.truncate(max(dst_size, dst_offset + copied))
+
+    return CopyResult(copied, seconds, copied / seconds if seconds else 0.0, nreads, nwrites)
@@ -0,0 +1,759 @@
+"""
+    Zoned namespaces
+
+    The zone report of a device, as returned by xnvme_znd_report_from_dev(),
+    decoded as a NumPy structured array with one record per zone, thus the
+    zones are filtered and sorted with vectorized operations instead of
+    walking the descriptors one ctypes struct at a time::
+
+        zones = dev.zone_report()
+        empty = zones[(zones["zs"] == ZS_EMPTY) & (zones["wp"] == zones["zslba"])]
+
+    NumPy is imported on first use, it is only needed for the zone report.
+
+    The state of the zones is kept by a ZoneStateCache, from a single zone
+    report, such that picking a zone is a lookup in memory instead of
+    reporting the zones of the device every time.
+
+    Records are spread across zones by an AppendScheduler, writing them with
+    zone appends, for which the device assigns the LBA. A ZRWAWriter writes a
+    zone via its zone random write area, allowing overwrites of the most
+    recently written data.
+"""
+import ctypes
+import errno
+
+from xnvme import (
+    CAPI,
+    XNVME_SPEC_NVM_OPC_WRITE,
+    XNVME_SPEC_ZND_CMD_MGMT_SEND_CLOSE,
+    XNVME_SPEC_ZND_CMD_MGMT_SEND_FINISH,
+    XNVME_SPEC_ZND_CMD_MGMT_SEND_OPEN,
+    XNVME_SPEC_ZND_CMD_MGMT_SEND_RESET,
+    XNVME_SPEC_ZND_MGMT_OPEN_WITH_ZRWA,
+    XNVME_SPEC_ZND_OPC_APPEND,
+    XNVME_SPEC_ZND_STATE_CLOSED,
+    XNVME_SPEC_ZND_STATE_EMPTY,
+    XNVME_SPEC_ZND_STATE_EOPEN,
+    XNVME_SPEC_ZND_STATE_FULL,
+    XNVME_SPEC_ZND_STATE_IOPEN,
+    XNVME_SPEC_ZND_STATE_OFFLINE,
+    XNVME_SPEC_ZND_STATE_RONLY,
+    XNVME_SPEC_ZND_TYPE_SEQWR,
+    xnvme_spec_znd_descr,
+)
+from xnvme.buf import Buffer, BufferPool, byteview
+from xnvme.queue import CommandError, Completion, check
+
+# Zone states, as found in the 'zs' field of the report
+ZS_EMPTY = XNVME_SPEC_ZND_STATE_EMPTY
+ZS_IOPEN = XNVME_SPEC_ZND_STATE_IOPEN
+ZS_EOPEN = XNVME_SPEC_ZND_STATE_EOPEN
+ZS_CLOSED = XNVME_SPEC_ZND_STATE_CLOSED
+ZS_RONLY = XNVME_SPEC_ZND_STATE_RONLY
+ZS_FULL = XNVME_SPEC_ZND_STATE_FULL
+ZS_OFFLINE = XNVME_SPEC_ZND_STATE_OFFLINE
+
+ZONE_STATES = [ZS_EMPTY, ZS_IOPEN, ZS_EOPEN, ZS_CLOSED, ZS_RONLY, ZS_FULL, ZS_OFFLINE]
+
+# Value of 'nidents' in the Changed Zone List log when more zones changed than it holds
+LOG_CHANGES_OVERFLOW = 0xFFFF
+
+# Value of the Maximum Active/Open Resources of a namespace without a limit
+RESOURCES_UNLIMITED = 0xFFFFFFFF
+
+# Active zones of an AppendScheduler, when the namespace does not limit them
+NZONES_DEFAULT = 4
+
+# Unit of the Zone Append Size Limit, assuming the minimum memory page size
+ZASL_UNIT = 4096
+
+# Fields of the records of the report: (name, format, offset in the descriptor)
+#
+# In the descriptor 'zt' is the lower nibble of byte 0 and 'zs' the upper
+# nibble of byte 1, those are shifted and masked when decoding
+DESCR_FIELDS = [
+    ("zt", "u1", 0),
+    ("zs", "u1", 1),
+    ("za", "u1", 2),
+    ("zcap", "<u8", 8),
+    ("zslba", "<u8", 16),
+    ("wp", "<u8", 24),
+]
+
+def numpy():
+    """Returns the numpy module, raising ImportError with a hint when it is missing"""
+
+    try:
+        import numpy as np  # pylint: disable=import-outside-toplevel
+    except ImportError as exc:
+        raise ImportError(
+            "the zone report requires numpy, e.g. pip install pyxnvme[numpy]"
+        ) from exc
+
+    return np
+
+def report_dtype(zdext_nbytes=0):
+    """Returns the dtype of the zone report, with 'zdext_nbytes' of extension per zone"""
+
+    fields = [(name, fmt) for name, fmt, _ in DESCR_FIELDS]
+    if zdext_nbytes:
+        fields.append(("ext", "u1", (zdext_nbytes,)))
+
+    return numpy().dtype(fields)
+
+def decode(addr, nentries, zrent_nbytes, zd_nbytes, zdext_nbytes=0):
+    """
+    Returns the 'nentries' zone report entries, of 'zrent_nbytes' each, at the
+    address 'addr' decoded as an array of report_dtype()
+
+    The entries are read in place via a dtype with explicit offsets, and
+    copied into the array column by column.
+    """
+
+    np = numpy()
+
+    fields = {
+        "names": [name for name, _, _ in DESCR_FIELDS],
+        "formats": [fmt for _, fmt, _ in DESCR_FIELDS],
+        "offsets": [off for _, _, off in DESCR_FIELDS],
+        "itemsize": zrent_nbytes,
+    }
+    if zdext_nbytes:
+        fields["names"].append("ext")
+        fields["formats"].append(("u1", (zdext_nbytes,)))
+        fields["offsets"].append(zd_nbytes)
+
+    storage = (ctypes.c_uint8 * (nentries * zrent_nbytes)).from_address(addr)
+    entries = np.frombuffer(storage, dtype=np.dtype(fields), count=nentries)
+
+    zones = np.empty(nentries, dtype=report_dtype(zdext_nbytes))
+    for name in fields["names"]:
+        zones[name] = entries[name]
+    zones["zt"] &= 0xF
+    zones["zs"] >>= 4
+
+    return zones
+
+def report(dev, slba=0, limit=0, extended=False):
+    """
+    Returns the zone report of 'dev', from the zone starting at 'slba', of
+    'limit' zones, zero meaning all, as a NumPy array of report_dtype()
+
+    With 'extended' then the zone descriptor extensions are included, as the
+    'ext' field of the records.
+    """
+
+    rprt = CAPI.xnvme_znd_report_from_dev(dev, slba, limit, 1 if extended else 0)
+    if not rprt:
+        raise OSError("xnvme_znd_report_from_dev(): failed")
+
+    try:
+        hdr = rprt.contents
+        return decode(
+            ctypes.addressof(hdr) + type(hdr).storage.offset,
+            hdr.nentries,
+            hdr.zrent_nbytes,
+            hdr.zd_nbytes,
+            hdr.zdext_nbytes if hdr.extended else 0,
+        )
+    finally:
+        CAPI.xnvme_buf_virt_free(rprt)
+
+def sync(dev, func, *args):
+    """
+    Issue the command of the C API function 'func', given a synchronous
+    command-context of 'dev', the nsid and 'args', and wait for it to complete
+    """
+
+    ctx = CAPI.xnvme_cmd_ctx_from_dev(dev)
+    check(
+        getattr(CAPI, func)(ctypes.byref(ctx), CAPI.xnvme_dev_get_nsid(dev), *args), func
+    )
+    if ctx.cpl.status.sc or ctx.cpl.status.sct:
+        raise CommandError(
+            Completion(
+                None, ctx.cpl.status.sc, ctx.cpl.status.sct, ctx.cpl.cdw0, ctx.cpl.result
+            )
+        )
+
+def mgmt_send(dev, zslba, action, select_all=False, action_so=0):
+    """
+    Send the zone management 'action', e.g. XNVME_SPEC_ZND_CMD_MGMT_SEND_RESET,
+    for the zone starting at 'zslba', or for all zones with 'select_all', and
+    wait for it to complete
+    """
+
+    sync(dev, "xnvme_znd_mgmt_send", zslba, select_all, action, action_so, None)
+
+def zrwa_flush(dev, lba):
+    """Commit the zone random write area of the zone containing 'lba', up to and including 'lba'"""
+
+    sync(dev, "xnvme_znd_zrwa_flush", lba)
+
+def descr(dev, slba):
+    """Returns the descriptor, a 'struct xnvme_spec_znd_descr', of the zone at 'slba'"""
+
+    zdescr = xnvme_spec_znd_descr()
+    check(
+        CAPI.xnvme_znd_descr_from_dev(dev, slba, ctypes.byref(zdescr)),
+        "xnvme_znd_descr_from_dev"
+    )
+
+    return zdescr
+
+def resource_limits(dev):
+    """Returns the (open, active) zones allowed by the namespace of 'dev', None meaning any"""
+
+    zns = CAPI.xnvme_znd_dev_get_ns(dev)
+    if not zns:
+        raise OSError("xnvme_znd_dev_get_ns(): failed")
+
+    # The limits are zero-based
+    return tuple(
+        None if val == RESOURCES_UNLIMITED else val + 1
+        for val in (zns.contents.mor, zns.contents.mar)
+    )
+
+class ZoneStateCache(object):
+    """
+    The state and write pointer of the zones of the Device 'dev', taken from a
+    single zone report and kept current without reporting the zones again
+
+    Writes and appends are accounted for via written() and appended(), which
+    the Device calls for writes done through it, and zone management done via
+    reset(), finish(), open() and close() updates the zone it is done on.
+    Changes made by the device itself, e.g. the controller finishing a zone,
+    are picked up by update() from the Changed Zone List log.
+
+    Sequential-write zones are indexed by state, such that find() returns a
+    zone in a given state in O(1), where xnvme_znd_report_find_arbitrary()
+    scans the report. 'zcap_max' is the largest capacity of those zones.
+    """
+
+    def __init__(self, dev):
+        self.dev = dev
+        self.zsze = dev.nsect
+        self.state = []
+        self.wp = []
+        self.zcap = []
+        self.zcap_max = 0
+        self._indexed = []
+        self._in_state = {}
+
+        self.reload()
+
+    def reload(self):
+        """Replace the state of all zones with a zone report"""
+
+        zones = report(self.dev)
+
+        self.state = zones["zs"].tolist()
+        self.wp = zones["wp"].tolist()
+        self.zcap = zones["zcap"].tolist()
+        self._indexed = (
+            (zones["zt"] == XNVME_SPEC_ZND_TYPE_SEQWR) & (zones["zcap"] > 0)
+        ).tolist()
+        self.zcap_max = max(
+            [zcap for zcap, indexed in zip(self.zcap, self._indexed) if indexed] or [0]
+        )
+
+        # Dictionaries as ordered sets, such that find() is first-in-first-out
+        self._in_state = dict((state, {}) for state in ZONE_STATES)
+        for idx, state in enumerate(self.state):
+            if self._indexed[idx]:
+                self._in_state.setdefault(state, {})[idx] = None
+
+    def __len__(self):
+        return len(self.state)
+
+    def _set(self, idx, state, wp):
+        """Set the state and write pointer of the zone at index 'idx'"""
+
+        if self._indexed[idx] and state != self.state[idx]:
+            del self._in_state[self.state[idx]][idx]
+            self._in_state.setdefault(state, {})[idx] = None
+
+        self.state[idx] = state
+        self.wp[idx] = wp
+
+    def zslba(self, slba):
+        """Returns the start LBA of the zone containing 'slba'"""
+
+        return slba - slba % self.zsze
+
+    def get(self, slba):
+        """Returns the (state, wp, zcap) of the zone containing 'slba'"""
+
+        idx = slba // self.zsze
+
+        return self.state[idx], self.wp[idx], self.zcap[idx]
+
+    def find(self, state):
+        """Returns the start LBA of a zone in 'state', None when there is none"""
+
+        for idx in self._in_state.get(state, ()):
+            return idx * self.zsze
+
+        return None
+
+    def zones(self, state):
+        """Returns the start LBAs of the zones in 'state'"""
+
+        return [idx * self.zsze for idx in self._in_state.get(state, ())]
+
+    def count(self, state):
+        """Returns the number of zones in 'state'"""
+
+        return len(self._in_state.get(state, ()))
+
+    def _advance(self, idx, wp):
+        """Move the write pointer of the zone at 'idx' to 'wp', as done by a write"""
+
+        state = self.state[idx]
+        if state in (ZS_EMPTY, ZS_CLOSED):
+            state = ZS_IOPEN
+        if wp >= idx * self.zsze + self.zcap[idx]:
+            state = ZS_FULL
+
+        self._set(idx, state, max(wp, self.wp[idx]))
+
+    def written(self, slba, nlbs):
+        """Account for 'nlbs' logical blocks written at 'slba'"""
+
+        end = slba + nlbs
+        while slba < end:
+            idx = slba // self.zsze
+            zend = min(end, (idx + 1) * self.zsze)
+            self._advance(idx, zend)
+            slba = zend
+
+    def appended(self, zslba, nlbs):
+        """Account for 'nlbs' logical blocks appended to the zone at 'zslba'"""
+
+        idx = zslba // self.zsze
+        self._advance(idx, self.wp[idx] + nlbs)
+
+    def refresh(self, slba):
+        """Replace the state of the zone containing 'slba' with its descriptor"""
+
+        zdescr = descr(self.dev, self.zslba(slba))
+        self.zcap[slba // self.zsze] = zdescr.zcap
+        self._set(slba // self.zsze, zdescr.zs, zdescr.wp)
+
+    def update(self):
+        """
+        Refresh the zones changed by the device, as listed by the Changed Zone
+        List log, returns their start LBAs
+
+        The log lists zones changed by the controller only, e.g. finished or
+        taken offline, not those changed by commands. When more zones changed
+        than the log lists, then all zones are reloaded.
+        """
+
+        log = CAPI.xnvme_znd_log_changes_from_dev(self.dev)
+        if not log:
+            raise OSError("xnvme_znd_log_changes_from_dev(): failed")
+
+        try:
+            nidents = log.contents.nidents
+            if nidents == LOG_CHANGES_OVERFLOW:
+                changed = None
+            else:
+                changed = list(log.contents.idents[:nidents])
+        finally:
+            CAPI.xnvme_buf_free(self.dev, log)
+
+        if changed is None:
+            self.reload()
+            return list(range(0, len(self) * self.zsze, self.zsze))
+
+        for zslba in changed:
+            self.refresh(zslba)
+
+        return changed
+
+    def reset(self, zslba):
+        """Reset the zone at 'zslba'"""
+
+        mgmt_send(self.dev, zslba, XNVME_SPEC_ZND_CMD_MGMT_SEND_RESET)
+        self._set(zslba // self.zsze, ZS_EMPTY, self.zslba(zslba))
+
+    def finish(self, zslba):
+        """Finish the zone at 'zslba', transitioning it to full"""
+
+        mgmt_send(self.dev, zslba, XNVME_SPEC_ZND_CMD_MGMT_SEND_FINISH)
+        idx = zslba // self.zsze
+        self._set(idx, ZS_FULL, idx * self.zsze + self.zcap[idx])
+
+    def open(self, zslba, zrwa=False):
+        """Open the zone at 'zslba' explicitly, with a ZRWA when 'zrwa' is True"""
+
+        mgmt_send(
+            self.dev, zslba, XNVME_SPEC_ZND_CMD_MGMT_SEND_OPEN, False,
+            XNVME_SPEC_ZND_MGMT_OPEN_WITH_ZRWA if zrwa else 0
+        )
+        idx = zslba // self.zsze
+        self._set(idx, ZS_EOPEN, self.wp[idx])
+
+    def close(self, zslba):
+        """Close the zone at 'zslba'"""
+
+        mgmt_send(self.dev, zslba, XNVME_SPEC_ZND_CMD_MGMT_SEND_CLOSE)
+        idx = zslba // self.zsze
+        if self.state[idx] in (ZS_IOPEN, ZS_EOPEN):
+            self._set(idx, ZS_CLOSED, self.wp[idx])
+
+class AppendScheduler(object):
+    """
+    Appends records to the Device 'dev', spread across 'nzones' active zones
+
+    Each record is written by a single zone append, submitted to the queue of
+    the Device without waiting for it, to the active zones in turn, with at
+    most 'inflight' appends outstanding per zone. The device assigns the LBA
+    of a record, flush() returns the (tag, lba) of the records appended.
+
+    A zone without room for a record is retired, it is finished, unless
+    full, once its appends have completed, and replaced by another zone,
+    explicitly opened: a closed zone when there is one, otherwise an empty
+    zone. The zones are picked via the ZoneStateCache of the Device.
+
+    'nzones' defaults to, and is limited by, the open and active resources
+    of the namespace left by the zones already open, or active, on it,
+    counting retired zones not yet finished. Records are at most
+    'max_nbytes', the smallest of the transfer size, the Zone Append Size
+    Limit and the largest zone capacity.
+    """
+
+    def __init__(self, dev, nzones=None, inflight=None):
+        self.dev = dev
+        self.zones = dev.zones
+
+        nopen = self.zones.count(ZS_IOPEN) + self.zones.count(ZS_EOPEN)
+        nactive = nopen + self.zones.count(ZS_CLOSED)
+        limits = [
+            limit - nused
+            for limit, nused in zip(resource_limits(dev), (nopen, nactive))
+            if limit is not None
+        ]
+        if nzones:
+            limits.append(nzones)
+        self.nzones = min(limits) if limits else NZONES_DEFAULT
+        if self.nzones < 1:
+            raise OSError(
+                errno.EBUSY, "no zone resources left, %d zones open, %d active" % (nopen, nactive)
+            )
+        self.inflight = inflight or max(1, dev.qdepth // self.nzones)
+
+        self.max_nbytes = min(dev.cmd_nbytes, self.zones.zcap_max * dev.lba_nbytes)
+        ctrlr = CAPI.xnvme_znd_dev_get_ctrlr(dev)
+        if ctrlr and ctrlr.contents.zasl:
+            self.max_nbytes = min(self.max_nbytes, ZASL_UNIT << ctrlr.contents.zasl)
+
+        self.stats = {"appends": 0, "zones": 0, "finished": 0}
+
+        self._pool = BufferPool(dev, self.max_nbytes, min(self.max_nbytes, 4096))
+        self._active = []
+        self._retired = []
+        self._room = {}
+        self._outstanding = {}
+        self._next = 0
+        self._cpls = []
+        self._results = []
+        self._errors = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _activate(self):
+        """Open a zone and make it active, returns False when there is none to open"""
+
+        zslba = self.zones.find(ZS_CLOSED)
+        if zslba is None:
+            zslba = self.zones.find(ZS_EMPTY)
+        if zslba is None:
+            return False
+
+        self.zones.open(zslba)
+        _, wp, zcap = self.zones.get(zslba)
+        self._active.append(zslba)
+        self._room[zslba] = zslba + zcap - wp
+        self._outstanding[zslba] = 0
+        self.stats["zones"] += 1
+
+        return True
+
+    def _retire(self):
+        """Finish the retired zones without outstanding appends"""
+
+        for zslba in [zslba for zslba in self._retired if not self._outstanding[zslba]]:
+            self._retired.remove(zslba)
+            del self._room[zslba], self._outstanding[zslba]
+            if self.zones.get(zslba)[0] != ZS_FULL:
+                self.zones.finish(zslba)
+                self.stats["finished"] += 1
+
+    def _reap(self):
+        """Account for the completed appends, then finish the retired zones"""
+
+        cpls, self._cpls = self._cpls, []
+        for cpl in cpls:
+            tag, zslba, nlbs = cpl.tag
+            self._outstanding[zslba] -= 1
+            if cpl.sc or cpl.sct:
+                self._errors.append(cpl)
+                self.zones.refresh(zslba)
+            else:
+                self.zones.appended(zslba, nlbs)
+                self._results.append((tag, cpl.result))
+
+        self._retire()
+
+    def _zone(self, nlbs):
+        """Returns the active zone to append 'nlbs' logical blocks to"""
+
+        while True:
+            for zslba in [zslba for zslba in self._active if self._room[zslba] < nlbs]:
+                self._active.remove(zslba)
+                self._retired.append(zslba)
+            self._retire()
+
+            while len(self._active) + len(self._retired) < self.nzones:
+                if not self._activate():
+                    break
+            if not (self._active or self._retired):
+                raise OSError(errno.ENOSPC, "no zone with room for %d logical blocks" % nlbs)
+
+            for _ in range(len(self._active)):
+                zslba = self._active[self._next % len(self._active)]
+                self._next += 1
+                if self._outstanding[zslba] < self.inflight:
+                    return zslba
+
+            self.dev.queue.poke()
+            self._reap()
+
+    def append(self, data, tag=None):
+        """
+        Append the record 'data', bytes-like, of a multiple of lba_nbytes and at
+        most 'max_nbytes', without waiting for it; 'tag' identifies the record
+        in the results of flush()
+        """
+
+        data = byteview(data)
+        nbytes = len(data)
+        if nbytes % self.dev.lba_nbytes or not 0 < nbytes <= self.max_nbytes:
+            raise ValueError(
+                "data: %d bytes, must be a multiple of lba_nbytes: %d and at most %d" % (
+                    nbytes, self.dev.lba_nbytes, self.max_nbytes
+                )
+            )
+        nlbs = nbytes // self.dev.lba_nbytes
+
+        zslba = self._zone(nlbs)
+        buf = self._pool.get(nbytes)
+        buf[:nbytes] = data
+
+        self.dev.queue.submit(
+            XNVME_SPEC_ZND_OPC_APPEND, zslba, nlbs - 1, buf, (tag, zslba, nlbs), self._cpls
+        )
+        self._room[zslba] -= nlbs
+        self._outstanding[zslba] += 1
+        self.stats["appends"] += 1
+
+        return tag
+
+    def append_batch(self, records):
+        """
+        Append the bytes-like 'records', returns the LBA of each, in order
+
+        The results of records appended before, by append(), and not yet
+        flushed are kept for the next flush().
+        """
+
+        # Tags private to the batch, thus told apart from those of append()
+        batch = object()
+        nrecords = 0
+        for idx, data in enumerate(records):
+            self.append(data, (batch, idx))
+            nrecords += 1
+
+        lbas = [None] * nrecords
+        others = []
+        for tag, lba in self.flush():
+            if isinstance(tag, tuple) and len(tag) == 2 and tag[0] is batch:
+                lbas[tag[1]] = lba
+            else:
+                others.append((tag, lba))
+        self._results[:0] = others
+
+        return lbas
+
+    def flush(self):
+        """
+        Wait for the appends, returns the (tag, lba) of the records appended
+        since the last flush, raises CommandError for a failed append
+        """
+
+        self.dev.queue.wait()
+        self._reap()
+
+        results, self._results = self._results, []
+        errors, self._errors = self._errors, []
+        if errors:
+            raise CommandError(errors[0])
+
+        return results
+
+    def close(self):
+        """Flush, then close the active zones, releasing their open resources"""
+
+        try:
+            self.flush()
+        finally:
+            for zslba in self._active:
+                if self.zones.get(zslba)[0] in (ZS_IOPEN, ZS_EOPEN):
+                    self.zones.close(zslba)
+            self._active = []
+            self._pool.clear()
+
+class ZRWAWriter(object):
+    """
+    Writes the zone at 'zslba' of the Device 'dev' via its zone random write
+    area (ZRWA), which the zone is opened with
+
+    Writes go anywhere between the write pointer and the end of the ZRWA,
+    'zrwas' logical blocks further, thus data in the ZRWA is overwritten in
+    place. Data is committed, and the write pointer advanced, by flushing the
+    ZRWA, in units of 'zrwafg' logical blocks.
+
+    The ZRWA is flushed only when a write does not fit in it, then with a
+    single flush, committing all data written except the last 'keep' logical
+    blocks, which remain overwritable, and at least what makes room for the
+    write. Larger 'keep' means more flushes.
+
+    Writes are submitted without waiting for them, they are waited for before
+    a flush, or a write overlapping them, and by flush(), which commits all
+    data written, and is called when leaving the context. Data up to a
+    multiple of 'zrwafg', or the end of the zone, is committed, the rest is
+    left in the ZRWA.
+    """
+
+    def __init__(self, dev, zslba, keep=0):
+        zns = CAPI.xnvme_znd_dev_get_ns(dev)
+        if not zns or not zns.contents.ozcs.bits.zrwasup:
+            raise ValueError("dev: '%s' does not support ZRWA" % dev.uri)
+
+        self.dev = dev
+        self.zones = dev.zones
+        self.zslba = self.zones.zslba(zslba)
+        self.zrwas = zns.contents.zrwas
+        self.zrwafg = zns.contents.zrwafg or 1
+        self.keep = keep
+        if keep >= self.zrwas:
+            raise ValueError("keep: %d must be less than zrwas: %d" % (keep, self.zrwas))
+
+        self.zones.open(self.zslba, zrwa=True)
+        _, self.wp, zcap = self.zones.get(self.zslba)
+        self.zend = self.zslba + zcap
+        self.end = self.wp
+
+        self.stats = {"writes": 0, "flushes": 0}
+
+        self._cpls = []
+        self._inflight = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
+
+    def _wait(self):
+        """Wait for the outstanding writes, raise CommandError for a failed write"""
+
+        self.dev.queue.wait()
+        self._inflight = []
+
+        cpls, self._cpls = self._cpls, []
+        for cpl in cpls:
+            if cpl.sc or cpl.sct:
+                raise CommandError(cpl)
+
+    def _align(self, lba):
+        """Returns 'lba' rounded up to a flush-granule, at most the end of the zone"""
+
+        return min(self.zend, self.zslba - (self.zslba - lba) // self.zrwafg * self.zrwafg)
+
+    def _floor(self, lba):
+        """Returns 'lba' rounded down to a flush-granule, unless at the end of the zone"""
+
+        if lba >= self.zend:
+            return self.zend
+
+        return self.zslba + (lba - self.zslba) // self.zrwafg * self.zrwafg
+
+    def commit(self, lba):
+        """Flush the ZRWA up to, not including, 'lba', advancing the write pointer to it"""
+
+        if lba <= self.wp:
+            return
+        if lba > self.end:
+            raise ValueError("lba: %d beyond the data written, ending at %d" % (lba, self.end))
+
+        self._wait()
+        zrwa_flush(self.dev, lba - 1)
+        self.zones.written(self.wp, lba - self.wp)
+        self.wp = lba
+        self.stats["flushes"] += 1
+
+    def pwrite(self, offset, data):
+        """
+        Write 'data', a Buffer or bytes-like, at the byte 'offset', between the
+        write pointer and the end of the zone, returns the number of bytes written
+        """
+
+        buf = data
+        if not isinstance(data, Buffer):
+            buf = Buffer(self.dev, len(memoryview(data).cast("B")))
+            buf[:] = memoryview(data).cast("B")
+
+        cmds = self.dev.commands(XNVME_SPEC_NVM_OPC_WRITE, offset, len(buf), buf.addr)
+        slba, nlbs = offset // self.dev.lba_nbytes, len(buf) // self.dev.lba_nbytes
+        if slba < self.wp or slba + nlbs > self.zend:
+            raise ValueError(
+                "offset: %d outside of the writable LBAs, %d to %d" % (offset, self.wp, self.zend)
+            )
+        if nlbs > self.zrwas:
+            raise ValueError("data: %d logical blocks exceeds zrwas: %d" % (nlbs, self.zrwas))
+
+        if slba + nlbs > self.wp + self.zrwas:
+            lba = self._align(max(slba + nlbs - self.zrwas, self.end - self.keep))
+            if lba > slba or lba > self.end:
+                lba = self._align(slba + nlbs - self.zrwas)
+            if lba > slba or lba > self.end:
+                raise ValueError(
+                    "offset: %d leaves unwritten logical blocks below the ZRWA" % offset
+                )
+            self.commit(lba)
+
+        if any(slba < end and start < slba + nlbs for start, end, _ in self._inflight):
+            self._wait()
+
+        for opcode, cslba, nlb, addr in cmds:
+            self.dev.queue.submit(opcode, cslba, nlb, addr, None, self._cpls)
+        # The payload is referenced until the writes are waited for
+        self._inflight.append((slba, slba + nlbs, buf))
+        self.end = max(self.end, slba + nlbs)
+        self.stats["writes"] += 1
+
+        return len(buf)
+
+    def flush(self):
+        """Wait for the writes, then commit the data written, see ZRWAWriter"""
+
+        self._wait()
+        self.commit(max(self.wp, self._floor(self.end)))
@@ -0,0 +1,738 @@
+#!/usr/bin/env python3
+"""
+    Generate ctypes bindings for the public xNVMe C API
+
+    The public headers, include/libxnvme*.h, are parsed for macro-constants,
+    enums, structs, unions, callback-typedefs and function prototypes. From
+    these a Python module is emitted with a ctypes Structure/Union per C struct
+    and union, and a prototype table from which argtypes/restype are set on the
+    loaded library for every exported function.
+
+    ctags, as used by docs/autogen/apigen.py, lists the symbols but not the
+    member layout (bit-widths, nested anonymous unions, array-lengths) needed
+    for ctypes, thus the declarations are parsed directly. The parser handles
+    the subset of C used by the public headers, and the sizes of the emitted
+    types are verified against the XNVME_STATIC_ASSERT() of the headers.
+"""
+from __future__ import print_function
+import argparse
+import ctypes
+import glob
+import keyword
+import logging
+import sys
+import os
+import re
+
+HEADER = '''"""
+    ctypes bindings for the xNVMe C API
+
+    Autogenerated by scripts/ctypes_generator.py from:
+
+%(headers)s
+
+    Do not edit, re-generate with: make gen-pyxnvme-ctypes
+"""
+# pylint: disable=invalid-name,too-few-public-methods,line-too-long
+import ctypes
+
+'''
+
+LOAD = '''
+def load(capi):
+    """Set argtypes and restype, on the given CDLL, for the functions in PROTOTYPES"""
+
+    for name, (restype, argtypes) in PROTOTYPES.items():
+        func = getattr(capi, name, None)
+        if func is None:  # Declared in the headers, not exported by the library
+            continue
+
+        func.restype = restype
+        func.argtypes = argtypes
+
+    return capi
+'''
+
+# Mapping of C base types to ctypes, pointers to 'char' are handled explicitly
+CTYPES = {
+    "void": None,
+    "bool": "ctypes.c_bool",
+    "_Bool": "ctypes.c_bool",
+    "char": "ctypes.c_char",
+    "signed char": "ctypes.c_byte",
+    "unsigned char": "ctypes.c_ubyte",
+    "short": "ctypes.c_short",
+    "unsigned short": "ctypes.c_ushort",
+    "int": "ctypes.c_int",
+    "unsigned": "ctypes.c_uint",
+    "unsigned int": "ctypes.c_uint",
+    "long": "ctypes.c_long",
+    "unsigned long": "ctypes.c_ulong",
+    "long long": "ctypes.c_longlong",
+    "unsigned long long": "ctypes.c_ulonglong",
+    "float": "ctypes.c_float",
+    "double": "ctypes.c_double",
+    "long double": "ctypes.c_longdouble",
+    "int8_t": "ctypes.c_int8",
+    "int16_t": "ctypes.c_int16",
+    "int32_t": "ctypes.c_int32",
+    "int64_t": "ctypes.c_int64",
+    "uint8_t": "ctypes.c_uint8",
+    "uint16_t": "ctypes.c_uint16",
+    "uint32_t": "ctypes.c_uint32",
+    "uint64_t": "ctypes.c_uint64",
+    "size_t": "ctypes.c_size_t",
+    "ssize_t": "ctypes.c_ssize_t",
+    "off_t": "ctypes.c_int64",
+    "FILE": None,
+}
+
+TOKEN = re.compile(r"""
+    (?P<ident>[A-Za-z_]\w*)
+  | (?P<number>0[xX][0-9a-fA-F]+[uUlL]*|\d+[uUlL]*)
+  | (?P<string>"(?:[^"\\]|\\.)*")
+  | (?P<char>'(?:[^'\\]|\\.)*')
+  | (?P<op><<|>>|->|\.\.\.|[{}()\[\];,:*=+\-|&~<>/!%^?.])
+  | (?P<space>\s+)
+""", re.VERBOSE)
+
+RE_STATIC_ASSERT = re.compile(
+    r"XNVME_STATIC_ASSERT\(\s*sizeof\((?P<kind>struct|union)\s+(?P<name>\w+)\)"
+    r"\s*==\s*(?P<size>\w+)\s*,[^)]*\)"
+)
+
+QUALIFIERS = ["const", "volatile", "extern", "restrict", "__restrict"]
+
+def expand_path(path):
+    """Expands variables from the given path and turns it into absolute path"""
+
+    return os.path.abspath(os.path.expanduser(os.path.expandvars(path)))
+
+def setup():
+    """Parse command-line arguments for generator and setup logger"""
+
+    prsr = argparse.ArgumentParser(
+        description="xNVMe ctypes-generator",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    prsr.add_argument(
+        "--headers",
+        nargs="+",
+        default=[
+            p for p in sorted(glob.glob(os.sep.join(["include", "libxnvme*.h"])))
+            if not p.endswith("libxnvmec.h")
+        ],
+        help="Path to the header-files to generate bindings for"
+    )
+    prsr.add_argument(
+        "--output",
+        default=os.sep.join(["pyxnvme", "xnvme", "libxnvme.py"]),
+        help="Path to the Python module to emit"
+    )
+    prsr.add_argument(
+        "--log-level",
+        help="log-devel",
+        default="INFO",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
+    )
+
+    args = prsr.parse_args()
+    args.headers = [expand_path(path) for path in args.headers]
+    args.output = expand_path(args.output)
+
+    logging.basicConfig(
+        format='%(asctime)s %(message)s',
+        level=getattr(logging, args.log_level.upper(), None)
+    )
+
+    return args
+
+def pyname(name):
+    """Returns 'name' usable as a Python identifier, e.g. for the member 'async'"""
+
+    return "%s_" % name if keyword.iskeyword(name) else name
+
+class Api(object):
+    """The declarations collected from the headers"""
+
+    def __init__(self):
+        self.consts = {}        # name -> int
+        self.enums = {}         # name -> [(member, int)]
+        self.records = {}       # name -> record-dict, see Parser.record()
+        self.opaque = set()     # struct names declared but not defined
+        self.callbacks = {}     # name -> (ret, [params])
+        self.funcs = {}         # name -> (ret, [params])
+        self.sizes = {}         # struct/union name -> sizeof from static asserts
+        self.headers = []
+
+class Parser(object):
+    """Parser for the subset of C declarations found in the public headers"""
+
+    def __init__(self, api, text):
+        self.api = api
+        self.toks = []
+        self.pos = 0
+        self.nanon = {}
+
+        self.tokenize(self.preprocess(text))
+
+    def preprocess(self, text):
+        """Strip comments and pre-processor directives, collecting constants"""
+
+        text = re.sub(r"/\*.*?\*/", " ", text, flags=re.DOTALL)
+        text = re.sub(r"//[^\n]*", " ", text)
+        text = re.sub(r"\\\n", " ", text)
+
+        for match in RE_STATIC_ASSERT.finditer(text):
+            self.api.sizes[match.group("name")] = self.evaluate(match.group("size"))
+        text = RE_STATIC_ASSERT.sub(" ", text)
+
+        lines = []
+        skip = 0
+        for line in text.splitlines():
+            stripped = line.strip()
+            if not stripped.startswith("#"):
+                lines.append("" if skip else line)
+                continue
+
+            directive = stripped[1:].split()
+            if not directive:
+                continue
+            if directive[0] in ["if", "ifdef", "ifndef"]:
+                if skip or directive[-1] == "__cplusplus":
+                    skip += 1
+            elif directive[0] == "endif" and skip:
+                skip -= 1
+            elif directive[0] == "define" and not skip and len(directive) > 2:
+                name = directive[1]
+                if "(" in name:
+                    continue
+                value = self.evaluate(" ".join(directive[2:]))
+                if value is not None:
+                    self.api.consts[name] = value
+
+        return "\n".join(lines)
+
+    def evaluate(self, expr):
+        """Evaluate an integer constant-expression, None when it is not one"""
+
+        expr = re.sub(r"\b(0[xX][0-9a-fA-F]+|\d+)[uUlL]+\b", r"\1", expr.strip())
+        names = re.findall(r"\b[A-Za-z_]\w*", expr)
+        if any(name not in self.api.consts for name in names):
+            return None
+        if not re.match(r"^[\w\s()+\-*/<>|&~]+$", expr):
+            return None
+
+        try:
+            value = eval(expr, {"__builtins__": {}}, dict(self.api.consts))
+        except (SyntaxError, TypeError, ZeroDivisionError):
+            return None
+
+        return value if isinstance(value, int) else None
+
+    def tokenize(self, text):
+        """Split the given 'text' into tokens"""
+
+        pos = 0
+        while pos < len(text):
+            match = TOKEN.match(text, pos)
+            if not match:
+                raise ValueError("Cannot tokenize: %r" % text[pos:pos + 40])
+            pos = match.end()
+            if match.lastgroup != "space":
+                self.toks.append(match.group())
+
+    def peek(self, offset=0):
+        """Returns the token at the current position + 'offset'"""
+
+        idx = self.pos + offset
+
+        return self.toks[idx] if idx < len(self.toks) else None
+
+    def take(self, expected=None):
+        """Consume a token, when 'expected' is given then it must match"""
+
+        tok = self.peek()
+        if expected is not None and tok != expected:
+            raise ValueError("Expected %r got %r at %r" % (
+                expected, tok, " ".join(self.toks[self.pos:self.pos + 10])
+            ))
+        self.pos += 1
+
+        return tok
+
+    def until(self, stop):
+        """Returns the tokens up to 'stop', at nesting-depth zero, consuming 'stop'"""
+
+        toks = []
+        depth = 0
+        while True:
+            tok = self.take()
+            if tok is None:
+                raise ValueError("Unexpected end, looking for %r" % stop)
+            if tok == stop and depth == 0:
+                return toks
+            if tok in "({[":
+                depth += 1
+            elif tok in ")}]":
+                depth -= 1
+            toks.append(tok)
+
+    def anon_name(self, parent):
+        """Returns a name for an anonymous record nested within 'parent'"""
+
+        self.nanon[parent] = self.nanon.get(parent, -1) + 1
+
+        return "_%s_%d" % (parent, self.nanon[parent])
+
+    def parse(self):
+        """Parse the top-level declarations"""
+
+        while self.peek() is not None:
+            tok = self.peek()
+
+            if tok == ";":
+                self.take()
+            elif tok == "static":  # static inline functions are not exported
+                while self.take() != "{":
+                    pass
+                self.pos -= 1
+                self.take("{")
+                self.until("}")
+            elif tok == "typedef":
+                self.take()
+                self.typedef(self.until(";"))
+            elif tok in ["struct", "union"] and self.is_definition():
+                self.record_definition()
+            elif tok == "enum" and self.peek(2) == "{":
+                self.enum()
+            else:
+                self.declaration(self.until(";"))
+
+    def is_definition(self):
+        """Check whether a struct/union definition starts at the current position"""
+
+        offset = 1
+        while self.peek(offset) == "__attribute__":
+            offset += 6     # __attribute__ ( ( packed ) )
+        return self.peek(offset + 1) == "{"
+
+    def record_definition(self):
+        """Parse a top-level struct/union definition"""
+
+        kind = self.take()
+        packed = False
+        packed = self.attributes()
+        name = self.take()
+
+        rec = self.record(kind, name, packed)
+        rec["packed"] = self.attributes() or rec["packed"]
+        self.take(";")
+
+    def attributes(self):
+        """Consume '__attribute__((...))', returns True when one of them is packed"""
+
+        packed = False
+        while self.peek() == "__attribute__":
+            self.take()
+            self.take("(")
+            attrs = self.until(")")
+            packed = packed or "packed" in attrs or "__packed__" in attrs
+
+        return packed
+
+    def record(self, kind, name, packed=False):
+        """Parse the body of a struct/union, registering it as 'name'"""
+
+        rec = {"kind": kind, "name": name, "packed": packed, "members": []}
+        self.take("{")
+
+        while self.peek() != "}":
+            tok = self.peek()
+
+            if tok in ["struct", "union"] and (
+                    self.peek(1) == "{" or self.peek(2) == "{"):
+                nkind = self.take()
+                if self.peek() != "{":
+                    self.take()
+                nname = self.anon_name(name)
+                self.record(nkind, nname, packed)
+                decl = self.until(";")
+                if decl:
+                    for dname, dims, bits in self.declarators(decl):
+                        rec["members"].append(
+                            (dname, ("record", nname), 0, dims, bits, False)
+                        )
+                else:
+                    rec["members"].append((nname, ("record", nname), 0, [], None, True))
+                continue
+
+            if tok in ["SLIST_ENTRY", "SLIST_HEAD"]:
+                self.take()
+                self.take("(")
+                self.until(")")
+                mname = self.take()
+                self.take(";")
+                rec["members"].append((mname, ("base", "void"), 1, [], None, False))
+                continue
+
+            decl = self.until(";")
+            btype, nptr, rest = self.split_type(decl)
+            for dname, dims, bits in self.declarators(rest):
+                rec["members"].append((dname, btype, nptr, dims, bits, False))
+
+        self.take("}")
+        self.api.records[name] = rec
+        self.api.opaque.discard(name)
+
+        return rec
+
+    def declarators(self, toks):
+        """Parse 'name[dim]..: bits, ...' returning [(name, dims, bits)]"""
+
+        decls = []
+        for part in self.split(toks, ","):
+            ptr = 0
+            while part and part[0] == "*":
+                ptr += 1
+                part = part[1:]
+            name = part[0]
+            dims = []
+            bits = None
+            idx = 1
+            while idx < len(part):
+                if part[idx] == "[":
+                    end = part.index("]", idx)
+                    dims.append(self.evaluate(" ".join(part[idx + 1:end])) or 0)
+                    idx = end + 1
+                elif part[idx] == ":":
+                    bits = self.evaluate(" ".join(part[idx + 1:]))
+                    break
+                else:
+                    raise ValueError("Unhandled declarator: %r" % part)
+            if ptr:
+                raise ValueError("Pointer declarators in lists are not supported")
+            decls.append((name, dims, bits))
+
+        return decls
+
+    @staticmethod
+    def split(toks, sep):
+        """Split 'toks' on 'sep' at nesting-depth zero"""
+
+        parts = [[]]
+        depth = 0
+        for tok in toks:
+            if tok in "([{":
+                depth += 1
+            elif tok in ")]}":
+                depth -= 1
+            if tok == sep and depth == 0:
+                parts.append([])
+                continue
+            parts[-1].append(tok)
+
+        return [part for part in parts if part]
+
+    def split_type(self, toks, named=True):
+        """
+        Split a declaration into its base-type, pointer-depth and the remainder
+
+        With 'named' then the declaration is expected to contain a declarator
+        """
+
+        toks = [tok for tok in toks if tok not in QUALIFIERS]
+        if toks[0] in ["struct", "union", "enum"]:
+            btype = (toks[0], toks[1])
+            idx = 2
+            if toks[0] == "struct" and toks[1] not in self.api.records:
+                self.api.opaque.add(toks[1])
+        else:
+            idx = 0
+            words = []
+            while idx < len(toks) and re.match(r"^[A-Za-z_]\w*$", toks[idx]):
+                words.append(toks[idx])
+                idx += 1
+                if " ".join(words) in CTYPES and not " ".join(
+                        words + toks[idx:idx + 1]) in CTYPES:
+                    break
+                if words[-1] in self.api.callbacks or words[-1] in CTYPES:
+                    if not named or idx >= len(toks) or toks[idx] in "*[":
+                        break
+                    if " ".join(words + [toks[idx]]) not in CTYPES:
+                        break
+            if named and idx == len(toks) and len(words) > 1:
+                idx -= 1
+                words = words[:-1]
+            btype = ("base", " ".join(words))
+
+        nptr = 0
+        while idx < len(toks) and toks[idx] == "*":
+            nptr += 1
+            idx += 1
+
+        return btype, nptr, toks[idx:]
+
+    def param(self, toks):
+        """Parse a single function parameter, returning (btype, nptr)"""
+
+        if toks == ["void"]:
+            return None
+        if toks == ["..."]:
+            return ("base", "..."), 0
+
+        btype, nptr, rest = self.split_type(toks)
+        if "[" in rest:     # Array parameters decay to pointers
+            nptr += 1
+
+        return btype, nptr
+
+    def typedef(self, toks):
+        """Parse a typedef; only function-pointer typedefs are in the public headers"""
+
+        if "(" not in toks or toks[toks.index("(") + 1] != "*":
+            logging.warning("Skipping typedef: %r", " ".join(toks))
+            return
+
+        lparen = toks.index("(")
+        name = toks[lparen + 2]
+        btype, nptr, _ = self.split_type(toks[:lparen], named=False)
+        params = toks[toks.index("(", lparen + 1) + 1:-1]
+
+        self.api.callbacks[name] = (
+            (btype, nptr),
+            [p for p in [self.param(part) for part in self.split(params, ",")] if p]
+        )
+
+    def enum(self):
+        """Parse an enum definition"""
+
+        self.take("enum")
+        name = self.take()
+        self.take("{")
+        body = self.until("}")
+        self.take(";")
+
+        members = []
+        value = -1
+        for part in self.split(body, ","):
+            if "=" in part:
+                value = self.evaluate(" ".join(part[2:]))
+            else:
+                value += 1
+            self.api.consts[part[0]] = value
+            members.append((part[0], value))
+
+        self.api.enums[name] = members
+
+    def declaration(self, toks):
+        """Parse a top-level declaration, registering function-prototypes"""
+
+        if toks and toks[0] in ["struct", "union"] and len(toks) == 2:
+            if toks[1] not in self.api.records:
+                self.api.opaque.add(toks[1])
+            return
+        if "(" not in toks or toks[0] == "extern":
+            logging.info("Skipping declaration: %r", " ".join(toks))
+            return
+
+        lparen = toks.index("(")
+        name = toks[lparen - 1]
+        btype, nptr, _ = self.split_type(toks[:lparen - 1], named=False)
+        params = toks[lparen + 1:-1]
+
+        self.api.funcs[name] = (
+            (btype, nptr),
+            [p for p in [self.param(part) for part in self.split(params, ",")] if p]
+        )
+
+class Emitter(object):
+    """Emit the ctypes module from the collected API"""
+
+    def __init__(self, api):
+        self.api = api
+        self.lines = []
+
+    def ctype(self, btype, nptr, dims=None, is_arg=False):
+        """Returns the ctypes expression for a type"""
+
+        kind, name = btype
+        expr = None
+
+        if kind in ["struct", "union"]:
+            if name in self.api.records:
+                expr = name
+            else:   # Opaque handles are passed around as void pointers
+                expr = None
+                nptr = max(nptr, 1)
+        elif kind == "record":
+            expr = name
+        elif kind == "enum":
+            expr = "ctypes.c_int"
+        elif name in self.api.callbacks:
+            expr = name
+        elif name in ["char"] and nptr:
+            expr = "ctypes.c_char_p"
+            nptr -= 1
+        elif name in CTYPES:
+            expr = CTYPES[name]
+        else:
+            raise ValueError("Unhandled type: %r" % (btype,))
+
+        if expr is None and nptr:   # void *, FILE *, opaque *
+            expr = "ctypes.c_void_p"
+            nptr -= 1
+
+        for _ in range(nptr):
+            expr = "ctypes.POINTER(%s)" % expr
+
+        for dim in reversed(dims or []):
+            expr = "%s * %d" % (expr, dim) if " " not in expr else "(%s) * %d" % (expr, dim)
+
+        if is_arg and expr and "*" in expr:
+            expr = "ctypes.POINTER(%s)" % expr.split(" * ")[0].strip("()")
+
+        return expr
+
+    def emit(self, line=""):
+        """Append 'line' to the output"""
+
+        self.lines.append(line)
+
+    def records_ordered(self):
+        """Returns the records ordered such that by-value dependencies come first"""
+
+        order = []
+        visiting = set()
+
+        def visit(name):
+            if name in order or name in visiting:
+                return
+            visiting.add(name)
+            for _, btype, nptr, _, _, _ in self.api.records[name]["members"]:
+                if nptr or btype[0] not in ["struct", "union", "record"]:
+                    continue
+                if btype[1] in self.api.records:
+                    visit(btype[1])
+            visiting.discard(name)
+            order.append(name)
+
+        for name in sorted(self.api.records):
+            visit(name)
+
+        return order
+
+    def generate(self):
+        """Returns the source of the ctypes module"""
+
+        self.emit(HEADER % {
+            "headers": "\n".join("    * %s" % hdr for hdr in self.api.headers)
+        })
+
+        for name in sorted(self.api.consts):
+            self.emit("%s = %d" % (name, self.api.consts[name]))
+        self.emit()
+
+        for name in sorted(self.api.enums):
+            self.emit("%s = {" % name)
+            for member, value in self.api.enums[name]:
+                self.emit("    %d: \"%s\"," % (value, member))
+            self.emit("}")
+        self.emit()
+
+        for name in sorted(self.api.records):
+            rec = self.api.records[name]
+            self.emit()
+            self.emit("class %s(ctypes.%s):" % (
+                name, "Structure" if rec["kind"] == "struct" else "Union"
+            ))
+            self.emit("    \"\"\"%s %s\"\"\"" % (
+                rec["kind"], name) if not name.startswith("_") else "    pass")
+        self.emit()
+
+        for name in sorted(self.api.callbacks):
+            (ret, params) = self.api.callbacks[name]
+            self.emit("%s = ctypes.CFUNCTYPE(%s)" % (name, ", ".join(
+                [str(self.ctype(*ret))] + [self.ctype(*p, is_arg=True) for p in params]
+            )))
+        self.emit()
+
+        for name in self.records_ordered():
+            rec = self.api.records[name]
+            self.emit()
+            if rec["packed"]:
+                self.emit("%s._pack_ = 1" % name)
+            anon = [pyname(m[0]) for m in rec["members"] if m[5]]
+            if anon:
+                self.emit("%s._anonymous_ = [%s]" % (
+                    name, ", ".join("\"%s\"" % m for m in anon)
+                ))
+            self.emit("%s._fields_ = [" % name)
+            for mname, btype, nptr, dims, bits, _ in rec["members"]:
+                expr = self.ctype(btype, nptr, dims)
+                if bits is not None:
+                    self.emit("    (\"%s\", %s, %d)," % (pyname(mname), expr, bits))
+                else:
+                    self.emit("    (\"%s\", %s)," % (pyname(mname), expr))
+            self.emit("]")
+        self.emit()
+
+        self.emit("SIZES = {")
+        for name in sorted(self.api.sizes):
+            if name in self.api.records:
+                self.emit("    \"%s\": %d," % (name, self.api.sizes[name]))
+        self.emit("}")
+        self.emit()
+
+        self.emit("PROTOTYPES = {")
+        for name in sorted(self.api.funcs):
+            ret, params = self.api.funcs[name]
+            if any(p[0] == ("base", "...") for p in params):
+                logging.info("Skipping variadic: %r", name)
+                continue
+            self.emit("    \"%s\": (%s, [%s])," % (
+                name,
+                self.ctype(*ret),
+                ", ".join(self.ctype(*p, is_arg=True) for p in params)
+            ))
+        self.emit("}")
+
+        self.emit(LOAD.rstrip("\n"))
+
+        return "\n".join(self.lines) + "\n"
+
+def verify(path):
+    """Import the generated module and check sizes against the static asserts"""
+
+    namespace = {}
+    with open(path) as gfd:
+        exec(compile(gfd.read(), path, "exec"), namespace)
+
+    nerr = 0
+    for name, size in sorted(namespace["SIZES"].items()):
+        actual = ctypes.sizeof(namespace[name])
+        if actual != size:
+            logging.error("sizeof(%s): %d != %d", name, actual, size)
+            nerr += 1
+
+    return nerr
+
+def main(args):
+    """Generate the ctypes-bindings"""
+
+    api = Api()
+    for path in args.headers:
+        logging.info("Parsing: %r", path)
+        with open(path) as hfd:
+            Parser(api, hfd.read()).parse()
+        api.headers.append(os.path.basename(path))
+
+    with open(args.output, "w") as ofd:
+        ofd.write(Emitter(api).generate())
+
+    logging.info("Emitted: %r", args.output)
+
+    return verify(args.output)
+
+if __name__ == "__main__":
+    sys.exit(main(setup()))
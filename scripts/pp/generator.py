@@ -1,11 +1,20 @@
 #!/usr/bin/env python3
 """
     Generate pretty-print helper-functions _yaml, _fpr, _pr, _str for enums and structs.
+
+    With --py-output, then instead of the C helpers, a Python module is emitted
+    with a _to_dict() function per struct of the format declaration, returning
+    the members printed by the C helpers as Python values, read from the ctypes
+    Structures of pyxnvme, thus without a round trip through YAML.
 """
 from __future__ import print_function
 from subprocess import Popen, PIPE
 import argparse
+import builtins
+import ctypes
+import keyword
 import logging
+import re
 import sys
 import os
 try:
@@ -134,6 +143,146 @@ def tags_to_declr(args, tags):
         "src_path": src_path,
     }
 
+def pyname(name):
+    """Returns 'name' usable as a Python identifier, as done by scripts/ctypes_generator.py"""
+
+    return "%s_" % name if keyword.iskeyword(name) else name
+
+def load_ctypes(path):
+    """Returns the namespace of the ctypes module at 'path', e.g. pyxnvme/xnvme/libxnvme.py"""
+
+    namespace = {"__name__": "libxnvme"}
+    with open(path) as cfd:
+        exec(compile(cfd.read(), path, "exec"), namespace)  # pylint: disable=exec-used
+
+    return namespace
+
+def field_type(cls, name):
+    """Returns the ctype of the member 'name' of 'cls', searching anonymous members"""
+
+    for field in getattr(cls, "_fields_", []):
+        if field[0] == name:
+            return field[1]
+
+    for anon in getattr(cls, "_anonymous_", []):
+        ftype = field_type(field_type(cls, anon), name)
+        if ftype is not None:
+            return ftype
+
+    return None
+
+def py_value(ctype, ref):
+    """Returns the Python expression of the value of 'ref', a member of type 'ctype'"""
+
+    if issubclass(ctype, ctypes.Array) and ctype._type_ in (ctypes.c_char, ctypes.c_int8):
+        return "string(%s)" % ref
+    if ctype is ctypes.c_char_p:
+        return "string(%s)" % ref
+    if issubclass(ctype, ctypes._SimpleCData):  # pylint: disable=protected-access
+        return ref
+
+    return "value(%s)" % ref
+
+def py_dict(ctype, fmt, ref):
+    """
+    Returns the Python expression of a dict of the members, in 'fmt', of 'ref'
+    of type 'ctype', or of all of its members when none of 'fmt' are found
+    """
+
+    subs = [
+        (sub, field_type(ctype, pyname(sub))) for sub in fmt
+        if field_type(ctype, pyname(sub)) is not None
+    ]
+    if not subs:
+        return "value(%s)" % ref
+
+    return "{%s}" % ", ".join(
+        "\"%s\": %s" % (sub, py_value(stype, "%s.%s" % (ref, pyname(sub))))
+        for sub, stype in subs
+    )
+
+def py_obj(struct):
+    """Returns the name of the argument of the _to_dict() of 'struct', not shadowing a builtin"""
+
+    return "%s_" % struct["obj"] if hasattr(builtins, struct["obj"]) else struct["obj"]
+
+def py_members(struct, cls, namespace):
+    """
+    Returns the (key, expression) tuples of the members of the format
+    declaration 'struct', as Python expressions on the ctypes Structure 'cls'
+    given as the argument 'obj' of the struct
+
+    Members of the declaration which are not members of 'cls', e.g. computed
+    from arguments other than the struct, are left out.
+    """
+
+    obj = py_obj(struct)
+    members = []
+    keys = set()
+
+    for field, fmt in (struct.get("members") or {}).items():
+        field = str(field)
+        name = field.split("[")[0].split("?")[0]
+        ftype = field_type(cls, pyname(name))
+        if ftype is None or name in keys or name == "add_info" or "yaml" in field:
+            logging.info("Skipping: %s.%s", struct["name"], field)
+            continue
+        if isinstance(fmt, str) and fmt.strip() == "none":
+            continue
+
+        ref = "%s.%s" % (obj, pyname(name))
+        count = field.split("]")[1] if "]" in field else ""
+        count = re.sub(r"^%s->" % struct["obj"], "%s." % obj, count)
+
+        if isinstance(fmt, dict) and "mem_val" in fmt:
+            continue
+        elif isinstance(fmt, dict) and issubclass(ftype, ctypes.Array):
+            expr = "[%s for item in %s[:%s]]" % (
+                py_dict(ftype._type_, fmt, "item"), ref, count or len(ftype)
+            )
+        elif isinstance(fmt, dict):
+            expr = py_dict(ftype, fmt, ref)
+        elif isinstance(fmt, str) and fmt.endswith("_str") and fmt[:-4] in namespace:
+            expr = "enum(libxnvme.%s, %s)" % (fmt[:-4], ref)
+        elif fmt == "%*s" and "%s_state" % struct["name"].split("_descr")[0] in namespace:
+            expr = "enum(libxnvme.%s_state, %s)" % (struct["name"].split("_descr")[0], ref)
+        elif isinstance(fmt, str) and re.match(r"%-?(\.\*)?s$", fmt.split(":")[0]):
+            expr = "string(%s)" % ref
+        elif isinstance(fmt, str) and fmt.endswith("bytes2double"):
+            expr = "uint(%s)" % ref
+        elif count and not count.isdigit() and not count.startswith("%s." % obj):
+            continue
+        elif count and not count.isdigit():
+            expr = "[value(item) for item in %s[:%s]]" % (ref, count)
+        else:
+            expr = py_value(ftype, ref)
+
+        keys.add(name)
+        members.append((name, expr))
+
+    return members
+
+def py_declr(args, fmt):
+    """Returns the declarations of the _to_dict() functions of the structs in 'fmt'"""
+
+    namespace = load_ctypes(args.py_ctypes)
+
+    declr = []
+    for struct in fmt["structs_1"] + fmt["structs_2"]:
+        cls = namespace.get(struct["name"])
+        if not isinstance(cls, type) or not issubclass(cls, (ctypes.Structure, ctypes.Union)):
+            logging.info("Skipping: %s, not a ctypes struct", struct["name"])
+            continue
+        if struct.get("switch") or struct.get("yaml_args"):
+            logging.info("Skipping: %s, not printed from the struct", struct["name"])
+            continue
+
+        members = py_members(struct, cls, namespace)
+        if members:
+            declr.append({"name": struct["name"], "obj": py_obj(struct), "members": members})
+
+    return declr
+
 def setup():
     """Parse command-line arguments for generator and setup logger"""
 
@@ -143,7 +292,6 @@ def setup():
     )
     prsr.add_argument(
         "--hdr-file",
-        required=True,
         help="Path to the header-filer to generate pp-helpers for"
     )
     prsr.add_argument(
@@ -172,6 +320,19 @@ def setup():
         help="Path to directory in which to emit pp-source-file",
         default=os.sep.join(["."])
     )
+    prsr.add_argument(
+        "--py-output",
+        help="Path of the Python module to emit, instead of the C pp-helpers",
+        default=None
+    )
+    prsr.add_argument(
+        "--py-ctypes",
+        help="Path to the ctypes-bindings read by the Python module",
+        default=os.sep.join([
+            os.path.dirname(os.path.abspath(__file__)), "..", "..", "pyxnvme", "xnvme",
+            "libxnvme.py"
+        ])
+    )
     prsr.add_argument(
         "--log-level",
         help="log-devel",
@@ -180,8 +341,13 @@ def setup():
     )
 
     args = prsr.parse_args()
+    if not args.hdr_file and not args.py_output:
+        prsr.error("one of --hdr-file or --py-output is required")
+
     args.fmt = expand_path(args.fmt)
-    args.hdr_file = expand_path(args.hdr_file)
+    args.hdr_file = expand_path(args.hdr_file) if args.hdr_file else None
+    args.py_output = expand_path(args.py_output) if args.py_output else None
+    args.py_ctypes = expand_path(args.py_ctypes)
     args.templates = expand_path(args.templates)
     args.hdr_output = expand_path(args.hdr_output)
     args.src_output = expand_path(args.src_output)
@@ -196,6 +362,17 @@ def setup():
 def main(args):
     """Generate pp-helper functions"""
 
+    if args.py_output:
+        fmt = yaml.load(open(args.fmt), Loader=yaml.Loader)
+        tmpl_env = jinja2.Environment(
+            loader=jinja2.FileSystemLoader(searchpath=args.templates)
+        )
+        with open(args.py_output, "w") as pfd:
+            pfd.write(tmpl_env.get_template("pp-python.jinja").render(
+                declr=py_declr(args, fmt), fmt_fname=os.path.basename(args.fmt)
+            ))
+        return 0
+
     ctags_fpath = "/tmp/ctags"
 
     # Run ctags on the given header-file